@@ -1,12 +1,14 @@
 """Sand Fall (Bext Version), by Al Sweigart al@inventwithpython.com
 
 A falling sand animation. (Must be run from a Terminal.)
+The sand is moved by the sandengine.py module, and only the rows that
+changed are redrawn.
 Inspired by https://asciinema.org/a/6515"""
 __version__ = 1
 
 # This program MUST be run in a Terminal/Command Prompt window.
 
-import random, time, sys
+import random, time, sys, os
 
 try:
     import bext
@@ -21,13 +23,13 @@ or a Command Prompt window (on Windows) and running:
     python -m pip install --user bext''')
     sys.exit()
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'gamesbyexample'))
+import sandengine  # Imports the sandengine.py program.
+
 WIDTH = 80
 HEIGHT = 25
 
-X = 0
-Y = 1
 PAUSE_LENGTH = 0.0
-SAND = chr(9617) # Character 9617 is '░'
 
 sources = [{'x': WIDTH // 2, 'y': 0, 'frequency': random.randint(2, 6), 'next': 1},
            {'x': 10, 'y': 0, 'frequency': random.randint(2, 6), 'next': 1},
@@ -36,50 +38,23 @@ sources = [{'x': WIDTH // 2, 'y': 0, 'frequency': random.randint(2, 6), 'next':
 bext.fg('yellow')
 bext.clear()
 
-allSand = []
+grid = sandengine.SandGrid(WIDTH, HEIGHT)
 while True: # Main program loop.
     # Generate sand from each source.
     for source in sources:
-        if source['next'] <= 0 and (source['x'], source['y']) not in allSand:
-            allSand.append((source['x'], source['y']))
-            bext.goto(source['x'], source['y'])
-            print(SAND, end='')
-
+        if source['next'] <= 0 and grid.addGrain(source['x'], source['y']):
             source['next'] = source['frequency']
         source['next'] -= 1
 
     # Simulate all sand in the sandspace:
-    for i, sand in enumerate(allSand):
-        if sand[Y] == HEIGHT - 1:
-            continue # Sand is on the very bottom, so it won't move at all.
-
-        # If nothing is under this sand, move it down:
-        if (sand[X], sand[Y] + 1) not in allSand:
-            allSand[i] = (sand[X], sand[Y] + 1)
-            bext.goto(sand[X], sand[Y])
-            print(' ', end='')
-            bext.goto(sand[X], sand[Y] + 1)
-            print(SAND, end='')
-        else:
-            canFallLeft  = ((sand[X] - 1, sand[Y] + 1) not in allSand) and (sand[X] > 0)
-            canFallRight = ((sand[X] + 1, sand[Y] + 1) not in allSand) and (sand[X] < WIDTH - 1)
-
-            if canFallLeft and canFallRight:
-                fallingDirection = random.choice((-1, 1))
-            elif canFallLeft and not canFallRight:
-                fallingDirection = -1
-            elif not canFallLeft and canFallRight:
-                fallingDirection = 1
-            else:
-                continue
-
-            allSand[i] = (sand[X] + fallingDirection, sand[Y] + 1)
-            bext.goto(sand[X], sand[Y])
-            print(' ', end='')
-            bext.goto(sand[X] + fallingDirection, sand[Y] + 1)
-            print(SAND, end='')
+    grid.step()
+
+    # Redraw only the rows that changed:
+    for y in range(HEIGHT):
+        if grid.changedRows[y]:
+            bext.goto(0, y)
+            print(grid.getRowText(y), end='')
 
     sys.stdout.flush() # (Required for bext-using programs.)
-    # Draw the sand space on the screen:
     time.sleep(PAUSE_LENGTH)
     # At this point, go back to the start of the main program loop.
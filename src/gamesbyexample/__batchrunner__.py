@@ -0,0 +1,260 @@
+# Batch Runner
+# By Al Sweigart al@inventwithpython.com
+
+# Runs every program in PROGRAMS without anyone at the keyboard: each
+# program gets a scripted stdin, its output is captured, and it's
+# stopped once it runs out of time or prints too much. The wall time,
+# peak memory, and output size of each run is saved to a JSON report,
+# which can be compared against an earlier report to find slowdowns.
+#
+# Run __generatehashes__.py first to create __programdata__.py, then:
+#   python __batchrunner__.py                      (run everything)
+#   python __batchrunner__.py bagels.py hangman.py (run some programs)
+#   python __batchrunner__.py --baseline old.json  (compare to a report)
+
+import argparse, concurrent.futures, json, os, signal, subprocess, sys, threading, time
+
+FOLDER_OF_THIS_FILE = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_TIME_BUDGET = 5.0  # Seconds before a program is stopped.
+DEFAULT_OUTPUT_BUDGET = 1000000  # Bytes of output before a program is stopped.
+DEFAULT_REPORT_FILENAME = '__batchreport__.json'
+
+# Most programs are given a mix of common answers, and then stdin is
+# closed, which makes any further input() call raise EOFError:
+DEFAULT_INPUT = '\n1\ny\n5\nn\nquit\n' * 10
+
+# Programs that need particular answers to get past their first
+# questions. Keys=filenames, values=stdin text:
+SCRIPTED_INPUTS = {
+    'birthdayparadox.py': '23\n\n',
+    'collatz.py': '27\n',
+    'collatzstats.py': '1-100000\nY\n',
+    'coinflipsimulator.py': '10000\n',
+    'milliondicestats.py': '2\n',
+    'primenumbers.py': '1000000000000\n\n',
+    'sudoku.py': 'hint\n' * 60 + 'quit\n',
+}
+
+# These are set for every program, so animations see an 80 x 25
+# terminal and Pygame games run without opening a window:
+PROGRAM_ENVIRONMENT = {
+    'COLUMNS': '80',
+    'LINES': '25',
+    'PYTHONIOENCODING': 'utf-8',
+    'SDL_VIDEODRIVER': 'dummy',
+    'SDL_AUDIODRIVER': 'dummy',
+    'PYGAME_HIDE_SUPPORT_PROMPT': '1',
+}
+
+
+def _readOutput(stream, result, countKey, tailKey, outputBudget, process):
+    """Read everything from stream, counting the bytes in
+    result[countKey] and keeping the last 2000 bytes in result[tailKey]
+    (if tailKey isn't None). Stops the process if it goes over
+    outputBudget bytes."""
+    tail = b''
+    while True:
+        data = stream.read1(65536) if hasattr(stream, 'read1') else stream.read(65536)
+        if not data:
+            break
+        result[countKey] += len(data)
+        tail = (tail + data)[-2000:]
+        if outputBudget is not None and result[countKey] > outputBudget and result['status'] is None:
+            result['status'] = 'output budget'
+            _killProcess(process)
+    if tailKey is not None:
+        result[tailKey] = tail.decode('utf-8', 'replace')
+
+
+def _killProcess(process):
+    """Stop process if it's still running."""
+    if process.returncode is not None:
+        return  # The process has already been waited on.
+    if hasattr(os, 'wait4'):
+        # Popen.kill() calls waitpid() first, which would take the exit
+        # status and memory use that _waitForProcess() needs:
+        try:
+            os.kill(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        process.kill()
+
+
+def _waitForProcess(process, deadline):
+    """Wait for process to finish, killing it at deadline. Returns an
+    (exitCode, peakRssKb) tuple. peakRssKb is None where the operating
+    system can't report it."""
+    if not hasattr(os, 'wait4'):  # Windows can't get a child's memory use.
+        try:
+            process.wait(max(0, deadline - time.time()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        return process.returncode, None
+
+    while True:
+        pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        if pid != 0:
+            break
+        if time.time() > deadline:
+            _killProcess(process)
+            pid, status, rusage = os.wait4(process.pid, 0)
+            break
+        time.sleep(0.01)
+    # Tell the Popen object the process is done, so it won't wait again:
+    if os.WIFSIGNALED(status):
+        process.returncode = -os.WTERMSIG(status)
+    else:
+        process.returncode = os.WEXITSTATUS(status)
+
+    peakRssKb = rusage.ru_maxrss
+    if sys.platform == 'darwin':
+        peakRssKb //= 1024  # macOS reports bytes instead of kilobytes.
+    return process.returncode, peakRssKb
+
+
+def runProgram(filename, stdinText=None, timeBudget=DEFAULT_TIME_BUDGET,
+               outputBudget=DEFAULT_OUTPUT_BUDGET, folder=FOLDER_OF_THIS_FILE):
+    """Run the program filename (relative to folder) with stdinText as
+    its input, and return a dictionary describing how the run went."""
+    if stdinText is None:
+        stdinText = SCRIPTED_INPUTS.get(filename, DEFAULT_INPUT)
+    programPath = os.path.join(folder, filename)
+    environment = dict(os.environ)
+    environment.update(PROGRAM_ENVIRONMENT)
+
+    result = {'filename': filename, 'status': None, 'exitCode': None,
+              'wallTime': None, 'peakRssKb': None,
+              'outputBytes': 0, 'stderrBytes': 0}
+    startTime = time.time()
+    # Programs are run from their own folder, like the launcher does:
+    process = subprocess.Popen([sys.executable, programPath],
+                               cwd=os.path.dirname(programPath),
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, env=environment)
+
+    readers = [threading.Thread(target=_readOutput, args=(process.stdout, result, 'outputBytes', None, outputBudget, process)),
+               threading.Thread(target=_readOutput, args=(process.stderr, result, 'stderrBytes', 'stderrTail', None, process))]
+    for reader in readers:
+        reader.daemon = True
+        reader.start()
+    try:
+        process.stdin.write(stdinText.encode('utf-8'))
+        process.stdin.close()  # Later input() calls get EOFError.
+    except (BrokenPipeError, OSError):
+        pass  # The program ended without reading all of its input.
+
+    result['exitCode'], result['peakRssKb'] = _waitForProcess(process, startTime + timeBudget)
+    result['wallTime'] = round(time.time() - startTime, 3)
+    for reader in readers:
+        reader.join(1)
+
+    if result['status'] is None:
+        if result['wallTime'] >= timeBudget:
+            result['status'] = 'time budget'
+        elif result['exitCode'] == 0:
+            result['status'] = 'finished'
+        elif 'EOFError' in result.get('stderrTail', ''):
+            result['status'] = 'out of input'
+        else:
+            result['status'] = 'crashed'
+    # Only keep the error message of programs that crashed:
+    if result['status'] != 'crashed':
+        result.pop('stderrTail', None)
+    return result
+
+
+def runPrograms(filenames, numWorkers=None, timeBudget=DEFAULT_TIME_BUDGET,
+                outputBudget=DEFAULT_OUTPUT_BUDGET, folder=FOLDER_OF_THIS_FILE, verbose=True):
+    """Run each program in filenames over a pool of numWorkers threads
+    (each waiting on its own process), and return the report
+    dictionary."""
+    if numWorkers is None:
+        numWorkers = os.cpu_count() or 1
+    startTime = time.time()
+    results = []
+    with concurrent.futures.ThreadPoolExecutor(numWorkers) as pool:
+        futures = [pool.submit(runProgram, filename, None, timeBudget, outputBudget, folder)
+                   for filename in filenames]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if verbose:
+                print('%-32s %-14s %7.2fs %8s KB %9s bytes' % (
+                    result['filename'], result['status'], result['wallTime'],
+                    result['peakRssKb'], result['outputBytes']))
+    results.sort(key=lambda result: result['filename'])
+
+    statusCounts = {}  # Keys=statuses, values=how many programs had it.
+    for result in results:
+        statusCounts[result['status']] = statusCounts.get(result['status'], 0) + 1
+    return {'python': sys.version.split()[0], 'platform': sys.platform,
+            'timeBudget': timeBudget, 'outputBudget': outputBudget,
+            'totalWallTime': round(time.time() - startTime, 3),
+            'statusCounts': statusCounts, 'programs': results}
+
+
+def compareReports(report, baseline, threshold=0.25):
+    """Return a list of strings describing the programs that got slower,
+    used more memory, or changed status since the baseline report.
+    threshold is the fraction of change that's worth reporting."""
+    baselineResults = {result['filename']: result for result in baseline['programs']}
+    changes = []
+    for result in report['programs']:
+        old = baselineResults.get(result['filename'])
+        if old is None:
+            continue
+        if result['status'] != old['status']:
+            changes.append('%s: status changed from %s to %s' % (result['filename'], old['status'], result['status']))
+        # Time is only comparable for programs that finished by themselves:
+        if result['status'] == old['status'] != 'time budget' and old['wallTime'] > 0.1 and \
+           result['wallTime'] > old['wallTime'] * (1 + threshold):
+            changes.append('%s: wall time went from %.2fs to %.2fs' % (result['filename'], old['wallTime'], result['wallTime']))
+        if result['peakRssKb'] and old['peakRssKb'] and result['peakRssKb'] > old['peakRssKb'] * (1 + threshold):
+            changes.append('%s: peak RSS went from %s KB to %s KB' % (result['filename'], old['peakRssKb'], result['peakRssKb']))
+    return changes
+
+
+def getProgramFilenames():
+    """Return the filenames of every program in PROGRAMS."""
+    try:
+        from __programdata__ import PROGRAMS
+    except ImportError:
+        print('Run __generatehashes__.py first to create __programdata__.py.')
+        sys.exit(1)
+    return [program['filename'] for program in PROGRAMS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the programs without a keyboard and report how they did.')
+    parser.add_argument('programs', nargs='*', help='the programs to run (default: all of PROGRAMS)')
+    parser.add_argument('--time', type=float, default=DEFAULT_TIME_BUDGET, help='seconds each program may run')
+    parser.add_argument('--output', type=int, default=DEFAULT_OUTPUT_BUDGET, help='bytes each program may print')
+    parser.add_argument('--workers', type=int, default=None, help='how many programs to run at once')
+    parser.add_argument('--report', default=DEFAULT_REPORT_FILENAME, help='the JSON report file to write')
+    parser.add_argument('--baseline', default=None, help='an earlier JSON report to compare against')
+    args = parser.parse_args()
+
+    filenames = args.programs or getProgramFilenames()
+    report = runPrograms(filenames, args.workers, args.time, args.output)
+    with open(args.report, 'w', encoding='utf-8') as reportFile:
+        json.dump(report, reportFile, indent=2)
+    print()
+    print('Ran %s programs in %.1f seconds: %s' % (len(filenames), report['totalWallTime'],
+          ', '.join('%s %s' % (count, status) for status, count in sorted(report['statusCounts'].items()))))
+    print('Report saved to', args.report)
+
+    if args.baseline is not None:
+        with open(args.baseline, encoding='utf-8') as baselineFile:
+            changes = compareReports(report, json.load(baselineFile))
+        print()
+        print('%s changes since %s:' % (len(changes), args.baseline))
+        for change in changes:
+            print('  ' + change)
+
+
+if __name__ == '__main__':
+    os.chdir(FOLDER_OF_THIS_FILE)
+    main()
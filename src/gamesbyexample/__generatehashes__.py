@@ -1,32 +1,81 @@
 # This code reads in all the .py files to create the PROGRAMS list in __init__.py.
 # It copies the PROGRAMS dictionary to the clipboard to paste into this file.
 # It also generates the _originalFiles.zip file.
+#
+# Builds are incremental: the digest, zip CRC, and compressed data of
+# every file are cached in __buildcache__/, keyed by the file's SHA-256
+# digest. Only files whose size or modification time changed are read
+# again, and only content that has never been seen before is compressed
+# (in a process pool if there are many). The zip is then written in one
+# pass from the cached compressed data. The time each step took is saved
+# in __buildmanifest__.json.
+import concurrent.futures
+import hashlib
+import io
+import json
 import os
 import pprint
-import zipfile
+import struct
+import sys
+import time
 import zlib
 
-PROGRAMS = []
-
 SUPPORT_FILES = {
-    'mazerunner2d.py': ['maze11x11s1.txt', 'maze51x17s42.txt'],
-    'alphabetizewordquiz.py': ['commonenglishwords.txt'],
-    'hamsburger.py': ['nounlist.txt'],
+    'mazerunner2d.py': ['maze11x11s1.txt', 'maze51x17s42.txt', 'mazeengine.py'],
+    'mazerunner3d.py': ['maze11x11s1.txt', 'maze51x17s42.txt', 'mazeengine.py'],
+    'mazemakerrec.py': ['mazeengine.py'],
+    'alphabetizewordquiz.py': ['commonenglishwords.txt', 'wordindex.py'],
+    'hamsburger.py': ['nounlist.txt', 'wordindex.py'],
+    'hacking.py': ['sevenletterwords.txt', 'wordindex.py'],
+    'hangmanunfair.py': ['commonenglishwords.txt', 'evilhangman.py', 'wordindex.py'],
+    'caesarhacker.py': ['commonenglishwords.txt', 'cryptanalysis.py'],
+    'affinecipher.py': ['cipherstream.py', 'commonenglishwords.txt', 'cryptanalysis.py'],
+    'simplesubcipher.py': ['cipherstream.py', 'commonenglishwords.txt', 'cryptanalysis.py'],
+    'vigenerecipher.py': ['cipherstream.py', 'commonenglishwords.txt', 'cryptanalysis.py'],
+    'caesarcipher.py': ['cipherstream.py'],
+    'rot13cipher.py': ['cipherstream.py'],
+    'railfencecipher.py': ['cipherstream.py'],
+    'morsecode.py': ['cipherstream.py'],
+    'leetspeak.py': ['cipherstream.py'],
     'rushhour.py': ['rushhourpuzzles.txt'],
-    'sokoban.py': ['sokobanlevels.txt'],
-    'parkingvalet.py': ['parkingvaletpuzzles.txt'],
+    'sokoban.py': ['sokobanlevels.txt', 'sokobansolver.py'],
+    'parkingvalet.py': ['parkingvaletpuzzles.txt', 'parkingvaletsolver.py'],
     #'stickyhands.py': ['stickyhandslevels.txt'],
     'periodictable.py': ['periodictable.csv'],
     #'mazerunnerhtml.py': ['maze11x11s1', 'maze_html_images', 'maze_html_images/A.jpg', 'maze_html_images/AB.jpg', 'maze_html_images/ABC.jpg', 'maze_html_images/ABCD.jpg', 'maze_html_images/ABCDE.jpg', 'maze_html_images/ABCDEF.jpg', 'maze_html_images/ABCDEF_exitback.jpg', 'maze_html_images/ABCDEF_exitleft.jpg', 'maze_html_images/ABCDEF_exitright.jpg', 'maze_html_images/ABCDE_exitback.jpg', 'maze_html_images/ABCDE_exitleft.jpg', 'maze_html_images/ABCDE_exitright.jpg', 'maze_html_images/ABCDF.jpg', 'maze_html_images/ABCDF_exitback.jpg', 'maze_html_images/ABCDF_exitleft.jpg', 'maze_html_images/ABCDF_exitright.jpg', 'maze_html_images/ABCD_exitback.jpg', 'maze_html_images/ABCD_exitleft.jpg', 'maze_html_images/ABCD_exitright.jpg', 'maze_html_images/ABCE.jpg', 'maze_html_images/ABCEF.jpg', 'maze_html_images/ABCEF_exitback.jpg', 'maze_html_images/ABCEF_exitleft.jpg', 'maze_html_images/ABCEF_exitright.jpg', 'maze_html_images/ABCE_exitback.jpg', 'maze_html_images/ABCE_exitleft.jpg', 'maze_html_images/ABCE_exitright.jpg', 'maze_html_images/ABCF.jpg', 'maze_html_images/ABCF_exitback.jpg', 'maze_html_images/ABCF_exitleft.jpg', 'maze_html_images/ABCF_exitright.jpg', 'maze_html_images/ABC_exitback.jpg', 'maze_html_images/ABC_exitleft.jpg', 'maze_html_images/ABC_exitright.jpg', 'maze_html_images/ABD.jpg', 'maze_html_images/ABDE.jpg', 'maze_html_images/ABDEF.jpg', 'maze_html_images/ABDEF_exitback.jpg', 'maze_html_images/ABDEF_exitleft.jpg', 'maze_html_images/ABDEF_exitright.jpg', 'maze_html_images/ABDE_exitback.jpg', 'maze_html_images/ABDE_exitleft.jpg', 'maze_html_images/ABDE_exitright.jpg', 'maze_html_images/ABDF.jpg', 'maze_html_images/ABDF_exitback.jpg', 'maze_html_images/ABDF_exitleft.jpg', 'maze_html_images/ABDF_exitright.jpg', 'maze_html_images/ABD_exitback.jpg', 'maze_html_images/ABD_exitleft.jpg', 'maze_html_images/ABD_exitright.jpg', 'maze_html_images/ABE.jpg', 'maze_html_images/ABEF.jpg', 'maze_html_images/ABEF_exitback.jpg', 'maze_html_images/ABEF_exitleft.jpg', 'maze_html_images/ABEF_exitright.jpg', 'maze_html_images/ABE_exitback.jpg', 'maze_html_images/ABE_exitleft.jpg', 'maze_html_images/ABE_exitright.jpg', 'maze_html_images/ABF.jpg', 'maze_html_images/ABF_exitback.jpg', 'maze_html_images/ABF_exitleft.jpg', 'maze_html_images/ABF_exitright.jpg', 'maze_html_images/AB_exitback.jpg', 'maze_html_images/AB_exitleft.jpg', 'maze_html_images/AB_exitright.jpg', 'maze_html_images/AC.jpg', 'maze_html_images/ACD.jpg', 'maze_html_images/ACDE.jpg', 'maze_html_images/ACDEF.jpg', 'maze_html_images/ACDEF_exitback.jpg', 'maze_html_images/ACDEF_exitleft.jpg', 'maze_html_images/ACDEF_exitright.jpg', 'maze_html_images/ACDE_exitback.jpg', 'maze_html_images/ACDE_exitleft.jpg', 'maze_html_images/ACDE_exitright.jpg', 'maze_html_images/ACDF.jpg', 'maze_html_images/ACDF_exitback.jpg', 'maze_html_images/ACDF_exitleft.jpg', 'maze_html_images/ACDF_exitright.jpg', 'maze_html_images/ACD_exitback.jpg', 'maze_html_images/ACD_exitleft.jpg', 'maze_html_images/ACD_exitright.jpg', 'maze_html_images/ACE.jpg', 'maze_html_images/ACEF.jpg', 'maze_html_images/ACEF_exitback.jpg', 'maze_html_images/ACEF_exitleft.jpg', 'maze_html_images/ACEF_exitright.jpg', 'maze_html_images/ACE_exitback.jpg', 'maze_html_images/ACE_exitleft.jpg', 'maze_html_images/ACE_exitright.jpg', 'maze_html_images/ACF.jpg', 'maze_html_images/ACF_exitback.jpg', 'maze_html_images/ACF_exitleft.jpg', 'maze_html_images/ACF_exitright.jpg', 'maze_html_images/AC_exitback.jpg', 'maze_html_images/AC_exitleft.jpg', 'maze_html_images/AC_exitright.jpg', 'maze_html_images/AD.jpg', 'maze_html_images/ADE.jpg', 'maze_html_images/ADEF.jpg', 'maze_html_images/ADEF_exitback.jpg', 'maze_html_images/ADEF_exitleft.jpg', 'maze_html_images/ADEF_exitright.jpg', 'maze_html_images/ADE_exitback.jpg', 'maze_html_images/ADE_exitleft.jpg', 'maze_html_images/ADE_exitright.jpg', 'maze_html_images/ADF.jpg', 'maze_html_images/ADF_exitback.jpg', 'maze_html_images/ADF_exitleft.jpg', 'maze_html_images/ADF_exitright.jpg', 'maze_html_images/AD_exitback.jpg', 'maze_html_images/AD_exitleft.jpg', 'maze_html_images/AD_exitright.jpg', 'maze_html_images/AE.jpg', 'maze_html_images/AEF.jpg', 'maze_html_images/AEF_exitback.jpg', 'maze_html_images/AEF_exitleft.jpg', 'maze_html_images/AEF_exitright.jpg', 'maze_html_images/AE_exitback.jpg', 'maze_html_images/AE_exitleft.jpg', 'maze_html_images/AE_exitright.jpg', 'maze_html_images/AF.jpg', 'maze_html_images/AF_exitback.jpg', 'maze_html_images/AF_exitleft.jpg', 'maze_html_images/AF_exitright.jpg', 'maze_html_images/A_exitback.jpg', 'maze_html_images/A_exitleft.jpg', 'maze_html_images/A_exitright.jpg', 'maze_html_images/B.jpg', 'maze_html_images/BC.jpg', 'maze_html_images/BCD.jpg', 'maze_html_images/BCDE.jpg', 'maze_html_images/BCDEF.jpg', 'maze_html_images/BCDEF_exitback.jpg', 'maze_html_images/BCDEF_exitleft.jpg', 'maze_html_images/BCDEF_exitright.jpg', 'maze_html_images/BCDE_exitback.jpg', 'maze_html_images/BCDE_exitleft.jpg', 'maze_html_images/BCDE_exitright.jpg', 'maze_html_images/BCDF.jpg', 'maze_html_images/BCDF_exitback.jpg', 'maze_html_images/BCDF_exitleft.jpg', 'maze_html_images/BCDF_exitright.jpg', 'maze_html_images/BCD_exitback.jpg', 'maze_html_images/BCD_exitleft.jpg', 'maze_html_images/BCD_exitright.jpg', 'maze_html_images/BCE.jpg', 'maze_html_images/BCEF.jpg', 'maze_html_images/BCEF_exitback.jpg', 'maze_html_images/BCEF_exitleft.jpg', 'maze_html_images/BCEF_exitright.jpg', 'maze_html_images/BCE_exitback.jpg', 'maze_html_images/BCE_exitleft.jpg', 'maze_html_images/BCE_exitright.jpg', 'maze_html_images/BCF.jpg', 'maze_html_images/BCF_exitback.jpg', 'maze_html_images/BCF_exitleft.jpg', 'maze_html_images/BCF_exitright.jpg', 'maze_html_images/BC_exitback.jpg', 'maze_html_images/BC_exitleft.jpg', 'maze_html_images/BC_exitright.jpg', 'maze_html_images/BD.jpg', 'maze_html_images/BDE.jpg', 'maze_html_images/BDEF.jpg', 'maze_html_images/BDEF_exitback.jpg', 'maze_html_images/BDEF_exitleft.jpg', 'maze_html_images/BDEF_exitright.jpg', 'maze_html_images/BDE_exitback.jpg', 'maze_html_images/BDE_exitleft.jpg', 'maze_html_images/BDE_exitright.jpg', 'maze_html_images/BDF.jpg', 'maze_html_images/BDF_exitback.jpg', 'maze_html_images/BDF_exitleft.jpg', 'maze_html_images/BDF_exitright.jpg', 'maze_html_images/BD_exitback.jpg', 'maze_html_images/BD_exitleft.jpg', 'maze_html_images/BD_exitright.jpg', 'maze_html_images/BE.jpg', 'maze_html_images/BEF.jpg', 'maze_html_images/BEF_exitback.jpg', 'maze_html_images/BEF_exitleft.jpg', 'maze_html_images/BEF_exitright.jpg', 'maze_html_images/BE_exitback.jpg', 'maze_html_images/BE_exitleft.jpg', 'maze_html_images/BE_exitright.jpg', 'maze_html_images/BF.jpg', 'maze_html_images/BF_exitback.jpg', 'maze_html_images/BF_exitleft.jpg', 'maze_html_images/BF_exitright.jpg', 'maze_html_images/B_exitback.jpg', 'maze_html_images/B_exitleft.jpg', 'maze_html_images/B_exitright.jpg', 'maze_html_images/C.jpg', 'maze_html_images/CD.jpg', 'maze_html_images/CDE.jpg', 'maze_html_images/CDEF.jpg', 'maze_html_images/CDEF_exitback.jpg', 'maze_html_images/CDEF_exitleft.jpg', 'maze_html_images/CDEF_exitright.jpg', 'maze_html_images/CDE_exitback.jpg', 'maze_html_images/CDE_exitleft.jpg', 'maze_html_images/CDE_exitright.jpg', 'maze_html_images/CDF.jpg', 'maze_html_images/CDF_exitback.jpg', 'maze_html_images/CDF_exitleft.jpg', 'maze_html_images/CDF_exitright.jpg', 'maze_html_images/CD_exitback.jpg', 'maze_html_images/CD_exitleft.jpg', 'maze_html_images/CD_exitright.jpg', 'maze_html_images/CE.jpg', 'maze_html_images/CEF.jpg', 'maze_html_images/CEF_exitback.jpg', 'maze_html_images/CEF_exitleft.jpg', 'maze_html_images/CEF_exitright.jpg', 'maze_html_images/CE_exitback.jpg', 'maze_html_images/CE_exitleft.jpg', 'maze_html_images/CE_exitright.jpg', 'maze_html_images/CF.jpg', 'maze_html_images/CF_exitback.jpg', 'maze_html_images/CF_exitleft.jpg', 'maze_html_images/CF_exitright.jpg', 'maze_html_images/C_exitback.jpg', 'maze_html_images/C_exitleft.jpg', 'maze_html_images/C_exitright.jpg', 'maze_html_images/D.jpg', 'maze_html_images/DE.jpg', 'maze_html_images/DEF.jpg', 'maze_html_images/DEF_exitback.jpg', 'maze_html_images/DEF_exitleft.jpg', 'maze_html_images/DEF_exitright.jpg', 'maze_html_images/DE_exitback.jpg', 'maze_html_images/DE_exitleft.jpg', 'maze_html_images/DE_exitright.jpg', 'maze_html_images/DF.jpg', 'maze_html_images/DF_exitback.jpg', 'maze_html_images/DF_exitleft.jpg', 'maze_html_images/DF_exitright.jpg', 'maze_html_images/D_exitback.jpg', 'maze_html_images/D_exitleft.jpg', 'maze_html_images/D_exitright.jpg', 'maze_html_images/E.jpg', 'maze_html_images/EF.jpg', 'maze_html_images/EF_exitback.jpg', 'maze_html_images/EF_exitleft.jpg', 'maze_html_images/EF_exitright.jpg', 'maze_html_images/E_exitback.jpg', 'maze_html_images/E_exitleft.jpg', 'maze_html_images/E_exitright.jpg', 'maze_html_images/F.jpg', 'maze_html_images/forward.png', 'maze_html_images/F_exitback.jpg', 'maze_html_images/F_exitleft.jpg', 'maze_html_images/F_exitright.jpg', 'maze_html_images/OPEN.jpg', 'maze_html_images/OPEN_exitback.jpg', 'maze_html_images/OPEN_exitleft.jpg', 'maze_html_images/OPEN_exitright.jpg', 'maze_html_images/turn_left.png', 'maze_html_images/turn_right.png'],
-    'sudoku.py': ['sudokupuzzles.txt'],
+    'sudoku.py': ['sudokupuzzles.txt', 'sudokusolver.py'],
+    'conwaysgameoflife.py': ['lifeengine.py'],
+    'conwaysgameoflife2.py': ['hashlife.py', 'gosperglidergun.rle'],
+    'reversegam.py': ['reversiengine.py'],
+    'birthdayparadox.py': ['montecarlo.py'],
+    'montyhall.py': ['montecarlo.py'],
+    'milliondicestats.py': ['montecarlo.py'],
+    'coinflipsimulator.py': ['montecarlo.py'],
+    'primenumbers.py': ['primes.py'],
+    'ulamspiral.py': ['primes.py'],
+    'collatz.py': ['collatzengine.py'],
+    'collatzstats.py': ['collatzengine.py'],
+    'fireflies.py': ['framebuffer.py'],
+    'fishtank.py': ['framebuffer.py'],
+    'langtonsant.py': ['framebuffer.py', 'cellularautomata.py'],
+    'forestfiresim.py': ['framebuffer.py', 'cellularautomata.py'],
+    'bouncingdots.py': ['framebuffer.py'],
+    'shimmer.py': ['framebuffer.py'],
+    'rotatingcube.py': ['framebuffer.py'],
+    'analogclock.py': ['framebuffer.py'],
+    'slidingtilepuzzle.py': ['slidingtilesolver.py'],
+    'sandsimulator.py': ['sandengine.py'],
+    'twentyfortyeight.py': ['twentyfortyeightengine.py'],
     # Pygame games
     'pygame_games/flippy.py': [
         'pygame_games',
+        'reversiengine.py',
         'pygame_games/freesansbold.ttf',
         'pygame_games/flippyboard.png',
         'pygame_games/flippybackground.png',
     ],
     'pygame_games/fourinarow.py': [
+        'fourinarowengine.py',
         'pygame_games/4row_red.png',
         'pygame_games/4row_black.png',
         'pygame_games/4row_humanwinner.png',
@@ -70,7 +119,7 @@ SUPPORT_FILES = {
         'pygame_games/beep3.ogg',
         'pygame_games/beep4.ogg',
     ],
-    'pygame_games/slidepuzzle.py': ['pygame_games/freesansbold.ttf'],
+    'pygame_games/slidepuzzle.py': ['pygame_games/freesansbold.ttf', 'slidingtilesolver.py'],
     'pygame_games/squirrel.py': [
         'pygame_games/freesansbold.ttf',
         'pygame_games/gameicon.png',
@@ -125,7 +174,14 @@ IGNORE_FILES = [
     'zombiebitefight.py',
 ]
 
-origFilesZip = zipfile.ZipFile('_originalFiles.zip', 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9)
+CACHE_FOLDER = '__buildcache__'
+CACHE_INDEX_FILENAME = os.path.join(CACHE_FOLDER, 'index.json')
+MANIFEST_FILENAME = '__buildmanifest__.json'
+ZIP_FILENAME = '_originalFiles.zip'
+COMPRESS_LEVEL = 9
+# Starting worker processes takes a moment, so only use them when there
+# are at least this many files to read:
+MIN_FILES_FOR_POOL = 20
 
 
 # allFiles = os.listdir('.') + ['pygame_games/' + f for f in os.listdir('pygame_games')]
@@ -279,66 +335,243 @@ allFiles = [
     'waterbucket.py',
     'zigzag.py',
 ]
-allFiles.extend(['pygame_games/' + f for f in os.listdir('pygame_games')])
-
-pyflakesChecklist = []
-
-for filename in allFiles:
-    if not filename.endswith('.py') or filename.startswith('_') or filename in IGNORE_FILES:
-        continue
-
-    if 'pygame_games' not in filename:
-        # The pygame games have a lot of pyflakes false positives, so we'll skip them.
-        pyflakesChecklist.append(filename)
-
-    print('Processing', filename)
-
-    with open(filename, encoding='utf-8') as fo:
-        lines = fo.readlines()
-        content = ''.join(lines)
-        # Get the title from the first line's comment:
-        try:
-            name, credit = lines[0][3:].split(',')
-        except:
-            print('WARNING: Badly formed credit docstring in', filename)
-            name = lines[0]
-            # raise
-
-        # Get the description from the subsequent lines' comments:
-        descLines = []
-        for i in range(1, len(lines)):
-            if '"""' not in lines[i]:
-                descLines.append(lines[i])
+
+
+def getProgramEntry(filename, content):
+    """Return the PROGRAMS entry for the program filename, whose source
+    code is the string content."""
+    lines = io.StringIO(content).readlines()
+    # Get the title from the first line's comment:
+    try:
+        name, credit = lines[0][3:].split(',')
+    except:
+        print('WARNING: Badly formed credit docstring in', filename)
+        name = lines[0]
+        # raise
+
+    # Get the description from the subsequent lines' comments:
+    descLines = []
+    for i in range(1, len(lines)):
+        if '"""' not in lines[i]:
+            descLines.append(lines[i])
+        else:
+            descLines.append(lines[i].replace('"""', ''))
+            break
+    desc = ''.join(descLines)
+
+    # Remove "This and other games are available at https://nostarch.com/XX"
+    desc = desc.replace('This and other games are available at https://nostarch.com/XX\n', '')
+
+    # The hash is of the text with universal newlines, the same as the
+    # launcher gets when it reads the file in text mode:
+    hash = zlib.adler32(content.encode('utf-8'))
+
+    return {'filename': filename, 'name': name, 'desc': desc, 'hash': hash}
+
+
+def buildCacheEntry(filename, isProgram):
+    """Read filename and return its cache entry. If its content hasn't
+    been compressed before, compress it into the cache folder. This runs
+    in the worker processes."""
+    startTime = time.time()
+    with open(filename, 'rb') as fileObj:
+        data = fileObj.read()
+    digest = hashlib.sha256(data).hexdigest()
+    blobFilename = os.path.join(CACHE_FOLDER, digest + '.deflate')
+    if os.path.exists(blobFilename):
+        compressedSize = os.path.getsize(blobFilename)
+        compressed = False
+    else:
+        # Raw deflate data (no zlib header), the way zip files store it:
+        compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15)
+        compressedData = compressor.compress(data) + compressor.flush()
+        compressedSize = len(compressedData)
+        with open(blobFilename + '.%s.tmp' % os.getpid(), 'wb') as blobFile:
+            blobFile.write(compressedData)
+        os.replace(blobFilename + '.%s.tmp' % os.getpid(), blobFilename)
+        compressed = True
+
+    entry = {'digest': digest, 'crc': zlib.crc32(data), 'compressedSize': compressedSize,
+             'program': None}
+    if isProgram:
+        content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        entry['program'] = getProgramEntry(filename, content)
+    return entry, compressed, time.time() - startTime
+
+
+def _buildCacheEntryArgs(args):
+    return buildCacheEntry(*args)
+
+
+def getDosDateTime(timestamp):
+    """Return the (time, date) numbers a zip file uses for timestamp."""
+    t = time.localtime(timestamp)
+    year = min(max(t.tm_year, 1980), 2107)
+    return ((t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+            ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday)
+
+
+def writeZip(zipFilename, zipEntries, cache):
+    """Write the zip file in one pass, copying each file's compressed
+    data from the cache folder. zipEntries is a list of filenames (and
+    folder names) in the order they go in the zip. Returns the size of
+    the zip file."""
+    centralDirectory = []
+    madeBy = (0 if sys.platform == 'win32' else 3) << 8 | 20  # 0 is DOS, 3 is Unix.
+    with open(zipFilename + '.tmp', 'wb') as zipFile:
+        for name in zipEntries:
+            entry = cache[name]
+            dosTime, dosDate = getDosDateTime(entry['mtime'] / 1e9)
+            externalAttr = (entry['mode'] & 0xFFFF) << 16
+            if entry['digest'] is None:  # This is a folder.
+                arcname, method, crc, compressedSize, size = name + '/', 0, 0, 0, 0
+                externalAttr |= 0x10  # The MS-DOS folder flag.
             else:
-                descLines.append(lines[i].replace('"""', ''))
-                break
-        desc = ''.join(descLines)
+                arcname, method, crc = name, 8, entry['crc']
+                compressedSize, size = entry['compressedSize'], entry['size']
+            arcnameBytes = arcname.encode('utf-8')
+            flags = 0x800 if not arcname.isascii() else 0  # 0x800 means UTF-8 names.
+            offset = zipFile.tell()
+            zipFile.write(struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, flags, method, dosTime, dosDate,
+                                      crc, compressedSize, size, len(arcnameBytes), 0))
+            zipFile.write(arcnameBytes)
+            if entry['digest'] is not None:
+                with open(os.path.join(CACHE_FOLDER, entry['digest'] + '.deflate'), 'rb') as blobFile:
+                    zipFile.write(blobFile.read())
+            centralDirectory.append(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, madeBy, 20, flags, method,
+                                                dosTime, dosDate, crc, compressedSize, size,
+                                                len(arcnameBytes), 0, 0, 0, 0, externalAttr, offset)
+                                    + arcnameBytes)
+
+        centralDirectoryOffset = zipFile.tell()
+        centralDirectory = b''.join(centralDirectory)
+        zipFile.write(centralDirectory)
+        zipFile.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(zipEntries), len(zipEntries),
+                                  len(centralDirectory), centralDirectoryOffset, 0))
+        zipSize = zipFile.tell()
+    os.replace(zipFilename + '.tmp', zipFilename)
+    return zipSize
+
+
+def writeIfChanged(filename, text):
+    """Write text to filename, unless the file already has that text.
+    Returns True if the file was written."""
+    try:
+        with open(filename, encoding='utf-8') as fileObj:
+            if fileObj.read() == text:
+                return False
+    except OSError:
+        pass
+    with open(filename, 'w', encoding='utf-8') as fileObj:
+        fileObj.write(text)
+    return True
+
+
+def main():
+    buildStartTime = stepStartTime = time.time()
+    steps = {}  # Keys=step names, values=seconds the step took.
 
-        # Remove "This and other games are available at https://nostarch.com/XX"
-        desc = desc.replace('This and other games are available at https://nostarch.com/XX\n', '')
+    def finishStep(stepName):
+        nonlocal stepStartTime
+        steps[stepName] = round(time.time() - stepStartTime, 4)
+        stepStartTime = time.time()
 
-        hash = zlib.adler32(content.encode('utf-8'))
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    try:
+        with open(CACHE_INDEX_FILENAME, encoding='utf-8') as cacheFile:
+            oldCache = json.load(cacheFile)
+    except (OSError, ValueError):
+        oldCache = {}  # A missing or corrupted cache means a full build.
+    finishStep('load cache')
 
-        entry = {'filename': filename, 'name': name, 'desc': desc, 'hash': hash}
-        PROGRAMS.append(entry)
+    # Find out which files go in the zip, in order:
+    programFilenames = []
+    pyflakesChecklist = []
+    zipEntries = []
+    for filename in allFiles + ['pygame_games/' + f for f in sorted(os.listdir('pygame_games'))]:
+        if not filename.endswith('.py') or filename.startswith('_') or filename in IGNORE_FILES:
+            continue
 
-    origFilesZip.write(filename)
-    if filename in SUPPORT_FILES:
-        for supportFilename in SUPPORT_FILES[filename]:
+        if 'pygame_games' not in filename:
+            # The pygame games have a lot of pyflakes false positives, so we'll skip them.
+            pyflakesChecklist.append(filename)
+        programFilenames.append(filename)
+
+        zipEntries.append(filename)
+        for supportFilename in SUPPORT_FILES.get(filename, []):
             if not os.path.exists(supportFilename):
                 raise Exception(supportFilename + ' does not exist. Halting.')
-            origFilesZip.write(supportFilename)
-origFilesZip.close()
+            zipEntries.append(supportFilename)
+    zipEntries = list(dict.fromkeys(zipEntries))  # Remove duplicates, keeping the order.
+    programFilenameSet = set(programFilenames)
+
+    # Only files with a new size or modification time need to be read:
+    cache = {}  # Keys=filenames, values=cache entry dictionaries.
+    filesToRead = []
+    for filename in zipEntries:
+        fileStat = os.stat(filename)
+        fileInfo = {'mtime': fileStat.st_mtime_ns, 'size': fileStat.st_size, 'mode': fileStat.st_mode}
+        oldEntry = oldCache.get(filename)
+        if os.path.isdir(filename):
+            cache[filename] = dict(fileInfo, digest=None, crc=0, compressedSize=0, program=None)
+        elif oldEntry is not None and all(oldEntry[key] == fileInfo[key] for key in fileInfo) and \
+             os.path.exists(os.path.join(CACHE_FOLDER, oldEntry['digest'] + '.deflate')):
+            cache[filename] = oldEntry
+        else:
+            cache[filename] = fileInfo
+            filesToRead.append(filename)
+    finishStep('check files')
+
+    fileTimes = {}  # Keys=filenames that were read, values=seconds.
+    numCompressed = 0
+    jobs = [(filename, filename in programFilenameSet) for filename in filesToRead]
+    if len(jobs) >= MIN_FILES_FOR_POOL:
+        with concurrent.futures.ProcessPoolExecutor() as pool:
+            results = list(pool.map(_buildCacheEntryArgs, jobs, chunksize=8))
+    else:
+        results = [buildCacheEntry(*job) for job in jobs]
+    for filename, (entry, compressed, seconds) in zip(filesToRead, results):
+        cache[filename].update(entry)
+        fileTimes[filename] = round(seconds, 4)
+        numCompressed += compressed
+        print('Processed', filename)
+    finishStep('hash and compress')
+
+    zipSize = writeZip(ZIP_FILENAME, zipEntries, cache)
+    finishStep('write zip')
+
+    PROGRAMS = [cache[filename]['program'] for filename in programFilenames]
+    programData = ('PROGRAMS = ' + pprint.pformat(PROGRAMS, indent=4, width=120) + '\n\n\n' +
+                   'SUPPORT_FILES = ' + pprint.pformat(SUPPORT_FILES, indent=4, width=120))
+    if writeIfChanged('__programdata__.py', programData):
+        print('Generated __programdata__.py')
+
+    pyflakesText = ''.join('@echo Checking ' + filename + '...\n' + '@pyflakes ' + filename + '\n'
+                           for filename in pyflakesChecklist)
+    if writeIfChanged('__pyflakescheck__.bat', pyflakesText):
+        print('Generated __pyflakescheck__.bat')
+    finishStep('write program data')
+
+    # Save the cache, and delete compressed data no file uses anymore:
+    with open(CACHE_INDEX_FILENAME + '.tmp', 'w', encoding='utf-8') as cacheFile:
+        json.dump(cache, cacheFile)
+    os.replace(CACHE_INDEX_FILENAME + '.tmp', CACHE_INDEX_FILENAME)
+    usedBlobFilenames = {entry['digest'] + '.deflate' for entry in cache.values() if entry['digest'] is not None}
+    for blobFilename in os.listdir(CACHE_FOLDER):
+        if blobFilename.endswith('.deflate') and blobFilename not in usedBlobFilenames:
+            os.unlink(os.path.join(CACHE_FOLDER, blobFilename))
+    finishStep('save cache')
 
-with open('__programdata__.py', 'w', encoding='utf-8') as programDataFile:
-    programDataFile.write('PROGRAMS = ' + pprint.pformat(PROGRAMS, indent=4, width=120))
-    programDataFile.write('\n\n\n')
-    programDataFile.write('SUPPORT_FILES = ' + pprint.pformat(SUPPORT_FILES, indent=4, width=120))
+    manifest = {'totalSeconds': round(time.time() - buildStartTime, 4), 'steps': steps,
+                'numPrograms': len(programFilenames), 'numZipEntries': len(zipEntries),
+                'numFilesRead': len(filesToRead), 'numFilesCompressed': numCompressed,
+                'zipBytes': zipSize, 'filesRead': fileTimes}
+    with open(MANIFEST_FILENAME, 'w', encoding='utf-8') as manifestFile:
+        json.dump(manifest, manifestFile, indent=2)
+    print('Done in %.3f seconds: %s of %s files read, %s compressed.' % (
+        manifest['totalSeconds'], len(filesToRead), len(zipEntries), numCompressed))
 
-print('Generating __pyflakescheck__.bat')
-with open('__pyflakescheck__.bat', 'w') as pyflakeBatFile:
-    for filename in pyflakesChecklist:
-        pyflakeBatFile.write('@echo Checking ' + filename + '...\n')
-        pyflakeBatFile.write('@pyflakes ' + filename + '\n')
 
-print('Done.')
+if __name__ == '__main__':
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    main()
@@ -13,29 +13,38 @@ if sys.version_info[0] == 2:
 
 
 
-import os, subprocess, zlib, zipfile, webbrowser, random
+import os, subprocess, zlib, zipfile, webbrowser, random, json, queue, threading, time
+
+_launcherStartTime = time.perf_counter()
 
 from .__programdata__ import PROGRAMS, SUPPORT_FILES
+from . import __warmpool__
 
 from tkinter import *
 from tkinter import font
 from tkinter import ttk
 
 FOLDER_OF_THIS_FILE = os.path.dirname(os.path.abspath(__file__))
+ORIGINAL_FILES_ZIP_FILENAME = os.path.join(FOLDER_OF_THIS_FILE, '_originalFiles.zip')
 
-os.chdir(FOLDER_OF_THIS_FILE) # Launch all (non-pygame) game programs with this folder as the cwd.
+# The index remembers the size, modification time, and hash of each
+# program file, so at startup a stat() call is enough to tell if a file
+# is unchanged, instead of reading and hashing the whole file:
+INDEX_FILENAME = os.path.join(FOLDER_OF_THIS_FILE, '__programindex__.json')
 
 # Sort the programs in "pygame_games/" without considering the folder name:
 PROGRAMS.sort(key=lambda x: os.path.basename(x['filename']))
 
-# TODO - add code that checks for a corrupted _originalFiles.zip file. Disable the "undo changes" button in that case.
+UNREADABLE = -1  # The hash recorded for files that can't be read or are gone.
+
+fileIndex = {}  # Keys=filenames, values=[mtime in ns, size, adler32 hash or UNREADABLE].
+fileIndexLock = threading.Lock()  # fileIndex is shared with the hash thread.
+hashQueue = queue.Queue()  # The filenames the hash thread needs to check.
+startupTimes = []  # A list of (step name, seconds) tuples.
+_originalFilesZip = None  # The shared ZipFile, opened when first needed.
+warmPoolServer = None  # The __warmpool__.py server process, if it's running.
 
-# Check for any missing files and reload them from the _originalFiles.zip file:
-for program in PROGRAMS:
-    if not os.path.exists(os.path.join(FOLDER_OF_THIS_FILE, program['filename'])):
-        # Restore the file from the original one in the _originalFiles.zip backup.
-        originalFilesZipFile = zipfile.ZipFile(os.path.join(FOLDER_OF_THIS_FILE, '_originalFiles.zip'), 'r')
-        originalFilesZipFile.extract(program['filename'], FOLDER_OF_THIS_FILE)
+# TODO - add code that checks for a corrupted _originalFiles.zip file. Disable the "undo changes" button in that case.
 
 # TODO - unpack support files if they're missing
 #for supportFiles in SUPPORT_FILES.values():
@@ -46,6 +55,146 @@ for program in PROGRAMS:
 #            originalFilesZipFile.extract(program['filename'], FOLDER_OF_THIS_FILE)
 
 
+def _recordStartupStep(stepName):
+    """Record how long it has been since the last recorded step."""
+    global _launcherStartTime
+    now = time.perf_counter()
+    startupTimes.append((stepName, now - _launcherStartTime))
+    _launcherStartTime = now
+
+
+def getStartupReport():
+    """Return a string describing how long each startup step took."""
+    lines = ['Launcher startup times:']
+    for stepName, seconds in startupTimes:
+        lines.append('  %-28s %7.1f ms' % (stepName, seconds * 1000))
+    lines.append('  %-28s %7.1f ms' % ('Total', sum(seconds for stepName, seconds in startupTimes) * 1000))
+    return '\n'.join(lines)
+
+
+def _printStartupReport():
+    _recordStartupStep('Draw window')
+    print(getStartupReport())
+
+
+def _getOriginalFilesZip():
+    """Return the ZipFile of _originalFiles.zip, opening it only once."""
+    global _originalFilesZip
+    if _originalFilesZip is None:
+        _originalFilesZip = zipfile.ZipFile(ORIGINAL_FILES_ZIP_FILENAME, 'r')
+    return _originalFilesZip
+
+
+def _getFileStat(filename):
+    """Return the [mtime in ns, size] of filename, or None if the file
+    doesn't exist."""
+    try:
+        fileStat = os.stat(os.path.join(FOLDER_OF_THIS_FILE, filename))
+    except OSError:
+        return None
+    return [fileStat.st_mtime_ns, fileStat.st_size]
+
+
+def _getFileHash(filename):
+    """Return the adler32 hash of filename, the same way that
+    __generatehashes__.py makes the hashes in PROGRAMS."""
+    with open(os.path.join(FOLDER_OF_THIS_FILE, filename), encoding='utf-8') as fileObj:
+        return zlib.adler32(fileObj.read().encode('utf-8'))
+
+
+def _loadIndex():
+    """Load the index file saved by an earlier run, if there is one."""
+    global fileIndex
+    try:
+        with open(INDEX_FILENAME, encoding='utf-8') as indexFile:
+            fileIndex = json.load(indexFile)
+    except (OSError, ValueError):
+        fileIndex = {}  # A missing or corrupted index is just rebuilt.
+
+
+def _saveIndex():
+    """Save the index to disk, for the next time the launcher starts."""
+    with fileIndexLock:
+        indexText = json.dumps(fileIndex)
+    try:
+        with open(INDEX_FILENAME + '.tmp', 'w', encoding='utf-8') as indexFile:
+            indexFile.write(indexText)
+        os.replace(INDEX_FILENAME + '.tmp', INDEX_FILENAME)
+    except OSError:
+        pass  # The folder may be read-only, in which case there's no index.
+
+
+def getKnownHash(filename):
+    """Return the hash of filename if the index has it for the file as
+    it is on disk now, otherwise return None and ask the hash thread to
+    hash the file. Returns UNREADABLE if the file is gone or couldn't
+    be read."""
+    fileStat = _getFileStat(filename)
+    if fileStat is None:
+        return UNREADABLE
+    with fileIndexLock:
+        entry = fileIndex.get(filename)
+    if entry is not None and entry[:2] == fileStat:
+        return entry[2]
+    hashQueue.put(filename)
+    return None
+
+
+def _runHashThread():
+    """Hash each file put in hashQueue. Runs in a background thread, so
+    files are never read and hashed on the Tk event loop."""
+    while True:
+        filename = hashQueue.get()
+        fileStat = _getFileStat(filename)
+        with fileIndexLock:
+            entry = fileIndex.get(filename)
+        if fileStat is not None and (entry is None or entry[:2] != fileStat):
+            try:
+                fileHash = _getFileHash(filename)
+            except (OSError, UnicodeDecodeError):
+                fileHash = UNREADABLE  # So the launcher stops waiting for it.
+            with fileIndexLock:
+                fileIndex[filename] = fileStat + [fileHash]
+        if hashQueue.empty():
+            _saveIndex()  # Save once a batch of files is done.
+
+
+def checkProgramFiles():
+    """Restore any missing program files from _originalFiles.zip, and
+    send any files that aren't in the index to the hash thread."""
+    for program in PROGRAMS:
+        filename = program['filename']
+        if _getFileStat(filename) is None:
+            # Restore the file from the original one in the _originalFiles.zip backup.
+            _getOriginalFilesZip().extract(filename, FOLDER_OF_THIS_FILE)
+            with fileIndexLock:
+                fileIndex[filename] = _getFileStat(filename) + [program['hash']]
+        else:
+            getKnownHash(filename)
+
+
+def _startWarmPool():
+    """Start the __warmpool__.py server, which keeps Python workers
+    ready to run programs. Its stdin is a pipe from this process, so it
+    stops when the launcher quits."""
+    global warmPoolServer
+    warmPoolServer = subprocess.Popen([sys.executable, os.path.join(FOLDER_OF_THIS_FILE, '__warmpool__.py'),
+                                       'serve', __warmpool__.getSocketPath()], stdin=subprocess.PIPE)
+
+
+def _getRunArgs(filename):
+    """Return the command that the new terminal window runs to run the
+    program filename."""
+    if warmPoolServer is not None and warmPoolServer.poll() is None:
+        # -S skips importing site, which the warm pool client doesn't need:
+        runArgs = [sys.executable, '-S', os.path.join(FOLDER_OF_THIS_FILE, '__warmpool__.py'), 'run',
+                   __warmpool__.getSocketPath(), __version__, filename]
+        if '--timing' in sys.argv:
+            runArgs.append('--timing')
+        return runArgs
+    return [sys.executable, os.path.join(FOLDER_OF_THIS_FILE, '__terminalopener__.py'), __version__, filename]
+
+
 def _executable_exists(name):
     # Find out if an executable program named `name` is reachable:
     return subprocess.call(['which', name], stdout=subprocess.PIPE, stderr=subprocess.PIPE) == 0
@@ -61,7 +210,6 @@ def programSelect(*args):
 
     descTextarea.configure(state='normal')
     descTextarea.delete('1.0', END)
-    filename = os.path.join(FOLDER_OF_THIS_FILE, PROGRAMS[i]['filename'])
 
     # Pygame games need to have their cwd changed to pygame_games/
     if 'Pygame' in PROGRAMS[i]['desc']:
@@ -75,10 +223,26 @@ def programSelect(*args):
     descTextarea.insert(INSERT, text)
     descTextarea.configure(state='disabled')
 
-    # Get the adler32 hash of the .py file:
-    fileObj = open(filename, encoding='utf-8')
-    fileHash = zlib.adler32(fileObj.read().encode('utf-8'))
-    fileObj.close()
+    updateUndoButton(i)
+
+
+def updateUndoButton(i):
+    """Enable the undo button if program i is different from the
+    original. If its hash isn't known yet, check again shortly."""
+    if i != CURRENT_SELECTED_INDEX:
+        return  # A different program has been selected since.
+    fileHash = getKnownHash(PROGRAMS[i]['filename'])
+    if fileHash is None:
+        # The hash thread is still working on this file:
+        undoChangesBtnSV.set('Checking File...')
+        undoChangesButton.config(state='disabled')
+        root.after(50, updateUndoButton, i)
+        return
+    if fileHash == UNREADABLE:
+        # The file is gone or isn't UTF-8 text, so offer to restore it:
+        undoChangesBtnSV.set('Restore Unreadable File')
+        undoChangesButton.config(state='normal')
+        return
 
     # Check if the .py file on disk is different from the original file (based on the hash):
     sourceFileIsChanged = fileHash != PROGRAMS[i]['hash']
@@ -93,7 +257,6 @@ def programSelect(*args):
 def runClick(*args):
     i = CURRENT_SELECTED_INDEX
     filename = os.path.join(FOLDER_OF_THIS_FILE, PROGRAMS[i]['filename'])
-    TERMINAL_OPENER_FILENAME = os.path.join(FOLDER_OF_THIS_FILE, '__terminalopener__.py')
     CRASH_DETECTOR_FILENAME = os.path.join(FOLDER_OF_THIS_FILE, '__crashdetector__.py')
 
     # Figure out which program to run to open a new terminal window and then run the .py file:
@@ -108,13 +271,16 @@ def runClick(*args):
         # If we run the following line instead of the previous, Ctrl-C will work on Windows but we don't get crash reporting.
         os.system('start cmd /K ' + sys.executable + ' ' + filename)
     elif sys.platform == 'darwin':
-        os.system('''osascript -e 'tell application "Terminal" to do script "''' + sys.executable + ' ' + CRASH_DETECTOR_FILENAME + ' ' + __version__ + ' ' + filename + '"' + "'")
+        if warmPoolServer is not None:
+            os.system('''osascript -e 'tell application "Terminal" to do script "''' + ' '.join(_getRunArgs(filename)) + '"' + "'")
+        else:
+            os.system('''osascript -e 'tell application "Terminal" to do script "''' + sys.executable + ' ' + CRASH_DETECTOR_FILENAME + ' ' + __version__ + ' ' + filename + '"' + "'")
     elif _executable_exists('gnome-terminal'):
         # gnome-terminal is used on Ubuntu Linux:
-        subprocess.call(['gnome-terminal', '--', sys.executable, TERMINAL_OPENER_FILENAME, __version__, filename])
+        subprocess.call(['gnome-terminal', '--'] + _getRunArgs(filename))
     elif _executable_exists('lxterminal'):
         # LXTerminal is used on Raspberry Pis:
-        subprocess.call(['lxterminal', '-e', sys.executable, TERMINAL_OPENER_FILENAME, __version__, filename])
+        subprocess.call(['lxterminal', '-e'] + _getRunArgs(filename))
 
 
 def viewSourceClick(*args):
@@ -138,8 +304,10 @@ def undoChangesClick(*args):
     i = CURRENT_SELECTED_INDEX
 
     # Restore the file from the original one in the _originalFiles.zip backup.
-    originalFilesZipFile = zipfile.ZipFile(os.path.join(FOLDER_OF_THIS_FILE, '_originalFiles.zip'), 'r')
-    originalFilesZipFile.extract(PROGRAMS[i]['filename'], FOLDER_OF_THIS_FILE)
+    filename = PROGRAMS[i]['filename']
+    _getOriginalFilesZip().extract(filename, FOLDER_OF_THIS_FILE)
+    with fileIndexLock:
+        fileIndex[filename] = _getFileStat(filename) + [PROGRAMS[i]['hash']]
 
     # Disable the undo button now that there are no changes.
     undoChangesBtnSV.set('File is Unchanged')
@@ -174,6 +342,23 @@ def quitLauncher(*args):
 
 def main():
     global root, descTextarea, programListbox, undoChangesBtnSV, undoChangesButton
+    _recordStartupStep('Import modules')
+    os.chdir(FOLDER_OF_THIS_FILE) # Launch all (non-pygame) game programs with this folder as the cwd.
+
+    _loadIndex()
+    _recordStartupStep('Load index')
+    hashThread = threading.Thread(target=_runHashThread)
+    hashThread.daemon = True
+    hashThread.start()
+    checkProgramFiles()
+    _recordStartupStep('Check program files')
+
+    # Pass --warmpool to run programs on Python workers that are started
+    # ahead of time (on Linux and macOS):
+    if '--warmpool' in sys.argv and __warmpool__.isSupported():
+        _startWarmPool()
+        _recordStartupStep('Start warm pool')
+
     root = Tk()
     root.title('Python Games by Example ' + __version__)
 
@@ -239,6 +424,11 @@ def main():
     root.bind('<Escape>', quitLauncher) # Bind Esc key to quit the program.
 
     root.resizable(False, False) # TODO: until we make the text area resize, disable resizing.
+    _recordStartupStep('Create window')
+
+    # Pass --timing to see how long the launcher took to start:
+    if '--timing' in sys.argv:
+        root.after_idle(_printStartupReport)
 
     root.mainloop()
 
@@ -0,0 +1,412 @@
+# Warm Pool
+# By Al Sweigart al@inventwithpython.com
+
+# Starting Python and importing modules like bext takes a while, and the
+# launcher used to do it several times per program: for
+# __terminalopener__.py, for __crashdetector__.py, and for the program
+# itself. The warm pool is a server that keeps a few worker processes
+# already forked, each attached to its own pty and with the common
+# modules already imported. To launch a program, the terminal window
+# runs this file as a client. The client gets a waiting worker's pty
+# from the server and passes the keyboard and screen through to it. The
+# worker runs the program in-process, so it catches crashes itself.
+#
+# This needs Unix (for fork and ptys) and Python 3.9 or later (to pass
+# the pty to the client). The launcher starts the server when it's run
+# with --warmpool. By hand:
+#   python __warmpool__.py serve SOCKET_PATH
+#   python __warmpool__.py run SOCKET_PATH LAUNCHER_VERSION PROGRAM [--timing]
+# SOCKET_PATH must be in a folder that only you can use (the server
+# makes it if it doesn't exist yet).
+
+# The client only imports what it needs, to start as fast as possible.
+# (Messages use marshal instead of json, which takes a while to import.)
+import marshal, os, select, socket, sys, time
+
+FOLDER_OF_THIS_FILE = os.path.dirname(os.path.abspath(__file__))
+TERMINAL_OPENER = os.path.join(FOLDER_OF_THIS_FILE, '__terminalopener__.py')
+
+POOL_SIZE = 2  # How many idle workers to keep waiting.
+
+# Each worker imports these while it waits for a program, so programs
+# that use them don't have to:
+PRELOAD_MODULES = ['bext', 'collections', 'copy', 'datetime', 'itertools', 'math',
+                   'pyperclip', 'random', 'shutil', 'textwrap', 'time']
+
+
+def isSupported():
+    """Return True if the warm pool can run on this computer."""
+    return os.name == 'posix' and hasattr(socket, 'send_fds')
+
+
+def _isPrivateFolder(folder):
+    """Return True if folder is a real folder (not a link) that belongs
+    to this user and that no one else can use."""
+    import stat
+    try:
+        info = os.lstat(folder)
+    except OSError:
+        return False
+    return stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+
+def getSocketPath():
+    """Return the path of the server's Unix socket for this user. It's in
+    a folder only this user can use, so no one else can run a fake
+    server there (the client sends it the environment variables)."""
+    folder = os.environ.get('XDG_RUNTIME_DIR')
+    if not folder or not _isPrivateFolder(folder):
+        import tempfile
+        folder = os.path.join(tempfile.gettempdir(), 'gamesbyexample-%s' % os.getuid())
+    return os.path.join(folder, 'gamesbyexample-warmpool.sock')
+
+
+def runProgram(programPath, launcherVersion):
+    """Run the Python program at programPath in this process, the way
+    `python programPath` would, and return its exit code. If the program
+    crashes, the traceback and crash report are printed."""
+    import traceback
+    try:
+        from . import __crashdetector__  # When imported by the launcher.
+    except ImportError:
+        import __crashdetector__  # When run as a script.
+    programFolder = os.path.dirname(os.path.abspath(programPath))
+    os.chdir(programFolder)
+    sys.argv = [programPath]
+    sys.path[0] = programFolder
+    programGlobals = {'__name__': '__main__', '__file__': programPath}
+    try:
+        with open(programPath, 'rb') as programFile:
+            code = compile(programFile.read(), programPath, 'exec')
+        exec(code, programGlobals)
+    except SystemExit as exception:
+        if exception.code is None:
+            return 0
+        if isinstance(exception.code, int):
+            return exception.code
+        print(exception.code, file=sys.stderr)  # sys.exit('message') prints the message.
+        return 1
+    except (KeyboardInterrupt, EOFError):
+        return 0  # Do nothing if Ctrl-C was pressed to exit the game.
+    except BaseException as exception:
+        # Show the traceback without this function's frame in it:
+        traceback.print_exception(type(exception), exception, exception.__traceback__.tb_next)
+        # The program's own __version__ is in its globals, no need to
+        # search its source code for it:
+        programVersion = programGlobals.get('__version__', 'N/A')
+        sys.stderr.write(__crashdetector__.getCrashReport(programPath, programVersion, launcherVersion))
+        return 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return 0
+
+
+def _sendMessage(connection, message):
+    """Send a marshalled message over a socket."""
+    data = marshal.dumps(message)
+    connection.sendall(len(data).to_bytes(4, 'big') + data)
+
+
+def _receiveExactly(connection, numBytes):
+    """Return numBytes bytes from the socket, or fewer if it closed."""
+    data = b''
+    while len(data) < numBytes:
+        chunk = connection.recv(numBytes - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def _receiveMessage(connection):
+    """Return a message sent with _sendMessage(), or None if the socket
+    closed first."""
+    length = _receiveExactly(connection, 4)
+    if len(length) < 4:
+        return None
+    data = _receiveExactly(connection, int.from_bytes(length, 'big'))
+    return marshal.loads(data) if len(data) == int.from_bytes(length, 'big') else None
+
+
+def _setWindowSize(fd, rows, columns):
+    """Set the size of the terminal or pty that fd is for."""
+    import fcntl, struct, termios
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack('HHHH', rows, columns, 0, 0))
+
+
+def _runWorker(jobFd):
+    """Import PRELOAD_MODULES, wait for a job from the server, and run
+    its program. This runs in a forked child whose stdin, stdout, and
+    stderr are a pty, and never returns."""
+    # The server's sys.stdout may be block-buffered for a pipe, so make
+    # new line-buffered ones for the pty:
+    sys.stdin = sys.__stdin__ = open(0, 'r', encoding='utf-8', closefd=False)
+    sys.stdout = sys.__stdout__ = open(1, 'w', buffering=1, encoding='utf-8', closefd=False)
+    sys.stderr = sys.__stderr__ = open(2, 'w', buffering=1, encoding='utf-8', closefd=False)
+    for moduleName in PRELOAD_MODULES:
+        try:
+            __import__(moduleName)
+        except Exception:
+            pass  # The program will report the missing module itself.
+    if 'random' in sys.modules:
+        sys.modules['random'].seed()  # Don't share the server's random state.
+
+    jobText = b''
+    while True:
+        data = os.read(jobFd, 65536)
+        if not data:
+            break
+        jobText += data
+    os.close(jobFd)
+    if not jobText:
+        os._exit(0)  # The server closed without sending a program.
+
+    job = marshal.loads(jobText)
+    os.environ.clear()
+    os.environ.update(job['environment'])  # Use the terminal window's environment.
+    exitCode = runProgram(job['program'], job['launcherVersion'])
+    os._exit(exitCode & 0xFF)
+
+
+class WarmPool:
+    def __init__(self, socketPath, poolSize=POOL_SIZE):
+        """Set up the server's socket and fork the first workers."""
+        self.socketPath = socketPath
+        self.poolSize = poolSize
+        self.idleWorkers = []  # A list of (pid, masterFd, jobFd) tuples.
+        self.runningWorkers = {}  # Keys=pids, values=client sockets.
+        folder = os.path.dirname(os.path.abspath(socketPath))
+        if not os.path.lexists(folder):
+            os.mkdir(folder, 0o700)
+        if not _isPrivateFolder(folder):
+            raise PermissionError('%s must be a folder that only this user can use.' % folder)
+        if os.path.lexists(socketPath):
+            os.unlink(socketPath)  # Left behind by a server that crashed.
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(socketPath)
+        os.chmod(socketPath, 0o600)  # Only this user may launch programs.
+        self.listener.listen()
+        self.fillPool()
+
+
+    def _forkWorker(self):
+        """Fork a new idle worker attached to a new pty."""
+        import pty
+        jobReadFd, jobWriteFd = os.pipe()
+        pid, masterFd = pty.fork()
+        if pid == 0:
+            # This is the worker. Close the server's files, then wait:
+            os.close(jobWriteFd)
+            self.listener.close()
+            for otherPid, otherMasterFd, otherJobFd in self.idleWorkers:
+                os.close(otherMasterFd)
+                os.close(otherJobFd)
+            for client in self.runningWorkers.values():
+                client.close()
+            _runWorker(jobReadFd)
+        os.close(jobReadFd)
+        self.idleWorkers.append((pid, masterFd, jobWriteFd))
+
+
+    def fillPool(self):
+        """Fork workers until there are poolSize idle ones."""
+        while len(self.idleWorkers) < self.poolSize:
+            self._forkWorker()
+
+
+    def startProgram(self, client):
+        """Read a job from the client socket, send it to an idle worker,
+        and send the worker's pty to the client."""
+        try:
+            job = _receiveMessage(client)
+        except (OSError, ValueError, EOFError):
+            job = None
+        if not isinstance(job, dict):
+            client.close()
+            return
+        if not self.idleWorkers:
+            self._forkWorker()
+        pid, masterFd, jobFd = self.idleWorkers.pop(0)
+
+        # Size the pty before the program can ask how big it is:
+        _setWindowSize(masterFd, job['rows'], job['columns'])
+        jobData = marshal.dumps(job)
+        while jobData:
+            jobData = jobData[os.write(jobFd, jobData):]
+        os.close(jobFd)
+        socket.send_fds(client, [b'+'], [masterFd])
+        os.close(masterFd)  # The client has its own copy now.
+        self.runningWorkers[pid] = client
+        self.fillPool()
+
+
+    def reapWorkers(self):
+        """Tell clients the exit codes of their finished workers."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            client = self.runningWorkers.pop(pid, None)
+            if client is not None:
+                try:
+                    _sendMessage(client, {'exitCode': os.waitstatus_to_exitcode(status)})
+                except OSError:
+                    pass  # The client's terminal window was closed.
+                client.close()
+            else:
+                # An idle worker died, so replace it:
+                for worker in self.idleWorkers:
+                    if worker[0] == pid:
+                        self.idleWorkers.remove(worker)
+                        os.close(worker[1])
+                        os.close(worker[2])
+                self.fillPool()
+
+
+    def serveForever(self, stopFile=None):
+        """Handle clients until stopFile (such as the launcher's end of a
+        pipe) reaches its end."""
+        while True:
+            watched = [self.listener] + ([stopFile] if stopFile is not None else [])
+            readable, writable, exceptional = select.select(watched, [], [], 0.1)
+            if stopFile is not None and stopFile in readable and not os.read(stopFile.fileno(), 1024):
+                break
+            if self.listener in readable:
+                client, address = self.listener.accept()
+                self.startProgram(client)
+            self.reapWorkers()
+
+
+    def close(self):
+        """Stop the idle workers and remove the socket."""
+        self.listener.close()
+        if os.path.exists(self.socketPath):
+            os.unlink(self.socketPath)
+        for pid, masterFd, jobFd in self.idleWorkers:
+            os.close(jobFd)  # The worker exits when it reads nothing.
+            os.close(masterFd)
+        self.idleWorkers = []
+
+
+def _passThrough(masterFd):
+    """Copy the keyboard to masterFd and masterFd to the screen until the
+    worker ends. Returns the perf_counter() time of the first output, or
+    None if there was no output."""
+    import signal, termios, tty
+    firstOutputTime = None
+    stdinIsTty = os.isatty(0)
+    if stdinIsTty:
+        oldTerminalMode = termios.tcgetattr(0)
+        tty.setraw(0)  # The pty handles Ctrl-C, echoing, and so on.
+        signal.signal(signal.SIGWINCH, lambda *args: _setWindowSize(masterFd, *os.get_terminal_size(0)[::-1]))
+    readFds = [masterFd, 0]
+    try:
+        while True:
+            readable, writable, exceptional = select.select(readFds, [], [])
+            if masterFd in readable:
+                try:
+                    data = os.read(masterFd, 65536)
+                except OSError:
+                    data = b''  # Linux raises EIO once the worker has ended.
+                if not data:
+                    break
+                if firstOutputTime is None:
+                    firstOutputTime = time.perf_counter()
+                while data:
+                    data = data[os.write(1, data):]
+            if 0 in readable:
+                data = os.read(0, 1024)
+                if data:
+                    os.write(masterFd, data)
+                else:
+                    readFds.remove(0)  # The keyboard input has ended.
+                    os.write(masterFd, b'\x04')  # Send the program an EOF.
+    finally:
+        if stdinIsTty:
+            termios.tcsetattr(0, termios.TCSAFLUSH, oldTerminalMode)
+    return firstOutputTime
+
+
+def runClient(socketPath, launcherVersion, programPath, showTiming=False):
+    """Run programPath on a warm worker, showing it in this terminal.
+    Returns the program's exit code, or None if there's no server."""
+    startTime = time.perf_counter()
+    # Only connect to a socket made by this user, in a folder no one
+    # else can use:
+    try:
+        socketOwner = os.lstat(socketPath).st_uid
+    except OSError:
+        return None
+    if socketOwner != os.getuid() or not _isPrivateFolder(os.path.dirname(os.path.abspath(socketPath))):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socketPath)
+    except OSError:
+        return None
+    try:
+        columns, rows = os.get_terminal_size(0)
+    except OSError:
+        columns, rows = 80, 25
+    job = {'program': os.path.abspath(programPath), 'launcherVersion': launcherVersion,
+           'environment': dict(os.environ), 'rows': rows, 'columns': columns}
+    _sendMessage(client, job)
+    message, fds, flags, address = socket.recv_fds(client, 1, 1)
+    if not fds:
+        return None
+    handOffTime = time.perf_counter()
+
+    firstOutputTime = _passThrough(fds[0])
+    os.close(fds[0])
+    reply = _receiveMessage(client)  # The server sends the exit code.
+    client.close()
+    exitCode = reply['exitCode'] if reply is not None else 1
+
+    if showTiming:
+        print('Warm pool: worker ready after %.1f ms, first output after %s.' % (
+            (handOffTime - startTime) * 1000,
+            'no output' if firstOutputTime is None else '%.1f ms' % ((firstOutputTime - startTime) * 1000)))
+    return exitCode
+
+
+def main():
+    if len(sys.argv) >= 3 and sys.argv[1] == 'serve':
+        try:
+            pool = WarmPool(sys.argv[2])
+        except OSError as error:
+            # Clients just run programs the usual way without a server.
+            print('Warm pool: can\'t serve on %s: %s' % (sys.argv[2], error), file=sys.stderr)
+            sys.exit(1)
+        try:
+            # The launcher starts the server with a pipe for its stdin,
+            # so the server stops when the launcher quits:
+            pool.serveForever(sys.stdin if not sys.stdin.isatty() else None)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            pool.close()
+    elif len(sys.argv) >= 5 and sys.argv[1] == 'run':
+        socketPath, launcherVersion, programToLaunch = sys.argv[2:5]
+        exitCode = runClient(socketPath, launcherVersion, programToLaunch, '--timing' in sys.argv)
+        if exitCode is None:
+            # There's no server, so run the program the usual way:
+            os.execv(sys.executable, [sys.executable, TERMINAL_OPENER, launcherVersion, programToLaunch])
+
+        # Pygame games only leave the terminal window open if there was no crash.
+        if 'pygame_games/' in programToLaunch and exitCode == 0:
+            sys.exit()
+        # Run a shell so the terminal window stays open, the same as
+        # __terminalopener__.py does:
+        import subprocess
+        subprocess.call([os.environ.get('SHELL', 'bash')])
+    else:
+        print('Usage: python __warmpool__.py serve SOCKET_PATH')
+        print('   or: python __warmpool__.py run SOCKET_PATH LAUNCHER_VERSION PROGRAM [--timing]')
+
+
+if __name__ == '__main__':
+    main()
@@ -10,7 +10,9 @@ try:
 except ImportError:
     pass  # If pyperclip is not installed, do nothing. It's no big deal.
 
-import random
+import random, sys
+import cipherstream  # Imports our cipherstream.py program.
+import cryptanalysis  # Imports our cryptanalysis.py program.
 
 # Note the space at the front of the SYMBOLS string:
 SYMBOLS = """ !"#$%&'()*+,-./0123456789:;<=>?@ABCDEF""" + \
@@ -22,9 +24,9 @@ def main():
 The affine cipher is a simple substitution cipher that uses addition and
 multiplication to encrypt and decrypt symbols.''')
 
-    # Let the user specify if they are encrypting or decrypting:
-    while True:  # Keep asking until the user enters e or d.
-        print('Do you want to (e)ncrypt or (d)ecrypt?')
+    # Let the user specify if they are encrypting, decrypting, or hacking:
+    while True:  # Keep asking until the user enters e, d, or h.
+        print('Do you want to (e)ncrypt, (d)ecrypt, or (h)ack?')
         response = input('> ').lower()
         if response.startswith('e'):
             myMode = 'encrypt'
@@ -32,10 +34,13 @@ multiplication to encrypt and decrypt symbols.''')
         elif response.startswith('d'):
             myMode = 'decrypt'
             break
-        print('Please enter the letter e or d.')
+        elif response.startswith('h'):
+            myMode = 'hack'
+            break
+        print('Please enter the letter e, d, or h.')
 
-    # Let the user specify the key to use:
-    while True:  # Keep asking until the user enters a valid key.
+    # Let the user specify the key to use (hacking doesn't need one):
+    while myMode != 'hack':  # Keep asking until the user enters a valid key.
         print('Please specify the key to use,')
         print('or RANDOM to have one generated for you:')
         response = input('> ').upper()
@@ -59,6 +64,8 @@ multiplication to encrypt and decrypt symbols.''')
         translated = encryptMessage(myKey, myMessage)
     elif myMode == 'decrypt':
         translated = decryptMessage(myKey, myMessage)
+    elif myMode == 'hack':
+        translated = hackMessage(myMessage)
     print('%sed text:' % (myMode.title()))
     print(translated)
 
@@ -129,6 +136,32 @@ def decryptMessage(key, message):
     return plaintext
 
 
+def hackMessage(message):
+    """Try every key, showing each better key as it's found, and return
+    the message decrypted with the most likely one."""
+    for score, keyA, keyB in cryptanalysis.hackAffine(message, SYMBOLS):
+        key = keyA * len(SYMBOLS) + keyB
+        print('Trying key {} (English score {:.2f})...'.format(key, score))
+    print('The most likely key is {}.'.format(key))
+    return decryptMessage(key, message)
+
+
+def streamMessage(mode, key, inFilename=None, outFilename=None):
+    """Encrypt or decrypt inFilename (or stdin) into outFilename (or
+    stdout) using the key, a chunk at a time."""
+    key = int(key)
+    if not checkKey(key, mode):
+        return
+    keyA, keyB = getKeyPartsFromKey(key)
+    # The symbol each symbol in SYMBOLS is encrypted to:
+    encryptedSymbols = ''.join(SYMBOLS[(i * keyA + keyB) % len(SYMBOLS)] for i in range(len(SYMBOLS)))
+    if mode == 'encrypt':
+        table = cipherstream.makeTable(SYMBOLS, encryptedSymbols)
+    else:
+        table = cipherstream.makeTable(encryptedSymbols, SYMBOLS)
+    cipherstream.streamFiles(cipherstream.TranslateTransform(table), inFilename, outFilename)
+
+
 def generateRandomKey():
     """Generate and return a random encryption key."""
     while True:
@@ -168,4 +201,10 @@ def findModInverse(a, m):
 
 # If this program was run (instead of imported), run the program:
 if __name__ == '__main__':
-    main()
+    # (!) Run this program as "python affinecipher.py --stream encrypt KEY"
+    # to translate stdin to stdout without any questions, or add input and
+    # output filenames to translate a file of any size.
+    if len(sys.argv) > 3 and sys.argv[1] == '--stream':
+        streamMessage(*sys.argv[2:])
+    else:
+        main()
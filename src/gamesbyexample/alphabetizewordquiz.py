@@ -5,6 +5,7 @@ Tags: short, game, word"""
 __version__ = 0
 import random
 import time
+import wordindex  # Imports our wordindex.py program.
 
 # Set up the constants:
 # (!) Try changing these constants.
@@ -19,8 +20,7 @@ REVERSE_ALPHABET = ''.join(sorted(ALPHABET, reverse=True))
 # Read in the words from the word file.
 # This file can be downloaded from:
 # https://inventwithpython.com/commonenglishwords.txt
-with open('commonenglishwords.txt') as wordFile:
-    allWords = wordFile.read().splitlines()
+allWords = wordindex.loadWordFile('commonenglishwords.txt').words
 
 
 def main():
@@ -6,14 +6,7 @@ __version__ = 0
 import math
 import sys
 import time
-
-try:
-    import bext
-except ImportError:
-    print('This program requires the bext module, which you')
-    print('can install by following the instructions at')
-    print('https://pypi.org/project/Bext/')
-    sys.exit()
+import framebuffer  # Imports our framebuffer.py program.
 
 # Set up the constants:
 HOUR_HAND_CHAR = '@'
@@ -49,16 +42,13 @@ CLOCKFACE = """       ##12###
        ###6###"""
 
 
-def main():
-    bext.clear()
-    # Draw the circle of the clock:
-    for y, row in enumerate(CLOCKFACE.splitlines()):
-        for x, char in enumerate(row):
-            if char != ' ':
-                bext.goto(x, y)
-                print(char)
-
+def main(frame):
     while True:  # Main program loop.
+        # Draw the circle of the clock:
+        frame.clear()
+        for y, row in enumerate(CLOCKFACE.splitlines()):
+            frame.write(0, y, row)
+
         # Get the current time from the computer's clock:
         currentTime = time.localtime()
         h = currentTime.tm_hour % 12  # Use 12-hour clock, not 24.
@@ -73,8 +63,7 @@ def main():
         secHandY = int(secHandYPos * SECOND_HAND_LENGTH + CENTERY)
         secHandPoints = line(CENTERX, CENTERY, secHandX, secHandY)
         for x, y in secHandPoints:
-            bext.goto(x, y)
-            print(SECOND_HAND_CHAR, end='')
+            frame.put(x, y, SECOND_HAND_CHAR)
 
         # Draw the minute hand:
         minHandDirection = COMPLETE_ARC * (m / 60) + OFFSET_90_DEGREES
@@ -84,8 +73,7 @@ def main():
         minHandY = int(minHandYPos * MINUTE_HAND_LENGTH + CENTERY)
         minHandPoints = line(CENTERX, CENTERY, minHandX, minHandY)
         for x, y in minHandPoints:
-            bext.goto(x, y)
-            print(MINUTE_HAND_CHAR, end='')
+            frame.put(x, y, MINUTE_HAND_CHAR)
 
         # Draw the hour hand:
         hourHandDirection = COMPLETE_ARC * (h / 12) + OFFSET_90_DEGREES
@@ -95,10 +83,10 @@ def main():
         hourHandY = int(hourHandYPos * HOUR_HAND_LENGTH + CENTERY)
         hourHandPoints = line(CENTERX, CENTERY, hourHandX, hourHandY)
         for x, y in hourHandPoints:
-            bext.goto(x, y)
-            print(HOUR_HAND_CHAR, end='')
+            frame.put(x, y, HOUR_HAND_CHAR)
 
-        sys.stdout.flush()  # (Required for bext-using programs.)
+        # Send only the characters that changed to the terminal:
+        frame.render()
 
         # Keep looping until the second changes:
         while True:
@@ -106,17 +94,6 @@ def main():
             if time.localtime().tm_sec != currentTime.tm_sec:
                 break
 
-        # Erase the clock hands:
-        for x, y in secHandPoints:
-            bext.goto(x, y)
-            print(' ', end='')
-        for x, y in minHandPoints:
-            bext.goto(x, y)
-            print(' ', end='')
-        for x, y in hourHandPoints:
-            bext.goto(x, y)
-            print(' ', end='')
-
 
 def line(x1, y1, x2, y2):
     """Returns a list of points in a line between (x1, y1) and (x2, y2).
@@ -183,7 +160,9 @@ def line(x1, y1, x2, y2):
 
 # If this program was run (instead of imported), run the game:
 if __name__ == '__main__':
+    frame = framebuffer.FrameBuffer(21, 21)  # The size of CLOCKFACE.
     try:
-        main()
+        main(frame)
     except KeyboardInterrupt:
+        print(frame.getReport())
         sys.exit()  # When Ctrl-C is pressed, end the program.
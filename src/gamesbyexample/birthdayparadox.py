@@ -4,7 +4,8 @@ More info at https://en.wikipedia.org/wiki/Birthday_problem
 This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: short, math, simulation"""
 __version__ = 0
-import datetime, random
+import datetime, random, sys
+import montecarlo  # Imports our montecarlo.py program.
 
 
 def getBirthdays(numberOfBirthdays):
@@ -25,15 +26,24 @@ def getBirthdays(numberOfBirthdays):
 def getMatch(birthdays):
     """Returns the date object of a birthday that occurs more than once
     in the birthdays list."""
-    if len(birthdays) == len(set(birthdays)):
-        return None  # All birthdays are unique, so return None.
-
-    # Compare each birthday to every other birthday:
-    for a, birthdayA in enumerate(birthdays):
-        for b, birthdayB in enumerate(birthdays[a + 1 :]):
-            if birthdayA == birthdayB:
-                return birthdayA  # Return the matching birthday.
-
+    # Remember each birthday in a set, so that checking for a match
+    # takes one lookup instead of comparing every pair of birthdays:
+    seenBirthdays = set()
+    for birthday in birthdays:
+        if birthday in seenBirthdays:
+            return birthday  # Return the matching birthday.
+        seenBirthdays.add(birthday)
+    return None  # All birthdays are unique, so return None.
+
+
+# For a much more accurate answer than 100,000 simulations give, run
+# "python birthdayparadox.py --simulate 23" to compare 23 birthdays
+# 100,000,000 times with montecarlo.py, which uses every CPU core and
+# prints the chance of a match with its margin of error. A number after
+# the group size, like "--simulate 23 5000", sets how many groups.
+if len(sys.argv) > 1 and sys.argv[1] == '--simulate':
+    montecarlo.runInNewProcess(['birthday'] + sys.argv[2:])
+    sys.exit()
 
 # Display the intro:
 print('''Birthday Paradox, by Al Sweigart al@inventwithpython.com
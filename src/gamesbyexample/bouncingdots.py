@@ -16,6 +16,7 @@ except ImportError:
     print('can install by following the instructions at')
     print('https://pypi.org/project/Bext/')
     sys.exit()
+import framebuffer  # Imports our framebuffer.py program.
 
 # Set up the constants:
 WIDTH, HEIGHT = bext.size()
@@ -42,8 +43,7 @@ Y = 'y'
 DIR = 'direction'
 
 
-def main():
-    bext.clear()
+def main(frame):
 
     # Generate some dots.
     dots = []
@@ -54,11 +54,10 @@ def main():
                       DIR: random.choice(DIRECTIONS)})
 
     while True:  # Main program loop.
+        # Erase the dots' current locations. The frame buffer only
+        # redraws the characters that actually change:
+        frame.clear()
         for dot in dots:  # Handle each dot in the dots list.
-            # Erase the dot's current location:
-            bext.goto(dot[X], dot[Y])
-            print(' ', end='')
-
             # Move the dot:
             if dot[DIR] == UP_RIGHT:
                 dot[X] += 1
@@ -74,9 +73,7 @@ def main():
                 dot[Y] += 1
 
             # Draw the dots at their new location:
-            bext.goto(dot[X], dot[Y])
-            bext.fg(dot[COLOR])
-            print(DOT_CHAR, end='')
+            frame.put(dot[X], dot[Y], DOT_CHAR, dot[COLOR])
 
             # See if the dot bounces off the corners:
             if dot[X] == 0 and dot[Y] == 0:
@@ -112,15 +109,17 @@ def main():
             elif dot[Y] == HEIGHT - 1 and dot[DIR] == DOWN_RIGHT:
                 dot[DIR] = UP_RIGHT
 
-        sys.stdout.flush()  # (Required for bext-using programs.)
+        frame.render()
         time.sleep(PAUSE_AMOUNT)
 
 
 # If this program was run (instead of imported), run the game:
 if __name__ == '__main__':
+    frame = framebuffer.FrameBuffer(WIDTH, HEIGHT)
     try:
-        main()
+        main(frame)
     except KeyboardInterrupt:
         print()
         print('Bouncing Dots, by Al Sweigart al@inventwithpython.com')
+        print(frame.getReport())
         sys.exit()  # When Ctrl-C is pressed, end the program.
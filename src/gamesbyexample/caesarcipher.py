@@ -9,12 +9,28 @@ try:
     import pyperclip  # pyperclip copies text to the clipboard.
 except ImportError:
     pass  # If pyperclip is not installed, do nothing. It's no big deal.
+import sys
+import cipherstream  # Imports our cipherstream.py program.
 
 # Every possible symbol that can be encrypted/decrypted:
 # (!) You can add numbers and punctuation marks to encrypt those
 # symbols as well.
 SYMBOLS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 
+# (!) Run this program as "python caesarcipher.py --stream encrypt 3" to
+# encrypt stdin to stdout without any questions, or add input and output
+# filenames, like "python caesarcipher.py --stream decrypt 3 in.txt out.txt"
+# to decrypt a file of any size.
+if len(sys.argv) > 3 and sys.argv[1] == '--stream':
+    key = int(sys.argv[3]) % len(SYMBOLS)
+    shiftedSymbols = SYMBOLS[key:] + SYMBOLS[:key]
+    if sys.argv[2] == 'encrypt':
+        table = cipherstream.makeTable(SYMBOLS, shiftedSymbols, upper=True)
+    else:
+        table = cipherstream.makeTable(shiftedSymbols, SYMBOLS, upper=True)
+    cipherstream.streamFiles(cipherstream.TranslateTransform(table), *sys.argv[4:6])
+    sys.exit()
+
 print('Caesar Cipher, by Al Sweigart al@inventwithpython.com')
 print('The Caesar cipher encrypts letters by shifting them over by a')
 print('key number. For example, a key of 2 means the letter A is')
@@ -1,11 +1,14 @@
 """Caesar Cipher Hacker, by Al Sweigart al@inventwithpython.com
 This programs hacks messages encrypted with the Caesar cipher by doing
-a brute force attack against every possible key.
+a brute force attack against every possible key, and shows the most
+English looking decryptions first.
 More info at:
 https://en.wikipedia.org/wiki/Caesar_cipher#Breaking_the_cipher
 This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: tiny, beginner, cryptography, math"""
 __version__ = 0
+import cryptanalysis  # Imports our cryptanalysis.py program.
+
 print('Caesar Cipher Hacker, by Al Sweigart al@inventwithpython.com')
 
 # Let the user specify the message to hack:
@@ -16,24 +19,14 @@ message = input('> ')
 # (This must match the SYMBOLS used when encrypting the message.)
 SYMBOLS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 
-for key in range(len(SYMBOLS)):  # Loop through every possible key.
-    translated = ''
-
-    # Decrypt each symbol in the message:
-    for symbol in message:
-        if symbol in SYMBOLS:
-            num = SYMBOLS.find(symbol)  # Get the number of the symbol.
-            num = num - key  # Decrypt the number.
-
-            # Handle the wrap-around if num is less than 0:
-            if num < 0:
-                num = num + len(SYMBOLS)
-
-            # Add decrypted number's symbol to translated:
-            translated = translated + SYMBOLS[num]
-        else:
-            # Just add the symbol without decrypting:
-            translated = translated + symbol
+# Try every possible key, ranked from the most to least English looking
+# decryption:
+results = cryptanalysis.hackCaesar(message, SYMBOLS)
+for score, key in results:
+    translated = cryptanalysis.caesarTranslate(message, key, 'decrypt', SYMBOLS)
 
     # Display the key being tested, along with its decrypted text:
     print('Key #{}: {}'.format(key, translated))
+
+bestScore, bestKey = results[0]
+print('The most likely key is #{}.'.format(bestKey))
@@ -0,0 +1,277 @@
+"""Cellular Automata, by Al Sweigart al@inventwithpython.com
+A cellular automaton toolkit module, used by the forest fire and
+Langton's ant programs. A BitGrid keeps one integer per state, with a
+bit set for every cell in that state, so a rule updates every cell at
+once with bitwise operations. Random rules (like "1% of trees catch
+fire") use random masks made from a few calls to random.getrandbits()
+instead of calling random.random() once per cell. Turmites (like
+Langton's ant) keep their cells in a bytearray and only touch the cells
+the ants are on.
+Run it to time a million cell grid, for example:
+python cellularautomata.py 1000 1000
+More info at https://en.wikipedia.org/wiki/Cellular_automaton
+Tags: large, module, simulation"""
+__version__ = 0
+import random, sys, time
+
+"""The cells of a BitGrid are stored the same way as in lifeengine.py:
+the cell at (x, y) is bit number y * width + x of each state's integer.
+A rule is a function that takes the BitGrid and returns a dictionary
+with the integer for each state in the next step:
+
+    def rule(grid):
+        alive = grid.planes[ALIVE] | grid.randomMask(0.01)
+        return {ALIVE: alive, DEAD: grid.fullMask ^ alive}
+
+Every cell must be in exactly one state in the returned dictionary."""
+
+# The number of binary digits that randomMask() probabilities are
+# rounded to:
+PROBABILITY_BITS = 16
+
+# Turmite directions, in clockwise order:
+NORTH = 0
+EAST = 1
+SOUTH = 2
+WEST = 3
+DIRECTION_DELTAS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+# How many clockwise quarter turns each turmite rule letter turns.
+# Keys=rule letters, values=number of turns:
+TURNS = {'N': 0, 'R': 1, 'U': 2, 'L': 3}
+
+
+class BitGrid:
+    def __init__(self, width, height, states, wrap=False, rng=random):
+        """Create a width x height grid with every cell in the first of
+        the states. If wrap is True, the edges of the grid wrap around
+        when finding neighbors. rng makes the random masks."""
+        if width < 2 or height < 2:
+            raise ValueError('The grid must be at least 2x2.')
+        if len(states) < 2 or len(set(states)) != len(states):
+            raise ValueError('There must be at least two different states.')
+        self.width = width
+        self.height = height
+        self.numCells = width * height
+        self.states = tuple(states)
+        self.wrap = wrap
+        self.rng = rng
+        self.fullMask = (1 << self.numCells) - 1
+
+        # Masks with a bit set for every cell in the leftmost column
+        # and in the rightmost column:
+        rowsOf1 = self.fullMask // ((1 << width) - 1)  # Bit 0 of every row.
+        self.leftColumnMask = rowsOf1
+        self.rightColumnMask = rowsOf1 << (width - 1)
+        self.notLeftColumnMask = self.fullMask ^ self.leftColumnMask
+        self.notRightColumnMask = self.fullMask ^ self.rightColumnMask
+        self.firstRowMask = (1 << width) - 1
+
+        # planes[state] has a bit set for every cell in that state:
+        self.planes = {state: 0 for state in self.states}
+        self.planes[self.states[0]] = self.fullMask
+        # A bit is set for every cell that changed in the last step, so
+        # only those cells need to be redrawn. Every cell is new at first:
+        self.changed = self.fullMask
+        self.generation = 0
+
+
+    def getState(self, x, y):
+        bit = y * self.width + x
+        for state in self.states:
+            if (self.planes[state] >> bit) & 1:
+                return state
+
+
+    def setState(self, x, y, state):
+        self.setStates(1 << (y * self.width + x), state)
+
+
+    def setStates(self, cells, state):
+        """Put every cell that is set in the cells mask into state."""
+        if state not in self.planes:
+            raise ValueError('Unknown state ' + repr(state))
+        for planeState in self.states:
+            if planeState == state:
+                self.planes[planeState] |= cells
+            else:
+                self.planes[planeState] &= ~cells
+        self.changed |= cells
+
+
+    def count(self, state):
+        return bin(self.planes[state]).count('1')
+
+
+    def randomMask(self, probability):
+        """Return a mask where each cell has the given probability of
+        being set, made from PROBABILITY_BITS random integers."""
+        if probability <= 0:
+            return 0
+        if probability >= 1:
+            return self.fullMask
+        # Going from the lowest binary digit of the probability to the
+        # highest, OR in a random mask for each 1 digit and AND one in
+        # for each 0 digit. Each step halves the chance so far, then
+        # adds 1/2 for a 1 digit:
+        digits = round(probability * (1 << PROBABILITY_BITS))
+        mask = 0
+        getrandbits = self.rng.getrandbits
+        for i in range(PROBABILITY_BITS):
+            if (digits >> i) & 1:
+                mask |= getrandbits(self.numCells)
+            elif mask:
+                mask &= getrandbits(self.numCells)
+        return mask
+
+
+    def randomize(self, state, probability):
+        """Put each cell into state with the given probability."""
+        self.setStates(self.randomMask(probability), state)
+
+
+    def getNeighborhood(self, cells):
+        """Return a mask of the cells in cells or next to one of them
+        (including diagonally)."""
+        width = self.width
+        # The cell to the west and east of each cell:
+        west = (cells << 1) & self.notLeftColumnMask
+        east = (cells >> 1) & self.notRightColumnMask
+        if self.wrap:
+            west |= (cells & self.rightColumnMask) >> (width - 1)
+            east |= (cells & self.leftColumnMask) << (width - 1)
+        row = cells | west | east
+        # The cells above and below each cell:
+        above = (row << width) & self.fullMask
+        below = row >> width
+        if self.wrap:
+            rowShift = self.numCells - width
+            above |= row >> rowShift
+            below |= (row & self.firstRowMask) << rowShift
+        return row | above | below
+
+
+    def step(self, rule, generations=1):
+        """Replace the planes with the ones the rule function returns
+        for the given number of generations."""
+        for i in range(generations):
+            oldPlanes = self.planes
+            self.planes = rule(self)
+            changed = 0
+            for state in self.states:
+                changed |= oldPlanes[state] ^ self.planes[state]
+            self.changed = changed
+            self.generation += 1
+
+
+    def getChangedCells(self):
+        """Return a list of (x, y) tuples of the cells that changed in
+        the last step."""
+        return self._getCells(self.changed)
+
+
+    def _getCells(self, cells):
+        width = self.width
+        result = []
+        while cells:
+            lowestBit = cells & -cells
+            bit = lowestBit.bit_length() - 1
+            result.append((bit % width, bit // width))
+            cells ^= lowestBit
+        return result
+
+
+    def getRows(self, stateChars):
+        """Return a list of strings, one per row, drawing each cell with
+        the character for its state in the stateChars dictionary."""
+        text = [stateChars[self.states[0]]] * self.numCells
+        for state in self.states[1:]:
+            char = stateChars[state]
+            for x, y in self._getCells(self.planes[state]):
+                text[y * self.width + x] = char
+        text = ''.join(text)
+        width = self.width
+        return [text[y * width:(y + 1) * width] for y in range(self.height)]
+
+
+class Turmites:
+    def __init__(self, width, height, rule='RL'):
+        """Create a width x height wrap-around grid of cells in color 0.
+        An ant on a cell of color c turns by the rule's letter c (R for
+        right, L for left, U for a u-turn, or N for no turn), changes
+        the cell to the next color, and moves forward. Langton's ant is
+        the rule 'RL'."""
+        if not rule or any(letter not in TURNS for letter in rule):
+            raise ValueError('Rules are made of the letters ' + ''.join(TURNS))
+        self.width = width
+        self.height = height
+        self.turns = [TURNS[letter] for letter in rule]
+        self.colors = bytearray(width * height)  # colors[y * width + x]
+        self.ants = []  # A list of [x, y, direction] lists.
+        self.generation = 0
+
+
+    def addAnt(self, x, y, direction=NORTH):
+        self.ants.append([x, y, direction])
+
+
+    def getColor(self, x, y):
+        return self.colors[y * self.width + x]
+
+
+    def step(self, generations=1):
+        """Move every ant for the given number of generations. Returns a
+        set of the (x, y) tuples of the cells that changed or that an ant
+        moved onto, which are the only cells to redraw."""
+        width, height = self.width, self.height
+        colors, turns = self.colors, self.turns
+        numColors = len(turns)
+        touched = set()
+        for i in range(generations):
+            for ant in self.ants:
+                x, y, direction = ant
+                cell = y * width + x
+                color = colors[cell]
+                direction = (direction + turns[color]) % 4
+                colors[cell] = (color + 1) % numColors
+                touched.add((x, y))
+                dx, dy = DIRECTION_DELTAS[direction]
+                ant[0] = (x + dx) % width
+                ant[1] = (y + dy) % height
+                ant[2] = direction
+                touched.add((ant[0], ant[1]))
+            self.generation += 1
+        return touched
+
+
+def runBenchmark(grid, rule, generations=100):
+    """Time the rule on the grid and print the results."""
+    print('Stepping a %sx%s grid for %s generations...' % (grid.width, grid.height, generations))
+    startTime = time.time()
+    grid.step(rule, generations)
+    totalTime = time.time() - startTime
+    print('%.2f generations per second (%.1f million cells per second).'
+          % (generations / totalTime, generations * grid.numCells / totalTime / 1000000))
+
+
+def _sampleRule(grid):
+    # Cells switch on at random, and spread to their neighbors:
+    on = grid.planes[True] | grid.randomMask(0.001)
+    on |= grid.getNeighborhood(on) & grid.randomMask(0.25)
+    return {True: on, False: grid.fullMask ^ on}
+
+
+# If this program isn't being imported, run the benchmarks.
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        width, height = int(sys.argv[1]), int(sys.argv[2])
+    else:
+        width, height = 1000, 1000
+    runBenchmark(BitGrid(width, height, (False, True)), _sampleRule)
+
+    turmites = Turmites(width, height)
+    for i in range(100):
+        turmites.addAnt(random.randrange(width), random.randrange(height), random.randrange(4))
+    startTime = time.time()
+    turmites.step(1000)
+    totalTime = time.time() - startTime
+    print('100 ants: %.0f ant moves per second.' % (100 * 1000 / totalTime))
@@ -0,0 +1,394 @@
+"""Cipher Stream, by Al Sweigart al@inventwithpython.com
+A streaming module, used by the cipher programs to encrypt and decrypt
+whole files instead of one typed message. The file (or stdin) is read
+in big chunks of bytes, each chunk is translated with a few calls to
+bytes.translate() using tables made ahead of time, and the results are
+written out in big blocks. Ciphers that depend on where a letter is
+(like the Vigenere key letter, or the rail fence zig zag) remember
+their place from one chunk to the next, so chunks can be any size. The
+ciphers only change ASCII symbols, and UTF-8 text never has ASCII bytes
+inside its other characters, so UTF-8 text passes through unharmed.
+(The rail fence cipher moves bytes around, so it should only be used on
+ASCII text to match railfencecipher.py.)
+Run it to time each kind of transform, for example:
+python cipherstream.py 100
+More info at https://en.wikipedia.org/wiki/Stream_(computing)
+Tags: large, module, cryptography"""
+__version__ = 0
+import os, random, re, sys, tempfile, time
+
+CHUNK_SIZE = 1 << 22  # Read 4 MB at a time.
+WRITE_BUFFER_SIZE = 1 << 24  # Write 16 MB at a time.
+SPOOL_SIZE = 1 << 22  # Rail fence rails bigger than this go to a file.
+
+UPPER_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+LOWER_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+LETTER_BYTES = (UPPER_LETTERS + LOWER_LETTERS).encode('ascii')
+NON_LETTER_BYTES = bytes(byte for byte in range(256) if byte not in LETTER_BYTES)
+# The most common symbols in text besides letters. Vigenere padding is
+# added after each one with replace(), and after the rest with a format
+# string, so this turns the rest into % signs:
+COMMON_NON_LETTERS = (b' ', b'\n', b'\r', b'.', b',', b'\'')
+COMMON_NON_LETTER_BYTES = b''.join(COMMON_NON_LETTERS)
+RARE_NON_LETTERS = NON_LETTER_BYTES.translate(None, COMMON_NON_LETTER_BYTES)
+RARE_NON_LETTERS_TO_PERCENT = bytes.maketrans(RARE_NON_LETTERS, b'%' * len(RARE_NON_LETTERS))
+# Byte values in order from least to most likely to be in text:
+UNUSUAL_BYTES = bytes(range(1, 9)) + bytes(range(14, 32)) + b'\x7f\x00' + bytes(range(128, 256)) + bytes(range(9, 14)) + bytes(range(32, 127))
+# Vigenere padding can't be a letter (it would use up a key letter),
+# a % sign (it would be a format code), or a common symbol (it would
+# get padded too):
+FILLER_BYTES = UNUSUAL_BYTES.translate(None, LETTER_BYTES + b'%' + COMMON_NON_LETTER_BYTES)
+
+
+def makeTable(fromSymbols, toSymbols, upper=False):
+    """Return a bytes.translate() table that changes each ASCII symbol
+    in fromSymbols to the one at the same index in toSymbols. If upper
+    is True, lowercase letters are made uppercase first."""
+    table = bytearray(range(256))
+    if upper:
+        table[ord('a'):ord('z') + 1] = UPPER_LETTERS.encode('ascii')
+    mapping = bytes.maketrans(fromSymbols.encode('ascii'), toSymbols.encode('ascii'))
+    return bytes(table).translate(mapping)
+
+
+def _getUnusedByte(data, candidates=UNUSUAL_BYTES):
+    """Return a byte value from candidates that isn't in data, or None
+    if they all are."""
+    for byte in candidates:
+        if byte not in data:
+            return byte
+    return None
+
+
+class Transform:
+    """A transform changes a stream one chunk at a time. translate()
+    returns the bytes for the next chunk, and finish() returns a list of
+    any bytes left over at the end of the stream."""
+    def translate(self, data):
+        return data
+
+
+    def finish(self):
+        return []
+
+
+class TranslateTransform(Transform):
+    """Changes each byte with a table from makeTable(), for ciphers where
+    each symbol always becomes the same symbol."""
+    def __init__(self, table):
+        self.table = table
+
+
+    def translate(self, data):
+        return data.translate(self.table)
+
+
+class VigenereTransform(Transform):
+    def __init__(self, key, mode):
+        """Encrypt or decrypt with the Vigenere cipher key, the same way
+        as vigenerecipher.py: each letter is shifted by the next letter
+        of the key, and other bytes are left as they are (and don't use
+        up a letter of the key)."""
+        if not key.isalpha() or not key.isascii():
+            raise ValueError('The key must be made of letters.')
+        if mode not in ('encrypt', 'decrypt'):
+            raise ValueError("The mode must be 'encrypt' or 'decrypt'.")
+        self.tables = []
+        for keyLetter in key.upper():
+            shift = UPPER_LETTERS.find(keyLetter)
+            if mode == 'decrypt':
+                shift = (26 - shift) % 26
+            self.tables.append(makeTable(UPPER_LETTERS + LOWER_LETTERS,
+                UPPER_LETTERS[shift:] + UPPER_LETTERS[:shift] + LOWER_LETTERS[shift:] + LOWER_LETTERS[:shift]))
+        self.keyIndex = 0  # The key letter for the next letter.
+
+
+    def translate(self, data):
+        keyLength = len(self.tables)
+        if keyLength == 1:
+            return data.translate(self.tables[self.keyIndex])  # It's a Caesar cipher.
+        filler = _getUnusedByte(data, FILLER_BYTES)
+        if filler is None:
+            # A piece shorter than FILLER_BYTES can't have all of them in it:
+            pieceSize = len(FILLER_BYTES) - 1
+            return b''.join([self.translate(data[i:i + pieceSize]) for i in range(0, len(data), pieceSize)])
+
+        # Letters that use the same key letter aren't evenly spaced,
+        # because other symbols don't use up a key letter. But if each
+        # other symbol is followed by keyLength - 1 filler bytes, they
+        # are, and can be translated with one slice per key letter. The
+        # common symbols are padded with replace(), and the rest with a
+        # format string, which has %c for each rare symbol:
+        padding = bytes([filler]) * (keyLength - 1)
+        rareSymbols = data.translate(None, LETTER_BYTES + COMMON_NON_LETTER_BYTES)
+        padded = data
+        if rareSymbols:
+            padded = data.translate(RARE_NON_LETTERS_TO_PERCENT).replace(b'%', b'%c' + padding) % tuple(rareSymbols)
+        for symbol in COMMON_NON_LETTERS:
+            padded = padded.replace(symbol, symbol + padding)
+
+        translated = bytearray(padded)
+        for i in range(keyLength):
+            table = self.tables[(self.keyIndex + i) % keyLength]
+            translated[i::keyLength] = padded[i::keyLength].translate(table)
+        numLetters = len(data) - (len(padded) - len(data)) // (keyLength - 1)
+        self.keyIndex = (self.keyIndex + numLetters) % keyLength
+        return translated.translate(None, bytes([filler]))
+
+
+class RailFenceTransform(Transform):
+    def __init__(self, key, mode):
+        """Encrypt or decrypt with the rail fence cipher, the same way as
+        railfencecipher.py: the bytes zig zag down and up key rails, and
+        the encrypted message is each rail, from top to bottom. Every
+        rail depends on the whole message, so nothing is returned until
+        finish()."""
+        if key < 2:
+            raise ValueError('The key must be 2 or more.')
+        if mode not in ('encrypt', 'decrypt'):
+            raise ValueError("The mode must be 'encrypt' or 'decrypt'.")
+        self.key = key
+        self.mode = mode
+        self.period = 2 * (key - 1)  # The zig zag repeats this often.
+        self.position = 0  # How many bytes have been read.
+        if mode == 'encrypt':
+            self.rails = [tempfile.SpooledTemporaryFile(SPOOL_SIZE) for i in range(key)]
+        else:
+            self.spool = tempfile.SpooledTemporaryFile(SPOOL_SIZE)
+
+
+    def _getRailStarts(self, rail, position):
+        # Return the indexes in a chunk starting at position of the
+        # first two bytes on rail. (The top and bottom rails only get
+        # one byte each time the zig zag repeats.)
+        first = (rail - position) % self.period
+        second = (self.period - rail - position) % self.period
+        return min(first, second), max(first, second)
+
+
+    def _getCount(self, length, index):
+        # Return how many of length bytes are at index, index + period,
+        # index + 2 * period, and so on:
+        return len(range(index, length, self.period))
+
+
+    def translate(self, data):
+        if self.mode == 'decrypt':
+            self.spool.write(data)
+        else:
+            for rail in range(self.key):
+                first, second = self._getRailStarts(rail, self.position)
+                if first == second:
+                    self.rails[rail].write(data[first::self.period])
+                else:
+                    # The bytes from the two starts take turns:
+                    railBytes = bytearray(self._getCount(len(data), first) + self._getCount(len(data), second))
+                    railBytes[0::2] = data[first::self.period]
+                    railBytes[1::2] = data[second::self.period]
+                    self.rails[rail].write(railBytes)
+        self.position += len(data)
+        return b''
+
+
+    def finish(self):
+        """Yield the translated message in chunks."""
+        if self.mode == 'encrypt':
+            for railFile in self.rails:
+                railFile.seek(0)
+                for chunk in iter(lambda: railFile.read(CHUNK_SIZE), b''):
+                    yield chunk
+                railFile.close()
+            return
+
+        # Work out where each rail starts in the encrypted message:
+        length = self.position
+        railOffsets = []
+        offset = 0
+        for rail in range(self.key):
+            railOffsets.append(offset)
+            first, second = self._getRailStarts(rail, 0)
+            offset += self._getCount(length, first)
+            if first != second:
+                offset += self._getCount(length, second)
+
+        # Decrypt a whole number of zig zags at a time, reading the next
+        # bytes of each rail:
+        chunkSize = max(CHUNK_SIZE // self.period, 1) * self.period
+        for start in range(0, length, chunkSize):
+            size = min(chunkSize, length - start)
+            chunk = bytearray(size)
+            for rail in range(self.key):
+                first, second = self._getRailStarts(rail, 0)
+                numBytes = self._getCount(size, first)
+                if first != second:
+                    numBytes += self._getCount(size, second)
+                self.spool.seek(railOffsets[rail])
+                railBytes = self.spool.read(numBytes)
+                railOffsets[rail] += numBytes
+                if first == second:
+                    chunk[first::self.period] = railBytes
+                else:
+                    chunk[first::self.period] = railBytes[0::2]
+                    chunk[second::self.period] = railBytes[1::2]
+            yield bytes(chunk)
+        self.spool.close()
+
+
+class CodeTransform(Transform):
+    def __init__(self, codes, separator):
+        """Replace each symbol with its code from the codes dictionary,
+        with separator between the codes, like englishToMorse() does.
+        Symbols that aren't in codes are left out."""
+        # Every symbol is replaced by width bytes: its separator and
+        # code, then filler bytes, which are taken out at the end. So
+        # the Nth byte of every replacement can be made with one
+        # translate() and put in place with one slice:
+        codes = {symbol.encode('latin-1'): (separator + code).encode('latin-1') for symbol, code in codes.items()}
+        self.width = max(len(code) for code in codes.values())
+        self.filler = bytes([_getUnusedByte(b''.join(codes.values()))])
+        self.tables = []
+        for i in range(self.width):
+            table = bytearray(self.filler * 256)  # Other symbols are left out.
+            for symbol, code in codes.items():
+                table[symbol[0]] = code[i] if i < len(code) else self.filler[0]
+            self.tables.append(bytes(table))
+        self.separatorLength = len(separator)
+        self.started = False
+
+
+    def translate(self, data):
+        translated = bytearray(len(data) * self.width)
+        for i, table in enumerate(self.tables):
+            translated[i::self.width] = data.translate(table)
+        translated = translated.translate(None, self.filler)
+        if not self.started and translated:
+            # There's no separator before the first code:
+            translated = translated[self.separatorLength:]
+            self.started = True
+        return translated
+
+
+class DecodeTransform(Transform):
+    def __init__(self, codes, separator):
+        """Split the stream on separator (and on line breaks) and replace
+        each code with its symbol from the codes dictionary, like
+        morseToEnglish() does. Codes that aren't in codes are left out."""
+        self.symbols = {code.encode('latin-1'): symbol.encode('latin-1') for code, symbol in codes.items()}
+        self.separator = separator.encode('latin-1')
+        self.unfinished = b''  # The end of the last chunk, which may be part of a code.
+
+
+    def translate(self, data):
+        data = data.replace(b'\r', self.separator).replace(b'\n', self.separator)
+        codes = (self.unfinished + data).split(self.separator)
+        self.unfinished = codes.pop()
+        getSymbol = self.symbols.get
+        return b''.join([getSymbol(code, b'') for code in codes])
+
+
+    def finish(self):
+        return [self.symbols.get(self.unfinished, b'')]
+
+
+class RandomReplaceTransform(Transform):
+    def __init__(self, replacements, chance, rng=random):
+        """Replace each symbol that is a key in the replacements
+        dictionary (in either case) with a random choice from its list
+        of replacements, with the given chance, like englishToLeetspeak()
+        does."""
+        self.replacements = {}  # Keys=bytes of one symbol, values=lists of bytes.
+        for symbol, symbolReplacements in replacements.items():
+            for caseSymbol in (symbol.lower(), symbol.upper()):
+                self.replacements[caseSymbol.encode('ascii')] = [
+                    replacement.encode('ascii') for replacement in symbolReplacements]
+        symbols = b''.join(self.replacements)
+        self.pattern = re.compile(b'([' + re.escape(symbols) + b'])')
+        self.chance = chance
+        self.rng = rng
+
+
+    def translate(self, data):
+        # Splitting on the symbols puts them at the odd indexes:
+        pieces = self.pattern.split(data)
+        random, choice = self.rng.random, self.rng.choice
+        replacements, chance = self.replacements, self.chance
+        for i in range(1, len(pieces), 2):
+            if random() <= chance:
+                pieces[i] = choice(replacements[pieces[i]])
+        return b''.join(pieces)
+
+
+def streamFiles(transform, inFilename=None, outFilename=None, chunkSize=CHUNK_SIZE):
+    """Translate inFilename into outFilename with transform, reading
+    chunkSize bytes at a time. If a filename is None or '-', stdin or
+    stdout is used instead. Returns the number of bytes read."""
+    if inFilename in (None, '-'):
+        inFile = sys.stdin.buffer
+    else:
+        inFile = open(inFilename, 'rb')
+    if outFilename in (None, '-'):
+        sys.stdout.flush()
+        outFile = sys.stdout.buffer
+    else:
+        outFile = open(outFilename, 'wb', buffering=WRITE_BUFFER_SIZE)
+
+    numBytes = 0
+    try:
+        while True:
+            data = inFile.read(chunkSize)
+            if not data:
+                break
+            numBytes += len(data)
+            outFile.write(transform.translate(data))
+        for data in transform.finish():
+            outFile.write(data)
+    finally:
+        if inFilename not in (None, '-'):
+            inFile.close()
+        if outFilename in (None, '-'):
+            outFile.flush()
+        else:
+            outFile.close()
+    return numBytes
+
+
+def _getBenchmarkText(numBytes):
+    # Text like English, made of random words and punctuation:
+    rng = random.Random(0)
+    words = [''.join(rng.choice(LOWER_LETTERS) for i in range(rng.randint(1, 10))) for j in range(1000)]
+    words += ['The', 'A', 'It', 'is,', 'end.', 'why?', '100%', '\n']
+    text = ' '.join(rng.choice(words) for i in range(CHUNK_SIZE // 5)).encode('ascii')
+    return (text * (numBytes // len(text) + 1))[:numBytes]
+
+
+def runBenchmark(numMegabytes=100):
+    """Stream numMegabytes of text through each kind of transform into
+    os.devnull and print how fast they went."""
+    numBytes = numMegabytes << 20
+    text = _getBenchmarkText(CHUNK_SIZE)
+    morseCodes = {'A': '.-', 'B': '-...', 'C': '-.-.', 'E': '.', ' ': '/'}
+    transforms = [
+        ('Translate table (Caesar, ROT13, substitution, affine)',
+         TranslateTransform(makeTable(UPPER_LETTERS, UPPER_LETTERS[3:] + UPPER_LETTERS[:3], upper=True))),
+        ('Vigenere', VigenereTransform('LEMON', 'encrypt')),
+        ('Rail fence', RailFenceTransform(5, 'encrypt')),
+        ('Rail fence decrypt', RailFenceTransform(5, 'decrypt')),
+        ('Codes (Morse code)', CodeTransform(morseCodes, ' ')),
+        ('Random replacements (leetspeak)', RandomReplaceTransform({'a': ['4', '@'], 'e': ['3']}, 0.7))]
+    print('Streaming %s MB through each transform...' % numMegabytes)
+    with open(os.devnull, 'wb') as outFile:
+        for name, transform in transforms:
+            startTime = time.time()
+            for i in range(0, numBytes, len(text)):
+                outFile.write(transform.translate(text[:numBytes - i]))
+            for data in transform.finish():
+                outFile.write(data)
+            print('%s: %.1f MB per second' % (name, numMegabytes / (time.time() - startTime)))
+
+
+# If this program isn't being imported, run the benchmark.
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        runBenchmark(int(sys.argv[1]))
+    else:
+        runBenchmark()
@@ -3,7 +3,16 @@ Simulate a large number of coin flips.
 This and other games are available at https://nostarch.com/XX
 Tags: tiny, beginner, math, simulation"""
 __version__ = 0
-import random
+import random, sys
+import montecarlo  # Imports our montecarlo.py program.
+
+# To see how often runs of heads and tails come up over 100,000,000
+# flips, run "python coinflipsimulator.py --simulate". montecarlo.py
+# does the flipping on every CPU core. "--simulate 5000" flips 5,000
+# coins instead.
+if len(sys.argv) > 1 and sys.argv[1] == '--simulate':
+    montecarlo.runInNewProcess(['coinflip'] + sys.argv[2:])
+    sys.exit()
 
 print('Coin Flip Simulator, by Al Sweigart al@inventwithpython.com')
 
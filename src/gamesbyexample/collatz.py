@@ -5,6 +5,7 @@ This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: tiny, beginner, math"""
 __version__ = 0
 import sys, time
+import collatzengine  # Imports our collatzengine.py program.
 
 print('''Collatz Sequence, or, the 3n + 1 Problem
 By Al Sweigart al@inventwithpython.com
@@ -28,13 +29,11 @@ if not response.isdecimal() or response == '0':
     sys.exit()
 
 n = int(response)
-print(n, end='', flush=True)
-while n != 1:
-    if n % 2 == 0:  # If n is even...
-        n = n // 2
-    else:  # Otherwise, n is odd...
-        n = 3 * n + 1
-
-    print(', ' + str(n), end='', flush=True)
-    time.sleep(0.1)
+length = collatzengine.CollatzCache(min(n + 1, 100000)).getLength(n)
+print('This sequence has', length, 'numbers:')
+for i, number in enumerate(collatzengine.iterSequence(n)):
+    if i != 0:
+        print(', ', end='')
+        time.sleep(0.1)
+    print(number, end='', flush=True)
 print()
@@ -0,0 +1,160 @@
+"""Collatz Engine, by Al Sweigart al@inventwithpython.com
+A fast Collatz sequence length module, used by the Collatz Sequence and
+Collatz Sequence Stats programs. Sequence lengths are cached in a
+compact array, so a sequence stops being followed as soon as it reaches
+a number whose length is already known. Big ranges of starting numbers
+are split across worker processes, one cache per worker.
+Run it to benchmark it, for example:
+python collatzengine.py 1 10000000
+More info at https://en.wikipedia.org/wiki/Collatz_conjecture
+Tags: large, module, math"""
+__version__ = 0
+import array, multiprocessing, os, sys, time
+
+# Lengths are cached for numbers below this cap. Each cached length
+# takes 2 bytes, so the default cache takes 32 MB:
+DEFAULT_CACHE_CAP = 2 ** 24
+CHUNK_SIZE = 1000000  # How many starting numbers a worker does at a time.
+
+
+class CollatzCache:
+    def __init__(self, cap=DEFAULT_CACHE_CAP):
+        """Set up an empty cache of sequence lengths for the numbers
+        from 1 up to (but not including) cap."""
+        self.cap = max(cap, 2)
+        # lengths[n] is the length of n's sequence, or 0 if unknown.
+        # (Lengths fit in 2 bytes for any number that fits in 64 bits.)
+        self.lengths = array.array('H', bytes(2 * self.cap))
+        self.lengths[1] = 1  # The sequence for 1 is just "1".
+
+
+    def getLength(self, number):
+        """Return how many numbers are in the Collatz sequence starting
+        at number, including number and the final 1."""
+        lengths = self.lengths
+        cap = self.cap
+        path = []  # The numbers walked through with unknown lengths.
+        n = number
+        while n >= cap or lengths[n] == 0:
+            path.append(n)
+            if n % 2 == 0:
+                n = n // 2
+            else:
+                n = 3 * n + 1
+
+        # Walk back along the path, caching each length:
+        length = lengths[n]
+        for n in reversed(path):
+            length += 1
+            if n < cap:
+                lengths[n] = length
+        return length
+
+
+def iterSequence(number):
+    """Yield each number in the Collatz sequence starting at number."""
+    n = number
+    yield n
+    while n != 1:
+        if n % 2 == 0:  # If n is even...
+            n = n // 2
+        else:  # Otherwise, n is odd...
+            n = 3 * n + 1
+        yield n
+
+
+def _getChunkStats(cache, begin, end):
+    """Return a stats dictionary (see getRangeStats()) for the starting
+    numbers from begin up to (but not including) end."""
+    getLength = cache.getLength
+    shortestLength, shortestStart = None, None
+    longestLength, longestStart = None, None
+    histogram = {}  # Keys=sequence lengths, values=how many starts have it.
+    for start in range(begin, end):
+        length = getLength(start)
+        histogram[length] = histogram.get(length, 0) + 1
+        if shortestLength is None or length < shortestLength:
+            shortestLength, shortestStart = length, start
+        if longestLength is None or length > longestLength:
+            longestLength, longestStart = length, start
+    return {'shortestLength': shortestLength, 'shortestStart': shortestStart,
+            'longestLength': longestLength, 'longestStart': longestStart,
+            'histogram': histogram}
+
+
+def _mergeStats(stats, moreStats):
+    """Combine moreStats into stats. Ties go to the smaller starting
+    number, the same as going through the range in order."""
+    if stats['shortestLength'] is None or (moreStats['shortestLength'], moreStats['shortestStart']) < (stats['shortestLength'], stats['shortestStart']):
+        stats['shortestLength'] = moreStats['shortestLength']
+        stats['shortestStart'] = moreStats['shortestStart']
+    if stats['longestLength'] is None or (moreStats['longestLength'], -moreStats['longestStart']) > (stats['longestLength'], -stats['longestStart']):
+        stats['longestLength'] = moreStats['longestLength']
+        stats['longestStart'] = moreStats['longestStart']
+    for length, count in moreStats['histogram'].items():
+        stats['histogram'][length] = stats['histogram'].get(length, 0) + count
+
+
+_workerCache = None  # Each worker process's own CollatzCache.
+
+
+def _initWorker(cacheCap):
+    """Set up the cache for a worker process."""
+    global _workerCache
+    _workerCache = CollatzCache(cacheCap)
+
+
+def _getWorkerChunkStats(chunk):
+    """Return the stats for a (begin, end) chunk, using the worker
+    process's cache."""
+    return _getChunkStats(_workerCache, chunk[0], chunk[1])
+
+
+def getRangeStats(begin, end, numWorkers=None, cacheCap=DEFAULT_CACHE_CAP, chunkSize=CHUNK_SIZE):
+    """Return a dictionary of stats for the starting numbers from begin
+    up to (but not including) end. The keys are 'shortestLength',
+    'shortestStart', 'longestLength', 'longestStart', and 'histogram'
+    (a dictionary of how many starting numbers have each length). The
+    range is split across numWorkers processes (all CPU cores by
+    default), each with a cache of up to cacheCap lengths."""
+    if numWorkers is None:
+        numWorkers = os.cpu_count() or 1
+    chunks = [(chunkBegin, min(chunkBegin + chunkSize, end))
+              for chunkBegin in range(begin, end, chunkSize)]
+
+    stats = {'shortestLength': None, 'shortestStart': None,
+             'longestLength': None, 'longestStart': None, 'histogram': {}}
+    if numWorkers == 1 or len(chunks) < 2:
+        cache = CollatzCache(min(cacheCap, end))
+        for chunkBegin, chunkEnd in chunks:
+            _mergeStats(stats, _getChunkStats(cache, chunkBegin, chunkEnd))
+    else:
+        pool = multiprocessing.Pool(min(numWorkers, len(chunks)), _initWorker, (min(cacheCap, end),))
+        try:
+            for chunkStats in pool.imap_unordered(_getWorkerChunkStats, chunks):
+                _mergeStats(stats, chunkStats)
+        finally:
+            pool.terminate()
+    return stats
+
+
+def runBenchmark(begin=1, end=10000001):
+    """Print how long it takes to get the stats for a range, with and
+    without multiple worker processes."""
+    for numWorkers in (1, None):
+        startTime = time.time()
+        stats = getRangeStats(begin, end, numWorkers)
+        totalTime = time.time() - startTime
+        print('%s workers: %s starting numbers in %.2f seconds (%s per second).'
+              % (numWorkers or os.cpu_count(), format(end - begin, ','), totalTime,
+                 format(int((end - begin) / totalTime), ',')))
+    print('Shortest sequence: %s numbers, starting from %s.' % (stats['shortestLength'], stats['shortestStart']))
+    print('Longest sequence: %s numbers, starting from %s.' % (stats['longestLength'], stats['longestStart']))
+
+
+# If this program isn't being imported, run the benchmark.
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        runBenchmark(int(sys.argv[1]), int(sys.argv[2]) + 1)
+    else:
+        runBenchmark()
@@ -4,7 +4,15 @@ More info at: https://en.wikipedia.org/wiki/Collatz_conjecture
 This and other games are available at https://nostarch.com/XX
 Tags: short, math"""
 __version__ = 0
-print('''Collatz Sequence Stats, by Al Sweigart al@inventwithpython.com
+import sys
+import collatzengine  # Imports our collatzengine.py program.
+
+# Ranges with more starting numbers than this only show the summary:
+MAX_NUMBERS_TO_PRINT = 10000
+
+
+def main():
+    print('''Collatz Sequence Stats, by Al Sweigart al@inventwithpython.com
 
 The Collatz sequence is a sequence of numbers produced from a
 starting number, following two rules:
@@ -19,49 +27,49 @@ eventually terminates.
 (Run the collatz.py program to see the actual numbers in the sequence.)
 ''')
 
+    while True: # Ask for a starting number range.
+        print('Enter a starting number range (like 1-1000):')
+        response = input('> ')
+
+        rangeOfNums = response.split('-')
+        if len(rangeOfNums) == 2:
+            if rangeOfNums[0].isdecimal() and rangeOfNums[1].isdecimal():
+                beginRange = int(rangeOfNums[0])
+                endRange = int(rangeOfNums[1])
+                if beginRange > 0 and endRange > 0 and beginRange < endRange:
+                    break
+        print('Enter a number range, with two numbers separated by a dash.')
+
+    if endRange - beginRange < MAX_NUMBERS_TO_PRINT:
+        # Sequence lengths are cached, so each sequence is only
+        # followed until it reaches a number seen before:
+        cache = collatzengine.CollatzCache(endRange + 1)
+        for startingNum in range(beginRange, endRange + 1):
+            length = cache.getLength(startingNum)
+            print('Starting number:', startingNum, 'Sequence length:', length)
+    else:
+        print('Finding the lengths of', endRange - beginRange + 1, 'sequences...')
+
+    # The stats are found by worker processes on every CPU core:
+    stats = collatzengine.getRangeStats(beginRange, endRange + 1)
+
+    print('Shortest sequence started from', stats['shortestStart'])
+    print('and produced a sequence with', stats['shortestLength'], 'numbers.')
+
+    print('Longest sequence started from', stats['longestStart'])
+    print('and produced a sequence with', stats['longestLength'], 'numbers.')
+
+    # Display the histogram of sequence lengths, if asked:
+    print('Show how many sequences have each length? Y/N')
+    if input('> ').upper().startswith('Y'):
+        histogram = stats['histogram']
+        for length in sorted(histogram):
+            print('Length', length, '-', histogram[length], 'sequences')
+
 
-while True: # Ask for a starting number range.
-    print('Enter a starting number range (like 1-1000):')
-    response = input('> ')
-
-    rangeOfNums = response.split('-')
-    if len(rangeOfNums) == 2:
-        if rangeOfNums[0].isdecimal() and rangeOfNums[1].isdecimal():
-            beginRange = int(rangeOfNums[0])
-            endRange = int(rangeOfNums[1])
-            if beginRange > 0 and endRange > 0 and beginRange < endRange:
-                break
-    print('Enter a number range, with two numbers separated by a dash.')
-
-# Keep track of stats:
-shortestLength = None
-shortestLengthStartingNumber = None
-longestLength = None
-longestLengthStartingNumber = None
-
-for startingNum in range(beginRange, endRange + 1):
-    n = startingNum
-    length = 1
-
-    # Run through the sequence:
-    while n != 1:
-        if n % 2 == 0:  # If n is even...
-            n = n // 2
-        else: # Otherwise, n is odd...
-            n = 3 * n + 1
-        length += 1
-
-    if shortestLength == None or length < shortestLength:
-        shortestLength = length
-        shortestLengthStartingNumber = startingNum
-    if longestLength == None or length > longestLength:
-        longestLength = length
-        longestLengthStartingNumber = startingNum
-
-    print('Starting number:', startingNum, 'Sequence length:', length)
-
-print('Shortest sequence started from', shortestLengthStartingNumber)
-print('and produced a sequence with', shortestLength, 'numbers.')
-
-print('Longest sequence started from', longestLengthStartingNumber)
-print('and produced a sequence with', longestLength, 'numbers.')
+# If this program was run (instead of imported), run the program:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
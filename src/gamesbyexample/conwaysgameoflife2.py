@@ -2,6 +2,8 @@
 This version of Conway's Game of Life uses squares instead of text
 characters.
 The classic cellular automata simulation. Press Ctrl-C to stop.
+Run it with an RLE pattern file (like gosperglidergun.rle) to run the
+pattern on an infinite plane instead of a wrap-around grid.
 More info at: https://en.wikipedia.org/wiki/Conway%27s_Game_of_Life
 This program MUST be run in a Terminal/Command Prompt window.
 Do not resize the terminal window while this program is running.
@@ -9,6 +11,7 @@ This and other games are available at https://nostarch.com/XX
 Tags: large, artistic, simulation, bext, terminal"""
 __version__ = 0  # TODO - There's a weird bug on the Windows that adds unwanted scrolling.
 import random, sys, time
+import hashlife  # Imports our hashlife.py program.
 
 try:
     import bext
@@ -42,10 +45,17 @@ def main():
     currentCells = {}
     nextCells = {}
     previousCells = {}
-    for x in range(WIDTH):
-        for y in range(HEIGHT):
-            if random.randint(0, 1) == 0:
-                nextCells[x, y] = True
+    plane = None  # The infinite plane, if a pattern file was given.
+    if len(sys.argv) > 1:
+        # (!) Try running this program with "gosperglidergun.rle" or an
+        # RLE file downloaded from https://conwaylife.com/wiki/
+        plane = hashlife.LifePlane(hashlife.loadRle(sys.argv[1]))
+        nextCells = getVisibleCells(plane)
+    else:
+        for x in range(WIDTH):
+            for y in range(HEIGHT):
+                if random.randint(0, 1) == 0:
+                    nextCells[x, y] = True
 
     bext.clear()
 
@@ -79,7 +89,17 @@ def main():
                         print(' ', end='')
 
             print()  # Print a newline at the end of the row.
-        print('Press Ctrl-C to quit.', end='', flush=True)
+        if plane is None:
+            print('Press Ctrl-C to quit.', end='', flush=True)
+        else:
+            print('Generation %s, population %s. Press Ctrl-C to quit.'
+                  % (plane.generation, plane.population()), end='', flush=True)
+
+            # Calculate the next cells on the infinite plane:
+            plane.step()
+            nextCells = getVisibleCells(plane)
+            time.sleep(PAUSE_LENGTH)  # Pause to reduce flickering.
+            continue
 
         # Calculate next cells based on current cells:
         nextCells = {}
@@ -121,6 +141,16 @@ def main():
         time.sleep(PAUSE_LENGTH)  # Pause to reduce flickering.
 
 
+def getVisibleCells(plane):
+    """Return a dictionary of the living cells on the plane that fit
+    on the screen."""
+    visibleCells = {}  # Keys=(x, y) tuples, values=True.
+    for x, y in plane.getCells():
+        if 0 <= x < WIDTH and 0 <= y < HEIGHT:
+            visibleCells[x, y] = True
+    return visibleCells
+
+
 # If this program was run (instead of imported), run the game:
 if __name__ == '__main__':
     try:
@@ -0,0 +1,470 @@
+"""Cryptanalysis, by Al Sweigart al@inventwithpython.com
+A code breaking module, used by the cipher programs to hack messages
+without the key. Decryptions are scored by how English they look: the
+chance of each four letter sequence (a "quadgram", like TION or THEH)
+appearing in English is looked up in a table, so gibberish scores low.
+The table is built once from an English word list and saved as an array
+of 26 ** 4 floats. Caesar and affine keys are brute forced. Vigenere
+key lengths are found from repeated sequences (the Kasiski examination)
+and the index of coincidence, then each key letter by letter frequency.
+Simple substitution keys are found by hill climbing: swapping pairs of
+key letters while the score goes up, restarting from several random
+keys in a pool of processes. Only a sample of a long message is scored,
+and the whole message is decrypted at once with str.translate(), so
+megabyte messages are hacked in seconds.
+Run it to time hacking a long message, for example:
+python cryptanalysis.py 2000000
+More info at https://en.wikipedia.org/wiki/Frequency_analysis
+Tags: large, module, cryptography"""
+__version__ = 0
+import array, collections, math, multiprocessing, os, random, re, sys, time
+
+LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+NUM_QUADGRAMS = 26 ** 4
+QUADGRAM_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'englishquadgrams.bin')
+WORD_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'commonenglishwords.txt')
+
+# The word list has no word frequencies, so the made up English text
+# that the quadgram table is counted from mixes its words in with these
+# common words, which make up about half of real English text. They are
+# in order from most to least common:
+COMMON_WORDS = '''THE OF AND TO A IN IS YOU THAT IT HE WAS FOR ON ARE AS WITH
+HIS THEY I AT BE THIS HAVE FROM OR ONE HAD BY WORD BUT NOT WHAT ALL WERE
+WE WHEN YOUR CAN SAID THERE USE AN EACH WHICH SHE DO HOW THEIR IF WILL UP
+OTHER ABOUT OUT MANY THEN THEM THESE SO SOME HER WOULD MAKE LIKE HIM INTO
+TIME HAS LOOK TWO MORE WRITE GO SEE NUMBER NO WAY COULD PEOPLE MY THAN
+FIRST WATER BEEN CALL WHO OIL ITS NOW FIND LONG DOWN DAY DID GET COME
+MADE MAY PART'''.split()
+COMMON_WORDS_FRACTION = 0.5
+TRAINING_WORDS = 1000000  # The number of words in the made up text.
+
+# The percentage of English letters that are each letter:
+LETTER_FREQUENCIES = {'E': 12.7, 'T': 9.06, 'A': 8.17, 'O': 7.51, 'I': 6.97,
+    'N': 6.75, 'S': 6.33, 'H': 6.09, 'R': 5.99, 'D': 4.25, 'L': 4.03,
+    'C': 2.78, 'U': 2.76, 'M': 2.41, 'W': 2.36, 'F': 2.23, 'G': 2.02,
+    'Y': 1.97, 'P': 1.93, 'B': 1.29, 'V': 0.98, 'K': 0.77, 'J': 0.15,
+    'X': 0.15, 'Q': 0.1, 'Z': 0.07}
+ETAOIN = ''.join(sorted(LETTERS, key=lambda letter: -LETTER_FREQUENCIES[letter]))
+
+SAMPLE_LENGTH = 1000  # How many letters of a message are scored.
+KEY_LENGTH_SAMPLE_LENGTH = 100000  # How many letters find key lengths.
+MAX_KEY_LENGTH = 20
+NUM_KEY_LENGTHS = 4  # How many of the likeliest key lengths are tried.
+NUM_RESTARTS = 8  # How many hill climbs hackSubstitution() runs.
+
+# Symbols that English text has besides letters. Other symbols in a
+# decryption count as badly as the least likely quadgram:
+ENGLISH_SYMBOLS = set(LETTERS + LETTERS.lower() + ' \t\n.,;:!?\'"-()0123456789')
+
+_quadgramScores = None  # Set by getQuadgramScores().
+
+
+def getLetters(text):
+    """Return the letters in text as a string of uppercase letters."""
+    return re.sub('[^A-Z]', '', text.upper())
+
+
+def makeTrainingText(rng=None):
+    """Return made up English text (without spaces) of words from the
+    word list mixed in with COMMON_WORDS, to count quadgrams in."""
+    if rng is None:
+        rng = random.Random(0)  # Always make the same table.
+    with open(WORD_FILENAME) as wordFile:
+        words = [getLetters(word) for word in wordFile.read().split()]
+    words = [word for word in words if word]
+    # The common words' frequencies follow Zipf's law: the Nth most
+    # common word is 1/N as common as the most common one:
+    commonWeights = [1 / rank for rank in range(1, len(COMMON_WORDS) + 1)]
+    commonTotal = sum(commonWeights)
+    weights = [COMMON_WORDS_FRACTION * weight / commonTotal for weight in commonWeights]
+    weights += [(1 - COMMON_WORDS_FRACTION) / len(words)] * len(words)
+    return ''.join(rng.choices(COMMON_WORDS + words, weights, k=TRAINING_WORDS))
+
+
+def buildQuadgramTable(text):
+    """Return an array of the base 10 log of the chance of each quadgram
+    in the letters of text. The quadgram ABCD is at index
+    (((A * 26) + B) * 26 + C) * 26 + D, where A is 0, B is 1, and so on.
+    Quadgrams that aren't in text get the chance of one hundredth of a
+    quadgram."""
+    letters = getLetters(text)
+    counts = collections.Counter(letters[i:i + 4] for i in range(len(letters) - 3))
+    total = sum(counts.values())
+    table = array.array('f', [math.log10(0.01 / total)]) * NUM_QUADGRAMS
+    for quadgram, count in counts.items():
+        table[_getQuadgramIndex(quadgram)] = math.log10(count / total)
+    return table
+
+
+def _getQuadgramIndex(quadgram):
+    index = 0
+    for letter in quadgram:
+        index = index * 26 + ord(letter) - 65  # 65 is ord('A').
+    return index
+
+
+def getQuadgramScores(filename=QUADGRAM_FILENAME):
+    """Return a (dictionary, floor) tuple. Keys=quadgrams, values=their
+    log chance. Quadgrams not in the dictionary have the floor score.
+    The table is built and saved to filename first if it doesn't exist
+    yet."""
+    global _quadgramScores
+    if _quadgramScores is not None:
+        return _quadgramScores
+    table = array.array('f')
+    if not os.path.exists(filename) or os.path.getsize(filename) != NUM_QUADGRAMS * table.itemsize:
+        print('Building the quadgram table. This only happens once...')
+        tempFilename = filename + '.tmp'
+        with open(tempFilename, 'wb') as tableFile:
+            buildQuadgramTable(makeTrainingText()).tofile(tableFile)
+        os.replace(tempFilename, filename)
+    with open(filename, 'rb') as tableFile:
+        table.fromfile(tableFile, NUM_QUADGRAMS)
+
+    # Looking up string slices in a dictionary is faster than working
+    # out array indexes, so only the quadgrams seen are kept in one:
+    floor = min(table)
+    scores = {}
+    for index, score in enumerate(table):
+        if score != floor:
+            quadgram = (LETTERS[index // 17576] + LETTERS[index // 676 % 26]
+                        + LETTERS[index // 26 % 26] + LETTERS[index % 26])
+            scores[quadgram] = score
+    _quadgramScores = (scores, floor)
+    return _quadgramScores
+
+
+def scoreLetters(letters):
+    """Return the total quadgram score of a string of uppercase letters.
+    Higher (closer to zero) scores are more like English."""
+    scores, floor = getQuadgramScores()
+    getScore = scores.get
+    return sum([getScore(letters[i:i + 4], floor) for i in range(len(letters) - 3)])
+
+
+def englishScore(text):
+    """Return the average quadgram score of text, counting symbols that
+    aren't in English text as the lowest score. Scores are around -4.5
+    for English and -7 for gibberish."""
+    scores, floor = getQuadgramScores()
+    letters = getLetters(text)
+    numOddSymbols = sum(1 for symbol in text if symbol not in ENGLISH_SYMBOLS)
+    numScores = max(len(letters) - 3, 0) + numOddSymbols
+    if numScores == 0:
+        return floor
+    return (scoreLetters(letters) + floor * numOddSymbols) / numScores
+
+
+def getSample(message, length=SAMPLE_LENGTH):
+    """Return the start of message that has about length letters."""
+    # Letters are most of any text, so twice length is usually enough:
+    end = 2 * length
+    while end < len(message) and len(getLetters(message[:end])) < length:
+        end *= 2
+    return message[:end]
+
+
+# Caesar cipher:
+
+def caesarTranslate(message, key, mode='decrypt', symbols=LETTERS):
+    """Encrypt or decrypt message with the Caesar cipher key. Symbols
+    that aren't in symbols are left as they are."""
+    if mode == 'decrypt':
+        key = -key
+    key %= len(symbols)
+    return message.translate(str.maketrans(symbols, symbols[key:] + symbols[:key]))
+
+
+def hackCaesar(message, symbols=LETTERS):
+    """Return a list of (score, key) tuples for every key, from most
+    to least English."""
+    sample = getSample(message)
+    results = [(englishScore(caesarTranslate(sample, key, symbols=symbols)), key)
+               for key in range(len(symbols))]
+    results.sort(key=lambda result: result[0], reverse=True)
+    return results
+
+
+# Affine cipher:
+
+def affineTranslate(message, keyA, keyB, mode, symbols):
+    """Encrypt or decrypt message with the affine cipher keys, the same
+    way as affinecipher.py."""
+    numSymbols = len(symbols)
+    encrypted = ''.join(symbols[(i * keyA + keyB) % numSymbols] for i in range(numSymbols))
+    if mode == 'encrypt':
+        return message.translate(str.maketrans(symbols, encrypted))
+    return message.translate(str.maketrans(encrypted, symbols))
+
+
+def hackAffine(message, symbols):
+    """Try every affine cipher key and yield (score, keyA, keyB) tuples
+    each time a more English decryption is found."""
+    sample = getSample(message, 200)
+    bestScore = None
+    for keyA in range(1, len(symbols)):
+        if math.gcd(keyA, len(symbols)) != 1:
+            continue  # This isn't a valid key.
+        for keyB in range(len(symbols)):
+            score = englishScore(affineTranslate(sample, keyA, keyB, 'decrypt', symbols))
+            if bestScore is None or score > bestScore:
+                bestScore = score
+                yield score, keyA, keyB
+
+
+# Vigenere cipher:
+
+def vigenereTranslate(message, key, mode='decrypt'):
+    """Encrypt or decrypt message with the Vigenere cipher key, the same
+    way as vigenerecipher.py: each letter is shifted by the next letter
+    of the key, keeping its case, and other symbols are left as they
+    are (and don't use up a letter of the key)."""
+    key = key.upper()
+    tables = []
+    for keyLetter in key:
+        shift = LETTERS.find(keyLetter)
+        if mode == 'decrypt':
+            shift = -shift
+        shifted = LETTERS[shift % 26:] + LETTERS[:shift % 26]
+        tables.append(str.maketrans(LETTERS + LETTERS.lower(), shifted + shifted.lower()))
+
+    # Split the message into runs of letters and runs of other symbols,
+    # then translate every len(key)th letter with the same table:
+    pieces = re.split('([^A-Za-z]+)', message)
+    letters = ''.join(pieces[0::2])
+    translated = list(letters)
+    for i, table in enumerate(tables):
+        translated[i::len(key)] = letters[i::len(key)].translate(table)
+    translated = ''.join(translated)
+    # Put the other symbols back between the translated letters:
+    start = 0
+    for i in range(0, len(pieces), 2):
+        end = start + len(pieces[i])
+        pieces[i] = translated[start:end]
+        start = end
+    return ''.join(pieces)
+
+
+def getIndexOfCoincidence(letters):
+    """Return the chance that two letters picked from letters are the
+    same. It's about 0.066 for English and 0.038 for random letters."""
+    if len(letters) < 2:
+        return 0.0
+    counts = collections.Counter(letters)
+    return sum(count * (count - 1) for count in counts.values()) / (len(letters) * (len(letters) - 1))
+
+
+def getKasiskiFactors(letters, maxKeyLength=MAX_KEY_LENGTH):
+    """Return a Counter of how many times each possible key length
+    divides the spacing between repeats of the same three letters."""
+    lastSeen = {}  # Keys=three letter sequences, values=their last index.
+    factors = collections.Counter()
+    for i in range(len(letters) - 2):
+        sequence = letters[i:i + 3]
+        if sequence in lastSeen:
+            spacing = i - lastSeen[sequence]
+            for keyLength in range(2, maxKeyLength + 1):
+                if spacing % keyLength == 0:
+                    factors[keyLength] += 1
+        lastSeen[sequence] = i
+    return factors
+
+
+def getLikelyKeyLengths(letters, maxKeyLength=MAX_KEY_LENGTH):
+    """Return a list of the key lengths from 1 to maxKeyLength, from
+    most to least likely. A key length that is right splits the letters
+    into columns that were each Caesar shifted, which have the same
+    index of coincidence as English."""
+    letters = letters[:KEY_LENGTH_SAMPLE_LENGTH]
+    indexes = {}
+    for keyLength in range(1, maxKeyLength + 1):
+        columns = [letters[i::keyLength] for i in range(keyLength)]
+        indexes[keyLength] = sum(map(getIndexOfCoincidence, columns)) / keyLength
+    # Multiples of the key length are just as English, so a key length
+    # is preferred over a longer one unless that one's index is
+    # noticeably higher. Kasiski factors break ties:
+    kasiskiFactors = getKasiskiFactors(letters[:10000], maxKeyLength)
+    bestIndex = max(indexes.values())
+    return sorted(indexes, key=lambda keyLength: (indexes[keyLength] < 0.9 * bestIndex,
+                                                  -round(indexes[keyLength], 2),
+                                                  -kasiskiFactors[keyLength], keyLength))
+
+
+def _getColumnShift(column):
+    # Return the Caesar key whose decryption of column has the closest
+    # letter frequencies to English, by the chi-squared statistic:
+    counts = collections.Counter(column)
+    bestShift, bestChiSquared = 0, None
+    for shift in range(26):
+        chiSquared = 0
+        for i, letter in enumerate(LETTERS):
+            expected = LETTER_FREQUENCIES[letter] * len(column) / 100
+            chiSquared += (counts[LETTERS[(i + shift) % 26]] - expected) ** 2 / expected
+        if bestChiSquared is None or chiSquared < bestChiSquared:
+            bestShift, bestChiSquared = shift, chiSquared
+    return bestShift
+
+
+def _getShortestRepeat(key):
+    # LEMONLEMON decrypts the same as LEMON, so return LEMON:
+    for length in range(1, len(key)):
+        if len(key) % length == 0 and key[:length] * (len(key) // length) == key:
+            return key[:length]
+    return key
+
+
+def hackVigenere(message, numKeyLengths=NUM_KEY_LENGTHS, maxKeyLength=MAX_KEY_LENGTH):
+    """Yield (score, key) tuples each time a more English decryption is
+    found, trying the likeliest key lengths first."""
+    letters = getLetters(message[:4 * KEY_LENGTH_SAMPLE_LENGTH])
+    if not letters:
+        yield 0.0, LETTERS[0]  # There are no letters to decrypt.
+        return
+    sampleLetters = letters[:SAMPLE_LENGTH]
+    bestScore = None
+    triedKeys = set()
+    # A key longer than the message would leave columns with no letters:
+    maxKeyLength = min(maxKeyLength, len(letters))
+    for keyLength in getLikelyKeyLengths(letters, maxKeyLength)[:numKeyLengths]:
+        columns = [letters[i::keyLength] for i in range(keyLength)]
+        shifts = [_getColumnShift(column) for column in columns]
+        score = scoreLetters(vigenereTranslate(sampleLetters, ''.join(LETTERS[shift] for shift in shifts)))
+        # Short messages don't have enough letters for the frequencies
+        # to be right, so also try every shift of each key letter:
+        for i in range(keyLength):
+            for shift in range(26):
+                newShifts = shifts[:i] + [shift] + shifts[i + 1:]
+                newScore = scoreLetters(vigenereTranslate(sampleLetters, ''.join(LETTERS[s] for s in newShifts)))
+                if newScore > score:
+                    shifts, score = newShifts, newScore
+        key = _getShortestRepeat(''.join(LETTERS[shift] for shift in shifts))
+        if key in triedKeys:
+            continue
+        triedKeys.add(key)
+        score = scoreLetters(vigenereTranslate(sampleLetters, key)) / max(len(sampleLetters) - 3, 1)
+        if bestScore is None or score > bestScore:
+            bestScore = score
+            yield score, key
+
+
+# Simple substitution cipher:
+
+def substitutionTranslate(message, key, mode='decrypt'):
+    """Encrypt or decrypt message with the simple substitution key, the
+    same way as simplesubcipher.py: LETTERS[i] encrypts to key[i]."""
+    key = key.upper()
+    if mode == 'encrypt':
+        return message.translate(str.maketrans(LETTERS + LETTERS.lower(), key + key.lower()))
+    return message.translate(str.maketrans(key + key.lower(), LETTERS + LETTERS.lower()))
+
+
+def _climbSubstitution(args):
+    """Hill climb from a starting key and return the (score, key) tuple
+    of the best key found. The first restart starts from the key that
+    matches up letters by how common they are."""
+    letters, seed = args
+    rng = random.Random(seed)
+    if seed == 0:
+        cipherOrder = sorted(LETTERS, key=lambda letter: -letters.count(letter))
+        # decrypted[i] is the plaintext letter that LETTERS[i] decrypts to:
+        decrypted = [ETAOIN[cipherOrder.index(letter)] for letter in LETTERS]
+    else:
+        decrypted = list(LETTERS)
+        rng.shuffle(decrypted)
+    bestScore = scoreLetters(letters.translate(str.maketrans(LETTERS, ''.join(decrypted))))
+
+    swaps = [(i, j) for i in range(26) for j in range(i + 1, 26)]
+    improved = True
+    while improved:
+        improved = False
+        rng.shuffle(swaps)
+        for i, j in swaps:
+            decrypted[i], decrypted[j] = decrypted[j], decrypted[i]
+            score = scoreLetters(letters.translate(str.maketrans(LETTERS, ''.join(decrypted))))
+            if score > bestScore:
+                bestScore = score
+                improved = True
+            else:
+                decrypted[i], decrypted[j] = decrypted[j], decrypted[i]  # Swap back.
+
+    key = ''.join(LETTERS[decrypted.index(letter)] for letter in LETTERS)
+    return bestScore / max(len(letters) - 3, 1), key
+
+
+def hackSubstitution(message, numRestarts=NUM_RESTARTS, numWorkers=None, seed=0):
+    """Hill climb from numRestarts starting keys spread over numWorkers
+    processes (all CPU cores by default), and yield (score, key) tuples
+    each time a climb finds a more English decryption."""
+    letters = getLetters(getSample(message))
+    if numWorkers is None:
+        numWorkers = os.cpu_count() or 1
+    getQuadgramScores()  # Load the table before the processes are made.
+    climbs = [(letters, seed + i) for i in range(numRestarts)]
+    pool = multiprocessing.Pool(numWorkers) if numWorkers > 1 else None
+    try:
+        if pool is not None:
+            results = pool.imap_unordered(_climbSubstitution, climbs)
+        else:
+            results = map(_climbSubstitution, climbs)
+        bestScore = None
+        for score, key in results:
+            if bestScore is None or score > bestScore:
+                bestScore = score
+                yield score, key
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def _getBenchmarkText():
+    # Real English to encrypt, from the docstrings of the programs here:
+    folder = os.path.dirname(os.path.abspath(__file__))
+    docstrings = []
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith('.py') and not filename.startswith('_'):
+            with open(os.path.join(folder, filename), encoding='utf-8') as programFile:
+                match = re.match(r'"""(.*?)"""', programFile.read(), re.DOTALL)
+            if match:
+                docstrings.append(match.group(1))
+    return '\n'.join(docstrings)
+
+
+def runBenchmark(messageLength=2000000, rng=random):
+    """Encrypt messageLength characters of English with each cipher and
+    a random key, then time hacking and decrypting them."""
+    text = _getBenchmarkText()
+    text = (text * (messageLength // len(text) + 1))[:messageLength]
+    print('Hacking %s character messages...' % len(text))
+    getQuadgramScores()
+
+    ciphers = []  # A list of (name, plaintext, ciphertext, hack function, decrypt function) tuples.
+    key = rng.randint(1, 25)
+    ciphers.append(('Caesar', text.upper(), caesarTranslate(text.upper(), key, 'encrypt'),
+                    lambda message: hackCaesar(message)[:1], caesarTranslate))
+    symbols = ' !"#$%&\'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~'
+    keyA = rng.choice([keyA for keyA in range(2, len(symbols)) if math.gcd(keyA, len(symbols)) == 1])
+    keyB = rng.randrange(len(symbols))
+    ciphers.append(('Affine', text, affineTranslate(text, keyA, keyB, 'encrypt', symbols),
+                    lambda message: hackAffine(message, symbols),
+                    lambda message, keyA, keyB: affineTranslate(message, keyA, keyB, 'decrypt', symbols)))
+    key = ''.join(rng.choice(LETTERS) for i in range(rng.randint(5, 12)))
+    ciphers.append(('Vigenere', text, vigenereTranslate(text, key, 'encrypt'), hackVigenere, vigenereTranslate))
+    key = ''.join(rng.sample(LETTERS, 26))
+    ciphers.append(('Substitution', text, substitutionTranslate(text, key, 'encrypt'),
+                    hackSubstitution, substitutionTranslate))
+
+    for name, plaintext, ciphertext, hack, decrypt in ciphers:
+        startTime = time.time()
+        for result in hack(ciphertext):
+            pass  # The last result is the best one.
+        decrypted = decrypt(ciphertext, *result[1:])
+        print('%s: %.2f seconds, %s' % (name, time.time() - startTime,
+              'hacked' if decrypted == plaintext else 'NOT hacked'))
+
+
+# If this program isn't being imported, run the benchmark.
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        runBenchmark(int(sys.argv[1]))
+    else:
+        runBenchmark()
@@ -0,0 +1,195 @@
+"""Evil Hangman, by Al Sweigart al@inventwithpython.com
+An adversarial hangman module, used by the unfair hangman game. It
+never picks a secret word. Instead it keeps every word that fits the
+guesses so far, and on each guess splits them into groups by where the
+guessed letter appears in them (nowhere, only the 2nd letter, the 1st
+and 4th letters, and so on). Then it keeps the biggest group. The words
+are a bitmask over a wordindex.py index, so splitting is a couple of
+bitwise operations per group and position, not a loop over the words.
+Run it to time scripted games, for example:
+python evilhangman.py commonenglishwords.txt
+More info at https://en.wikipedia.org/wiki/Hangman_(game)#Variants
+Tags: large, module, word"""
+__version__ = 0
+import random, sys, time
+import wordindex  # Imports our wordindex.py program.
+
+WORD_FILENAME = 'commonenglishwords.txt'
+LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+try:
+    _countBits = int.bit_count  # Python 3.10 and later have this.
+except AttributeError:
+    def _countBits(number):
+        return bin(number).count('1')
+
+
+class EvilHangman:
+    def __init__(self, index, length):
+        """Start a game where the secret word is any word in the
+        wordindex.WordIndex that is length letters long."""
+        if not index.wordsByLength.get(length):
+            raise ValueError('There are no words that are %s letters long.' % length)
+        self.index = index
+        self.length = length
+        self.candidates = index._getAllMask(length)  # A bit for every word that fits.
+        self.pattern = wordindex.BLANK * length  # Like '_PP_E'.
+        self.guessedLetters = ''
+
+
+    def getPartitions(self, letter):
+        """Return a dictionary of the candidates split up by where letter
+        is in them. Keys=bitmasks of the positions of letter, values=
+        bitmasks of the candidates with letter in exactly those spots."""
+        partitions = {0: self.candidates}
+        for position, masks in enumerate(self.index.letterMasks[self.length]):
+            letterMask = masks.get(letter, 0)
+            if not letterMask or self.pattern[position] != wordindex.BLANK:
+                continue  # No candidate has letter in this position.
+            splitPartitions = {}
+            for positions, words in partitions.items():
+                withLetter = words & letterMask
+                if withLetter:
+                    splitPartitions[positions | (1 << position)] = withLetter
+                if withLetter != words:
+                    splitPartitions[positions] = words ^ withLetter
+            partitions = splitPartitions
+        return partitions
+
+
+    def guess(self, letter):
+        """Keep the biggest group of candidates for the guessed letter,
+        and return the list of positions the letter is in (an empty list
+        for a miss). Ties go to a miss, then to revealing fewer letters."""
+        letter = letter.upper()
+        if letter in self.guessedLetters:
+            raise ValueError(letter + ' was already guessed.')
+        self.guessedLetters += letter
+        positions, self.candidates = self._getBiggestPartition(letter)
+
+        revealed = [i for i in range(self.length) if (positions >> i) & 1]
+        for i in revealed:
+            self.pattern = self.pattern[:i] + letter + self.pattern[i + 1:]
+        return revealed
+
+
+    def _getBiggestPartition(self, letter):
+        """Return the (positions, candidates) of the biggest partition
+        from getPartitions(), without making all of them. The candidates
+        are split one position at a time, and a group smaller than the
+        biggest partition found so far can't hold a bigger one, so it
+        isn't split any further."""
+        letterMasks = []  # (position, bitmask) tuples.
+        withLetter = 0
+        for position, masks in enumerate(self.index.letterMasks[self.length]):
+            letterMask = masks.get(letter, 0) & self.candidates
+            if letterMask and self.pattern[position] == wordindex.BLANK:
+                letterMasks.append((position, letterMask))
+                withLetter |= letterMask
+
+        # The words without the letter are usually the biggest group:
+        best = (0, self.candidates ^ withLetter)
+        bestSize = _countBits(best[1])
+        # Each stack item is a group that has the letter in the positions
+        # given, and maybe more of the positions after letterMasks[i]:
+        stack = [(0, withLetter, 0)]
+        while stack:
+            positions, words, i = stack.pop()
+            size = _countBits(words)
+            if size < bestSize:
+                continue  # Nothing in this group can be bigger.
+            if i == len(letterMasks):
+                if size > bestSize or bin(positions).count('1') < bin(best[0]).count('1'):
+                    best, bestSize = (positions, words), size
+                continue
+            position, letterMask = letterMasks[i]
+            inPosition = words & letterMask
+            # Search the bigger half first, so it sets a high bestSize:
+            halves = [(positions | (1 << position), inPosition, i + 1),
+                      (positions, words ^ inPosition, i + 1)]
+            halves.sort(key=lambda half: _countBits(half[1]))
+            stack.extend(half for half in halves if half[1])
+        return best
+
+
+    def getCandidateCount(self):
+        return _countBits(self.candidates)
+
+
+    def getCandidates(self):
+        return self.index._getWords(self.length, self.candidates)
+
+
+    def isSolved(self):
+        return wordindex.BLANK not in self.pattern
+
+
+    def getSecretWord(self, rng=random):
+        """Return a word that fits every guess so far, to show the player
+        when they lose."""
+        return rng.choice(self.getCandidates())
+
+
+def newGame(index=None, minLength=4, maxLength=9, rng=random):
+    """Return an EvilHangman game for a random word length between
+    minLength and maxLength, using the words in WORD_FILENAME unless
+    another index is given."""
+    if index is None:
+        index = wordindex.loadWordFile(WORD_FILENAME, upper=True)
+    lengths = [length for length in range(minLength, maxLength + 1) if index.wordsByLength.get(length)]
+    return EvilHangman(index, rng.choice(lengths))
+
+
+def playScript(index, length, guesses):
+    """Play the guesses in order until the word is solved. Returns a
+    (number of misses, number of guesses, slowest guess in seconds)
+    tuple."""
+    game = EvilHangman(index, length)
+    misses = slowest = 0
+    for numGuesses, letter in enumerate(guesses, start=1):
+        startTime = time.perf_counter()
+        if not game.guess(letter):
+            misses += 1
+        slowest = max(slowest, time.perf_counter() - startTime)
+        if game.isSolved():
+            break
+    return misses, numGuesses, slowest
+
+
+def runBenchmark(index, numScripts=100, rng=random):
+    """Replay scripted guesses (most common letters first, then random
+    orders) for every word length, and print the misses and times."""
+    scripts = ['ETAOINSHRDLCUMWFGYPBVKJXQZ']
+    scripts += [''.join(rng.sample(LETTERS, len(LETTERS))) for i in range(numScripts - 1)]
+    print('%s words, %s scripted guess orders per length.' % (len(index), len(scripts)))
+    for length in sorted(index.wordsByLength):
+        numWords = len(index.wordsByLength[length])
+        if numWords < 2:
+            continue
+        totalTime = totalGuesses = totalMisses = slowest = 0
+        for script in scripts:
+            startTime = time.perf_counter()
+            misses, numGuesses, slowestGuess = playScript(index, length, script)
+            totalTime += time.perf_counter() - startTime
+            totalGuesses += numGuesses
+            totalMisses += misses
+            slowest = max(slowest, slowestGuess)
+        print('%2s letters (%6s words): %4.1f misses per game, %.3f ms per guess (slowest %.3f ms)' % (
+            length, numWords, totalMisses / len(scripts), 1000 * totalTime / totalGuesses, 1000 * slowest))
+
+
+def _makeRandomIndex(numWords, length, rng):
+    # Made-up words, with letters as common as they are in English:
+    letters = 'EEEEEEEEEEEETTTTTTTTTAAAAAAAAOOOOOOOIIIIIIINNNNNNNSSSSSSHHHHHHRRRRRRDDDDLLLLCCCUUUMMMWWFFGGYYPPBVKJXQZ'
+    return wordindex.WordIndex(''.join(rng.choice(letters) for i in range(length)) for j in range(numWords))
+
+
+# If this program isn't being imported, run the benchmark.
+if __name__ == '__main__':
+    rng = random.Random(42)
+    if len(sys.argv) > 1:
+        runBenchmark(wordindex.loadWordFile(sys.argv[1], upper=True), rng=rng)
+    else:
+        runBenchmark(wordindex.loadWordFile(WORD_FILENAME, upper=True), rng=rng)
+        print()
+        runBenchmark(_makeRandomIndex(100000, 8, rng), 20, rng)
@@ -5,10 +5,10 @@ This and other games are available at https://nostarch.com/XX
 Tags: large, artistic, bext"""
 __version__ = 0
 import math
-import os
 import random
 import sys
 import time
+import framebuffer  # Imports our framebuffer.py program.
 
 # This program draws 3D points that rotate around a center point. This
 # gives the fireflies a "swirling" kind of movement.
@@ -37,7 +37,7 @@ FIREFLY_LIGHT = chr(9604)  # Draw a block for lit up fireflies.
 X, Y, Z = 0, 1, 2
 
 
-def main():
+def main(frame):
     # First we create data structures for our fireflies.
     # Each firefly is represented by dictionary with keys
     # 'originalPosition', 'rotationAmount', 'rotVelocity',
@@ -131,9 +131,8 @@ def main():
                 darkPoints.append(rotatedAndTransformedPoint)
 
         # Display the animate firefly scene:
-        displayFireflies(lightPoints, darkPoints)
-        time.sleep(PAUSE_AMOUNT)  # Pause before erasing the screen.
-        clearScreen()
+        displayFireflies(lightPoints, darkPoints, frame)
+        time.sleep(PAUSE_AMOUNT)  # Pause before the next frame.
 
 
 def rotatePoint(x, y, z, ax, ay, az):
@@ -175,32 +174,27 @@ def transformPoint(point):
             int(point[Y] * SCALEY + TRANSLATEY))
 
 
-def displayFireflies(lightPoints, darkPoints):
-    # Loop over every place on the screen and draw fireflies:
-    for y in range(HEIGHT):
-        for x in range(WIDTH):
-            if (x, y) in lightPoints:
-                print(FIREFLY_LIGHT, end='')  # Display lit firefly.
-            elif (x, y) in darkPoints:
-                print(FIREFLY_DARK, end='')  # Display dark firefly.
-            else:
-                print(' ', end='')  # Display an empty space.
-        print()  # Print a newline.
-    print('Press Ctrl-C to quit.', end='', flush=True)
-
+def displayFireflies(lightPoints, darkPoints, frame):
+    # Draw the fireflies into the frame buffer. Lit fireflies are drawn
+    # last so they show up in front of dark ones:
+    frame.clear()
+    for x, y in darkPoints:
+        frame.put(x, y, FIREFLY_DARK)  # Display dark firefly.
+    for x, y in lightPoints:
+        frame.put(x, y, FIREFLY_LIGHT)  # Display lit firefly.
+    frame.write(0, HEIGHT, 'Press Ctrl-C to quit.')
 
-def clearScreen():
-    """Clear the terminal window screen by running cls or clear."""
-    if sys.platform == 'win32':
-        os.system('cls')  # Windows uses the cls command.
-    else:
-        os.system('clear')  # macOS and Linux use the clear command.
+    # Only the characters that changed are sent to the terminal,
+    # instead of clearing and reprinting the whole screen:
+    frame.render()
 
 
 # If this program was run (instead of imported), run the game:
 if __name__ == '__main__':
+    frame = framebuffer.FrameBuffer(WIDTH, HEIGHT + 1)  # +1 for the quit message.
     try:
-        main()
+        main(frame)
     except KeyboardInterrupt:
         print('Fireflies, by Al Sweigart al@inventwithpython.com')
+        print(frame.getReport())
         sys.exit()  # When Ctrl-C is pressed, end the program.
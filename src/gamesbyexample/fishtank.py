@@ -16,6 +16,7 @@ except ImportError:
     print('can install by following the instructions at')
     print('https://pypi.org/project/Bext/')
     sys.exit()
+import framebuffer  # Imports our framebuffer.py program.
 
 # Set up the constants:
 WIDTH, HEIGHT = bext.size()
@@ -56,11 +57,13 @@ RIGHT_EDGE = WIDTH - 1 - LONGEST_FISH_LENGTH
 TOP_EDGE = 0
 BOTTOM_EDGE = HEIGHT - 2
 
+# Each frame is drawn into this frame buffer, which then only sends the
+# characters that changed to the terminal:
+FRAME = framebuffer.FrameBuffer(WIDTH, HEIGHT)
+
 
 def main():
     global FISHES, BUBBLERS, BUBBLES, KELPS, STEP
-    bext.bg('black')
-    bext.clear()
 
     # Generate the global variables:
     FISHES = []
@@ -89,7 +92,6 @@ def main():
         simulateAquarium()
         drawAquarium()
         time.sleep(1 / FRAMES_PER_SECOND)
-        clearAquarium()
         STEP += 1
 
 
@@ -219,21 +221,18 @@ def drawAquarium():
     """Draw the aquarium on the screen."""
     global FISHES, BUBBLERS, BUBBLES, KELP, STEP
 
+    # Start with empty black water:
+    FRAME.clear(' ', None, 'black')
+
     # Draw quit message.
-    bext.fg('white')
-    bext.goto(0, 0)
-    print('Fish Tank, by Al Sweigart    Ctrl-C to quit.', end='')
+    FRAME.write(0, 0, 'Fish Tank, by Al Sweigart    Ctrl-C to quit.', 'white', 'black')
 
     # Draw the bubbles:
-    bext.fg('white')
     for bubble in BUBBLES:
-        bext.goto(bubble['x'], bubble['y'])
-        print(random.choice(('o', 'O')), end='')
+        FRAME.put(bubble['x'], bubble['y'], random.choice(('o', 'O')), 'white', 'black')
 
     # Draw the fish:
     for fish in FISHES:
-        bext.goto(fish['x'], fish['y'])
-
         # Get the correct right- or left-facing fish text.
         if fish['goingRight']:
             fishText = fish['right'][STEP % len(fish['right'])]
@@ -242,50 +241,21 @@ def drawAquarium():
 
         # Draw each character of the fish text in the right color.
         for i, fishPart in enumerate(fishText):
-            bext.fg(fish['colors'][i])
-            print(fishPart, end='')
+            FRAME.put(fish['x'] + i, fish['y'], fishPart, fish['colors'][i], 'black')
 
     # Draw the kelp:
-    bext.fg('green')
     for kelp in KELPS:
         for i, kelpSegment in enumerate(kelp['segments']):
             if kelpSegment == '(':
-                bext.goto(kelp['x'], BOTTOM_EDGE - i)
+                FRAME.put(kelp['x'], BOTTOM_EDGE - i, kelpSegment, 'green', 'black')
             elif kelpSegment == ')':
-                bext.goto(kelp['x'] + 1, BOTTOM_EDGE - i)
-            print(kelpSegment, end='')
+                FRAME.put(kelp['x'] + 1, BOTTOM_EDGE - i, kelpSegment, 'green', 'black')
 
     # Draw the sand on the bottom:
-    bext.fg('yellow')
-    bext.goto(0, HEIGHT - 1)
-    print(chr(9617) * (WIDTH - 1), end='')  # Draws '░' characters.
-
-    sys.stdout.flush()  # (Required for bext-using programs.)
-
-
-def clearAquarium():
-    """Draw empty spaces over everything on the screen."""
-    global FISHES, BUBBLERS, BUBBLES, KELP
-
-    # Draw the bubbles:
-    for bubble in BUBBLES:
-        bext.goto(bubble['x'], bubble['y'])
-        print(' ', end='')
-
-    # Draw the fish:
-    for fish in FISHES:
-        bext.goto(fish['x'], fish['y'])
-
-        # Draw each character of the fish text in the right color.
-        print(' ' * len(fish['left'][0]), end='')
-
-    # Draw the kelp:
-    for kelp in KELPS:
-        for i, kelpSegment in enumerate(kelp['segments']):
-            bext.goto(kelp['x'], HEIGHT - 2 - i)
-            print('  ', end='')
+    FRAME.write(0, HEIGHT - 1, chr(9617) * (WIDTH - 1), 'yellow', 'black')  # Draws '░' characters.
 
-    sys.stdout.flush()  # (Required for bext-using programs.)
+    # Send only the changes since the last frame to the terminal:
+    FRAME.render()
 
 
 # If this program was run (instead of imported), run the game:
@@ -293,4 +263,5 @@ if __name__ == '__main__':
     try:
         main()
     except KeyboardInterrupt:
+        print(FRAME.getReport())
         sys.exit()  # When Ctrl-C is pressed, end the program.
@@ -1,18 +1,14 @@
 """Forest Fire Sim, by Al Sweigart al@inventwithpython.com
 A simulation of wildfires spreading in a forest. Press Ctrl-C to stop.
+To time a big forest instead, run it with a size, for example:
+python forestfiresim.py 1000 1000
 Inspired by Nicky Case's Emoji Sim http://ncase.me/simulating/model/
 This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: short, bext, simulation"""
 __version__ = 0
-import random, sys, time
-
-try:
-    import bext
-except ImportError:
-    print('This program requires the bext module, which you')
-    print('can install by following the instructions at')
-    print('https://pypi.org/project/Bext/')
-    sys.exit()
+import sys, time
+import framebuffer  # Imports our framebuffer.py program.
+import cellularautomata  # Imports our cellularautomata.py program.
 
 # Set up the constants:
 WIDTH = 79
@@ -31,85 +27,67 @@ FIRE_CHANCE = 0.01  # Chance a tree is hit by lightning & burns.
 PAUSE_LENGTH = 0.5
 
 
-def main():
-    forest = createNewForest()
-    bext.clear()
+def main(frame):
+    forest = createNewForest(WIDTH, HEIGHT)
 
     while True:  # Main program loop.
-        displayForest(forest)
+        displayForest(forest, frame)
 
         # Run a single simulation step:
-        nextForest = {'width': forest['width'],
-                      'height': forest['height']}
-
-        for x in range(forest['width']):
-            for y in range(forest['height']):
-                if (x, y) in nextForest:
-                    # If we've already set nextForest[(x, y)] on a
-                    # previous iteration, just do nothing here:
-                    continue
-
-                if ((forest[(x, y)] == EMPTY)
-                    and (random.random() <= GROW_CHANCE)):
-                    # Grow a tree in this empty space.
-                    nextForest[(x, y)] = TREE
-                elif ((forest[(x, y)] == TREE)
-                    and (random.random() <= FIRE_CHANCE)):
-                    # Lightning sets this tree on fire.
-                    nextForest[(x, y)] = FIRE
-                elif forest[(x, y)] == FIRE:
-                    # This tree is currently burning.
-                    # Loop through all the neighboring spaces:
-                    for ix in range(-1, 2):
-                        for iy in range(-1, 2):
-                            # Fire spreads to neighboring trees:
-                            if forest.get((x + ix, y + iy)) == TREE:
-                                nextForest[(x + ix, y + iy)] = FIRE
-                    # The tree has burned down now, so erase it:
-                    nextForest[(x, y)] = EMPTY
-                else:
-                    # Just copy the existing object:
-                    nextForest[(x, y)] = forest[(x, y)]
-        forest = nextForest
+        forest.step(forestFireRule)
 
         time.sleep(PAUSE_LENGTH)
 
 
-def createNewForest():
-    """Returns a dictionary for a new forest data structure."""
-    forest = {'width': WIDTH, 'height': HEIGHT}
-    for x in range(WIDTH):
-        for y in range(HEIGHT):
-            if (random.random() * 100) <= INITIAL_TREE_DENSITY:
-                forest[(x, y)] = TREE  # Start as a tree.
-            else:
-                forest[(x, y)] = EMPTY  # Start as an empty space.
+def forestFireRule(forest):
+    """Return the tree, fire, and empty spaces of the next step of the
+    forest, a cellularautomata.BitGrid."""
+    trees = forest.planes[TREE]
+    fires = forest.planes[FIRE]
+    empty = forest.planes[EMPTY]
+    # Fire spreads to neighboring trees, and lightning sets some other
+    # trees on fire:
+    catching = trees & (forest.getNeighborhood(fires) | forest.randomMask(FIRE_CHANCE))
+    # Trees grow in some empty spaces:
+    growing = empty & forest.randomMask(GROW_CHANCE)
+    # The burning trees have burned down now, so they become empty:
+    return {TREE: (trees ^ catching) | growing,
+            FIRE: catching,
+            EMPTY: (empty ^ growing) | fires}
+
+
+def createNewForest(width, height):
+    """Returns a BitGrid for a new forest data structure."""
+    forest = cellularautomata.BitGrid(width, height, (EMPTY, TREE, FIRE))
+    forest.randomize(TREE, INITIAL_TREE_DENSITY)
     return forest
 
 
-def displayForest(forest):
+def displayForest(forest, frame):
     """Display the forest data structure on the screen."""
-    bext.goto(0, 0)
-    for y in range(forest['height']):
-        for x in range(forest['width']):
-            if forest[(x, y)] == TREE:
-                bext.fg('green')
-                print(TREE, end='')
-            elif forest[(x, y)] == FIRE:
-                bext.fg('red')
-                print(FIRE, end='')
-            elif forest[(x, y)] == EMPTY:
-                print(EMPTY, end='')
-        print()
-    bext.fg('reset')  # Use the default font color.
-    print('Grow chance: {}%  '.format(GROW_CHANCE * 100), end='')
-    print('Lightning chance: {}%  '.format(FIRE_CHANCE * 100), end='')
-    print('Press Ctrl-C to quit.')
+    # Draw only the changed spaces into the frame buffer, which only
+    # sends the changed characters to the terminal:
+    for x, y in forest.getChangedCells():
+        state = forest.getState(x, y)
+        if state == TREE:
+            frame.put(x, y, TREE, 'green')
+        elif state == FIRE:
+            frame.put(x, y, FIRE, 'red')
+        elif state == EMPTY:
+            frame.put(x, y, EMPTY)
+    frame.write(0, forest.height, 'Grow chance: {}%  Lightning chance: {}%  Press Ctrl-C to quit.'
+                .format(GROW_CHANCE * 100, FIRE_CHANCE * 100))
+    frame.render()
 
 
 # If this program was run (instead of imported), run the game:
 if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        cellularautomata.runBenchmark(createNewForest(int(sys.argv[1]), int(sys.argv[2])), forestFireRule)
+        sys.exit()
+    frame = framebuffer.FrameBuffer(WIDTH, HEIGHT + 1)  # +1 for the status.
     try:
-        main()
+        main(frame)
     except KeyboardInterrupt:
+        print(frame.getReport())
         sys.exit()  # When Ctrl-C is pressed, end the program.
@@ -0,0 +1,376 @@
+"""Four in a Row Engine, by Al Sweigart al@inventwithpython.com
+A fast Four in a Row (Connect Four) AI module, used by the Four in a Row
+programs. The board is stored as two integer "bitboards" so that moves
+and wins are checked with a few bitwise operations. The AI uses negamax
+search with alpha-beta pruning, move ordering, and a transposition
+table, searching deeper and deeper until its time runs out.
+Run it to benchmark the exact solver against a slow reference solver.
+More info at https://en.wikipedia.org/wiki/Connect_Four#Mathematical_solution
+Tags: large, module, board game"""
+__version__ = 0
+import copy, random, sys, time
+
+"""Each column uses BOARD_HEIGHT + 1 bits, from the bottom row up, with
+one spare bit on top so that shifting can't wrap one column into the
+next. For the standard 7x6 board the bits are numbered:
+
+     5 12 19 26 33 40 47
+     4 11 18 25 32 39 46
+     3 10 17 24 31 38 45
+     2  9 16 23 30 37 44
+     1  8 15 22 29 36 43
+     0  7 14 21 28 35 42
+
+A Position keeps `mask`, with a bit set for every tile on the board, and
+`current`, with a bit set for every tile of the player whose turn it is.
+Dropping a tile in a column is just `mask + bottom of column`, because
+the addition carries up into the lowest empty space."""
+
+WIN_SCORE = 1000  # Bigger than any score evaluate() can return.
+
+
+class Position:
+    def __init__(self, width=7, height=6):
+        """Create an empty board of the given size."""
+        assert width >= 4 and height >= 4, 'Board must be at least 4x4.'
+        self.width = width
+        self.height = height
+        self.current = 0  # The tiles of the player whose turn it is.
+        self.mask = 0  # All of the tiles on the board.
+        self.numMoves = 0
+
+        columnHeight = height + 1
+        self.bottomMasks = [1 << (column * columnHeight) for column in range(width)]
+        self.topMasks = [1 << (height - 1 + column * columnHeight) for column in range(width)]
+        self.columnMasks = [((1 << height) - 1) << (column * columnHeight) for column in range(width)]
+        self.boardMask = sum(self.columnMasks)
+        # Try the middle columns first, since they're usually better:
+        middle = (width - 1) / 2
+        self.columnOrder = sorted(range(width), key=lambda column: abs(column - middle))
+
+
+    def copy(self):
+        """Return a copy of this position. (The lists of masks are shared
+        between the copies, since they never change.)"""
+        return copy.copy(self)
+
+
+    def canPlay(self, column):
+        """Return True if column has room for another tile."""
+        return self.mask & self.topMasks[column] == 0
+
+
+    def play(self, column):
+        """Drop the current player's tile in column and switch turns."""
+        self.current ^= self.mask  # Switch to the other player's tiles.
+        self.mask |= self.mask + self.bottomMasks[column]
+        self.numMoves += 1
+
+
+    def playSequence(self, columns):
+        """Play a string of column numbers, like '4453', where 1 is the
+        leftmost column."""
+        for char in columns:
+            self.play(int(char) - 1)
+
+
+    def setTile(self, column, row, isCurrentPlayer):
+        """Put a tile at column and row (counting up from 0 at the
+        bottom). Used to set up a position from another kind of board."""
+        bit = 1 << (column * (self.height + 1) + row)
+        self.mask |= bit
+        if isCurrentPlayer:
+            self.current |= bit
+        self.numMoves += 1
+
+
+    def isWinningMove(self, column):
+        """Return True if the current player wins by playing column."""
+        tiles = self.current | ((self.mask + self.bottomMasks[column]) & self.columnMasks[column])
+        return hasFourInARow(tiles, self.height)
+
+
+    def isFull(self):
+        """Return True if every space on the board has a tile."""
+        return self.numMoves == self.width * self.height
+
+
+    def key(self):
+        """Return an integer that is unique to this position."""
+        return self.current + self.mask
+
+
+def hasFourInARow(tiles, height=6):
+    """Return True if the tiles bitboard has four in a row."""
+    # Shifting by 1 checks vertically, height + 1 horizontally, and
+    # height and height + 2 the two diagonals:
+    for shift in (1, height + 1, height, height + 2):
+        pairs = tiles & (tiles >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def getWinningSpaces(tiles, mask, height, boardMask):
+    """Return a bitboard of the empty spaces that would give tiles four
+    in a row."""
+    # Vertical: three tiles below an empty space.
+    spaces = (tiles << 1) & (tiles << 2) & (tiles << 3)
+    for shift in (height + 1, height, height + 2):
+        # Two tiles on one side, plus a third on either side:
+        pair = (tiles << shift) & (tiles << (2 * shift))
+        spaces |= pair & (tiles << (3 * shift))
+        spaces |= pair & (tiles >> shift)
+        pair = (tiles >> shift) & (tiles >> (2 * shift))
+        spaces |= pair & (tiles << shift)
+        spaces |= pair & (tiles >> (3 * shift))
+    return spaces & (boardMask ^ mask)
+
+
+def _countBits(number):
+    """Return the number of 1 bits in number."""
+    return bin(number).count('1')
+
+
+def evaluate(position):
+    """Return a score for the current player: the number of spaces
+    that would win for them, minus the spaces that would win for the
+    other player."""
+    opponent = position.current ^ position.mask
+    height, boardMask = position.height, position.boardMask
+    ourSpaces = getWinningSpaces(position.current, position.mask, height, boardMask)
+    theirSpaces = getWinningSpaces(opponent, position.mask, height, boardMask)
+    return _countBits(ourSpaces) - _countBits(theirSpaces)
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class Searcher:
+    def __init__(self, maxTableSize=1000000):
+        """Create a searcher with an empty transposition table."""
+        # Keys=Position.key() integers, values=(depth, flag, score,
+        # bestColumn) tuples:
+        self.table = {}
+        self.maxTableSize = maxTableSize
+        self.nodes = 0
+        self.deadline = None
+
+
+    def negamax(self, position, depth, alpha, beta):
+        """Return the score of position for the current player, looking
+        depth moves ahead. Scores of WIN_SCORE or more mean a win."""
+        self.nodes += 1
+        if self.deadline is not None and self.nodes & 1023 == 0 and time.time() > self.deadline:
+            raise _OutOfTime()
+
+        width, numMoves = position.width, position.numMoves
+        if numMoves == width * position.height:
+            return 0  # The board is full, so it's a tie.
+
+        # Win right away if we can:
+        playable = [column for column in position.columnOrder if position.canPlay(column)]
+        for column in playable:
+            if position.isWinningMove(column):
+                return WIN_SCORE + (width * position.height - numMoves)
+
+        if depth == 0:
+            return evaluate(position)
+
+        # Look up this position in the transposition table:
+        key = position.key()
+        originalAlpha = alpha
+        bestColumn = None
+        entry = self.table.get(key)
+        if entry is not None:
+            entryDepth, flag, score, bestColumn = entry
+            if entryDepth >= depth:
+                if flag == 0:
+                    return score  # The exact score.
+                elif flag < 0:
+                    beta = min(beta, score)  # An upper bound.
+                else:
+                    alpha = max(alpha, score)  # A lower bound.
+                if alpha >= beta:
+                    return score
+
+        # Order the moves: the best move from the table first, then the
+        # ones that make the most new winning spaces for us.
+        opponentSpaces = getWinningSpaces(position.current ^ position.mask, position.mask,
+                                          position.height, position.boardMask)
+        moveScores = []
+        for column in playable:
+            newMask = position.mask | (position.mask + position.bottomMasks[column])
+            if ((newMask ^ position.mask) << 1) & opponentSpaces:
+                moveScore = -1  # This lets the opponent win on top of us.
+            else:
+                newTiles = position.current | (newMask ^ position.mask)
+                moveScore = _countBits(getWinningSpaces(newTiles, newMask, position.height, position.boardMask))
+            if column == bestColumn:
+                moveScore = 1000
+            moveScores.append((moveScore, column))
+        moveScores.sort(key=lambda pair: pair[0], reverse=True)
+
+        bestScore = -WIN_SCORE * 2
+        for moveScore, column in moveScores:
+            child = position.copy()
+            child.play(column)
+            score = -self.negamax(child, depth - 1, -beta, -alpha)
+            if score > bestScore:
+                bestScore, bestColumn = score, column
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        # Save the result in the transposition table:
+        if len(self.table) >= self.maxTableSize:
+            self.table.clear()
+        if bestScore <= originalAlpha:
+            flag = -1  # The real score is at most bestScore.
+        elif bestScore >= beta:
+            flag = 1  # The real score is at least bestScore.
+        else:
+            flag = 0
+        self.table[key] = (depth, flag, bestScore, bestColumn)
+        return bestScore
+
+
+    def getBestMove(self, position, timeLimit=1.0, maxDepth=None):
+        """Return a (column, score, depth) tuple for the best move found
+        by searching deeper and deeper until timeLimit seconds pass, or
+        None if the board is full."""
+        emptySpaces = position.width * position.height - position.numMoves
+        if maxDepth is None or maxDepth > emptySpaces:
+            maxDepth = emptySpaces
+        self.nodes = 0
+        self.deadline = time.time() + timeLimit
+        columns = [column for column in position.columnOrder if position.canPlay(column)]
+        random.shuffle(columns)  # Pick randomly between equally good moves.
+        columns.sort(key=lambda column: abs(column - (position.width - 1) / 2))
+        if not columns:
+            return None  # There are no moves left.
+        bestColumn, bestScore, bestDepth = columns[0], 0, 0
+
+        try:
+            for depth in range(1, maxDepth + 1):
+                # Search every move at this depth:
+                depthBestColumn, depthBestScore = None, -WIN_SCORE * 2
+                alpha = -WIN_SCORE * 2
+                for column in columns:
+                    if position.isWinningMove(column):
+                        return (column, WIN_SCORE, depth)
+                    child = position.copy()
+                    child.play(column)
+                    score = -self.negamax(child, depth - 1, -WIN_SCORE * 2, -alpha)
+                    if score > depthBestScore:
+                        depthBestColumn, depthBestScore = column, score
+                    alpha = max(alpha, score)
+                bestColumn, bestScore, bestDepth = depthBestColumn, depthBestScore, depth
+
+                # Search the best move first at the next depth:
+                columns.remove(bestColumn)
+                columns.insert(0, bestColumn)
+                if abs(bestScore) >= WIN_SCORE:
+                    break  # The game's outcome is already known.
+        except _OutOfTime:
+            pass  # Use the best move from the last finished depth.
+        self.deadline = None
+        return (bestColumn, bestScore, bestDepth)
+
+
+    def solve(self, position):
+        """Return the exact score of position for the current player:
+        positive for a win, negative for a loss, and 0 for a tie. The
+        sooner the win, the bigger the score."""
+        self.deadline = None
+        emptySpaces = position.width * position.height - position.numMoves
+        score = self.negamax(position, emptySpaces, -WIN_SCORE * 2, WIN_SCORE * 2)
+        return _toGameScore(score, position)
+
+
+def _toGameScore(score, position):
+    """Convert a negamax score into the standard Connect Four solver
+    score: the number of tiles the winner had left when they won."""
+    if score == 0:
+        return 0
+    emptySpaces = abs(score) - WIN_SCORE  # Counted before the winning move.
+    if score > 0:
+        return (emptySpaces + 1) // 2
+    return -((emptySpaces + 1) // 2)
+
+
+def slowSolve(position, cache=None):
+    """Return the exact score of position without any pruning. This is
+    slow, but simple enough to check the fast solver against."""
+    if cache is None:
+        cache = {}
+    key = position.key()
+    if key in cache:
+        return cache[key]
+    if position.isFull():
+        return 0
+    bestScore = None
+    for column in range(position.width):
+        if not position.canPlay(column):
+            continue
+        if position.isWinningMove(column):
+            score = (position.width * position.height - position.numMoves + 1) // 2
+        else:
+            child = position.copy()
+            child.play(column)
+            score = -slowSolve(child, cache)
+        if bestScore is None or score > bestScore:
+            bestScore = score
+    cache[key] = bestScore
+    return bestScore
+
+
+def makeRandomPosition(numMoves):
+    """Return a random position with numMoves tiles where nobody has
+    won yet, or None if the random game ended early."""
+    position = Position()
+    for i in range(numMoves):
+        columns = [column for column in range(position.width)
+                   if position.canPlay(column) and not position.isWinningMove(column)]
+        if columns == []:
+            return None
+        position.play(random.choice(columns))
+    return position
+
+
+def runBenchmark(numPositions=100, numMoves=30):
+    """Solve random positions and check the answers against slowSolve()."""
+    random.seed(42)
+    positions = []
+    while len(positions) < numPositions:
+        position = makeRandomPosition(numMoves)
+        if position is not None:
+            positions.append(position)
+
+    print('Solving %s random positions with %s tiles played...' % (numPositions, numMoves))
+    searcher = Searcher()
+    totalNodes = 0
+    startTime = time.time()
+    scores = []
+    for position in positions:
+        searcher.nodes = 0
+        scores.append(searcher.solve(position))
+        totalNodes += searcher.nodes
+    totalTime = time.time() - startTime
+
+    numWrong = 0
+    for position, score in zip(positions, scores):
+        if slowSolve(position) != score:
+            numWrong += 1
+    print('Mean time: %.2f ms, mean nodes: %s, %.0f nodes per second.'
+          % (totalTime / numPositions * 1000, totalNodes // numPositions, totalNodes / totalTime))
+    print('%s of %s scores matched the slow solver.' % (numPositions - numWrong, numPositions))
+
+
+# If this program isn't being imported, run the benchmark.
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        runBenchmark(int(sys.argv[1]), int(sys.argv[2]))
+    else:
+        runBenchmark()
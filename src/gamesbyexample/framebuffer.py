@@ -0,0 +1,195 @@
+"""Frame Buffer, by Al Sweigart al@inventwithpython.com
+A terminal drawing module, used by the text animation programs. Each
+frame is drawn into a grid of characters in memory. Then render()
+compares it to the previous frame and sends the terminal only the
+changed runs of characters, with cursor moves and color changes in
+between, in a single write and flush. This keeps animations smooth
+even over slow connections like SSH.
+Run it to see how many bytes per frame a sample animation needs.
+Tags: large, module, bext"""
+__version__ = 0
+import os, random, sys, time
+
+try:
+    import bext  # noqa: F401 -- bext sets up Windows terminals for escape codes.
+except ImportError:
+    if sys.platform == 'win32':
+        os.system('')  # This turns on escape codes in Windows 10 and later.
+
+# The escape codes for each color, the same as bext.fg() and bext.bg()
+# use. None is the terminal's default color:
+COLOR_CODES = {None: '\x1b[39m', 'reset': '\x1b[39m', 'black': '\x1b[30m',
+               'red': '\x1b[31m', 'green': '\x1b[32m', 'yellow': '\x1b[33m',
+               'blue': '\x1b[34m', 'purple': '\x1b[35m', 'magenta': '\x1b[35m',
+               'cyan': '\x1b[36m', 'white': '\x1b[37m'}
+BG_COLOR_CODES = {None: '\x1b[49m', 'reset': '\x1b[49m', 'black': '\x1b[40m',
+                  'red': '\x1b[41m', 'green': '\x1b[42m', 'yellow': '\x1b[43m',
+                  'blue': '\x1b[44m', 'purple': '\x1b[45m', 'magenta': '\x1b[45m',
+                  'cyan': '\x1b[46m', 'white': '\x1b[47m'}
+CLEAR_SCREEN = '\x1b[39m\x1b[49m\x1b[2J'  # Clears to the default colors.
+
+# Rewriting a few unchanged characters is cheaper than a cursor move,
+# which takes 6 or more bytes:
+MAX_GAP_TO_REWRITE = 4
+
+
+class FrameBuffer:
+    def __init__(self, width, height, output=None):
+        """Set up a blank frame of width x height characters. Frames
+        are written to output, which is sys.stdout by default."""
+        self.width = width
+        self.height = height
+        self.output = output
+        self.chars = [[' '] * width for y in range(height)]
+        self.colors = [[None] * width for y in range(height)]
+        self.bgColors = [[None] * width for y in range(height)]
+        # The characters and colors currently shown on the terminal,
+        # or None if the whole screen needs to be redrawn:
+        self.shownChars = None
+        self.shownColors = None
+        self.shownBgColors = None
+        self.bytesLastFrame = 0
+        self.totalBytes = 0
+        self.numFrames = 0
+
+
+    def clear(self, char=' ', color=None, bgColor=None):
+        """Fill the whole frame with char."""
+        for y in range(self.height):
+            self.chars[y] = [char] * self.width
+            self.colors[y] = [color] * self.width
+            self.bgColors[y] = [bgColor] * self.width
+
+
+    def put(self, x, y, char, color=None, bgColor=None):
+        """Put char at x, y in the frame. Positions outside the frame
+        are ignored, so sprites can move partly offscreen."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.chars[y][x] = char
+            self.colors[y][x] = color
+            self.bgColors[y][x] = bgColor
+
+
+    def write(self, x, y, text, color=None, bgColor=None):
+        """Put each character of text in the frame, starting at x, y and
+        going right."""
+        for i, char in enumerate(text):
+            self.put(x + i, y, char, color, bgColor)
+
+
+    def get(self, x, y):
+        """Return the character at x, y in the frame."""
+        return self.chars[y][x]
+
+
+    def invalidate(self):
+        """Make the next render() redraw the whole screen, such as after
+        the screen was cleared or written to by something else."""
+        self.shownChars = None
+        self.shownColors = None
+        self.shownBgColors = None
+
+
+    def render(self):
+        """Send the changes since the last frame to the terminal, and
+        return the number of bytes sent."""
+        pieces = []
+        if self.shownChars is None:
+            # Nothing is known about the screen, so clear it and then
+            # draw everything that isn't a blank space:
+            pieces.append(CLEAR_SCREEN)
+            self.shownChars = [[' '] * self.width for y in range(self.height)]
+            self.shownColors = [[None] * self.width for y in range(self.height)]
+            self.shownBgColors = [[None] * self.width for y in range(self.height)]
+        cursorX, cursorY = None, None  # None means unknown.
+        # Every render() leaves the terminal set to the default colors:
+        currentColor = currentBgColor = None
+
+        for y in range(self.height):
+            rowChars, rowColors, rowBgColors = self.chars[y], self.colors[y], self.bgColors[y]
+            shownChars, shownColors, shownBgColors = self.shownChars[y], self.shownColors[y], self.shownBgColors[y]
+            if rowChars == shownChars and rowColors == shownColors and rowBgColors == shownBgColors:
+                continue  # Skip rows without any changes.
+            for x in range(self.width):
+                char, color, bgColor = rowChars[x], rowColors[x], rowBgColors[x]
+                # (The color of a space doesn't matter, only its
+                # background color.)
+                if char == shownChars[x] and bgColor == shownBgColors[x] and (color == shownColors[x] or char == ' '):
+                    continue  # This character hasn't changed.
+
+                # Move the cursor here, unless it's cheaper to rewrite
+                # the unchanged characters in between:
+                if cursorY != y or cursorX is None or not (0 <= x - cursorX <= MAX_GAP_TO_REWRITE) or \
+                   any(rowBgColors[gapX] != currentBgColor or (rowColors[gapX] != currentColor and rowChars[gapX] != ' ')
+                       for gapX in range(cursorX, x)):
+                    pieces.append('\x1b[%d;%dH' % (y + 1, x + 1))
+                else:
+                    pieces.append(''.join(rowChars[cursorX:x]))
+
+                if bgColor != currentBgColor:
+                    pieces.append(BG_COLOR_CODES[bgColor])
+                    currentBgColor = bgColor
+                if color != currentColor and char != ' ':
+                    pieces.append(COLOR_CODES[color])
+                    currentColor = color
+                pieces.append(char)
+                cursorX, cursorY = x + 1, y
+            self.shownChars[y] = list(rowChars)
+            self.shownColors[y] = list(rowColors)
+            self.shownBgColors[y] = list(rowBgColors)
+
+        # Leave the terminal with its default colors:
+        if currentColor is not None:
+            pieces.append(COLOR_CODES[None])
+        if currentBgColor is not None:
+            pieces.append(BG_COLOR_CODES[None])
+        # Park the cursor below the frame:
+        pieces.append('\x1b[%d;1H' % (self.height + 1))
+        text = ''.join(pieces)
+        output = self.output if self.output is not None else sys.stdout
+        output.write(text)
+        output.flush()
+
+        self.bytesLastFrame = len(text.encode('utf-8'))
+        self.totalBytes += self.bytesLastFrame
+        self.numFrames += 1
+        return self.bytesLastFrame
+
+
+    def getReport(self):
+        """Return a string describing the bytes written per frame."""
+        if self.numFrames == 0:
+            return 'No frames were rendered.'
+        return '%s frames rendered, %s bytes per frame on average (the screen has %s characters).' % (
+            self.numFrames, self.totalBytes // self.numFrames, self.width * self.height)
+
+
+def runDemo(width=79, height=23, numFrames=200):
+    """Animate dots bouncing around, then print the bytes per frame."""
+    frame = FrameBuffer(width, height)
+    dots = [[random.randint(0, width - 1), random.randint(0, height - 1), random.choice((-1, 1)),
+             random.choice((-1, 1)), random.choice(('red', 'green', 'yellow', 'cyan'))] for i in range(10)]
+    for i in range(numFrames):
+        frame.clear()
+        for dot in dots:
+            dot[0] += dot[2]
+            dot[1] += dot[3]
+            if not 0 <= dot[0] < width:
+                dot[2] = -dot[2]
+                dot[0] += 2 * dot[2]
+            if not 0 <= dot[1] < height:
+                dot[3] = -dot[3]
+                dot[1] += 2 * dot[3]
+            frame.put(dot[0], dot[1], 'O', dot[4])
+        frame.write(0, height - 1, 'Frame %s, %s bytes' % (i, frame.bytesLastFrame))
+        frame.render()
+        time.sleep(0.02)
+    print(frame.getReport())
+
+
+# If this program isn't being imported, run the demo.
+if __name__ == '__main__':
+    try:
+        runDemo()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
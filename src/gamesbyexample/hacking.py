@@ -8,17 +8,15 @@ __version__ = 0
 # download it from https://inventwithpython.com/sevenletterwords.txt
 
 import random, sys
+import wordindex  # Imports our wordindex.py program.
 
 # Set up the constants:
 # The garbage filler characters for the "computer memory" display.
 GARBAGE_CHARS = '~!@#$%^&*()_+-={}[]|;:,.<>?/'
 
-# Load the WORDS list from a text file that has 7-letter words.
-with open('sevenletterwords.txt') as wordListFile:
-    WORDS = wordListFile.readlines()
-for i in range(len(WORDS)):
-    # Convert each word to uppercase and remove the trailing newline:
-    WORDS[i] = WORDS[i].strip().upper()
+# Load the WORDS index from a text file that has 7-letter words, in
+# uppercase:
+WORDS = wordindex.loadWordFile('sevenletterwords.txt', upper=True)
 
 
 def main():
@@ -55,54 +53,37 @@ def getWords():
     The secret password will be the first word in the list.
     To make the game fair, we try to ensure that there are words with
     a range of matching numbers of letters as the secret word."""
-    secretPassword = random.choice(WORDS)
+    secretPassword = WORDS.getRandomWord()
     words = [secretPassword]
 
+    # wordsByMatches[k] is a list of the words with exactly k matching
+    # letters, found with the index instead of by trying random words:
+    wordsByMatches = WORDS.getWordsByMatches(secretPassword)
+
     # Find two more words; these have zero matching letters.
-    # We use "< 3" because the secret password is already in words.
-    while len(words) < 3:
-        randomWord = getOneWordExcept(words)
-        if numMatchingLetters(secretPassword, randomWord) == 0:
-            words.append(randomWord)
-
-    # Find two words that have 3 matching letters (but give up at 500
-    # tries if not enough can be found).
-    for i in range(500):
-        if len(words) == 5:
-            break  # Found 5 words, so break out of the loop.
-
-        randomWord = getOneWordExcept(words)
-        if numMatchingLetters(secretPassword, randomWord) == 3:
-            words.append(randomWord)
+    words.extend(pickWords(wordsByMatches[0], 2))
 
-    # Find at least seven words that have at least one matching letter
-    # (but give up at 500 tries if not enough can be found).
-    for i in range(500):
-        if len(words) == 12:
-            break  # Found 7 or more words, so break out of the loop.
+    # Find two words that have 3 matching letters (if there are enough).
+    words.extend(pickWords(wordsByMatches[3], 2))
 
-        randomWord = getOneWordExcept(words)
-        if numMatchingLetters(secretPassword, randomWord) != 0:
-            words.append(randomWord)
+    # Find at least seven words that have at least one matching letter
+    # (if there are enough).
+    someMatches = [word for k in range(1, len(secretPassword))
+                   for word in wordsByMatches[k] if word not in words]
+    words.extend(pickWords(someMatches, 12 - len(words)))
 
     # Add any random words needed to get 12 words total.
-    while len(words) < 12:
-        randomWord = getOneWordExcept(words)
-        words.append(randomWord)
+    otherWords = [word for word in WORDS.wordsByLength[len(secretPassword)]
+                  if word not in words]
+    words.extend(pickWords(otherWords, 12 - len(words)))
 
     assert len(words) == 12
     return words
 
 
-def getOneWordExcept(blocklist=None):
-    """Returns a random word from WORDS that isn't in blocklist."""
-    if blocklist == None:
-        blocklist = []
-
-    while True:
-        randomWord = random.choice(WORDS)
-        if randomWord not in blocklist:
-            return randomWord
+def pickWords(candidates, numWords):
+    """Returns up to numWords random words from candidates."""
+    return random.sample(candidates, min(numWords, len(candidates)))
 
 
 def numMatchingLetters(word1, word2):
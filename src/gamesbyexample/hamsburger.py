@@ -7,6 +7,7 @@ __version__ = 0
 # http://www.desiquintans.com/downloads/nounlist/nounlist.txt
 
 import random, os, sys
+import wordindex  # Imports our wordindex.py program.
 
 
 def pluralize(word):
@@ -28,20 +29,18 @@ if not os.path.exists('nounlist.txt'):
     print('nounlist.txt not found. Download it from http://www.desiquintans.com/downloads/nounlist/nounlist.txt')
     sys.exit()
 
-fo = open('nounlist.txt')
-nouns = fo.readlines()
-fo.close()
-
-for i, noun in enumerate(nouns):
-    nouns[i] = noun.strip()  # Remove the trailing \n from each string.
+nounIndex = wordindex.loadWordFile('nounlist.txt')
+nouns = nounIndex.words
 
 if not os.path.exists('hamsburger.txt'):
     print('Generating silly pluralizations for hamsburger.txt...')
 
     sillyPluralizations = []
     for stem in nouns:
-        for fullWord in nouns:
-            if fullWord.startswith(stem) and fullWord != stem:
+        # Find the nouns that start with stem with a binary search of
+        # the index, instead of checking every noun:
+        for fullWord in nounIndex.getWordsWithPrefix(stem):
+            if fullWord != stem:
                 pluralizedWord = pluralize(stem) + fullWord[len(stem):]
                 sillyPhrase = 'The plural of {} is {}.'.format(fullWord, pluralizedWord)
                 sillyPluralizations.append(sillyPhrase)
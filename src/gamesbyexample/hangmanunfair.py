@@ -1,9 +1,12 @@
 """Hangman with Random Letters, by Al Sweigart al@inventwithpython.com
 A completely unfair word-guessing game. (This is a joke program.)
+In evil mode, the secret word is any common English word that fits the
+guesses so far, and each guess gets the answer that helps the least.
 This and other games are available at https://nostarch.com/XX
 Tags: large, game, humor, puzzle, word"""
 __version__ = 0
 import random, sys
+import evilhangman  # Imports our evilhangman.py program.
 
 # Set up the constants:
 HANGMAN_PICS = [r"""
@@ -63,28 +66,49 @@ r"""
     |
 ====="""]
 CATEGORY = 'Random'
+EVIL_CATEGORY = 'Common English words'
 
 
 def main():
     print('''HANGMAN WITH RANDOM LETTERS
 By Al Sweigart al@inventwithpython.com
-''')
+
+Play with (R)andom letters, or (E)vil mode, where the computer keeps
+changing the word to dodge your guesses?''')
+    while True:
+        mode = input('> ').upper()
+        if mode in ('R', 'E'):
+            break
+        print('Please enter R or E.')
 
     # Setup variables for a new game:
     missedLetters = []
     correctLetters = []
 
-    secretWord = ''
-    for i in range(random.randint(4, 9)): # The secret word has 4 to 9 letters.
-        secretWord += random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+    if mode == 'R':
+        category = CATEGORY
+        evilGame = None
+        secretWord = ''
+        for i in range(random.randint(4, 9)): # The secret word has 4 to 9 letters.
+            secretWord += random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+    else:
+        category = EVIL_CATEGORY
+        # There is no secret word, just every word that fits so far:
+        evilGame = evilhangman.newGame()
+        secretWord = evilGame.pattern
 
 
     while True: # Main game loop.
-        drawHangman(missedLetters, correctLetters, secretWord)
+        drawHangman(missedLetters, correctLetters, secretWord, category)
 
         # Let the player enter their letter guess:
         guess = getPlayerGuess(missedLetters + correctLetters)
 
+        if evilGame is not None:
+            # The evil game picks the words the guess does the least for:
+            evilGame.guess(guess)
+            secretWord = evilGame.pattern
+
         if guess in secretWord:
             # The player has guessed correctly:
             correctLetters.append(guess)
@@ -104,17 +128,20 @@ By Al Sweigart al@inventwithpython.com
 
             # Check if player has guessed too many times and lost
             if len(missedLetters) == len(HANGMAN_PICS) - 1:
-                drawHangman(missedLetters, correctLetters, secretWord)
+                drawHangman(missedLetters, correctLetters, secretWord, category)
+                if evilGame is not None:
+                    # Pick one of the words that are still left to show:
+                    secretWord = evilGame.getSecretWord()
                 print('You have run out of guesses!')
                 print('The word was "{}"'.format(secretWord))
                 break
 
 
-def drawHangman(missedLetters, correctLetters, secretWord):
+def drawHangman(missedLetters, correctLetters, secretWord, category):
     """Draw the current state of the hangman, along with the missed and
     correctly-guessed letters of the secret word."""
     print(HANGMAN_PICS[len(missedLetters)])
-    print('The category is:', CATEGORY)
+    print('The category is:', category)
     print()
 
     # Show the previously guessed letters:
@@ -0,0 +1,391 @@
+"""Hashlife, by Al Sweigart al@inventwithpython.com
+An infinite-plane Conway's Game of Life engine module, used by the
+Conway's Game of Life programs. It stores the plane as a quadtree of
+shared, memoized nodes (the "Hashlife" algorithm), so empty space costs
+nothing and repeating patterns can jump 2^N generations in one call.
+Run it with an RLE pattern file to print each generation's population
+and bounding box, for example: python hashlife.py gosperglidergun.rle
+More info at: https://en.wikipedia.org/wiki/Hashlife
+More info about RLE files at: https://conwaylife.com/wiki/Run_Length_Encoded
+Tags: large, module, simulation"""
+__version__ = 0
+import sys, time
+
+"""A node at level k is a square of 2^k by 2^k cells made up of four
+level k-1 nodes: nw (top-left), ne (top-right), sw (bottom-left), and
+se (bottom-right). Level 0 nodes are single cells. Every node is made
+with join(), which returns the existing node if an identical one was
+made before. That way an empty region or a repeated glider is only
+stored (and simulated) once, no matter how many times it appears."""
+
+
+class _Node:
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population')
+
+    def __init__(self, nw, ne, sw, se, level, population):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+
+DEAD_CELL = _Node(None, None, None, None, 0, 0)
+LIVE_CELL = _Node(None, None, None, None, 0, 1)
+
+_joinCache = {}       # Keys=(nw, ne, sw, se) tuples, values=_Node objects.
+_emptyCache = {}      # Keys=levels, values=empty _Node objects.
+_successorCache = {}  # Keys=(_Node, stepPower) tuples, values=_Node objects.
+# The caches are cleared when they hold more nodes than this in total:
+MAX_CACHE_SIZE = 2000000
+
+
+def join(nw, ne, sw, se):
+    """Return the node made from the four given quadrant nodes."""
+    key = (nw, ne, sw, se)
+    node = _joinCache.get(key)
+    if node is None:
+        node = _Node(nw, ne, sw, se, nw.level + 1,
+                     nw.population + ne.population + sw.population + se.population)
+        _joinCache[key] = node
+    return node
+
+
+def getEmpty(level):
+    """Return an empty node of the given level."""
+    if level == 0:
+        return DEAD_CELL
+    node = _emptyCache.get(level)
+    if node is None:
+        smaller = getEmpty(level - 1)
+        node = _emptyCache[level] = join(smaller, smaller, smaller, smaller)
+    return node
+
+
+def getCacheSize():
+    """Return the number of nodes in the memo caches."""
+    return len(_joinCache) + len(_successorCache)
+
+
+def clearCaches():
+    """Forget all memoized nodes to free up memory. Existing nodes still
+    work, but won't share memory with nodes made afterwards."""
+    _joinCache.clear()
+    _emptyCache.clear()
+    _successorCache.clear()
+
+
+def centre(node):
+    """Return a node one level bigger, with node in its centre."""
+    border = getEmpty(node.level - 1)
+    return join(join(border, border, border, node.nw),
+                join(border, border, node.ne, border),
+                join(border, node.sw, border, border),
+                join(node.se, border, border, border))
+
+
+def _isPadded(node):
+    """Return True if all of the node's living cells are in its central
+    half, so it can be stepped without cells leaving the result."""
+    return (node.nw.se.population + node.ne.sw.population +
+            node.sw.ne.population + node.se.nw.population) == node.population
+
+
+def _lifeFourByFour(node):
+    """Return the level 1 centre of a level 2 node, one generation
+    later, using the regular Game of Life rules."""
+    # Read the 4x4 cells into a list of rows:
+    rows = []
+    for top, bottom in ((node.nw, node.ne), (node.sw, node.se)):
+        rows.append([top.nw.population, top.ne.population, bottom.nw.population, bottom.ne.population])
+        rows.append([top.sw.population, top.se.population, bottom.sw.population, bottom.se.population])
+
+    newCells = []
+    for y, x in ((1, 1), (1, 2), (2, 1), (2, 2)):
+        numNeighbors = (rows[y - 1][x - 1] + rows[y - 1][x] + rows[y - 1][x + 1] +
+                        rows[y][x - 1] + rows[y][x + 1] +
+                        rows[y + 1][x - 1] + rows[y + 1][x] + rows[y + 1][x + 1])
+        if numNeighbors == 3 or (numNeighbors == 2 and rows[y][x] == 1):
+            newCells.append(LIVE_CELL)
+        else:
+            newCells.append(DEAD_CELL)
+    return join(newCells[0], newCells[1], newCells[2], newCells[3])
+
+
+def successor(node, stepPower):
+    """Return the centre of node (one level smaller) after 2^stepPower
+    generations. stepPower must be at most node.level - 2."""
+    if node.population == 0:
+        return node.nw  # Empty nodes stay empty.
+    key = (node, stepPower)
+    result = _successorCache.get(key)
+    if result is not None:
+        return result
+
+    if node.level == 2:
+        result = _lifeFourByFour(node)
+    else:
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        # Nine overlapping sub-squares, each half the size of node:
+        n00 = nw
+        n01 = join(nw.ne, ne.nw, nw.se, ne.sw)
+        n02 = ne
+        n10 = join(nw.sw, nw.se, sw.nw, sw.ne)
+        n11 = join(nw.se, ne.sw, sw.ne, se.nw)
+        n12 = join(ne.sw, ne.se, se.nw, se.ne)
+        n20 = sw
+        n21 = join(sw.ne, se.nw, sw.se, se.sw)
+        n22 = se
+
+        if stepPower < node.level - 2:
+            # Take a single smaller step: the centres of the nine
+            # sub-squares are stepped, then just their centres kept.
+            c00, c01, c02 = successor(n00, stepPower), successor(n01, stepPower), successor(n02, stepPower)
+            c10, c11, c12 = successor(n10, stepPower), successor(n11, stepPower), successor(n12, stepPower)
+            c20, c21, c22 = successor(n20, stepPower), successor(n21, stepPower), successor(n22, stepPower)
+            result = join(join(c00.se, c01.sw, c10.ne, c11.nw),
+                          join(c01.se, c02.sw, c11.ne, c12.nw),
+                          join(c10.se, c11.sw, c20.ne, c21.nw),
+                          join(c11.se, c12.sw, c21.ne, c22.nw))
+        else:
+            # Take the full step as two half steps:
+            halfPower = stepPower - 1
+            c00, c01, c02 = successor(n00, halfPower), successor(n01, halfPower), successor(n02, halfPower)
+            c10, c11, c12 = successor(n10, halfPower), successor(n11, halfPower), successor(n12, halfPower)
+            c20, c21, c22 = successor(n20, halfPower), successor(n21, halfPower), successor(n22, halfPower)
+            result = join(successor(join(c00, c01, c10, c11), halfPower),
+                          successor(join(c01, c02, c11, c12), halfPower),
+                          successor(join(c10, c11, c20, c21), halfPower),
+                          successor(join(c11, c12, c21, c22), halfPower))
+
+    _successorCache[key] = result
+    return result
+
+
+def buildNode(cells, left, top, level):
+    """Return a node of the given level whose top-left corner is at
+    (left, top), with the living cells from the cells set."""
+    if len(cells) == 0:
+        return getEmpty(level)
+    if level == 0:
+        return LIVE_CELL
+    half = 1 << (level - 1)
+    quadrants = (set(), set(), set(), set())  # nw, ne, sw, se
+    for x, y in cells:
+        quadrants[(x >= left + half) + 2 * (y >= top + half)].add((x, y))
+    return join(buildNode(quadrants[0], left, top, level - 1),
+                buildNode(quadrants[1], left + half, top, level - 1),
+                buildNode(quadrants[2], left, top + half, level - 1),
+                buildNode(quadrants[3], left + half, top + half, level - 1))
+
+
+class LifePlane:
+    def __init__(self, cells=()):
+        """Create an infinite plane with the living (x, y) cells given."""
+        cells = set(cells)
+        self.generation = 0
+        if len(cells) == 0:
+            self.left, self.top = 0, 0
+        else:
+            self.left = min(x for x, y in cells)
+            self.top = min(y for x, y in cells)
+        size = max([1] + [max(x - self.left, y - self.top) + 1 for x, y in cells])
+        level = max(3, (size - 1).bit_length())
+        self.root = buildNode(cells, self.left, self.top, level)
+
+
+    def population(self):
+        """Return the number of living cells."""
+        return self.root.population
+
+
+    def _centreRoot(self):
+        """Put a ring of empty space around the root node."""
+        half = 1 << (self.root.level - 1)
+        self.root = centre(self.root)
+        self.left -= half
+        self.top -= half
+
+
+    def jump(self, stepPower):
+        """Advance the plane by 2^stepPower generations in one step."""
+        if getCacheSize() > MAX_CACHE_SIZE:
+            clearCaches()  # Chaotic patterns would fill up the memory.
+        # Grow the root until it's big enough to take the step and all
+        # the living cells are well away from its edges:
+        while self.root.level < stepPower + 2 or not _isPadded(self.root):
+            self._centreRoot()
+        self._centreRoot()  # Leave room for the cells to spread out.
+
+        quarter = 1 << (self.root.level - 2)
+        self.root = successor(self.root, stepPower)
+        self.left += quarter
+        self.top += quarter
+        self.generation += 1 << stepPower
+
+        # Trim away empty space so the root doesn't keep growing:
+        while self.root.level > 3 and _isPadded(self.root) and _isPadded(centreNode(self.root)):
+            quarter = 1 << (self.root.level - 2)
+            self.root = centreNode(self.root)
+            self.left += quarter
+            self.top += quarter
+
+
+    def step(self, generations=1):
+        """Advance the plane by the given number of generations, made
+        up of the biggest power-of-two jumps possible."""
+        stepPower = 0
+        while generations > 0:
+            if generations & 1:
+                self.jump(stepPower)
+            generations >>= 1
+            stepPower += 1
+
+
+    def getCells(self):
+        """Return a list of the (x, y) coordinates of all living cells."""
+        cells = []
+        _collectCells(self.root, self.left, self.top, cells)
+        return cells
+
+
+    def boundingBox(self):
+        """Return a (left, top, right, bottom) tuple of the smallest
+        box holding every living cell, or None if there are none."""
+        if self.root.population == 0:
+            return None
+        box = _getBox(self.root, {})
+        return (self.left + box[0], self.top + box[1], self.left + box[2], self.top + box[3])
+
+
+    def isAlive(self, x, y):
+        """Return True if the cell at (x, y) is alive."""
+        x -= self.left
+        y -= self.top
+        node = self.root
+        size = 1 << node.level
+        if not (0 <= x < size and 0 <= y < size):
+            return False
+        while node.level > 0 and node.population > 0:
+            half = 1 << (node.level - 1)
+            if y < half:
+                node = node.nw if x < half else node.ne
+            else:
+                node = node.sw if x < half else node.se
+            x %= half
+            y %= half
+        return node.population == 1
+
+
+    def getRows(self, left, top, width, height, alive='O', dead=' '):
+        """Return a list of strings showing the cells in the given
+        rectangle of the plane."""
+        rows = [[dead] * width for y in range(height)]
+        for x, y in self.getCells():
+            if left <= x < left + width and top <= y < top + height:
+                rows[y - top][x - left] = alive
+        return [''.join(row) for row in rows]
+
+
+def centreNode(node):
+    """Return the centre of node, one level smaller."""
+    return join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+
+def _collectCells(node, left, top, cells):
+    """Add the (x, y) coordinates of living cells in node to cells."""
+    if node.population == 0:
+        return
+    if node.level == 0:
+        cells.append((left, top))
+        return
+    half = 1 << (node.level - 1)
+    _collectCells(node.nw, left, top, cells)
+    _collectCells(node.ne, left + half, top, cells)
+    _collectCells(node.sw, left, top + half, cells)
+    _collectCells(node.se, left + half, top + half, cells)
+
+
+def _getBox(node, boxCache):
+    """Return the (left, top, right, bottom) box of the living cells in
+    a non-empty node, relative to its top-left corner."""
+    if node.level == 0:
+        return (0, 0, 0, 0)
+    box = boxCache.get(node)
+    if box is not None:
+        return box
+    half = 1 << (node.level - 1)
+    left, top, right, bottom = None, None, None, None
+    for quadrant, offsetX, offsetY in ((node.nw, 0, 0), (node.ne, half, 0),
+                                       (node.sw, 0, half), (node.se, half, half)):
+        if quadrant.population == 0:
+            continue
+        qLeft, qTop, qRight, qBottom = _getBox(quadrant, boxCache)
+        if left is None:
+            left, top, right, bottom = qLeft + offsetX, qTop + offsetY, qRight + offsetX, qBottom + offsetY
+        else:
+            left, top = min(left, qLeft + offsetX), min(top, qTop + offsetY)
+            right, bottom = max(right, qRight + offsetX), max(bottom, qBottom + offsetY)
+    box = boxCache[node] = (left, top, right, bottom)
+    return box
+
+
+def parseRle(text):
+    """Return a set of (x, y) living cells from the text of an RLE
+    pattern file."""
+    cells = set()
+    x, y = 0, 0
+    runCount = ''
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('#') or line.startswith('x'):
+            continue  # Skip comments and the "x = 3, y = 3" header line.
+        for char in line:
+            if char.isdigit():
+                runCount += char
+                continue
+            count = int(runCount) if runCount != '' else 1
+            runCount = ''
+            if char == '!':
+                return cells  # The end of the pattern.
+            elif char == '$':
+                x, y = 0, y + count  # Move down to the next row.
+            elif char == 'b' or char == '.':
+                x += count  # Skip dead cells.
+            elif char.isalpha():
+                for i in range(count):  # Any other letter is a live cell.
+                    cells.add((x + i, y))
+                x += count
+    return cells
+
+
+def loadRle(filename):
+    """Return a set of (x, y) living cells from an RLE pattern file."""
+    with open(filename, encoding='utf-8') as rleFile:
+        return parseRle(rleFile.read())
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: python hashlife.py pattern.rle [stepPower] [numSteps]')
+        print('Each step jumps 2^stepPower generations (default 0, so one')
+        print('generation per step) and prints the population and bounding box.')
+        sys.exit()
+
+    plane = LifePlane(loadRle(sys.argv[1]))
+    stepPower = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    numSteps = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    startTime = time.time()
+    print('Generation 0: population %s, bounding box %s' % (plane.population(), plane.boundingBox()))
+    for i in range(numSteps):
+        plane.jump(stepPower)
+        print('Generation %s: population %s, bounding box %s'
+              % (plane.generation, plane.population(), plane.boundingBox()))
+    print('Done in %.3f seconds.' % (time.time() - startTime))
+
+
+# If this program isn't being imported, run the pattern file.
+if __name__ == '__main__':
+    main()
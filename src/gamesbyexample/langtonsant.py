@@ -4,7 +4,7 @@ More info: https://en.wikipedia.org/wiki/Langton%27s_ant
 This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: large, artistic, bext, simulation"""
 __version__ = 0
-import copy, random, sys, time
+import random, sys, time
 
 try:
     import bext
@@ -13,6 +13,8 @@ except ImportError:
     print('can install by following the instructions at')
     print('https://pypi.org/project/Bext/')
     sys.exit()
+import framebuffer  # Imports our framebuffer.py program.
+import cellularautomata  # Imports our cellularautomata.py program.
 
 # Set up the constants:
 WIDTH, HEIGHT = bext.size()
@@ -37,130 +39,67 @@ ANT_COLOR = 'red'
 BLACK_TILE = 'black'
 WHITE_TILE = 'white'
 
-NORTH = 'north'
-SOUTH = 'south'
-EAST = 'east'
-WEST = 'west'
-
-
-def main():
-    bext.fg(ANT_COLOR)  # The ants' color is the foreground color.
-    bext.bg(WHITE_TILE)  # Set the background to white to start.
-    bext.clear()
-
-    # Create a new board data structure:
-    board = {'width': WIDTH, 'height': HEIGHT}
-
-    # Create ant data structures:
-    ants = []
+# The ant's rule: on a white tile (color 0) it turns left, and on a
+# black tile (color 1) it turns right. (!) Try changing this to 'RLR'
+# or 'LLRR', and adding colors to TILE_COLORS for the new tile colors:
+RULE = 'LR'
+TILE_COLORS = [WHITE_TILE, BLACK_TILE]
+# The ant characters for each direction:
+ANT_CHARS = {cellularautomata.NORTH: ANT_UP,
+             cellularautomata.SOUTH: ANT_DOWN,
+             cellularautomata.EAST: ANT_LEFT,
+             cellularautomata.WEST: ANT_RIGHT}
+
+
+def main(frame):
+    # The ants' color is the foreground color, and the background is
+    # white to start:
+    frame.clear(' ', ANT_COLOR, WHITE_TILE)
+
+    # Create a new board data structure, with the ants on it:
+    board = cellularautomata.Turmites(WIDTH, HEIGHT, RULE)
     for i in range(NUMBER_OF_ANTS):
-        ant = {
-            'x': random.randint(0, WIDTH - 1),
-            'y': random.randint(0, HEIGHT - 1),
-            'direction': random.choice([NORTH, SOUTH, EAST, WEST]),
-        }
-        ants.append(ant)
+        board.addAnt(random.randint(0, WIDTH - 1),
+                     random.randint(0, HEIGHT - 1),
+                     random.choice(list(ANT_CHARS)))
 
     # Keep track of which tiles have changed and need to be redrawn on
     # the screen:
     changedTiles = []
 
     while True:  # Main program loop.
-        displayBoard(board, ants, changedTiles)
-        changedTiles = []
-
-        # nextBoard is what the board will look like on the next step in
-        # the simulation. Start with a copy of the current step's board:
-        nextBoard = copy.copy(board)
-
-        # Run a single simulation step for each ant:
-        for ant in ants:
-            if board.get((ant['x'], ant['y']), False) == True:
-                nextBoard[(ant['x'], ant['y'])] = False
-                # Turn clockwise:
-                if ant['direction'] == NORTH:
-                    ant['direction'] = EAST
-                elif ant['direction'] == EAST:
-                    ant['direction'] = SOUTH
-                elif ant['direction'] == SOUTH:
-                    ant['direction'] = WEST
-                elif ant['direction'] == WEST:
-                    ant['direction'] = NORTH
-            else:
-                nextBoard[(ant['x'], ant['y'])] = True
-                # Turn counter clockwise:
-                if ant['direction'] == NORTH:
-                    ant['direction'] = WEST
-                elif ant['direction'] == WEST:
-                    ant['direction'] = SOUTH
-                elif ant['direction'] == SOUTH:
-                    ant['direction'] = EAST
-                elif ant['direction'] == EAST:
-                    ant['direction'] = NORTH
-            changedTiles.append((ant['x'], ant['y']))
-
-            # Move the ant forward in whatever direction it's facing:
-            if ant['direction'] == NORTH:
-                ant['y'] -= 1
-            if ant['direction'] == SOUTH:
-                ant['y'] += 1
-            if ant['direction'] == WEST:
-                ant['x'] -= 1
-            if ant['direction'] == EAST:
-                ant['x'] += 1
-
-            # If the ant goes past the edge of the screen,
-            # it should wrap around to other side.
-            ant['x'] = ant['x'] % WIDTH
-            ant['y'] = ant['y'] % HEIGHT
-
-            changedTiles.append((ant['x'], ant['y']))
-
-        board = nextBoard
-
-
-def displayBoard(board, ants, changedTiles):
+        displayBoard(board, changedTiles, frame)
+
+        # Run a single simulation step for each ant. Only the tiles the
+        # ants were on and moved to change:
+        changedTiles = board.step()
+
+
+def displayBoard(board, changedTiles, frame):
     """Displays the board and ants on the screen. The changedTiles
     argument is a list of (x, y) tuples for tiles on the screen that
     have changed and need to be redrawn."""
+    antChars = {(x, y): ANT_CHARS[direction] for x, y, direction in board.ants}
 
-    # Draw the board data structure:
+    # Draw the board data structure into the frame buffer:
     for x, y in changedTiles:
-        bext.goto(x, y)
-        if board.get((x, y), False):
-            bext.bg(BLACK_TILE)
-        else:
-            bext.bg(WHITE_TILE)
-
-        antIsHere = False
-        for ant in ants:
-            if (x, y) == (ant['x'], ant['y']):
-                antIsHere = True
-                if ant['direction'] == NORTH:
-                    print(ANT_UP, end='')
-                elif ant['direction'] == SOUTH:
-                    print(ANT_DOWN, end='')
-                elif ant['direction'] == EAST:
-                    print(ANT_LEFT, end='')
-                elif ant['direction'] == WEST:
-                    print(ANT_RIGHT, end='')
-                break
-        if not antIsHere:
-            print(' ', end='')
+        tileColor = TILE_COLORS[board.getColor(x, y) % len(TILE_COLORS)]
+        frame.put(x, y, antChars.get((x, y), ' '), ANT_COLOR, tileColor)
 
     # Display the quit message at the bottom of the screen:
-    bext.goto(0, HEIGHT)
-    bext.bg(WHITE_TILE)
-    print('Press Ctrl-C to quit.', end='')
+    frame.write(0, HEIGHT, 'Press Ctrl-C to quit.', ANT_COLOR, WHITE_TILE)
 
-    sys.stdout.flush()  # (Required for bext-using programs.)
+    # Send just the changed tiles to the terminal, all at once:
+    frame.render()
     time.sleep(PAUSE_AMOUNT)
 
 
 # If this program was run (instead of imported), run the game:
 if __name__ == '__main__':
+    frame = framebuffer.FrameBuffer(WIDTH, HEIGHT + 1)  # +1 for the quit message.
     try:
-        main()
+        main(frame)
     except KeyboardInterrupt:
         print("Langton's Ant, by Al Sweigart al@inventwithpython.com")
+        print(frame.getReport())
         sys.exit()  # When Ctrl-C is pressed, end the program.
@@ -3,12 +3,21 @@ Translates English messages into l33t5p34]<.
 This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: tiny, beginner, word"""
 __version__ = 0
-import random
+import random, sys
 
 try:
     import pyperclip  # pyperclip copies text to the clipboard.
 except ImportError:
     pass  # If pyperclip is not installed, do nothing. It's no big deal.
+import cipherstream  # Imports our cipherstream.py program.
+
+# The leetspeak for each letter. (Make sure all the keys are lowercase.)
+CHAR_MAPPING = {
+    'a': ['4', '@', '/-\\'], 'c': ['('], 'd': ['|)'], 'e': ['3'],
+    'f': ['ph'], 'h': [']-[', '|-|'], 'i': ['1', '!', '|'], 'k': [']<'],
+    'o': ['0'], 's': ['$', '5'], 't': ['7', '+'], 'u': ['|_|'],
+    'v': ['\\/']}
+LEET_CHANCE = 0.70  # The chance that each letter is changed.
 
 
 def main():
@@ -32,17 +41,11 @@ Enter your leet message:''')
 
 def englishToLeetspeak(message):
     """Convert the English string in message and return leetspeak."""
-    # Make sure all the keys in `charMapping` are lowercase.
-    charMapping = {
-    'a': ['4', '@', '/-\\'], 'c': ['('], 'd': ['|)'], 'e': ['3'],
-    'f': ['ph'], 'h': [']-[', '|-|'], 'i': ['1', '!', '|'], 'k': [']<'],
-    'o': ['0'], 's': ['$', '5'], 't': ['7', '+'], 'u': ['|_|'],
-    'v': ['\\/']}
     leetspeak = ''
     for char in message:  # Check each character:
         # There is a 70% chance we change the character to leetspeak.
-        if char.lower() in charMapping and random.random() <= 0.70:
-            possibleLeetReplacements = charMapping[char.lower()]
+        if char.lower() in CHAR_MAPPING and random.random() <= LEET_CHANCE:
+            possibleLeetReplacements = CHAR_MAPPING[char.lower()]
             leetReplacement = random.choice(possibleLeetReplacements)
             leetspeak = leetspeak + leetReplacement
         else:
@@ -51,6 +54,19 @@ def englishToLeetspeak(message):
     return leetspeak
 
 
+def streamMessage(inFilename=None, outFilename=None):
+    """Translate inFilename (or stdin) into outFilename (or stdout) a
+    chunk at a time."""
+    transform = cipherstream.RandomReplaceTransform(CHAR_MAPPING, LEET_CHANCE)
+    cipherstream.streamFiles(transform, inFilename, outFilename)
+
+
 # If this program was run (instead of imported), run the game:
 if __name__ == '__main__':
-    main()
+    # (!) Run this program as "python leetspeak.py --stream"
+    # to translate stdin to stdout without any questions, or add input and
+    # output filenames to translate a file of any size.
+    if len(sys.argv) > 1 and sys.argv[1] == '--stream':
+        streamMessage(*sys.argv[2:])
+    else:
+        main()
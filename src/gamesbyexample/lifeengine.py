@@ -0,0 +1,161 @@
+"""Life Engine, by Al Sweigart al@inventwithpython.com
+A fast Conway's Game of Life engine module, used by the Conway's Game
+of Life programs. The whole grid is packed into a single integer (one
+bit per cell) so that each generation is computed with a few dozen
+bitwise operations instead of eight dictionary lookups per cell.
+More info at: https://en.wikipedia.org/wiki/Conway%27s_Game_of_Life
+Tags: large, module, simulation"""
+__version__ = 0
+import random, sys, time
+
+"""The cells are stored in one integer. The cell at (x, y) is bit number
+y * width + x, so each row of the grid is `width` bits long:
+
+    bit:  0  1  2  3      (x, y) = (0, 0) (1, 0) (2, 0) (3, 0)
+          4  5  6  7               (0, 1) (1, 1) (2, 1) (3, 1)
+
+Shifting the integer by `width` bits moves every cell up or down one
+row, and shifting it by 1 bit moves every cell left or right one column.
+Adding up the eight shifted copies with bitwise "adder" logic counts the
+neighbors of every cell at the same time."""
+
+
+class LifeGrid:
+    def __init__(self, width, height, cells=0):
+        """Create a new toroidal (wrap-around) grid. `cells` is an
+        integer with one bit set for each living cell."""
+        assert width >= 2 and height >= 2, 'The grid must be at least 2x2.'
+        self.width = width
+        self.height = height
+        self.numCells = width * height
+        self.fullMask = (1 << self.numCells) - 1
+
+        # Masks with a bit set for every cell in the leftmost column
+        # and in the rightmost column:
+        rowsOf1 = self.fullMask // ((1 << width) - 1)  # Bit 0 of every row.
+        self.leftColumnMask = rowsOf1
+        self.rightColumnMask = rowsOf1 << (width - 1)
+        self.notLeftColumnMask = self.fullMask ^ self.leftColumnMask
+        self.notRightColumnMask = self.fullMask ^ self.rightColumnMask
+        self.firstRowMask = (1 << width) - 1
+
+        self.cells = cells & self.fullMask
+        self.generation = 0
+
+
+    def randomize(self):
+        """Give every cell a 50/50 chance of being alive."""
+        self.cells = random.getrandbits(self.numCells)
+
+
+    def clear(self):
+        """Kill every cell on the grid."""
+        self.cells = 0
+
+
+    def isAlive(self, x, y):
+        """Return True if the cell at (x, y) is alive."""
+        x %= self.width
+        y %= self.height
+        return (self.cells >> (y * self.width + x)) & 1 == 1
+
+
+    def setCell(self, x, y, alive=True):
+        """Make the cell at (x, y) alive (or dead if alive is False)."""
+        x %= self.width
+        y %= self.height
+        bit = 1 << (y * self.width + x)
+        if alive:
+            self.cells |= bit
+        else:
+            self.cells &= ~bit
+
+
+    def population(self):
+        """Return the number of living cells."""
+        return bin(self.cells).count('1')
+
+
+    def _shiftedNeighbors(self, cells):
+        """Return the eight copies of cells shifted one step in each
+        direction, wrapping around the edges of the grid."""
+        width = self.width
+        rowShift = self.numCells - width
+
+        # The cell to the west of each cell. The leftmost column wraps
+        # around to get the cell at the far right of the same row:
+        west = ((cells << 1) & self.notLeftColumnMask) | ((cells & self.rightColumnMask) >> (width - 1))
+        # The cell to the east of each cell:
+        east = ((cells >> 1) & self.notRightColumnMask) | ((cells & self.leftColumnMask) << (width - 1))
+
+        neighbors = []
+        for row in (west, cells, east):
+            # The cell above, wrapping the top row to the bottom row:
+            neighbors.append(((row << width) & self.fullMask) | (row >> rowShift))
+            # The cell below, wrapping the bottom row to the top row:
+            neighbors.append((row >> width) | ((row & self.firstRowMask) << rowShift))
+        neighbors.append(west)
+        neighbors.append(east)
+        return neighbors
+
+
+    def step(self, generations=1):
+        """Advance the grid by the given number of generations."""
+        for i in range(generations):
+            n = self._shiftedNeighbors(self.cells)
+
+            # Add up the eight neighbor bits of every cell at once. Each
+            # "full adder" turns three 1-bit numbers into a sum bit and
+            # a carry bit. The count is kept modulo 8, which is fine
+            # because 8 neighbors means the cell is dead anyway.
+            sum1, carry1 = _fullAdd(n[0], n[1], n[2])
+            sum2, carry2 = _fullAdd(n[3], n[4], n[5])
+            sum3, carry3 = n[6] ^ n[7], n[6] & n[7]
+            ones, carry4 = _fullAdd(sum1, sum2, sum3)
+            twosPartial, fours1 = _fullAdd(carry1, carry2, carry3)
+            twos, fours2 = twosPartial ^ carry4, twosPartial & carry4
+            fours = fours1 ^ fours2
+
+            # A cell is alive next generation if it has exactly 3
+            # neighbors, or if it is alive and has exactly 2 neighbors:
+            self.cells = twos & ~fours & (ones | self.cells)
+            self.generation += 1
+
+
+    def getRows(self, alive='O', dead=' '):
+        """Return a list of strings, one per row, with alive and dead
+        characters for each cell."""
+        # bin() puts the highest bit first, so reverse it to put cell
+        # (0, 0) first:
+        bits = bin(self.cells)[2:].zfill(self.numCells)[::-1]
+        text = bits.translate(str.maketrans({'1': alive, '0': dead}))
+        width = self.width
+        return [text[y * width:(y + 1) * width] for y in range(self.height)]
+
+
+def _fullAdd(a, b, c):
+    """Add the bits in a, b, and c in parallel. Returns a (sum, carry)
+    tuple of integers."""
+    aXorB = a ^ b
+    return aXorB ^ c, (a & b) | (c & aXorB)
+
+
+def runBenchmark(width=4096, height=4096, generations=20):
+    """Time the engine on a large random grid and print the results."""
+    print('Stepping a %sx%s grid for %s generations...' % (width, height, generations))
+    grid = LifeGrid(width, height)
+    grid.randomize()
+    startTime = time.time()
+    grid.step(generations)
+    totalTime = time.time() - startTime
+    print('%.2f generations per second (%.1f million cells per second).'
+          % (generations / totalTime, generations * grid.numCells / totalTime / 1000000))
+    print('Population after %s generations: %s' % (generations, grid.population()))
+
+
+# If this program isn't being imported, run the benchmark.
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        runBenchmark(int(sys.argv[1]), int(sys.argv[2]))
+    else:
+        runBenchmark()
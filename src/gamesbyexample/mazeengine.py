@@ -0,0 +1,406 @@
+"""Maze Engine, by Al Sweigart al@inventwithpython.com
+A maze module, used by the maze making and maze running programs. A
+maze is stored as a grid of bits, one per space, set for walls, so a
+10001 x 10001 maze takes about 12 MB. Mazes are made by the
+backtracker (with its own stack instead of recursion), Wilson's, or
+Eller's algorithm. Eller's algorithm makes one row at a time, so it can
+write mazes of any height to a file while only remembering one row.
+Files are read and written a row at a time, and the rows are turned
+into bits with string methods instead of one character at a time.
+Run it to make and solve a big maze, for example:
+python mazeengine.py 10001 10001 eller
+More info at https://en.wikipedia.org/wiki/Maze_generation_algorithm
+Tags: large, module, maze"""
+__version__ = 0
+import collections, heapq, random, sys, time
+
+# Maze file constants:
+WALL = '#'
+EMPTY = ' '
+START = 'S'
+EXIT = 'E'
+
+ALGORITHMS = ('backtracker', 'wilson', 'eller')
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))  # North, south, west, east.
+# These turn a row of text into binary digits for int(), and back:
+_TEXT_TO_BITS = bytes(ord('1') if i == ord(WALL) else ord('0') for i in range(256))
+_BITS_TO_TEXT = str.maketrans('01', EMPTY + WALL)
+
+
+class Maze:
+    def __init__(self, width, height):
+        """Set up a width x height maze of all walls, with the start in
+        the top-left corner and the exit in the bottom-right corner."""
+        self.width = width
+        self.height = height
+        self.rowBytes = (width + 7) // 8
+        # Bit x % 8 of byte y * rowBytes + x // 8 is set for walls:
+        self.walls = bytearray(b'\xff') * (self.rowBytes * height)
+        self.start = (1, 1)
+        self.exit = (width - 2, height - 2)
+
+
+    def isWall(self, x, y):
+        """Return True if x, y is a wall. Spaces outside of the maze are
+        walls."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return True
+        return (self.walls[y * self.rowBytes + (x >> 3)] >> (x & 7)) & 1 == 1
+
+
+    def setWall(self, x, y, isWall):
+        i = y * self.rowBytes + (x >> 3)
+        if isWall:
+            self.walls[i] |= 1 << (x & 7)
+        else:
+            self.walls[i] &= ~(1 << (x & 7))
+
+
+    def __getitem__(self, position):
+        """Return WALL or EMPTY for the (x, y) position, so the maze can
+        be used like the dictionaries the programs used to load."""
+        x, y = position
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise KeyError(position)
+        return WALL if self.isWall(x, y) else EMPTY
+
+
+    def get(self, position, default=None):
+        x, y = position
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return default
+        return WALL if self.isWall(x, y) else EMPTY
+
+
+    def setRow(self, y, rowText):
+        """Set the walls of row y from a string (or bytes) of WALL and
+        other characters."""
+        start = y * self.rowBytes
+        self.walls[start:start + self.rowBytes] = _packRow(rowText, self.width)
+
+
+    def getRowText(self, y, markStartAndExit=True):
+        """Return row y as a string of WALL and EMPTY characters."""
+        start = y * self.rowBytes
+        bits = int.from_bytes(self.walls[start:start + self.rowBytes], 'little')
+        row = format(bits, '0%sb' % (self.rowBytes * 8))[::-1][:self.width].translate(_BITS_TO_TEXT)
+        if markStartAndExit:
+            for char, (x, startOrExitY) in ((START, self.start), (EXIT, self.exit)):
+                if startOrExitY == y:
+                    row = row[:x] + char + row[x + 1:]
+        return row
+
+
+    def getNeighbors(self, x, y):
+        """Return a list of the non-wall (x, y) spaces next to x, y."""
+        return [(x + dx, y + dy) for dx, dy in DIRECTIONS if not self.isWall(x + dx, y + dy)]
+
+
+def _packRow(rowText, width):
+    """Return the wall bits of a row of text as bytes. Rows shorter than
+    width are filled out with walls."""
+    if isinstance(rowText, str):
+        rowText = rowText.encode('ascii')
+    rowText = rowText[:width].ljust(width, WALL.encode('ascii'))
+    # The first character becomes the lowest bit, so the binary digits
+    # are reversed before int() reads them:
+    bits = int(rowText.translate(_TEXT_TO_BITS)[::-1], 2)
+    return bits.to_bytes((width + 7) // 8, 'little')
+
+
+def _checkSize(width, height):
+    if width < 3 or height < 3 or width % 2 == 0 or height % 2 == 0:
+        raise ValueError('The width and height must be odd and greater than 2.')
+
+
+def iterBacktracker(width, height, rng=random):
+    """Make a maze with the recursive backtracker algorithm, yielding
+    the maze and the current (x, y) position after each step, so the
+    steps can be watched. The path back to the start is kept in a list
+    instead of the call stack, so big mazes don't hit the recursion
+    limit."""
+    _checkSize(width, height)
+    maze = Maze(width, height)
+    cellsWide = width // 2
+    visited = bytearray(cellsWide * (height // 2))  # One byte per cell.
+    visited[0] = 1
+    pathFromStart = [(1, 1)]
+    maze.setWall(1, 1, False)
+    while pathFromStart:
+        x, y = pathFromStart[-1]
+        yield maze, x, y
+        unvisitedNeighbors = []
+        for dx, dy in DIRECTIONS:
+            nextX, nextY = x + 2 * dx, y + 2 * dy
+            if 0 < nextX < width and 0 < nextY < height and not visited[(nextY // 2) * cellsWide + nextX // 2]:
+                unvisitedNeighbors.append((dx, dy))
+        if unvisitedNeighbors:
+            dx, dy = rng.choice(unvisitedNeighbors)
+            maze.setWall(x + dx, y + dy, False)
+            maze.setWall(x + 2 * dx, y + 2 * dy, False)
+            visited[((y + 2 * dy) // 2) * cellsWide + (x + 2 * dx) // 2] = 1
+            pathFromStart.append((x + 2 * dx, y + 2 * dy))
+        else:
+            pathFromStart.pop()
+
+
+def makeBacktrackerMaze(width, height, rng=random):
+    maze = None
+    for maze, x, y in iterBacktracker(width, height, rng):
+        pass
+    return maze
+
+
+def makeWilsonMaze(width, height, rng=random):
+    """Make a maze with Wilson's algorithm: random walks from cells not
+    yet in the maze, with loops erased, until they reach the maze. Every
+    possible maze is equally likely, unlike the backtracker's long,
+    winding passages."""
+    _checkSize(width, height)
+    maze = Maze(width, height)
+    cellsWide, cellsHigh = width // 2, height // 2
+    numCells = cellsWide * cellsHigh
+    inMaze = bytearray(numCells)
+    firstCell = rng.randrange(numCells)
+    inMaze[firstCell] = 1
+    maze.setWall(2 * (firstCell % cellsWide) + 1, 2 * (firstCell // cellsWide) + 1, False)
+    # walkDirection[cell] is the index into DIRECTIONS the walk last
+    # left cell by. Overwriting it when the walk comes back around
+    # erases the loop:
+    walkDirection = bytearray(numCells)
+    for firstCell in range(numCells):
+        if inMaze[firstCell]:
+            continue
+        cell = firstCell
+        while not inMaze[cell]:
+            cellX, cellY = cell % cellsWide, cell // cellsWide
+            while True:
+                direction = rng.randrange(4)
+                dx, dy = DIRECTIONS[direction]
+                if 0 <= cellX + dx < cellsWide and 0 <= cellY + dy < cellsHigh:
+                    break
+            walkDirection[cell] = direction
+            cell = (cellY + dy) * cellsWide + cellX + dx
+        # Carve the loop-erased walk into the maze:
+        cell = firstCell
+        while not inMaze[cell]:
+            inMaze[cell] = 1
+            cellX, cellY = cell % cellsWide, cell // cellsWide
+            dx, dy = DIRECTIONS[walkDirection[cell]]
+            maze.setWall(2 * cellX + 1, 2 * cellY + 1, False)
+            maze.setWall(2 * cellX + 1 + dx, 2 * cellY + 1 + dy, False)
+            cell = (cellY + dy) * cellsWide + cellX + dx
+    return maze
+
+
+def iterEllerRows(width, height, rng=random):
+    """Yield the rows of a maze made with Eller's algorithm, as bytes.
+    Only the current row of cells is remembered: each cell's set is the
+    cells it's already connected to, and every set must continue down
+    to the next row, so no part of the maze is cut off."""
+    _checkSize(width, height)
+    cellsWide, cellsHigh = width // 2, height // 2
+    yield b'#' * width
+    setOf = list(range(cellsWide))  # setOf[column] is the cell's set.
+    members = {column: [column] for column in range(cellsWide)}  # Keys=sets, values=columns.
+    nextSet = cellsWide
+    for cellY in range(cellsHigh):
+        isLastRow = cellY == cellsHigh - 1
+        cellRow = bytearray(b'#') * width
+        cellRow[1] = ord(EMPTY)
+        # Join cells to their right neighbor at random (or always, on
+        # the last row) if they're in different sets:
+        for column in range(cellsWide - 1):
+            cellRow[2 * column + 3] = ord(EMPTY)
+            leftSet, rightSet = setOf[column], setOf[column + 1]
+            if leftSet != rightSet and (isLastRow or rng.random() < 0.5):
+                cellRow[2 * column + 2] = ord(EMPTY)
+                # Move the smaller set's cells into the larger set:
+                if len(members[leftSet]) < len(members[rightSet]):
+                    leftSet, rightSet = rightSet, leftSet
+                for otherColumn in members[rightSet]:
+                    setOf[otherColumn] = leftSet
+                members[leftSet].extend(members.pop(rightSet))
+        yield bytes(cellRow)
+        if isLastRow:
+            break
+
+        # Each set goes down from at least one of its cells:
+        wallRow = bytearray(b'#') * width
+        goesDown = [False] * cellsWide
+        for setColumns in members.values():
+            goesDown[rng.choice(setColumns)] = True
+            for column in setColumns:
+                if rng.random() < 0.3:
+                    goesDown[column] = True
+        newMembers = {}
+        for column in range(cellsWide):
+            if goesDown[column]:
+                wallRow[2 * column + 1] = ord(EMPTY)
+                newMembers.setdefault(setOf[column], []).append(column)
+            else:
+                setOf[column] = nextSet  # The cell below starts a new set.
+                newMembers[nextSet] = [column]
+                nextSet += 1
+        members = newMembers
+        yield bytes(wallRow)
+    yield b'#' * width
+
+
+def makeEllerMaze(width, height, rng=random):
+    maze = Maze(width, height)
+    for y, row in enumerate(iterEllerRows(width, height, rng)):
+        maze.setRow(y, row)
+    return maze
+
+
+def makeMaze(width, height, algorithm='backtracker', rng=random):
+    """Return a new Maze made with one of the ALGORITHMS."""
+    if algorithm == 'backtracker':
+        return makeBacktrackerMaze(width, height, rng)
+    elif algorithm == 'wilson':
+        return makeWilsonMaze(width, height, rng)
+    elif algorithm == 'eller':
+        return makeEllerMaze(width, height, rng)
+    raise ValueError('Unknown maze algorithm ' + repr(algorithm))
+
+
+def writeRows(rows, filename, width, height):
+    """Write the rows (strings or bytes) of a maze to filename, marking
+    the start in the top-left corner and the exit in the bottom-right
+    corner. rows can be a generator, so the whole maze never has to be
+    in memory."""
+    with open(filename, 'wb', buffering=1 << 20) as mazeFile:
+        for y, row in enumerate(rows):
+            if isinstance(row, str):
+                row = row.encode('ascii')
+            if y == 1:
+                row = row[:1] + START.encode('ascii') + row[2:]
+            if y == height - 2:
+                row = row[:width - 2] + EXIT.encode('ascii') + row[width - 1:]
+            mazeFile.write(row + b'\n')
+
+
+def writeMaze(maze, filename):
+    """Write the maze to filename, one row per line."""
+    with open(filename, 'w', buffering=1 << 20) as mazeFile:
+        for y in range(maze.height):
+            mazeFile.write(maze.getRowText(y) + '\n')
+
+
+def readMaze(filename):
+    """Return a Maze read from the file filename. The file is read a
+    line at a time, and each line is turned into bits as a whole, so
+    even 10001 x 10001 mazes load in a few seconds."""
+    maze = None
+    numBlankLines = 0  # Blank lines are only kept if a row follows them.
+    with open(filename, 'rb') as mazeFile:
+        for y, line in enumerate(mazeFile):
+            row = line.rstrip()
+            if row == b'':
+                numBlankLines += 1
+                continue
+            if maze is None:
+                maze = Maze(len(row), 0)
+                maze.start = maze.exit = None
+            if row.translate(None, b'# SE') != b'':
+                badX = next(x for x, char in enumerate(row) if char not in b'# SE')
+                raise ValueError('Invalid character at column {}, line {}'.format(badX + 1, y + 1))
+            if len(row) > maze.width:
+                raise ValueError('Line {} is longer than the first line.'.format(y + 1))
+            if b'S' in row:
+                maze.start = (row.index(b'S'), maze.height + numBlankLines)
+            if b'E' in row:
+                maze.exit = (row.index(b'E'), maze.height + numBlankLines)
+            for rowText in [b''] * numBlankLines + [row]:
+                maze.walls += _packRow(rowText, maze.width)
+                maze.height += 1
+            numBlankLines = 0
+    if maze is None or maze.height == 0:
+        raise ValueError('The maze file ' + filename + ' is empty.')
+    if maze.start is None:
+        raise ValueError('No start in maze file.')
+    if maze.exit is None:
+        raise ValueError('No exit in maze file.')
+    return maze
+
+
+def solveMaze(maze, start=None, end=None, algorithm='astar'):
+    """Return the list of (x, y) spaces on the shortest path from start
+    to end (the maze's start and exit by default), or None if there
+    isn't one. algorithm is 'bfs' for a breadth-first search or 'astar'
+    for A* with the Manhattan distance, which searches fewer spaces
+    when the maze has loops or open areas."""
+    start = maze.start if start is None else start
+    end = maze.exit if end is None else end
+    # cameFrom[y * width + x] is the index into DIRECTIONS + 1 that the
+    # search came into x, y along, or 0 if it hasn't been reached yet:
+    width = maze.width
+    cameFrom = bytearray(width * maze.height)
+    if algorithm == 'bfs':
+        cameFrom[start[1] * width + start[0]] = 5
+        queue = collections.deque([start])
+        while queue:
+            x, y = queue.popleft()
+            if (x, y) == end:
+                break
+            for direction, (dx, dy) in enumerate(DIRECTIONS):
+                nextX, nextY = x + dx, y + dy
+                if not maze.isWall(nextX, nextY) and not cameFrom[nextY * width + nextX]:
+                    cameFrom[nextY * width + nextX] = direction + 1
+                    queue.append((nextX, nextY))
+    else:
+        endX, endY = end
+        # The Manhattan distance never drops by more than one per step,
+        # so a space has its fewest steps the first time it's popped off
+        # the heap. Its cameFrom is set then, so no steps are stored. The
+        # heap holds (f, -g, x, y, direction) tuples. Ties go to the
+        # spaces furthest along, which are closer to the end:
+        heap = [(abs(endX - start[0]) + abs(endY - start[1]), 0, start[0], start[1], 4)]
+        while heap:
+            f, negativeG, x, y, direction = heapq.heappop(heap)
+            if cameFrom[y * width + x]:
+                continue  # This space was already reached in fewer steps.
+            cameFrom[y * width + x] = direction + 1
+            if (x, y) == end:
+                break
+            nextG = 1 - negativeG
+            for direction, (dx, dy) in enumerate(DIRECTIONS):
+                nextX, nextY = x + dx, y + dy
+                if not maze.isWall(nextX, nextY) and not cameFrom[nextY * width + nextX]:
+                    heapq.heappush(heap, (nextG + abs(endX - nextX) + abs(endY - nextY), -nextG, nextX, nextY, direction))
+    if not cameFrom[end[1] * width + end[0]]:
+        return None
+    # Follow the directions back from the end to the start:
+    path = [end]
+    x, y = end
+    while (x, y) != start:
+        dx, dy = DIRECTIONS[cameFrom[y * width + x] - 1]
+        x, y = x - dx, y - dy
+        path.append((x, y))
+    path.reverse()
+    return path
+
+
+# If this program isn't being imported, make and solve a big maze.
+if __name__ == '__main__':
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 1001
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+    algorithm = sys.argv[3] if len(sys.argv) > 3 else 'eller'
+    filename = 'maze{}x{}{}.txt'.format(width, height, algorithm)
+
+    startTime = time.time()
+    if algorithm == 'eller':
+        # Eller's rows go straight to the file:
+        writeRows(iterEllerRows(width, height), filename, width, height)
+    else:
+        writeMaze(makeMaze(width, height, algorithm), filename)
+    print('Made {} in {:.1f} seconds.'.format(filename, time.time() - startTime))
+
+    startTime = time.time()
+    maze = readMaze(filename)
+    print('Read it in {:.1f} seconds ({} bytes of walls).'.format(time.time() - startTime, len(maze.walls)))
+
+    startTime = time.time()
+    path = solveMaze(maze, algorithm='bfs')
+    print('Solved it in {:.1f} seconds: the path is {} steps long.'.format(time.time() - startTime, len(path) - 1))
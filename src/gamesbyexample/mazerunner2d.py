@@ -5,6 +5,7 @@ This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: large, game, maze"""
 __version__ = 0
 import sys, os
+import mazeengine  # Imports our mazeengine.py program.
 
 # Maze file constants:
 WALL = '#'
@@ -14,21 +15,22 @@ EXIT = 'E'
 
 PLAYER = '@'  # (!) Try changing this to '+' or 'o'.
 BLOCK = chr(9617)  # Character 9617 is '░'
+# Mazes bigger than this are shown in a window around the player:
+VIEW_WIDTH = 79
+VIEW_HEIGHT = 21
 
 
 def displayMaze(maze):
-    # Display the maze:
-    for y in range(HEIGHT):
-        for x in range(WIDTH):
-            if (x, y) == (playerx, playery):
-                print(PLAYER, end='')
-            elif (x, y) == (exitx, exity):
-                print('X', end='')
-            elif maze[(x, y)] == WALL:
-                print(BLOCK, end='')
-            else:
-                print(maze[(x, y)], end='')
-        print()  # Print a newline after printing the row.
+    # Display the part of the maze around the player:
+    left = min(max(playerx - VIEW_WIDTH // 2, 0), max(WIDTH - VIEW_WIDTH, 0))
+    top = min(max(playery - VIEW_HEIGHT // 2, 0), max(HEIGHT - VIEW_HEIGHT, 0))
+    for y in range(top, min(top + VIEW_HEIGHT, HEIGHT)):
+        row = maze.getRowText(y, False)[left:left + VIEW_WIDTH].replace(WALL, BLOCK)
+        if y == exity and left <= exitx < left + VIEW_WIDTH:
+            row = row[:exitx - left] + 'X' + row[exitx - left + 1:]
+        if y == playery:
+            row = row[:playerx - left] + PLAYER + row[playerx - left + 1:]
+        print(row)
 
 
 print('''Maze Runner 2D, by Al Sweigart al@inventwithpython.com
@@ -57,31 +59,14 @@ while True:
     print('There is no file named', filename)
 
 # Load the maze from a file:
-mazeFile = open(filename)
-maze = {}
-lines = mazeFile.readlines()
-playerx = None
-playery = None
-exitx = None
-exity = None
-y = 0
-for line in lines:
-    WIDTH = len(line.rstrip())
-    for x, character in enumerate(line.rstrip()):
-        assert character in (WALL, EMPTY, START, EXIT), 'Invalid character at column {}, line {}'.format(x + 1, y + 1)
-        if character in (WALL, EMPTY):
-            maze[(x, y)] = character
-        elif character == START:
-            playerx, playery = x, y
-            maze[(x, y)] = EMPTY
-        elif character == EXIT:
-            exitx, exity = x, y
-            maze[(x, y)] = EMPTY
-    y += 1
-HEIGHT = y
-
-assert playerx != None and playery != None, 'No start in maze file.'
-assert exitx != None and exity != None, 'No exit in maze file.'
+try:
+    maze = mazeengine.readMaze(filename)
+except ValueError as error:
+    print(error)
+    sys.exit()
+WIDTH, HEIGHT = maze.width, maze.height
+playerx, playery = maze.start
+exitx, exity = maze.exit
 
 while True:  # Main game loop.
     displayMaze(maze)
@@ -1,9 +1,12 @@
 """Maze 3D, by Al Sweigart al@inventwithpython.com
 Move around a maze and try to escape... in 3D!
+Every view is drawn ahead of time, so to time the drawing, run:
+python mazerunner3d.py --benchmark 1001 1001
 This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: extra-large, artistic, maze, game"""
 __version__ = 0
-import copy, sys, os
+import copy, sys, os, time
+import mazeengine  # Imports our mazeengine.py program.
 
 # Set up the constants:
 WALL = '#'
@@ -130,19 +133,16 @@ _/...
 .\...
 ..\..'''.strip()) # Paste to 12, 0.
 
-def displayWallDict(wallDict):
-    """Display a wall dictionary, as returned by wallStrToWallDict(), on
-    the screen."""
-    print(BLOCK * (wallDict['width'] + 2))
+def wallDictToStr(wallDict):
+    """Return the text of a wall dictionary, as returned by
+    wallStrToWallDict(), with a border of blocks around it and a newline
+    at the end of every line."""
+    lines = [BLOCK * (wallDict['width'] + 2)]
     for y in range(wallDict['height']):
-        print(BLOCK, end='')
-        for x in range(wallDict['width']):
-            wall = wallDict[(x, y)]
-            if wall == '.':
-                wall = ' '
-            print(wall, end='')
-        print(BLOCK)  # Print block with a newline.
-    print(BLOCK * (wallDict['width'] + 2))
+        row = ''.join(wallDict[(x, y)] for x in range(wallDict['width']))
+        lines.append(BLOCK + row.replace('.', ' ') + BLOCK)
+    lines.append(BLOCK * (wallDict['width'] + 2))
+    return '\n'.join(lines) + '\n'
 
 
 def pasteWallDict(srcWallDict, dstWallDict, left, top):
@@ -155,64 +155,109 @@ def pasteWallDict(srcWallDict, dstWallDict, left, top):
     return dstWallDict
 
 
-def makeWallDict(maze, playerx, playery, playerDirection, exitx, exity):
-    """From the player's position and direction in the maze (which has
-    an exit at exitx, exity), create the wall representation dictionary
-    by pasting wall dictionaries on top of ALL_OPEN, then return it."""
-
-    # The A-F "sections" (which are relative to the player's direction)
-    # determine which walls in the maze we check to see if we need to
-    # paste them over the wall representation dictionary we're creating.
-
-    if playerDirection == NORTH:
-        # Map of the sections, relative  A
-        # to the player @:              BCD (Player facing north)
-        #                               E@F
-        offsets = (('A', 0, -2), ('B', -1, -1), ('C', 0, -1),
-                   ('D', 1, -1), ('E', -1, 0), ('F', 1, 0))
-    if playerDirection == SOUTH:
-        # Map of the sections, relative F@E
-        # to the player @:              DCB (Player facing south)
-        #                                A
-        offsets = (('A', 0, 2), ('B', 1, 1), ('C', 0, 1),
-                   ('D', -1, 1), ('E', 1, 0), ('F', -1, 0))
-    if playerDirection == EAST:
-        # Map of the sections, relative EB
-        # to the player @:              @CA (Player facing east)
-        #                               FD
-        offsets = (('A', 2, 0), ('B', 1, -1), ('C', 1, 0),
-                   ('D', 1, 1), ('E', 0, -1), ('F', 0, 1))
-    if playerDirection == WEST:
-        # Map of the sections, relative  DF
-        # to the player @:              AC@ (Player facing west)
-        #                                BE
-        offsets = (('A', -2, 0), ('B', -1, 1), ('C', -1, 0),
-                   ('D', -1, -1), ('E', 0, 1), ('F', 0, -1))
-
-    section = {}
-    for sec, xOff, yOff in offsets:
-        section[sec] = maze.get((playerx + xOff, playery + yOff), WALL)
-        if (playerx + xOff, playery + yOff) == (exitx, exity):
-            section[sec] = EXIT
-
+# The A-F "sections" (which are relative to the player's direction)
+# determine which walls in the maze are drawn. Keys=directions,
+# values=the x, y offsets of sections A to F from the player.
+SECTION_OFFSETS = {
+    # Map of the sections, relative  A
+    # to the player @:              BCD (Player facing north)
+    #                               E@F
+    NORTH: ((0, -2), (-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0)),
+    # Map of the sections, relative F@E
+    # to the player @:              DCB (Player facing south)
+    #                                A
+    SOUTH: ((0, 2), (1, 1), (0, 1), (-1, 1), (1, 0), (-1, 0)),
+    # Map of the sections, relative EB
+    # to the player @:              @CA (Player facing east)
+    #                               FD
+    EAST: ((2, 0), (1, -1), (1, 0), (1, 1), (0, -1), (0, 1)),
+    # Map of the sections, relative  DF
+    # to the player @:              AC@ (Player facing west)
+    #                                BE
+    WEST: ((-2, 0), (-1, 1), (-1, 0), (-1, -1), (0, 1), (0, -1))}
+SECTIONS = 'ABCDEF'
+# The exit sign is only drawn for sections C, E, and F. Keys=sections,
+# values=the bit set in the view key when that section is the exit:
+EXIT_BITS = {'C': 1 << 6, 'E': 1 << 7, 'F': 1 << 8}
+NUM_VIEW_KEYS = 1 << 9
+
+
+def getViewKey(maze, playerx, playery, playerDirection, exitx, exity):
+    """Return the view key for the player's position and direction in
+    the maze (which has an exit at exitx, exity). Bits 0 to 5 are set if
+    sections A to F are walls, and bits 6 to 8 if section C, E, or F is
+    the exit. Everything drawn on the screen depends only on this key."""
+    viewKey = 0
+    for i, (xOff, yOff) in enumerate(SECTION_OFFSETS[playerDirection]):
+        x, y = playerx + xOff, playery + yOff
+        if (x, y) == (exitx, exity):
+            viewKey |= EXIT_BITS.get(SECTIONS[i], 0)
+        elif maze.isWall(x, y):
+            viewKey |= 1 << i
+    return viewKey
+
+
+def makeViewStr(viewKey):
+    """Create the wall representation dictionary for a view key by
+    pasting wall dictionaries on top of ALL_OPEN, then return its
+    text."""
     wallDict = copy.copy(ALL_OPEN)
     PASTE_CLOSED_TO = {'A': (6, 4), 'B': (4, 3), 'C': (3, 1),
                        'D': (10, 3), 'E': (0, 0), 'F': (12, 0)}
     for sec in 'ABDCEF':
-        if section[sec] == WALL:
+        if viewKey & (1 << SECTIONS.index(sec)):
             wallDict = pasteWallDict(CLOSED[sec], wallDict,
                 PASTE_CLOSED_TO[sec][0], PASTE_CLOSED_TO[sec][1])
 
     # Draw the EXIT sign if needed:
-    if section['C'] == EXIT:
+    if viewKey & EXIT_BITS['C']:
         wallDict = pasteWallDict(EXIT_DICT, wallDict, 7, 9)
-    if section['E'] == EXIT:
+    if viewKey & EXIT_BITS['E']:
         wallDict = pasteWallDict(EXIT_DICT, wallDict, 0, 11)
-    if section['F'] == EXIT:
+    if viewKey & EXIT_BITS['F']:
         wallDict = pasteWallDict(EXIT_DICT, wallDict, 13, 11)
 
-    return wallDict
+    return wallDictToStr(wallDict)
+
+
+# Every view is drawn once, here, so drawing a frame is only a list
+# lookup. (Keys with more than one exit bit can't happen, but are
+# cheaper to draw than to skip.)
+VIEW_CACHE = [makeViewStr(viewKey) for viewKey in range(NUM_VIEW_KEYS)]
+
+
+def runBenchmark(width=1001, height=1001):
+    """Walk the solution of a big maze, drawing every frame to nowhere,
+    and print the frames per second with and without VIEW_CACHE."""
+    maze = mazeengine.makeMaze(width, height, 'eller')
+    path = mazeengine.solveMaze(maze)
+    exitx, exity = maze.exit
+    DIRECTION_OF_STEP = {(0, -1): NORTH, (0, 1): SOUTH,
+                         (1, 0): EAST, (-1, 0): WEST}
+    # Face each step of the path before taking it:
+    frames = []
+    for (x, y), (nextx, nexty) in zip(path, path[1:]):
+        frames.append((x, y, DIRECTION_OF_STEP[(nextx - x, nexty - y)]))
+    print('Walking {} steps of a {}x{} maze.'.format(len(frames), width, height))
+
+    with open(os.devnull, 'w', encoding='utf-8') as screen:
+        startTime = time.perf_counter()
+        for x, y, direction in frames:
+            screen.write(VIEW_CACHE[getViewKey(maze, x, y, direction, exitx, exity)])
+        seconds = time.perf_counter() - startTime
+        print('Cached:   {:.0f} frames per second'.format(len(frames) / seconds))
+
+        uncachedFrames = frames[:2000]
+        startTime = time.perf_counter()
+        for x, y, direction in uncachedFrames:
+            screen.write(makeViewStr(getViewKey(maze, x, y, direction, exitx, exity)))
+        seconds = time.perf_counter() - startTime
+        print('Uncached: {:.0f} frames per second'.format(len(uncachedFrames) / seconds))
+
 
+if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+    runBenchmark(*[int(arg) for arg in sys.argv[2:4]])
+    sys.exit()
 
 print('Maze Runner 3D, by Al Sweigart al@inventwithpython.com')
 print('(Maze files are generated by mazemakerrec.py)')
@@ -239,36 +284,19 @@ while True:
     print('There is no file named', filename)
 
 # Load the maze from a file:
-mazeFile = open(filename)
-maze = {}
-lines = mazeFile.readlines()
-px = None
-py = None
-exitx = None
-exity = None
-y = 0
-for line in lines:
-    WIDTH = len(line.rstrip())
-    for x, character in enumerate(line.rstrip()):
-        assert character in (WALL, EMPTY, START, EXIT), 'Invalid character at column {}, line {}'.format(x + 1, y + 1)
-        if character in (WALL, EMPTY):
-            maze[(x, y)] = character
-        elif character == START:
-            px, py = x, y
-            maze[(x, y)] = EMPTY
-        elif character == EXIT:
-            exitx, exity = x, y
-            maze[(x, y)] = EMPTY
-    y += 1
-HEIGHT = y
-
-assert px != None and py != None, 'No start point in file.'
-assert exitx != None and exity != None, 'No exit point in file.'
+try:
+    maze = mazeengine.readMaze(filename)
+except ValueError as error:
+    print(error)
+    sys.exit()
+WIDTH, HEIGHT = maze.width, maze.height
+px, py = maze.start
+exitx, exity = maze.exit
 pDir = NORTH
 
 
 while True:  # Main game loop.
-    displayWallDict(makeWallDict(maze, px, py, pDir, exitx, exity))
+    sys.stdout.write(VIEW_CACHE[getViewKey(maze, px, py, pDir, exitx, exity)])
 
     while True: # Get user move.
         print('Location ({}, {})  Direction: {}'.format(px, py, pDir))
@@ -4,7 +4,17 @@ A simulation of one million dice rolls.
 This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: tiny, beginner, math, simulation"""
 __version__ = 0
-import random, time
+import random, sys, time
+import montecarlo  # Imports our montecarlo.py program.
+
+# "python milliondicestats.py --simulate 2" rolls 2 dice (or however
+# many you give) 100 times more than this program does, with
+# montecarlo.py on every CPU core. The rolls are added up in bulk
+# instead of one by one. A second number, like "--simulate 2 5000",
+# sets the number of rolls.
+if len(sys.argv) > 1 and sys.argv[1] == '--simulate':
+    montecarlo.runInNewProcess(['dice'] + sys.argv[2:])
+    sys.exit()
 
 print('''Million Dice Roll Statistics Simulator
 By Al Sweigart al@inventwithpython.com
@@ -0,0 +1,258 @@
+"""Monte Carlo Harness, by Al Sweigart al@inventwithpython.com
+A module for running huge numbers of random simulations, used by the
+Birthday Paradox, Monty Hall, Million Dice Roll, and Coin Flip
+programs. Random numbers are drawn in big batches of bytes instead of
+one random.randint() call at a time, and the batches are shared out
+to every CPU core, each with its own seeded random number generator.
+Running estimates with 95% confidence intervals are printed as the
+results come in.
+Run it with the name of a simulation, for example:
+python montecarlo.py birthday 23 100000000
+More info at https://en.wikipedia.org/wiki/Monte_Carlo_method
+Tags: large, module, math, simulation"""
+__version__ = 0
+import functools, math, multiprocessing, os, random, re, subprocess, sys, time
+
+DEFAULT_TRIALS = 100000000  # 100 million.
+BATCH_SIZE = 1000000  # How many trials each worker runs at a time.
+BIRTHDAY_CHUNK_SIZE = 4096  # How many birthday groups to compare at once.
+Z_SCORE_95 = 1.96  # For 95% confidence intervals.
+DAYS_IN_YEAR = 365
+
+
+def getRandomValues(rng, count, numChoices):
+    """Return a bytes object of count random values from 0 up to (but
+    not including) numChoices, which must be 256 or less."""
+    # Bytes at or above the largest multiple of numChoices are thrown
+    # away so that every value is equally likely. The rest are turned
+    # into values with one bytes.translate() call.
+    limit = 256 - (256 % numChoices)
+    table = bytes([byte % numChoices for byte in range(limit)] + [0] * (256 - limit))
+    rejected = bytes(range(limit, 256))
+    values = b''
+    while len(values) < count:
+        numBytes = count - len(values) + (count >> 4) + 16  # Extra, for rejects.
+        randomBytes = rng.getrandbits(numBytes * 8).to_bytes(numBytes, 'little')
+        values += randomBytes.translate(table, rejected)
+    return values[:count]
+
+
+def birthdayTrials(numPeople, rng, numTrials):
+    """Simulate numTrials groups of numPeople birthdays, and count how
+    many groups have a matching birthday."""
+    if numPeople > DAYS_IN_YEAR:
+        return {'matching birthday': numTrials}  # There must be a match.
+    numMatches = 0
+    for start in range(0, numTrials, BIRTHDAY_CHUNK_SIZE):
+        numMatches += _countBirthdayMatches(numPeople, rng, min(BIRTHDAY_CHUNK_SIZE, numTrials - start))
+    return {'matching birthday': numMatches}
+
+
+def _countBirthdayMatches(numPeople, rng, numTrials):
+    """Return how many of numTrials groups of numPeople birthdays have a
+    matching birthday. Instead of a set for each group, each person's
+    birthdays in every group are packed into one big integer, 16 bits
+    per group, and each pair of people is compared in all the groups
+    at once with a few integer operations."""
+    # A birthday is a random value from 0 to 72 in the low byte and
+    # from 0 to 4 in the high byte, which is 5 * 73 = 365 equally
+    # likely days:
+    numBirthdays = numPeople * numTrials
+    birthdays = bytearray(2 * numBirthdays)
+    birthdays[0::2] = getRandomValues(rng, numBirthdays, 73)
+    birthdays[1::2] = getRandomValues(rng, numBirthdays, 5)
+    groupBytes = 2 * numTrials
+    people = [int.from_bytes(birthdays[i:i + groupBytes], 'little')
+              for i in range(0, len(birthdays), groupBytes)]
+
+    # XORing two people's birthdays leaves a 0 in the groups where they
+    # match. Adding 0x7fff to each 16 bits then sets the top bit only
+    # where they don't match, and never carries into the next group:
+    lowBits = int.from_bytes(b'\xff\x7f' * numTrials, 'little')
+    noMatches = int.from_bytes(b'\x00\x80' * numTrials, 'little')  # The top bit of each group.
+    for i, person in enumerate(people):
+        for otherPerson in people[:i]:
+            noMatches &= (person ^ otherPerson) + lowBits
+    return numTrials - bin(noMatches).count('1')
+
+
+def montyHallTrials(rng, numTrials):
+    """Simulate numTrials Monty Hall games, counting how often staying
+    with the first door wins and how often swapping wins."""
+    # Each random value from 0 to 8 picks both the car's door (value
+    # // 3) and the player's door (value % 3). Staying wins when they
+    # match, which is when value is 0, 4, or 8:
+    games = getRandomValues(rng, numTrials, 9)
+    stayWins = games.count(0) + games.count(4) + games.count(8)
+    return {'staying wins': stayWins, 'swapping wins': numTrials - stayWins}
+
+
+def diceTrials(numDice, rng, numTrials):
+    """Simulate numTrials rolls of numDice six-sided dice, counting how
+    often each total comes up."""
+    dice = getRandomValues(rng, numTrials * numDice, 6)  # Values 0 to 5.
+    # The totals are counted plus 1 for each die, since the values go
+    # from 0 to 5 instead of 1 to 6.
+    if numDice * 5 > 255:
+        # The totals don't fit in a byte, so add up each group of
+        # numDice dice one at a time:
+        totals = map(sum, zip(*[iter(dice)] * numDice))
+        return {total + numDice: count for total, count in _countValues(totals).items()}
+
+    # Each trial's dice are numDice bytes apart, so dice[i::numDice] has
+    # die i of every trial. Adding these as big ints adds up every
+    # trial's dice at once, one byte per trial. No total is over 255,
+    # so nothing carries into the next trial's byte:
+    totalsNumber = 0
+    for i in range(numDice):
+        totalsNumber += int.from_bytes(dice[i::numDice], 'little')
+    totals = totalsNumber.to_bytes(numTrials, 'little')
+    counts = {}
+    for total in range(numDice * 5 + 1):
+        count = totals.count(total)
+        if count:
+            counts[total + numDice] = count
+    return counts
+
+
+def coinFlipTrials(rng, numTrials):
+    """Simulate numTrials coin flips, counting the streaks of heads and
+    tails. (Streaks are cut off at the end of each batch of flips.)"""
+    flips = bin(rng.getrandbits(numTrials) | (1 << numTrials))[3:]  # 1 is heads.
+    streaks = re.findall('1+|0+', flips)
+    counts = {}
+    for streak, count in _countValues(streaks).items():
+        side = 'heads' if streak[0] == '1' else 'tails'
+        counts['%s %s in a row' % (len(streak), side)] = count
+    return counts
+
+
+def _countValues(values):
+    """Return a dictionary of how many times each value appears."""
+    counts = {}  # Keys=values, values=how many times they appear.
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def _runBatch(trialFunction, seed, batchNum, numTrials):
+    """Run one batch of trials with its own random number generator.
+    Returns a (numTrials, counts) tuple."""
+    # Seeding with a string hashes it, so each batch gets an unrelated
+    # stream of random numbers:
+    rng = random.Random('%s:%s' % (seed, batchNum))
+    return numTrials, trialFunction(rng, numTrials)
+
+
+def _runBatchArgs(args):
+    """Call _runBatch() with a tuple of arguments, for Pool.imap()."""
+    return _runBatch(*args)
+
+
+def printEstimates(counts, trialsDone, elapsedTime):
+    """Print the estimated chance of each outcome, with a 95%
+    confidence interval."""
+    print('%s trials in %.1f seconds (%.0f per second):'
+          % (format(trialsDone, ','), elapsedTime, trialsDone / max(elapsedTime, 0.001)))
+    for outcome in sorted(counts, key=_sortKey):
+        chance = counts[outcome] / trialsDone
+        interval = Z_SCORE_95 * math.sqrt(chance * (1 - chance) / trialsDone)
+        print('  %s: %.4f%% (+/- %.4f%%)' % (outcome, chance * 100, interval * 100))
+
+
+def _sortKey(outcome):
+    """Sort outcomes like '10 heads in a row' by number, then by text."""
+    match = re.match(r'\d+', str(outcome))
+    return (int(match.group()) if match else 0, str(outcome))
+
+
+def runSimulation(trialFunction, numTrials=DEFAULT_TRIALS, seed=None, numWorkers=None,
+                  batchSize=BATCH_SIZE, reportInterval=1.0):
+    """Run numTrials trials of trialFunction(rng, numTrials), spread
+    across numWorkers processes (all CPU cores by default). Running
+    estimates are printed every reportInterval seconds. Returns the
+    dictionary of total counts for each outcome."""
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    if numWorkers is None:
+        numWorkers = os.cpu_count() or 1
+
+    # Split the trials into batches, each with its own seed:
+    batches = []
+    for batchNum, start in enumerate(range(0, numTrials, batchSize)):
+        batches.append((trialFunction, seed, batchNum, min(batchSize, numTrials - start)))
+
+    counts = {}  # Keys=outcomes, values=total counts.
+    trialsDone = 0
+    startTime = time.time()
+    lastReportTime = startTime
+    if numWorkers == 1:
+        pool = None
+        results = map(_runBatchArgs, batches)
+    else:
+        pool = multiprocessing.Pool(numWorkers)
+        results = pool.imap_unordered(_runBatchArgs, batches)
+    try:
+        for batchTrials, batchCounts in results:
+            trialsDone += batchTrials
+            for outcome, count in batchCounts.items():
+                counts[outcome] = counts.get(outcome, 0) + count
+            if reportInterval is not None and time.time() > lastReportTime + reportInterval:
+                printEstimates(counts, trialsDone, time.time() - startTime)
+                lastReportTime = time.time()
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    if reportInterval is not None:
+        print()
+        print('Final results (seed %s, %s worker processes):' % (seed, numWorkers))
+        printEstimates(counts, trialsDone, time.time() - startTime)
+    return counts
+
+
+def runInNewProcess(args):
+    """Run this module as a program with the given command line
+    arguments. The simulation programs use this so that the worker
+    processes don't re-run the program's own code when they start."""
+    return subprocess.call([sys.executable, os.path.abspath(__file__)] + list(args))
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('birthday', 'montyhall', 'dice', 'coinflip'):
+        print('Usage:')
+        print('  python montecarlo.py birthday [numPeople] [numTrials]')
+        print('  python montecarlo.py montyhall [numTrials]')
+        print('  python montecarlo.py dice [numDice] [numTrials]')
+        print('  python montecarlo.py coinflip [numTrials]')
+        sys.exit()
+
+    args = [int(arg) for arg in sys.argv[2:]]
+    name = sys.argv[1]
+    if name == 'birthday':
+        numPeople = args[0] if len(args) > 0 else 23
+        numTrials = args[1] if len(args) > 1 else DEFAULT_TRIALS
+        print('Simulating %s groups of %s birthdays...' % (format(numTrials, ','), numPeople))
+        trialFunction = functools.partial(birthdayTrials, numPeople)
+    elif name == 'montyhall':
+        numTrials = args[0] if len(args) > 0 else DEFAULT_TRIALS
+        print('Simulating %s Monty Hall games...' % (format(numTrials, ',')))
+        trialFunction = montyHallTrials
+    elif name == 'dice':
+        numDice = args[0] if len(args) > 0 else 2
+        numTrials = args[1] if len(args) > 1 else DEFAULT_TRIALS
+        print('Simulating %s rolls of %s dice...' % (format(numTrials, ','), numDice))
+        trialFunction = functools.partial(diceTrials, numDice)
+    elif name == 'coinflip':
+        numTrials = args[0] if len(args) > 0 else DEFAULT_TRIALS
+        print('Simulating %s coin flips...' % (format(numTrials, ',')))
+        trialFunction = coinFlipTrials
+    runSimulation(trialFunction, numTrials)
+
+
+# If this program isn't being imported, run the simulation.
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
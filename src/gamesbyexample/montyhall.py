@@ -5,6 +5,7 @@ This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: large, game, math, simulation"""
 __version__ = 0
 import random, sys
+import montecarlo  # Imports our montecarlo.py program.
 
 ALL_CLOSED = """
 +------+  +------+  +------+
@@ -69,6 +70,14 @@ THIRD_CAR_OTHERS_GOAT = """
 |GOAT|||  |GOAT|||  |   O  |
 +------+  +------+  +------+"""
 
+# Still not sure swapping wins more often? "python montyhall.py
+# --simulate" has montecarlo.py play 100,000,000 games both ways on
+# every CPU core, instead of you playing them one at a time. Put a
+# number after it, like "--simulate 5000", to play that many instead.
+if len(sys.argv) > 1 and sys.argv[1] == '--simulate':
+    montecarlo.runInNewProcess(['montyhall'] + sys.argv[2:])
+    sys.exit()
+
 print('''The Monty Hall Problem, by Al Sweigart al@inventwithpython.com
 
 In the Monty Hall game show, you can pick one of three doors. One door
@@ -8,6 +8,8 @@ try:
     import pyperclip  # pyperclip copies text to the clipboard.
 except:
     pass  # If pyperclip is not installed, do nothing. It's no big deal.
+import sys
+import cipherstream  # Imports our cipherstream.py program.
 
 ENGLISH_TO_MORSE = {'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..',
     'E': '.', 'F': '..-.', 'G': '--.', 'H': '....', 'I': '..',
@@ -77,6 +79,27 @@ def morseToEnglish(message):
     return ''.join(english)
 
 
+def streamMessage(inputType, inFilename=None, outFilename=None):
+    """Translate inFilename (or stdin) into outFilename (or stdout) a
+    chunk at a time. inputType is 'E' if the input is English, or 'M'
+    if it's Morse code."""
+    if inputType.upper() == 'E':
+        codes = dict(ENGLISH_TO_MORSE)
+        for character, code in ENGLISH_TO_MORSE.items():
+            codes[character.lower()] = code  # Lowercase letters work too.
+        transform = cipherstream.CodeTransform(codes, ' ')
+    else:
+        transform = cipherstream.DecodeTransform(MORSE_TO_ENGLISH, ' ')
+    cipherstream.streamFiles(transform, inFilename, outFilename)
+
+
 # If the program is run (instead of imported), run the game:
 if __name__ == '__main__':
-    main()
+    # (!) Run this program as "python morsecode.py --stream E" to
+    # translate English from stdin to Morse code on stdout without any
+    # questions (or M to translate Morse code to English), or add input
+    # and output filenames to translate a file of any size.
+    if len(sys.argv) > 2 and sys.argv[1] == '--stream':
+        streamMessage(*sys.argv[2:])
+    else:
+        main()
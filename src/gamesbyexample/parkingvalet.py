@@ -7,7 +7,8 @@ More info at https://www.michaelfogleman.com/rush/
 This and other games are available at https://nostarch.com/XX
 Tags: large, board game, game, puzzle"""
 __version__ = 0
-import math, random, sys
+import math, sys
+import parkingvaletsolver  # Imports our parkingvaletsolver.py program.
 
 # Set up the constants:
 EMPTY_SPACE = '.'
@@ -22,6 +23,7 @@ Puzzles by Michael Fogleman.
 Get the "A" car to the right edge of the board.
 Enter moves as <car letter><direction>.
 Directions are (L)eft, (R)ight, (U)p, and (D)own.
+Enter HINT to see the fewest moves that solve the puzzle.
 """)
     input('Press Enter to begin...')
 
@@ -33,6 +35,8 @@ Directions are (L)eft, (R)ight, (U)p, and (D)own.
         playerMove = askForPlayerMove(gameBoard)
         if playerMove == 'RESET':
             gameBoard = getBoard(puzzle)  # Restore the original board.
+        elif playerMove == 'HINT':
+            showHint(gameBoard)
         else:
             makeMove(gameBoard, playerMove)
         if hasWon(gameBoard):
@@ -49,21 +53,12 @@ def getRandomPuzzle():
     ..BB.X...KDDAA.KL.HIEEL.HIJFFFGGJ...
     .EBBIK.EFGIKAAFGJL..F.JLD..H..DCCH..
     """
-    numberOfPuzzles = 0
-    puzzleFile = open('parkingvaletpuzzles.txt')
-    while puzzleFile.readline():
-        numberOfPuzzles += 1
-    puzzleFile.close()
-
-    randomPuzzleNum = random.randint(1, numberOfPuzzles)
-    counter = 1
-    puzzleFile = open('parkingvaletpuzzles.txt')
-    while True:
-        if counter == randomPuzzleNum:
-            return puzzleFile.readline()
-        else:
-            puzzleFile.readline()
-            counter += 1
+    # The puzzle is read straight from its place in the file, instead
+    # of reading every line before it:
+    puzzleStore = parkingvaletsolver.PuzzleStore('parkingvaletpuzzles.txt')
+    puzzle = puzzleStore.getRandomPuzzle()
+    puzzleStore.close()
+    return puzzle
 
 
 def getBoard(puzzleAsString):
@@ -194,6 +189,22 @@ def makeMove(board, move):
         board[newCarPosition] = car
 
 
+def showHint(board):
+    """Display the fewest moves that solve the board as it is now."""
+    puzzle = ''
+    for y in range(board['height']):
+        for x in range(board['width']):
+            # The solver uses X for walls, the same as the puzzle file:
+            puzzle += 'X' if board[(x, y)] == WALL else board[(x, y)]
+    solution = parkingvaletsolver.solve(puzzle)
+    if solution is None:
+        print('This puzzle has no solution from here. Enter RESET to start over.')
+    else:
+        print('Hint: these', len(solution), 'moves solve the puzzle:')
+        print(' '.join(solution))
+    input('Press Enter to continue...')
+
+
 def hasWon(board):
     """Return True if the 'A' car has reached the right edge."""
     # The puzzle is solved when the 'A' car reaches the right edge.
@@ -209,12 +220,12 @@ def askForPlayerMove(board):
     validMoves = getValidMoves(board)
     while True:
         allValidMoves = '", "'.join(validMoves)
-        print('Moves: "{}", "RESET", or "QUIT".'.format(allValidMoves))
+        print('Moves: "{}", "RESET", "HINT", or "QUIT".'.format(allValidMoves))
         move = input('> ').upper()
         if move == 'QUIT':
             sys.exit()
-        if move == 'RESET':
-            return 'RESET'
+        if move in ('RESET', 'HINT'):
+            return move
         if move in validMoves:
             return move
 
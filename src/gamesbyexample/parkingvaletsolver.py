@@ -0,0 +1,280 @@
+"""Parking Valet Solver, by Al Sweigart al@inventwithpython.com
+A Rush Hour puzzle module, used by the Parking Valet game for picking
+puzzles and giving hints. The puzzle file has one puzzle per line, all
+the same length, so any puzzle can be read straight from its position
+in the file without reading the lines before it. Each car can only
+slide along its lane, so a board is packed into a single int holding
+every car's position in its lane, and the solver searches these ints
+breadth first to find the fewest moves.
+Run it with a puzzle file to solve and rank every puzzle in it:
+python parkingvaletsolver.py parkingvaletpuzzles.txt
+More info at https://www.michaelfogleman.com/rush/
+Tags: large, module, puzzle"""
+__version__ = 0
+import math, mmap, multiprocessing, os, random, sys, time
+
+# Set up the constants:
+PUZZLE_FILENAME = 'parkingvaletpuzzles.txt'
+EMPTY_SPACE = '.'
+WALL = 'X'
+TARGET_CAR = 'A'  # The car that has to reach the right edge.
+# The move letters for sliding a car back or forward along its lane:
+HORIZONTAL_MOVES = ('L', 'R')
+VERTICAL_MOVES = ('U', 'D')
+
+
+class PuzzleStore:
+    def __init__(self, filename=PUZZLE_FILENAME):
+        """Open a puzzle file for reading single puzzles by number. The
+        file is memory mapped, so only the pages that are read get
+        loaded."""
+        with open(filename, 'rb') as puzzleFile:
+            self.data = mmap.mmap(puzzleFile.fileno(), 0, access=mmap.ACCESS_READ)
+        firstNewline = self.data.find(b'\n')
+        if firstNewline == -1:
+            firstNewline = len(self.data)  # The file has only one line.
+        self.recordLength = firstNewline + 1  # Includes the newline.
+        self.puzzleLength = len(self.data[:firstNewline].rstrip(b'\r'))
+
+        # If every line is as long as the first (the last line may be
+        # missing its newline), puzzle i starts at i * recordLength.
+        # Otherwise, the start of every line is found once, here:
+        numRecords = (len(self.data) + self.recordLength - 1) // self.recordLength
+        lastStart = (numRecords - 1) * self.recordLength
+        if (numRecords > 0 and self.data[lastStart - 1:lastStart] in (b'', b'\n')
+                and self.data.find(b'\n', lastStart, len(self.data) - 1) == -1):
+            self.offsets = None
+            self.numPuzzles = numRecords
+        else:
+            self.offsets = [0]
+            while True:
+                newline = self.data.find(b'\n', self.offsets[-1])
+                if newline == -1 or newline == len(self.data) - 1:
+                    break
+                self.offsets.append(newline + 1)
+            self.numPuzzles = len(self.offsets)
+
+
+    def __len__(self):
+        return self.numPuzzles
+
+
+    def getPuzzle(self, puzzleNum):
+        """Return the puzzle string on line puzzleNum (starting at 0)."""
+        if not 0 <= puzzleNum < self.numPuzzles:
+            raise IndexError('There is no puzzle number ' + str(puzzleNum))
+        if self.offsets is None:
+            start = puzzleNum * self.recordLength
+            end = start + self.recordLength
+        else:
+            start = self.offsets[puzzleNum]
+            end = self.data.find(b'\n', start)
+            if end == -1:
+                end = len(self.data)
+        return self.data[start:end].decode('ascii').rstrip('\r\n')
+
+
+    def getRandomPuzzle(self):
+        return self.getPuzzle(random.randrange(self.numPuzzles))
+
+
+    def close(self):
+        self.data.close()
+
+
+class ParkingLot:
+    def __init__(self, puzzle):
+        """Set up the unchanging parts of a puzzle from its string: each
+        car's lane, and the spaces the car covers at each position in
+        its lane. Spaces are bits numbered left to right, top to
+        bottom."""
+        self.length = int(math.sqrt(len(puzzle)))
+        if self.length * self.length != len(puzzle):
+            raise ValueError('Puzzles must be square.')
+        length = self.length
+
+        carSpaces = {}  # Keys=car letters, values=lists of space numbers.
+        self.wallMask = 0
+        for space, character in enumerate(puzzle):
+            if character == EMPTY_SPACE:
+                continue
+            elif character.isalpha() and character != WALL:
+                carSpaces.setdefault(character, []).append(space)
+            else:
+                self.wallMask |= 1 << space
+        if TARGET_CAR not in carSpaces:
+            raise ValueError('The puzzle has no ' + TARGET_CAR + ' car.')
+
+        # Each car's position is stored in bitsPerCar bits of the state:
+        self.bitsPerCar = length.bit_length()
+        self.cars = sorted(carSpaces)
+        self.target = self.cars.index(TARGET_CAR)
+        self.isHorizontal = []
+        self.maxPositions = []
+        # carMasks[car][position] is the bitmask of the spaces the car
+        # covers at that position in its lane. beforeMasks and
+        # afterMasks are the space the car moves onto going back or
+        # forward from that position:
+        self.carMasks = []
+        self.beforeMasks = []
+        self.afterMasks = []
+        self.startState = 0
+        for car, letter in enumerate(self.cars):
+            spaces = sorted(carSpaces[letter])
+            carLength = len(spaces)
+            isHorizontal = carLength == 1 or spaces[1] - spaces[0] == 1
+            step = 1 if isHorizontal else length
+            if carLength < 2 or any(spaces[i] != spaces[0] + i * step for i in range(carLength)) \
+               or (isHorizontal and spaces[0] // length != spaces[-1] // length):
+                raise ValueError('Car ' + letter + ' is not a straight line of spaces.')
+            if isHorizontal:
+                laneStart = spaces[0] - spaces[0] % length
+                position = spaces[0] % length
+            else:
+                laneStart = spaces[0] % length
+                position = spaces[0] // length
+            maxPosition = length - carLength
+            masks = [sum(1 << (laneStart + (position + i) * step) for i in range(carLength))
+                     for position in range(maxPosition + 1)]
+            self.isHorizontal.append(isHorizontal)
+            self.maxPositions.append(maxPosition)
+            self.carMasks.append(masks)
+            self.beforeMasks.append([0] + [1 << (laneStart + (position - 1) * step) for position in range(1, maxPosition + 1)])
+            self.afterMasks.append([1 << (laneStart + (position + carLength) * step) for position in range(maxPosition)] + [0])
+            self.startState |= position << (car * self.bitsPerCar)
+
+        # The target car is out when it covers a space on the right edge:
+        rightEdgeMask = sum(1 << (y * length + length - 1) for y in range(length))
+        self.isGoalPosition = [bool(mask & rightEdgeMask) for mask in self.carMasks[self.target]]
+
+
+    def getPosition(self, state, car):
+        return (state >> (car * self.bitsPerCar)) & ((1 << self.bitsPerCar) - 1)
+
+
+    def getOccupied(self, state):
+        """Return the bitmask of the spaces covered by walls and cars."""
+        occupied = self.wallMask
+        for car, masks in enumerate(self.carMasks):
+            occupied |= masks[self.getPosition(state, car)]
+        return occupied
+
+
+    def getMove(self, state, nextState):
+        """Return the move, such as 'AR', that changes state into
+        nextState."""
+        for car, letter in enumerate(self.cars):
+            difference = self.getPosition(nextState, car) - self.getPosition(state, car)
+            if difference != 0:
+                moveLetters = HORIZONTAL_MOVES if self.isHorizontal[car] else VERTICAL_MOVES
+                return letter + moveLetters[difference > 0]
+        raise ValueError('The states are the same.')
+
+
+    def search(self, maxStates=None):
+        """Search every state reachable from the start, breadth first.
+        Returns a (list of moves or None, number of states) tuple. The
+        moves slide a car one space, the same as the game's moves, so
+        the list is as short as a solution can be."""
+        carRange = range(len(self.cars))
+        bitsPerCar = self.bitsPerCar
+        positionMask = (1 << bitsPerCar) - 1
+        carMasks, beforeMasks, afterMasks = self.carMasks, self.beforeMasks, self.afterMasks
+        target, isGoalPosition = self.target, self.isGoalPosition
+
+        parents = {self.startState: None}  # Keys=states, values=the states before them.
+        if isGoalPosition[self.getPosition(self.startState, target)]:
+            return [], 1
+        # Each state is searched with the bitmask of occupied spaces,
+        # which is updated for each move instead of being rebuilt:
+        frontier = [(self.startState, self.getOccupied(self.startState))]
+        while frontier:
+            nextFrontier = []
+            for state, occupied in frontier:
+                for car in carRange:
+                    shift = car * bitsPerCar
+                    position = (state >> shift) & positionMask
+                    masks = carMasks[car]
+                    for newPosition, blockingMask in ((position - 1, beforeMasks[car][position]),
+                                                      (position + 1, afterMasks[car][position])):
+                        if blockingMask == 0 or occupied & blockingMask:
+                            continue  # The car is at the end of its lane or blocked.
+                        newState = state + ((newPosition - position) << shift)
+                        if newState in parents:
+                            continue
+                        parents[newState] = state
+                        if car == target and isGoalPosition[newPosition]:
+                            return self._getMovesTo(parents, newState), len(parents)
+                        nextFrontier.append((newState, occupied ^ masks[position] ^ masks[newPosition]))
+            if maxStates is not None and len(parents) > maxStates:
+                break
+            frontier = nextFrontier
+        return None, len(parents)
+
+
+    def _getMovesTo(self, parents, state):
+        moves = []
+        while parents[state] is not None:
+            moves.append(self.getMove(parents[state], state))
+            state = parents[state]
+        return list(reversed(moves))
+
+
+def solve(puzzle, maxStates=None):
+    """Return a list of the fewest moves (such as 'AR' or 'BU') that
+    solve the puzzle string, or None if it can't be solved."""
+    return ParkingLot(puzzle).search(maxStates)[0]
+
+
+def _rankPuzzle(puzzle):
+    startTime = time.time()
+    moves, numStates = ParkingLot(puzzle).search()
+    return (None if moves is None else len(moves)), numStates, time.time() - startTime
+
+
+def solveFile(filename=PUZZLE_FILENAME, numWorkers=None):
+    """Solve every puzzle in the file, spread across numWorkers
+    processes (all CPU cores by default), and print each puzzle's
+    fewest moves and the number of states searched, then a summary of
+    the difficulties."""
+    store = PuzzleStore(filename)
+    puzzles = [store.getPuzzle(i) for i in range(len(store))]
+    store.close()
+    if numWorkers is None:
+        numWorkers = os.cpu_count() or 1
+
+    startTime = time.time()
+    pool = multiprocessing.Pool(numWorkers) if numWorkers > 1 else None
+    try:
+        if pool is not None:
+            results = pool.imap(_rankPuzzle, puzzles, chunksize=32)
+        else:
+            results = map(_rankPuzzle, puzzles)
+        ranking = []  # A list of (moves, puzzle number) tuples.
+        for puzzleNum, (numMoves, numStates, seconds) in enumerate(results):
+            if numMoves is None:
+                print('Puzzle %s: no solution, %s states, %.3f s' % (puzzleNum, numStates, seconds))
+            else:
+                print('Puzzle %s: %s moves, %s states, %.3f s' % (puzzleNum, numMoves, numStates, seconds))
+                ranking.append((numMoves, puzzleNum))
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    print()
+    print('Solved %s of %s puzzles in %.1f seconds.' % (len(ranking), len(puzzles), time.time() - startTime))
+    if ranking:
+        ranking.sort()
+        print('Fewest moves: %s, median: %s, most: %s' % (
+            ranking[0][0], ranking[len(ranking) // 2][0], ranking[-1][0]))
+        print('The hardest puzzles are:')
+        for numMoves, puzzleNum in reversed(ranking[-10:]):
+            print('  Puzzle %s (%s moves): %s' % (puzzleNum, numMoves, puzzles[puzzleNum]))
+
+
+# If this program isn't being imported, solve the given puzzle file.
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        solveFile(sys.argv[1])
+    else:
+        solveFile()
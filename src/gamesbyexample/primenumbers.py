@@ -6,7 +6,8 @@ More info at: https://en.wikipedia.org/wiki/Prime_number
 This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: tiny, math, scrolling"""
 
-import math, sys
+import sys
+import primes  # Imports our primes.py program.
 
 def main():
     print('Prime Numbers, by Al Sweigart al@inventwithpython.com')
@@ -25,27 +26,15 @@ def main():
 
     input('Press Ctrl-C at any time to quit. Press Enter to begin...')
 
-    while True:
-        # Print out any prime numbers:
-        if isPrime(num):
-            print(str(num) + ', ', end='', flush=True)
-        num = num + 1  # Go to the next number.
+    # Print out the prime numbers, which are sieved a big segment of
+    # numbers at a time instead of being checked one at a time:
+    for prime in primes.iterPrimes(num):
+        print(str(prime) + ', ', end='', flush=True)
 
 
 def isPrime(number):
     """Returns True if number is prime, otherwise returns False."""
-    # Handle special cases:
-    if number < 2:
-        return False
-    elif number == 2:
-        return True
-
-    # Try to evenly divide number by all numbers from 2 up to number's
-    # square root.
-    for i in range(2, int(math.sqrt(number)) + 1):
-        if number % i == 0:
-            return False
-    return True
+    return primes.isPrime(number)
 
 
 # If this program was run (instead of imported), run the game:
@@ -0,0 +1,176 @@
+"""Primes, by Al Sweigart al@inventwithpython.com
+A fast prime number module, used by the Prime Numbers and Ulam Spiral
+programs. Primes are found a segment at a time with the Sieve of
+Eratosthenes, where each segment is a bytearray (of odd numbers only)
+small enough to stay in the CPU's cache. Single large numbers are
+checked with the Miller-Rabin primality test instead.
+Run it to benchmark how many primes per second it finds, for example:
+python primes.py 1000000000000
+More info at https://en.wikipedia.org/wiki/Sieve_of_Eratosthenes
+Tags: large, module, math"""
+__version__ = 0
+import itertools, math, sys, time
+
+# Each segment holds this many odd numbers, one byte each. 1 MB fits
+# in most CPUs' L2 or L3 cache, and is big enough that the Python code
+# run for each base prime doesn't dominate the time:
+SEGMENT_SIZE = 1048576
+
+# With these bases, Miller-Rabin is always correct for numbers below
+# 3,317,044,064,679,887,385,961,981:
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47)
+
+
+def primesUpTo(limit):
+    """Return a list of all the primes less than or equal to limit,
+    using a simple (unsegmented) Sieve of Eratosthenes."""
+    if limit < 2:
+        return []
+    # sieve[i] is 1 if the odd number 2 * i + 1 might be prime:
+    sieve = bytearray([1]) * ((limit + 1) // 2)
+    sieve[0] = 0  # 1 is not prime.
+    for i in range(1, _isqrt(limit) // 2 + 1):
+        if sieve[i]:
+            prime = 2 * i + 1
+            start = prime * prime // 2
+            sieve[start::prime] = bytes(len(range(start, len(sieve), prime)))
+    return [2] + list(itertools.compress(range(1, limit + 1, 2), sieve))
+
+
+def sieveSegment(low, size, basePrimes):
+    """Return a bytearray of size bytes, where byte i is 1 if the odd
+    number low + 2 * i is prime. low must be odd, and basePrimes must
+    include every odd prime up to the square root of the largest
+    number in the segment."""
+    segment = bytearray([1]) * size
+    zeros = memoryview(bytes(size))  # Slicing a memoryview doesn't copy.
+    high = low + 2 * size  # One past the last number in the segment.
+    for prime in basePrimes:
+        if prime * prime >= high:
+            break
+        # Find the first odd multiple of prime that is at least low
+        # (but not prime itself):
+        first = max(prime * prime, (low + prime - 1) // prime * prime)
+        if first % 2 == 0:
+            first += prime
+        start = (first - low) // 2
+        if start < size:
+            segment[start::prime] = zeros[:(size - 1 - start) // prime + 1]
+    if low == 1:
+        segment[0] = 0  # 1 is not prime.
+    return segment
+
+
+def _iterSegments(start, stop):
+    """Yield (low, segment) tuples covering the odd numbers from start
+    up to (but not including) stop, or forever if stop is None."""
+    low = max(start, 1) | 1  # Segments start on an odd number.
+    basePrimes = []
+    basePrimesLimit = 0
+    while stop is None or low < stop:
+        size = SEGMENT_SIZE
+        if stop is not None:
+            size = min(size, (stop - low + 1) // 2)
+        high = low + 2 * size
+        if basePrimesLimit * basePrimesLimit < high:
+            # Sieve more base primes, with room to spare for the next
+            # several segments:
+            basePrimesLimit = _isqrt(high) * 2 + 1000
+            basePrimes = primesUpTo(basePrimesLimit)[1:]  # Skip 2.
+        yield low, sieveSegment(low, size, basePrimes)
+        low = high
+
+
+def iterPrimes(start=0, stop=None):
+    """Yield the primes from start up to (but not including) stop, in
+    order. If stop is None, keep yielding primes forever."""
+    if start <= 2 and (stop is None or stop > 2):
+        yield 2
+    for low, segment in _iterSegments(start, stop):
+        yield from itertools.compress(range(low, low + 2 * len(segment), 2), segment)
+
+
+def countPrimes(start, stop):
+    """Return how many primes there are from start up to (but not
+    including) stop."""
+    total = 1 if start <= 2 < stop else 0
+    for low, segment in _iterSegments(start, stop):
+        total += segment.count(1)
+    return total
+
+
+def isPrime(number):
+    """Returns True if number is prime, otherwise returns False."""
+    if number < 2:
+        return False
+    for prime in SMALL_PRIMES:
+        if number % prime == 0:
+            return number == prime
+
+    # Write number - 1 as oddPart * 2 ** numTwos:
+    oddPart = number - 1
+    numTwos = 0
+    while oddPart % 2 == 0:
+        oddPart //= 2
+        numTwos += 1
+
+    for base in MILLER_RABIN_BASES:
+        x = pow(base, oddPart, number)
+        if x == 1 or x == number - 1:
+            continue
+        for i in range(numTwos - 1):
+            x = x * x % number
+            if x == number - 1:
+                break
+        else:
+            return False  # base proves that number is composite.
+    return True
+
+
+def _isqrt(number):
+    """Return the integer square root of number."""
+    if hasattr(math, 'isqrt'):
+        return math.isqrt(number)
+    root = int(math.sqrt(number))
+    while root * root > number:
+        root -= 1
+    while (root + 1) * (root + 1) <= number:
+        root += 1
+    return root
+
+
+def runBenchmark(start=10 ** 12, amount=10 ** 8):
+    """Print how fast primes are found between start and start + amount
+    with the sieve, and with Miller-Rabin on each odd number."""
+    print('Sieving the %s numbers after %s...' % (format(amount, ','), format(start, ',')))
+    startTime = time.time()
+    numPrimes = countPrimes(start, start + amount)
+    sieveTime = time.time() - startTime
+    print('Found %s primes in %.2f seconds (%s primes/second).'
+          % (format(numPrimes, ','), sieveTime, format(int(numPrimes / sieveTime), ',')))
+
+    startTime = time.time()
+    numPrimes = 0
+    for prime in iterPrimes(start, start + amount // 100):
+        numPrimes += 1
+    iterTime = time.time() - startTime
+    print('Streamed %s primes in %.2f seconds (%s primes/second).'
+          % (format(numPrimes, ','), iterTime, format(int(numPrimes / iterTime), ',')))
+
+    startTime = time.time()
+    numPrimes = 0
+    for number in range(start | 1, start + amount // 1000, 2):
+        if isPrime(number):
+            numPrimes += 1
+    millerRabinTime = time.time() - startTime
+    print('Miller-Rabin found %s primes in %.2f seconds (%s primes/second).'
+          % (format(numPrimes, ','), millerRabinTime, format(int(numPrimes / millerRabinTime), ',')))
+
+
+# If this program isn't being imported, run the benchmark.
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        runBenchmark(int(sys.argv[1]))
+    else:
+        runBenchmark()
@@ -8,9 +8,13 @@ __version__ = 1
 # Your Own Computer Games with Python", chapter 15:
 #   http://inventwithpython.com/chapter15.html
 
-import random, sys, pygame, time, copy
+import random, os, sys, pygame, copy
 from pygame.locals import *
 
+# The AI lives in reversiengine.py, one folder up from this program:
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import reversiengine
+
 FPS = 10 # frames per second to update the screen
 WINDOWWIDTH = 640 # width of the program's window, in pixels
 WINDOWHEIGHT = 480 # height in pixels
@@ -22,6 +26,7 @@ BLACK_TILE = 'BLACK_TILE' # an arbitrary but unique value
 EMPTY_SPACE = 'EMPTY_SPACE' # an arbitrary but unique value
 HINT_TILE = 'HINT_TILE' # an arbitrary but unique value
 ANIMATIONSPEED = 25 # integer from 1 to 100, higher is faster animation
+AITHINKINGTIME = 1 # how many seconds the computer can think about each move
 
 # Amount of space on the left & right side (XMARGIN) or above and below
 # (YMARGIN) the game board, in pixels.
@@ -156,12 +161,10 @@ def runGame():
             DISPLAYSURF.blit(newGameSurf, newGameRect)
             DISPLAYSURF.blit(hintsSurf, hintsRect)
 
-            # Make it look like the computer is thinking by pausing a bit.
-            pauseUntil = time.time() + random.randint(5, 15) * 0.1
-            while time.time() < pauseUntil:
-                pygame.display.update()
+            pygame.display.update()
 
-            # Make the move and end the turn.
+            # Let the computer think for up to AITHINKINGTIME seconds,
+            # then make the move and end the turn.
             x, y = getComputerMove(mainBoard, computerTile)
             makeMove(mainBoard, computerTile, x, y, True)
             if getValidMoves(mainBoard, playerTile) != []:
@@ -475,37 +478,22 @@ def makeMove(board, tile, xstart, ystart, realMove=False):
     return True
 
 
-def isOnCorner(x, y):
-    # Returns True if the position is in one of the four corners.
-    return (x == 0 and y == 0) or \
-           (x == BOARDWIDTH and y == 0) or \
-           (x == 0 and y == BOARDHEIGHT) or \
-           (x == BOARDWIDTH and y == BOARDHEIGHT)
-
-
 def getComputerMove(board, computerTile):
     # Given a board and the computer's tile, determine where to
-    # move and return that move as a [x, y] list.
-    possibleMoves = getValidMoves(board, computerTile)
-
-    # randomize the order of the possible moves
-    random.shuffle(possibleMoves)
-
-    # always go for a corner if available.
-    for x, y in possibleMoves:
-        if isOnCorner(x, y):
-            return [x, y]
-
-    # Go through all possible moves and remember the best scoring move
-    bestScore = -1
-    for x, y in possibleMoves:
-        dupeBoard = copy.deepcopy(board)
-        makeMove(dupeBoard, computerTile, x, y)
-        score = getScoreOfBoard(dupeBoard)[computerTile]
-        if score > bestScore:
-            bestMove = [x, y]
-            bestScore = score
-    return bestMove
+    # move and return that move as an (x, y) tuple.
+    computerTiles, otherTiles = 0, 0
+    for x in range(BOARDWIDTH):
+        for y in range(BOARDHEIGHT):
+            if board[x][y] == computerTile:
+                computerTiles |= 1 << reversiengine.toIndex(x, y)
+            elif board[x][y] in (WHITE_TILE, BLACK_TILE):
+                otherTiles |= 1 << reversiengine.toIndex(x, y)
+    move = AISEARCHER.getBestMove(computerTiles, otherTiles, AITHINKINGTIME)
+    return reversiengine.toXY(move)
+
+
+# the computer's AI, which remembers boards it has searched before
+AISEARCHER = reversiengine.Searcher()
 
 
 def checkForQuit():
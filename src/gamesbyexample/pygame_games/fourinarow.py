@@ -4,14 +4,18 @@
 
 
 __version__ = 1
-import random, copy, sys, pygame
+import random, os, sys, pygame
 from pygame.locals import *
 
+# The AI lives in fourinarowengine.py, one folder up from this program:
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import fourinarowengine
+
 BOARDWIDTH = 7  # how many spaces wide the board is
 BOARDHEIGHT = 6 # how many spaces tall the board is
 assert BOARDWIDTH >= 4 and BOARDHEIGHT >= 4, 'Board must be at least 4x4.'
 
-DIFFICULTY = 2 # how many moves to look ahead. (>2 is usually too much)
+DIFFICULTY = 1 # how many seconds the computer can think about each move
 
 SPACESIZE = 50 # size of the tokens and individual board spaces in pixels
 
@@ -34,6 +38,9 @@ EMPTY = None
 HUMAN = 'human'
 COMPUTER = 'computer'
 
+# The computer's AI, which remembers positions it has searched before:
+AI_SEARCHER = fourinarowengine.Searcher()
+
 
 def main():
     global FPSCLOCK, DISPLAYSURF, REDPILERECT, BLACKPILERECT, REDTOKENIMG
@@ -256,59 +263,17 @@ def animateComputerMoving(board, column):
 
 
 def getComputerMove(board):
-    potentialMoves = getPotentialMoves(board, BLACK, DIFFICULTY)
-    # get the best fitness from the potential moves
-    bestMoveFitness = -1
-    for i in range(BOARDWIDTH):
-        if potentialMoves[i] > bestMoveFitness and isValidMove(board, i):
-            bestMoveFitness = potentialMoves[i]
-    # find all potential moves that have this best fitness
-    bestMoves = []
-    for i in range(len(potentialMoves)):
-        if potentialMoves[i] == bestMoveFitness and isValidMove(board, i):
-            bestMoves.append(i)
-    return random.choice(bestMoves)
-
-
-def getPotentialMoves(board, tile, lookAhead):
-    if lookAhead == 0 or isBoardFull(board):
-        return [0] * BOARDWIDTH
-
-    if tile == RED:
-        enemyTile = BLACK
-    else:
-        enemyTile = RED
-
-    # Figure out the best move to make.
-    potentialMoves = [0] * BOARDWIDTH
-    for firstMove in range(BOARDWIDTH):
-        dupeBoard = copy.deepcopy(board)
-        if not isValidMove(dupeBoard, firstMove):
-            continue
-        makeMove(dupeBoard, tile, firstMove)
-        if isWinner(dupeBoard, tile):
-            # a winning move automatically gets a perfect fitness
-            potentialMoves[firstMove] = 1
-            break # don't bother calculating other moves
-        else:
-            # do other player's counter moves and determine best one
-            if isBoardFull(dupeBoard):
-                potentialMoves[firstMove] = 0
-            else:
-                for counterMove in range(BOARDWIDTH):
-                    dupeBoard2 = copy.deepcopy(dupeBoard)
-                    if not isValidMove(dupeBoard2, counterMove):
-                        continue
-                    makeMove(dupeBoard2, enemyTile, counterMove)
-                    if isWinner(dupeBoard2, enemyTile):
-                        # a losing move automatically gets the worst fitness
-                        potentialMoves[firstMove] = -1
-                        break
-                    else:
-                        # do the recursive call to getPotentialMoves()
-                        results = getPotentialMoves(dupeBoard2, tile, lookAhead - 1)
-                        potentialMoves[firstMove] += (sum(results) / BOARDWIDTH) / BOARDWIDTH
-    return potentialMoves
+    # Copy the board into a bitboard position, with black (the
+    # computer) as the current player:
+    position = fourinarowengine.Position(BOARDWIDTH, BOARDHEIGHT)
+    for x in range(BOARDWIDTH):
+        for y in range(BOARDHEIGHT):
+            if board[x][y] != EMPTY:
+                position.setTile(x, BOARDHEIGHT - 1 - y, board[x][y] == BLACK)
+
+    # Search deeper and deeper until DIFFICULTY seconds have passed:
+    column, score, depth = AI_SEARCHER.getBestMove(position, DIFFICULTY)
+    return column
 
 
 def getLowestEmptySpace(board, column):
@@ -4,9 +4,13 @@
 
 
 __version__ = 1
-import pygame, sys, random
+import pygame, sys, os
 from pygame.locals import *
 
+# Import slidingtilesolver.py from the folder above this one:
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import slidingtilesolver
+
 # Create the constants (go ahead and experiment with different values)
 BOARDWIDTH = 4  # number of columns in the board
 BOARDHEIGHT = 4 # number of rows in the board
@@ -15,6 +19,10 @@ WINDOWWIDTH = 640
 WINDOWHEIGHT = 480
 FPS = 30
 BLANK = None
+MINPUZZLEMOVES = 30 # new puzzles take at least this many moves to solve
+SOLVETIMELIMIT = 60 # seconds the solver may think before giving up
+HINTTIMELIMIT = 5 # seconds before a hint settles for the most promising move
+BUILDINGMSG = 'building' # the status while the solver's tables are built
 
 #                 R    G    B
 BLACK =         (  0,   0,   0)
@@ -40,9 +48,12 @@ UP = 'up'
 DOWN = 'down'
 LEFT = 'left'
 RIGHT = 'right'
+# the game's move for each of the solver's move letters
+SOLVERMOVES = {slidingtilesolver.UP: UP, slidingtilesolver.DOWN: DOWN,
+               slidingtilesolver.LEFT: LEFT, slidingtilesolver.RIGHT: RIGHT}
 
 def main():
-    global FPSCLOCK, DISPLAYSURF, BASICFONT, RESET_SURF, RESET_RECT, NEW_SURF, NEW_RECT, SOLVE_SURF, SOLVE_RECT
+    global FPSCLOCK, DISPLAYSURF, BASICFONT, RESET_SURF, RESET_RECT, NEW_SURF, NEW_RECT, SOLVE_SURF, SOLVE_RECT, HINT_SURF, HINT_RECT
 
     pygame.init()
     FPSCLOCK = pygame.time.Clock()
@@ -51,17 +62,27 @@ def main():
     BASICFONT = pygame.font.Font('freesansbold.ttf', BASICFONTSIZE)
 
     # Store the option buttons and their rectangles in OPTIONS.
+    HINT_SURF,  HINT_RECT  = makeText('Hint',     TEXTCOLOR, TILECOLOR, WINDOWWIDTH - 120, WINDOWHEIGHT - 120)
     RESET_SURF, RESET_RECT = makeText('Reset',    TEXTCOLOR, TILECOLOR, WINDOWWIDTH - 120, WINDOWHEIGHT - 90)
     NEW_SURF,   NEW_RECT   = makeText('New Game', TEXTCOLOR, TILECOLOR, WINDOWWIDTH - 120, WINDOWHEIGHT - 60)
     SOLVE_SURF, SOLVE_RECT = makeText('Solve',    TEXTCOLOR, TILECOLOR, WINDOWWIDTH - 120, WINDOWHEIGHT - 30)
 
-    mainBoard, solutionSeq = generateNewPuzzle(80)
+    # The solver needs tables that take a while to build the first time,
+    # so start building them now, while the player plays:
+    slidingtilesolver.startBuildingPatternDatabases()
+    mainBoard = generateNewPuzzle(MINPUZZLEMOVES)
     SOLVEDBOARD = getStartingBoard() # a solved board is the same as the board in a start state.
-    allMoves = [] # list of moves made from the solved configuration
+    allMoves = [] # list of moves made from the start of the puzzle
+    statusMsg = None # a message from the solver, shown until the next click or key
 
     while True: # main game loop
         slideTo = None # the direction, if any, a tile should slide
-        msg = 'Click tile or press arrow keys to slide.' # contains the message to show in the upper left corner.
+        msg = statusMsg or 'Click tile or press arrow keys to slide.' # contains the message to show in the upper left corner.
+        if statusMsg == BUILDINGMSG:
+            if slidingtilesolver.arePatternDatabasesReady():
+                statusMsg = msg = 'The solver is ready. Click Hint or Solve again.'
+            else:
+                msg = 'Getting the solver ready (%s%% done)...' % int(100 * slidingtilesolver.getBuildProgress())
         if mainBoard == SOLVEDBOARD:
             msg = 'Solved!'
 
@@ -69,6 +90,8 @@ def main():
 
         checkForQuit()
         for event in pygame.event.get(): # event handling loop
+            if event.type in (MOUSEBUTTONUP, KEYUP):
+                statusMsg = None
             if event.type == MOUSEBUTTONUP:
                 spotx, spoty = getSpotClicked(mainBoard, event.pos[0], event.pos[1])
 
@@ -78,11 +101,29 @@ def main():
                         resetAnimation(mainBoard, allMoves) # clicked on Reset button
                         allMoves = []
                     elif NEW_RECT.collidepoint(event.pos):
-                        mainBoard, solutionSeq = generateNewPuzzle(80) # clicked on New Game button
+                        mainBoard = generateNewPuzzle(MINPUZZLEMOVES) # clicked on New Game button
                         allMoves = []
+                    elif (SOLVE_RECT.collidepoint(event.pos) or HINT_RECT.collidepoint(event.pos)) and not slidingtilesolver.arePatternDatabasesReady():
+                        statusMsg = BUILDINGMSG # don't freeze the game waiting for the solver
                     elif SOLVE_RECT.collidepoint(event.pos):
-                        resetAnimation(mainBoard, solutionSeq + allMoves) # clicked on Solve button
-                        allMoves = []
+                        # clicked on Solve button
+                        solution = getSolution(mainBoard)
+                        if solution is None:
+                            statusMsg = 'The solver ran out of time.'
+                        else:
+                            for move in solution:
+                                slideAnimation(mainBoard, move, 'Solving...', animationSpeed=int(TILESIZE / 2))
+                                makeMove(mainBoard, move)
+                            allMoves.extend(solution)
+                    elif HINT_RECT.collidepoint(event.pos):
+                        # clicked on Hint button, so make the next move toward the solution
+                        hint = getHint(mainBoard)
+                        if hint is not None:
+                            slideTo, movesLeft, isExact = hint
+                            if isExact:
+                                statusMsg = '%s moves left after this one.' % (movesLeft - 1)
+                            else:
+                                statusMsg = 'At least %s moves left after this one.' % (movesLeft - 1)
                 else:
                     # check if the clicked tile was next to the blank spot
 
@@ -177,24 +218,6 @@ def isValidMove(board, move):
            (move == RIGHT and blankx != 0)
 
 
-def getRandomMove(board, lastMove=None):
-    # start with a full list of all four moves
-    validMoves = [UP, DOWN, LEFT, RIGHT]
-
-    # remove moves from the list as they are disqualified
-    if lastMove == UP or not isValidMove(board, DOWN):
-        validMoves.remove(DOWN)
-    if lastMove == DOWN or not isValidMove(board, UP):
-        validMoves.remove(UP)
-    if lastMove == LEFT or not isValidMove(board, RIGHT):
-        validMoves.remove(RIGHT)
-    if lastMove == RIGHT or not isValidMove(board, LEFT):
-        validMoves.remove(LEFT)
-
-    # return a random move from the list of remaining moves
-    return random.choice(validMoves)
-
-
 def getLeftTopOfTile(tileX, tileY):
     left = XMARGIN + (tileX * TILESIZE) + (tileX - 1)
     top = YMARGIN + (tileY * TILESIZE) + (tileY - 1)
@@ -247,6 +270,7 @@ def drawBoard(board, message):
     height = BOARDHEIGHT * TILESIZE
     pygame.draw.rect(DISPLAYSURF, BORDERCOLOR, (left - 5, top - 5, width + 11, height + 11), 4)
 
+    DISPLAYSURF.blit(HINT_SURF, HINT_RECT)
     DISPLAYSURF.blit(RESET_SURF, RESET_RECT)
     DISPLAYSURF.blit(NEW_SURF, NEW_RECT)
     DISPLAYSURF.blit(SOLVE_SURF, SOLVE_RECT)
@@ -293,22 +317,48 @@ def slideAnimation(board, direction, message, animationSpeed):
         FPSCLOCK.tick(FPS)
 
 
-def generateNewPuzzle(numSlides):
-    # From a starting configuration, make numSlides number of moves (and
-    # animate these moves).
-    sequence = []
+def generateNewPuzzle(minMoves):
+    # Return a random board that takes at least minMoves moves to solve.
+    tiles = slidingtilesolver.getRandomPuzzle(BOARDWIDTH, minMoves)
     board = getStartingBoard()
+    for i, tile in enumerate(tiles):
+        board[i % BOARDWIDTH][i // BOARDWIDTH] = tile if tile != slidingtilesolver.BLANK else BLANK
     drawBoard(board, '')
     pygame.display.update()
-    pygame.time.wait(500) # pause 500 milliseconds for effect
-    lastMove = None
-    for i in range(numSlides):
-        move = getRandomMove(board, lastMove)
-        slideAnimation(board, move, 'Generating new puzzle...', animationSpeed=int(TILESIZE / 3))
-        makeMove(board, move)
-        sequence.append(move)
-        lastMove = move
-    return (board, sequence)
+    return board
+
+
+def getSolution(board):
+    # Return the fewest moves that solve the board, or None if the
+    # solver runs out of time. (The solver only solves square boards.)
+    drawBoard(board, 'Thinking...')
+    pygame.display.update()
+    solution = slidingtilesolver.solve(getSolverTiles(board), SOLVETIMELIMIT)
+    if solution is None:
+        return None
+    return [SOLVERMOVES[move] for move in solution]
+
+
+def getHint(board):
+    # Return a (move, movesLeft, isExact) tuple for the next move toward
+    # solving the board, or None if it's already solved. If the solver
+    # runs out of time, movesLeft is only the fewest it could be.
+    drawBoard(board, 'Thinking...')
+    pygame.display.update()
+    hint = slidingtilesolver.getHint(getSolverTiles(board), HINTTIMELIMIT)
+    if hint is None:
+        return None
+    move, movesLeft, isExact = hint
+    return SOLVERMOVES[move], movesLeft, isExact
+
+
+def getSolverTiles(board):
+    # Return the board as the solver's list of tiles.
+    tiles = []
+    for y in range(BOARDHEIGHT):
+        for x in range(BOARDWIDTH):
+            tiles.append(slidingtilesolver.BLANK if board[x][y] == BLANK else board[x][y])
+    return tiles
 
 
 def resetAnimation(board, allMoves):
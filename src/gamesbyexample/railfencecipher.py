@@ -8,6 +8,8 @@ try:
     import pyperclip  # pyperclip copies text to the clipboard.
 except:
     pass  # If pyperclip is not installed, do nothing. It's no big deal.
+import sys
+import cipherstream  # Imports our cipherstream.py program.
 
 
 def main():
@@ -139,6 +141,19 @@ def decryptMessage(message, key):
     copyIfPossible(decryptedText)
 
 
+def streamMessage(mode, key, inFilename=None, outFilename=None):
+    """Encrypt or decrypt inFilename (or stdin) into outFilename (or
+    stdout) using the key, a chunk at a time."""
+    transform = cipherstream.RailFenceTransform(int(key), mode)
+    cipherstream.streamFiles(transform, inFilename, outFilename)
+
+
 # If this program was run (instead of imported), run the game:
 if __name__ == '__main__':
-    main()
+    # (!) Run this program as "python railfencecipher.py --stream encrypt 3"
+    # to translate stdin to stdout without any questions, or add input and
+    # output filenames to translate a file of any size.
+    if len(sys.argv) > 3 and sys.argv[1] == '--stream':
+        streamMessage(*sys.argv[2:])
+    else:
+        main()
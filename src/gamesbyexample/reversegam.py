@@ -7,7 +7,8 @@ __version__ = 0
 # A version of this game is featured in the book, "Invent Your Own
 # Computer Games with Python" https://nostarch.com/inventwithpython
 
-import copy, random, sys
+import copy, sys
+import reversiengine  # Imports our reversiengine.py program.
 
 COLS = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
 ROWS = ['1', '2', '3', '4', '5', '6', '7', '8']
@@ -15,6 +16,8 @@ ALL_DIRECTIONS = [[0, 1], [1, 1], [1, 0], [1, -1],
                   [0, -1], [-1, -1], [-1, 0], [-1, 1]]
 HUMAN = 'X'
 COMPUTER = 'O'
+# (!) Try changing this to make the computer stronger or weaker:
+AI_THINKING_SECONDS = 1.0  # How long the computer thinks about each move.
 
 def main():
     print('Reversegam, by Al Sweigart al@inventwithpython.com')
@@ -220,35 +223,22 @@ def makeMove(board, tile, xstart, ystart):
 
 
 def getComputerMove(board):
-    """Given a board and the computer's tile, determine where to move
-    and return that move as a [x, y] list."""
-    possibleMoves = getValidMoves(board, COMPUTER)
-
-    # Randomize the order of the possible moves so that if there are
-    # multiple best scoring moves, a random one is selected.
-    random.shuffle(possibleMoves)
-
-    # Always go for a corner if available:
-    for x, y in possibleMoves:
-        if isOnCorner(x, y):
-            return (x, y)
-
-    # Go through all possible moves and remember the best scoring move:
-    bestScore = -1
-    for x, y in possibleMoves:
-        duplicateBoard = copy.copy(board)
-        makeMove(duplicateBoard, COMPUTER, x, y)
-        score = getScoreOfBoard(duplicateBoard)[COMPUTER]
-        if score > bestScore:
-            bestMove = [x, y]
-            bestScore = score
-    return bestMove
-
-
-def isOnCorner(x, y):
-    """Returns True if the position is in one of the four corners."""
-    return ((x == 0 and y == 0) or (x == 7 and y == 0)
-        or (x == 0 and y == 7) or (x == 7 and y == 7))
+    """Given a board, determine where the computer should move and
+    return that move as an (x, y) tuple."""
+    # Convert the board into bitboards for the engine, which looks
+    # several moves ahead to find the best move:
+    computerTiles, humanTiles = 0, 0
+    for (x, y), tile in board.items():
+        if tile == COMPUTER:
+            computerTiles |= 1 << reversiengine.toIndex(x, y)
+        elif tile == HUMAN:
+            humanTiles |= 1 << reversiengine.toIndex(x, y)
+    move = AI_SEARCHER.getBestMove(computerTiles, humanTiles, AI_THINKING_SECONDS)
+    return reversiengine.toXY(move)
+
+
+# The computer's AI, which remembers boards it has searched before:
+AI_SEARCHER = reversiengine.Searcher()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,327 @@
+"""Reversi Engine, by Al Sweigart al@inventwithpython.com
+A fast Reversi (Othello) AI module, used by the Reversegam and Flippy
+programs. Each player's tiles are stored as a 64-bit integer
+"bitboard", so valid moves and flipped tiles are found for all eight
+directions at once with bit shifts. The AI uses iterative-deepening
+alpha-beta search with a transposition table and a weighted board.
+Run it to play a self-play match and report the nodes per second.
+More info at https://en.wikipedia.org/wiki/Computer_Othello
+Tags: large, module, board game"""
+__version__ = 0
+import random, sys, time
+
+"""The space at (x, y) is bit number y * 8 + x, so bit 0 is the top-left
+corner (A1) and bit 63 is the bottom-right corner (H8). Shifting a
+bitboard by 1 moves every tile one space right, and shifting it by 8
+moves every tile one space down. The column masks stop tiles in the
+rightmost column from wrapping around to the leftmost column."""
+
+BOARD_SIZE = 8
+FULL_BOARD = (1 << 64) - 1
+NOT_LEFT_COLUMN = 0xfefefefefefefefe   # Every space except column A.
+NOT_RIGHT_COLUMN = 0x7f7f7f7f7f7f7f7f  # Every space except column H.
+
+# The eight directions as (shift, mask) pairs. Positive shifts move
+# tiles to higher bits (right or down), negative shifts to lower bits.
+# The mask clears the tiles that wrapped around to the wrong column:
+DIRECTIONS = ((1, NOT_LEFT_COLUMN), (-1, NOT_RIGHT_COLUMN),
+              (8, FULL_BOARD), (-8, FULL_BOARD),
+              (9, NOT_LEFT_COLUMN), (7, NOT_RIGHT_COLUMN),
+              (-7, NOT_LEFT_COLUMN), (-9, NOT_RIGHT_COLUMN))
+
+# (!) Try changing these weights. Corners are good to have, and the
+# spaces next to corners are bad because they give the corner away.
+SPACE_WEIGHTS = [
+    100, -20, 10,  5,  5, 10, -20, 100,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+     10,  -2,  1,  1,  1,  1,  -2,  10,
+      5,  -2,  1,  0,  0,  1,  -2,   5,
+      5,  -2,  1,  0,  0,  1,  -2,   5,
+     10,  -2,  1,  1,  1,  1,  -2,  10,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+    100, -20, 10,  5,  5, 10, -20, 100]
+MOBILITY_WEIGHT = 5  # Points for each extra valid move we have.
+WIN_SCORE = 100000  # Bigger than any score evaluate() can return.
+
+# ROW_WEIGHTS[row][byte] is the total weight of the tiles in the byte
+# of a bitboard for that row, so a whole board is scored with 8 lookups:
+ROW_WEIGHTS = []
+for row in range(BOARD_SIZE):
+    rowTable = []
+    for byte in range(256):
+        rowTable.append(sum(SPACE_WEIGHTS[row * BOARD_SIZE + x] for x in range(BOARD_SIZE) if byte >> x & 1))
+    ROW_WEIGHTS.append(rowTable)
+
+
+def getStartingBoards():
+    """Return the (black, white) bitboards at the start of a game."""
+    black = (1 << toIndex(3, 4)) | (1 << toIndex(4, 3))
+    white = (1 << toIndex(3, 3)) | (1 << toIndex(4, 4))
+    return black, white
+
+
+def toIndex(x, y):
+    """Return the bit number of the space at (x, y)."""
+    return y * BOARD_SIZE + x
+
+
+def toXY(index):
+    """Return the (x, y) space for a bit number."""
+    return index % BOARD_SIZE, index // BOARD_SIZE
+
+
+def _shift(bits, shift, mask):
+    """Move every tile in bits one step in a direction."""
+    if shift > 0:
+        return (bits << shift) & mask  # The mask also drops bits past 63.
+    return (bits >> -shift) & mask
+
+
+def getMoves(player, opponent):
+    """Return a bitboard of every valid move for player."""
+    empty = FULL_BOARD & ~(player | opponent)
+    moves = 0
+    for shift, mask in DIRECTIONS:
+        # Follow lines of opponent tiles that start next to our tiles.
+        # A line can be at most 6 tiles long:
+        if shift > 0:
+            line = (player << shift) & mask & opponent
+            for i in range(5):
+                line |= (line << shift) & mask & opponent
+            moves |= (line << shift) & mask & empty
+        else:
+            line = (player >> -shift) & mask & opponent
+            for i in range(5):
+                line |= (line >> -shift) & mask & opponent
+            moves |= (line >> -shift) & mask & empty
+    return moves
+
+
+def getFlips(player, opponent, move):
+    """Return a bitboard of the opponent tiles flipped by player placing
+    a tile on the bit number move."""
+    flips = 0
+    moveBit = 1 << move
+    for shift, mask in DIRECTIONS:
+        line = 0
+        space = _shift(moveBit, shift, mask)
+        while space & opponent:
+            line |= space
+            space = _shift(space, shift, mask)
+        if space & player:
+            flips |= line  # The line ends with one of our tiles.
+    return flips
+
+
+def makeMove(player, opponent, move):
+    """Return the new (player, opponent) bitboards after player places
+    a tile on the bit number move."""
+    flips = getFlips(player, opponent, move)
+    return player | flips | (1 << move), opponent & ~flips
+
+
+def getMoveList(moves):
+    """Return a list of the bit numbers set in the moves bitboard."""
+    moveList = []
+    while moves:
+        lowestBit = moves & -moves
+        moveList.append(lowestBit.bit_length() - 1)
+        moves ^= lowestBit
+    return moveList
+
+
+def countTiles(bits):
+    """Return the number of tiles in a bitboard."""
+    return bin(bits).count('1')
+
+
+def evaluate(player, opponent):
+    """Return the weighted score of the board for player."""
+    score = 0
+    for row in range(BOARD_SIZE):
+        shift = row * BOARD_SIZE
+        score += ROW_WEIGHTS[row][(player >> shift) & 255] - ROW_WEIGHTS[row][(opponent >> shift) & 255]
+    mobility = countTiles(getMoves(player, opponent)) - countTiles(getMoves(opponent, player))
+    return score + mobility * MOBILITY_WEIGHT
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class Searcher:
+    def __init__(self, maxTableSize=1000000):
+        """Create a searcher with an empty transposition table."""
+        # Keys=(player, opponent) tuples, values=(depth, flag, score,
+        # bestMove) tuples:
+        self.table = {}
+        self.maxTableSize = maxTableSize
+        self.nodes = 0
+        self.deadline = None
+
+
+    def negamax(self, player, opponent, depth, alpha, beta):
+        """Return the score of the board for player, looking depth moves
+        ahead. Scores of WIN_SCORE or more mean a win."""
+        self.nodes += 1
+        if self.deadline is not None and self.nodes & 1023 == 0 and time.time() > self.deadline:
+            raise _OutOfTime()
+
+        moves = getMoves(player, opponent)
+        if moves == 0:
+            if getMoves(opponent, player) == 0:
+                # The game is over, so score it by the tiles each player has:
+                difference = countTiles(player) - countTiles(opponent)
+                if difference > 0:
+                    return WIN_SCORE + difference
+                elif difference < 0:
+                    return -WIN_SCORE + difference
+                return 0
+            # We have to pass, so it's the opponent's turn:
+            return -self.negamax(opponent, player, depth, -beta, -alpha)
+
+        if depth == 0:
+            return evaluate(player, opponent)
+
+        # Look up this board in the transposition table:
+        key = (player, opponent)
+        originalAlpha = alpha
+        bestMove = None
+        entry = self.table.get(key)
+        if entry is not None:
+            entryDepth, flag, score, bestMove = entry
+            if entryDepth >= depth:
+                if flag == 0:
+                    return score  # The exact score.
+                elif flag < 0:
+                    beta = min(beta, score)  # An upper bound.
+                else:
+                    alpha = max(alpha, score)  # A lower bound.
+                if alpha >= beta:
+                    return score
+
+        # Try the best move from the table first, then the moves on the
+        # best weighted spaces:
+        moveList = getMoveList(moves)
+        moveList.sort(key=lambda move: SPACE_WEIGHTS[move], reverse=True)
+        if bestMove in moveList:
+            moveList.remove(bestMove)
+            moveList.insert(0, bestMove)
+
+        bestScore = -WIN_SCORE * 2
+        for move in moveList:
+            newPlayer, newOpponent = makeMove(player, opponent, move)
+            score = -self.negamax(newOpponent, newPlayer, depth - 1, -beta, -alpha)
+            if score > bestScore:
+                bestScore, bestMove = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        # Save the result in the transposition table:
+        if len(self.table) >= self.maxTableSize:
+            self.table.clear()
+        if bestScore <= originalAlpha:
+            flag = -1  # The real score is at most bestScore.
+        elif bestScore >= beta:
+            flag = 1  # The real score is at least bestScore.
+        else:
+            flag = 0
+        self.table[key] = (depth, flag, bestScore, bestMove)
+        return bestScore
+
+
+    def getBestMove(self, player, opponent, timeLimit=1.0, maxDepth=60):
+        """Return the bit number of the best move for player (or None if
+        player can't move), searching deeper and deeper until
+        timeLimit seconds pass or maxDepth is reached."""
+        moveList = getMoveList(getMoves(player, opponent))
+        if moveList == []:
+            return None
+        random.shuffle(moveList)  # Pick randomly between equally good moves.
+        moveList.sort(key=lambda move: SPACE_WEIGHTS[move], reverse=True)
+        bestMove = moveList[0]
+        self.deadline = time.time() + timeLimit
+
+        try:
+            for depth in range(1, maxDepth + 1):
+                depthBestMove, depthBestScore = None, -WIN_SCORE * 2
+                for move in moveList:
+                    newPlayer, newOpponent = makeMove(player, opponent, move)
+                    score = -self.negamax(newOpponent, newPlayer, depth - 1, -WIN_SCORE * 2, -depthBestScore)
+                    if score > depthBestScore:
+                        depthBestMove, depthBestScore = move, score
+                bestMove = depthBestMove
+
+                # Search the best move first at the next depth:
+                moveList.remove(bestMove)
+                moveList.insert(0, bestMove)
+                if abs(depthBestScore) >= WIN_SCORE:
+                    break  # The game's outcome is already known.
+                if countTiles(player | opponent) + depth >= BOARD_SIZE * BOARD_SIZE:
+                    break  # The search already reaches the end of the game.
+        except _OutOfTime:
+            pass  # Use the best move from the last finished depth.
+        self.deadline = None
+        return bestMove
+
+
+def playGame(blackSearcher, whiteSearcher, blackDepth, whiteDepth, numRandomMoves=4):
+    """Play one game between two searchers that look a fixed number of
+    moves ahead. The first few moves are random so that each game is
+    different. Returns the number of black tiles minus white tiles."""
+    black, white = getStartingBoards()
+    isBlacksTurn = True
+    movesMade = 0
+    while True:
+        player, opponent = (black, white) if isBlacksTurn else (white, black)
+        moves = getMoves(player, opponent)
+        if moves == 0 and getMoves(opponent, player) == 0:
+            return countTiles(black) - countTiles(white)  # Game over.
+        if moves != 0:
+            if movesMade < numRandomMoves:
+                move = random.choice(getMoveList(moves))
+            elif isBlacksTurn:
+                move = blackSearcher.getBestMove(player, opponent, timeLimit=3600, maxDepth=blackDepth)
+            else:
+                move = whiteSearcher.getBestMove(player, opponent, timeLimit=3600, maxDepth=whiteDepth)
+            player, opponent = makeMove(player, opponent, move)
+            movesMade += 1
+            black, white = (player, opponent) if isBlacksTurn else (opponent, player)
+        isBlacksTurn = not isBlacksTurn
+
+
+def runMatch(numGames=1000, depthA=2, depthB=1):
+    """Play numGames games between an AI searching depthA moves ahead
+    and one searching depthB moves ahead, swapping colors each game."""
+    random.seed(42)
+    searcherA, searcherB = Searcher(), Searcher()
+    results = {'A': 0, 'B': 0, 'tie': 0}
+    startTime = time.time()
+    for gameNum in range(numGames):
+        if gameNum % 2 == 0:
+            difference = playGame(searcherA, searcherB, depthA, depthB)
+        else:
+            difference = -playGame(searcherB, searcherA, depthB, depthA)
+        if difference > 0:
+            results['A'] += 1
+        elif difference < 0:
+            results['B'] += 1
+        else:
+            results['tie'] += 1
+    totalTime = time.time() - startTime
+    totalNodes = searcherA.nodes + searcherB.nodes
+    print('Depth %s won %s, depth %s won %s, and %s were ties.'
+          % (depthA, results['A'], depthB, results['B'], results['tie']))
+    print('%s games in %.1f seconds, %.0f nodes per second.'
+          % (numGames, totalTime, totalNodes / totalTime))
+
+
+# If this program isn't being imported, run a self-play match.
+if __name__ == '__main__':
+    if len(sys.argv) == 4:
+        runMatch(int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        print('Usage: python reversiengine.py numGames depthA depthB')
+        print('Playing 100 games between depth 2 and depth 1...')
+        runMatch(100, 2, 1)
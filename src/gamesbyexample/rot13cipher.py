@@ -8,11 +8,23 @@ try:
     import pyperclip  # pyperclip copies text to the clipboard.
 except ImportError:
     pass  # If pyperclip is not installed, do nothing. It's no big deal.
+import sys
+import cipherstream  # Imports our cipherstream.py program.
 
 # Set up the constants:
 UPPER_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 LOWER_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
 
+# (!) Run this program as "python rot13cipher.py --stream" to translate
+# stdin to stdout without any questions, or add input and output
+# filenames, like "python rot13cipher.py --stream in.txt out.txt" to
+# translate a file of any size.
+if len(sys.argv) > 1 and sys.argv[1] == '--stream':
+    table = cipherstream.makeTable(UPPER_LETTERS + LOWER_LETTERS,
+        UPPER_LETTERS[13:] + UPPER_LETTERS[:13] + LOWER_LETTERS[13:] + LOWER_LETTERS[:13])
+    cipherstream.streamFiles(cipherstream.TranslateTransform(table), *sys.argv[2:4])
+    sys.exit()
+
 print('ROT13 Cipher, by Al Sweigart al@inventwithpython.com')
 print()
 
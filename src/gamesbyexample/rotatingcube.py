@@ -5,7 +5,8 @@ Tags: large, artistic, math"""
 __version__ = 0
 # This program MUST be run in a Terminal/Command Prompt window.
 
-import math, time, sys, os
+import math, time, sys
+import framebuffer  # Imports our framebuffer.py program.
 
 # Set up the constants:
 PAUSE_AMOUNT = 0.1  # Pause length of one-tenth of a second.
@@ -165,6 +166,9 @@ rotatedCorners = [None, None, None, None, None, None, None, None]
 xRotation = 0.0
 yRotation = 0.0
 zRotation = 0.0
+# Each frame is drawn into the frame buffer, which only sends the
+# characters that changed to the terminal (+1 row for the quit message):
+frame = framebuffer.FrameBuffer(WIDTH, HEIGHT + 1)
 
 try:
     while True:  # Main program loop.
@@ -187,29 +191,16 @@ try:
             pointsOnLine = line(fromX, fromY, toX, toY)
             cubePoints.extend(pointsOnLine)
 
-        # Get rid of duplicate points:
-        cubePoints = tuple(frozenset(cubePoints))
-
         # Display the cube on the screen:
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                if (x, y) in cubePoints:
-                    # Display full block:
-                    print(LINE_CHAR, end='', flush=False)
-                else:
-                    # Display empty space:
-                    print(' ', end='', flush=False)
-            print(flush=False)
-        print('Press Ctrl-C to quit.', end='', flush=True)
+        frame.clear()
+        for x, y in cubePoints:
+            frame.put(x, y, LINE_CHAR)  # Display full block.
+        frame.write(0, HEIGHT, 'Press Ctrl-C to quit.')
+        frame.render()
 
         time.sleep(PAUSE_AMOUNT)  # Pause for a bit.
 
-        # Clear the screen:
-        if sys.platform == 'win32':
-            os.system('cls')  # Windows uses the cls command.
-        else:
-            os.system('clear')  # macOS and Linux use the clear command.
-
 except KeyboardInterrupt:
     print('Rotating Cube, by Al Sweigart al@inventwithpython.com')
+    print(frame.getReport())
     sys.exit()  # When Ctrl-C is pressed, end the program.
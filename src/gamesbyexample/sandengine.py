@@ -0,0 +1,224 @@
+"""Sand Engine, by Al Sweigart al@inventwithpython.com
+A falling sand module, used by the sand animation programs. Each
+material (sand, water, and wall) is stored as one int per row, with bit
+x set where that material is in column x, so a whole row of grains is
+moved at once with a few bitwise operations. The rows are swept from
+the bottom up, and only rows that changed (or are next to a row that
+changed) in the last step are swept, so settled piles cost nothing.
+Sand falls straight down or diagonally, and sinks through water. Water
+does the same, but also flows sideways. Walls never move.
+Run it to time a big grid, for example:
+python sandengine.py 2000 2000
+More info at https://en.wikipedia.org/wiki/Falling-sand_game
+Tags: large, module, simulation"""
+__version__ = 0
+import random, sys, time
+
+# The materials:
+EMPTY = 0
+SAND = 1
+WATER = 2
+WALL = 3
+MATERIALS = (SAND, WATER, WALL)
+# The characters the materials are drawn with. Keys=materials,
+# values=characters:
+MATERIAL_CHARS = {EMPTY: ' ', SAND: chr(9617), WATER: '~', WALL: chr(9608)}
+
+
+class SandGrid:
+    def __init__(self, width, height, rng=random):
+        """Set up an empty width x height grid. rng picks which way
+        grains go when they can fall (or flow) either way."""
+        if width < 1 or height < 1:
+            raise ValueError('The grid must be at least 1 x 1.')
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.fullRow = (1 << width) - 1
+        # layers[material][y] is the bitmask of that material in row y:
+        self.layers = {material: [0] * height for material in MATERIALS}
+        # activeRows[y] is 1 if row y is swept in the next step, and
+        # changedRows[y] is 1 if row y changed in the last step (or was
+        # set before it), so only those rows need to be redrawn:
+        self.activeRows = bytearray(height)
+        self.changedRows = bytearray(height)
+        self._setRows = bytearray(height)  # Rows set since the last step.
+
+
+    def get(self, x, y):
+        """Return the material at x, y. Spaces outside of the grid are
+        walls."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return WALL
+        for material in MATERIALS:
+            if (self.layers[material][y] >> x) & 1:
+                return material
+        return EMPTY
+
+
+    def set(self, x, y, material):
+        """Put material (or EMPTY) at x, y, replacing what was there."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError('There is no space ' + str((x, y)))
+        if material != EMPTY and material not in MATERIALS:
+            raise ValueError('Unknown material ' + repr(material))
+        bit = 1 << x
+        for layerMaterial in MATERIALS:
+            if layerMaterial == material:
+                self.layers[layerMaterial][y] |= bit
+            else:
+                self.layers[layerMaterial][y] &= ~bit
+        self._setRows[y] = 1
+        self._wakeRows(y)
+
+
+    def addGrain(self, x, y, material=SAND):
+        """Put material at x, y if that space is empty, and return True
+        if it was. Used for sources that pour grains into the grid."""
+        if self.get(x, y) != EMPTY:
+            return False
+        self.set(x, y, material)
+        return True
+
+
+    def count(self, material):
+        return sum(bin(row).count('1') for row in self.layers[material])
+
+
+    def isSettled(self):
+        """Return True if nothing can move in the next step."""
+        return not any(self.activeRows)
+
+
+    def _wakeRows(self, y):
+        # A change in row y can let the grains in row y move, and the
+        # grains in the row above fall into it. Grains never move up, so
+        # the rows below aren't affected:
+        self.activeRows[y] = 1
+        if y > 0:
+            self.activeRows[y - 1] = 1
+
+
+    def step(self):
+        """Move every grain that can move by one space. Returns the
+        number of rows that changed."""
+        width, height = self.width, self.height
+        notFirstColumn = self.fullRow & ~1  # Grains that can go left.
+        notLastColumn = self.fullRow >> 1  # Grains that can go right.
+        sand, water, walls = self.layers[SAND], self.layers[WATER], self.layers[WALL]
+        getrandbits = self.rng.getrandbits
+        activeRows = self.activeRows
+        self.activeRows = nextActiveRows = bytearray(height)
+        self.changedRows = changedRows = self._setRows
+        self._setRows = bytearray(height)
+
+        # Sweep from the bottom up, so every grain moves at most once:
+        for y in range(height - 1, -1, -1):
+            if not activeRows[y]:
+                continue
+            rowChanged = belowChanged = False
+
+            if y < height - 1:
+                below = sand[y + 1] | water[y + 1] | walls[y + 1]
+                for layer in (sand, water):
+                    grains = layer[y]
+                    if not grains:
+                        continue
+                    # Fall straight down first, then diagonally into the
+                    # spaces that are still empty:
+                    down = grains & ~below
+                    below |= down
+                    rest = grains & ~down
+                    canGoLeft = rest & ~(below << 1) & notFirstColumn
+                    canGoRight = rest & ~(below >> 1) & notLastColumn
+                    goLeft = canGoLeft & ~canGoRight
+                    if canGoLeft & canGoRight:
+                        goLeft |= canGoLeft & canGoRight & getrandbits(width)
+                    # A grain going right and the grain two spaces to
+                    # its right going left can't land on the same space:
+                    goRight = canGoRight & ~goLeft & ~(goLeft >> 2)
+                    leaving = down | goLeft | goRight
+                    if leaving:
+                        landed = down | (goLeft >> 1) | (goRight << 1)
+                        layer[y] = grains ^ leaving
+                        layer[y + 1] |= landed
+                        below |= landed
+                        rowChanged = belowChanged = True
+
+                # Sand that can't fall sinks by trading places with water:
+                sinking = sand[y] & water[y + 1]
+                if sinking:
+                    sand[y] ^= sinking
+                    sand[y + 1] |= sinking
+                    water[y + 1] ^= sinking
+                    water[y] |= sinking
+                    rowChanged = belowChanged = True
+
+            # Water that didn't fall flows sideways:
+            if water[y]:
+                occupied = sand[y] | water[y] | walls[y]
+                canGoLeft = water[y] & ~(occupied << 1) & notFirstColumn
+                canGoRight = water[y] & ~(occupied >> 1) & notLastColumn
+                goLeft = canGoLeft & ~canGoRight
+                if canGoLeft & canGoRight:
+                    goLeft |= canGoLeft & canGoRight & getrandbits(width)
+                goRight = canGoRight & ~goLeft & ~(goLeft >> 2)
+                if goLeft | goRight:
+                    water[y] = (water[y] ^ goLeft ^ goRight) | (goLeft >> 1) | (goRight << 1)
+                    rowChanged = True
+
+            if rowChanged:
+                changedRows[y] = 1
+                nextActiveRows[y] = 1
+                if y > 0:
+                    # Grains above can fall into this row in this step:
+                    activeRows[y - 1] = nextActiveRows[y - 1] = 1
+            if belowChanged:
+                changedRows[y + 1] = nextActiveRows[y + 1] = 1
+        return changedRows.count(1)
+
+
+    def getRowText(self, y, materialChars=MATERIAL_CHARS):
+        """Return the text of row y, drawn with the materialChars."""
+        text = [materialChars[EMPTY]] * self.width
+        for material in MATERIALS:
+            bits = self.layers[material][y]
+            while bits:
+                lowestBit = bits & -bits
+                text[lowestBit.bit_length() - 1] = materialChars[material]
+                bits ^= lowestBit
+        return ''.join(text)
+
+
+    def getText(self, materialChars=MATERIAL_CHARS):
+        return '\n'.join(self.getRowText(y, materialChars) for y in range(self.height))
+
+
+def runBenchmark(width, height, numSteps=1000):
+    """Pour sand and water onto ledges in a width x height grid, and
+    print the steps per second."""
+    grid = SandGrid(width, height, random.Random(42))
+    for i in range(1, 5):
+        ledgeY = height * i // 5
+        for x in range(width * (i % 2) // 3, width * (i % 2 + 2) // 3):
+            grid.set(x, ledgeY, WALL)
+    sources = [(width * i // 8, SAND if i % 2 else WATER) for i in range(1, 8)]
+
+    startTime = time.perf_counter()
+    for i in range(numSteps):
+        for x, material in sources:
+            grid.addGrain(x, 0, material)
+        grid.step()
+    seconds = time.perf_counter() - startTime
+    print('{}x{} grid: {} steps in {:.2f} seconds, {:.0f} steps per second'.format(
+        width, height, numSteps, seconds, numSteps / seconds))
+    print('{} sand and {} water grains'.format(grid.count(SAND), grid.count(WATER)))
+
+
+# If this program isn't being imported, time a grid of the given size.
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        runBenchmark(int(sys.argv[1]), int(sys.argv[2]))
+    else:
+        runBenchmark(80, 25)
+        runBenchmark(2000, 2000)
@@ -2,7 +2,7 @@ import random
 import sys
 import time
 
-import bext
+import framebuffer  # Imports our framebuffer.py program.
 
 WIDTH, HEIGHT = 80, 25
 
@@ -15,12 +15,11 @@ ON = 'O'
 OFF = '.'
 
 # Starting state
-bext.clear()
+frame = framebuffer.FrameBuffer(WIDTH, HEIGHT)
+frame.clear(OFF)
 for y in range(HEIGHT):
     for x in range(WIDTH):
         canvas[(x, y)] = False
-        print(OFF, end='')
-    print()
 
 
 while True:
@@ -64,15 +63,16 @@ while True:
     for toDel in toDelete:
         del shimmers[(toDel[0], toDel[1])]
 
-    # Draw
+    # Draw (a tile toggled twice in one step isn't sent at all)
     for change in changed:
-        bext.goto(change[0], change[1])
         if canvas[(change[0], change[1])]:
-            print(ON, end='')
+            frame.put(change[0], change[1], ON)
         else:
-            print(OFF, end='')
+            frame.put(change[0], change[1], OFF)
+    frame.render()
 
     try:
         time.sleep(0.05)
     except KeyboardInterrupt:
+        print(frame.getReport())
         sys.exit()
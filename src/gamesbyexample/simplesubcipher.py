@@ -5,12 +5,14 @@ More info at: https://en.wikipedia.org/wiki/Substitution_cipher
 This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: short, cryptography, math"""
 __version__ = 0
-import random
+import random, sys
 
 try:
     import pyperclip  # pyperclip copies text to the clipboard.
 except ImportError:
     pass  # If pyperclip is not installed, do nothing. It's no big deal.
+import cipherstream  # Imports our cipherstream.py program.
+import cryptanalysis  # Imports our cryptanalysis.py program.
 
 # Every possible symbol that can be encrypted/decrypted:
 LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
@@ -20,9 +22,9 @@ def main():
 A simple substitution cipher has a one-to-one translation for each
 symbol in the plaintext and each symbol in the ciphertext.''')
 
-    # Let the user specify if they are encrypting or decrypting:
-    while True:  # Keep asking until the user enters e or d.
-        print('Do you want to (e)ncrypt or (d)ecrypt?')
+    # Let the user specify if they are encrypting, decrypting, or hacking:
+    while True:  # Keep asking until the user enters e, d, or h.
+        print('Do you want to (e)ncrypt, (d)ecrypt, or (h)ack?')
         response = input('> ').lower()
         if response.startswith('e'):
             myMode = 'encrypt'
@@ -30,10 +32,13 @@ symbol in the plaintext and each symbol in the ciphertext.''')
         elif response.startswith('d'):
             myMode = 'decrypt'
             break
-        print('Please enter the letter e or d.')
+        elif response.startswith('h'):
+            myMode = 'hack'
+            break
+        print('Please enter the letter e, d, or h.')
 
-    # Let the user specify the key to use:
-    while True:  # Keep asking until the user enters a valid key.
+    # Let the user specify the key to use (hacking doesn't need one):
+    while myMode != 'hack':  # Keep asking until the user enters a valid key.
         print('Please specify the key to use.')
         if myMode == 'encrypt':
             print('Or enter RANDOM to have one generated for you.')
@@ -56,6 +61,8 @@ symbol in the plaintext and each symbol in the ciphertext.''')
         translated = encryptMessage(myMessage, myKey)
     elif myMode == 'decrypt':
         translated = decryptMessage(myMessage, myKey)
+    elif myMode == 'hack':
+        translated = hackMessage(myMessage)
 
     # Display the results:
     print('The %sed message is:' % (myMode))
@@ -90,6 +97,16 @@ def decryptMessage(message, key):
     return translateMessage(message, key, 'decrypt')
 
 
+def hackMessage(message):
+    """Find the most likely key without being told it, showing each
+    better key as it's found, and return the decrypted message."""
+    print('Hacking. Longer messages are easier to hack...')
+    for score, key in cryptanalysis.hackSubstitution(message):
+        print('Trying key {} (English score {:.2f})...'.format(key, score))
+    print('The most likely key is {}.'.format(key))
+    return decryptMessage(message, key)
+
+
 def translateMessage(message, key, mode):
     """Encrypt or decrypt the message using the key."""
     translated = ''
@@ -116,6 +133,19 @@ def translateMessage(message, key, mode):
     return translated
 
 
+def streamMessage(mode, key, inFilename=None, outFilename=None):
+    """Encrypt or decrypt inFilename (or stdin) into outFilename (or
+    stdout) using the key, a chunk at a time."""
+    key = key.upper()
+    if not checkKey(key):
+        return
+    if mode == 'encrypt':
+        table = cipherstream.makeTable(LETTERS + LETTERS.lower(), key + key.lower())
+    else:
+        table = cipherstream.makeTable(key + key.lower(), LETTERS + LETTERS.lower())
+    cipherstream.streamFiles(cipherstream.TranslateTransform(table), inFilename, outFilename)
+
+
 def generateRandomKey():
     """Generate and return a random encryption key."""
     key = list(LETTERS)  # Get a list from the LETTERS string.
@@ -125,4 +155,10 @@ def generateRandomKey():
 
 # If this program was run (instead of imported), run the program:
 if __name__ == '__main__':
-    main()
+    # (!) Run this program as "python simplesubcipher.py --stream encrypt KEY"
+    # to translate stdin to stdout without any questions, or add input and
+    # output filenames to translate a file of any size.
+    if len(sys.argv) > 3 and sys.argv[1] == '--stream':
+        streamMessage(*sys.argv[2:])
+    else:
+        main()
@@ -3,20 +3,30 @@ Slide the numbered tiles into the correct order.
 This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: large, game, puzzle"""
 __version__ = 0
-import random, sys
+import sys
+import slidingtilesolver  # Imports our slidingtilesolver.py program.
 
 BLANK = '  '  # Note: This string is two spaces, not one.
+# New puzzles take at least this many moves to solve:
+MIN_PUZZLE_MOVES = 30
+HINT_TIME_LIMIT = 5  # Seconds before a hint settles for the most promising move.
+# The WASD key for each of the solver's move letters:
+SOLVER_KEYS = {slidingtilesolver.UP: 'W', slidingtilesolver.LEFT: 'A',
+               slidingtilesolver.DOWN: 'S', slidingtilesolver.RIGHT: 'D'}
 
 
 def main():
     print('''Sliding Tile Puzzle, by Al Sweigart al@inventwithpython.com
 
     Use the WASD keys to move the tiles
-    back into their original order:
+    back into their original order, or H for a hint:
            1  2  3  4
            5  6  7  8
            9 10 11 12
           13 14 15   ''')
+    # The solver's hints need tables that take a while to build the
+    # first time, so start building them while the player plays:
+    slidingtilesolver.startBuildingPatternDatabases()
     input('Press Enter to begin...')
 
     gameBoard = getNewPuzzle()
@@ -24,6 +34,9 @@ def main():
     while True:
         displayBoard(gameBoard)
         playerMove = askForPlayerMove(gameBoard)
+        if playerMove == 'H':
+            showHint(gameBoard)
+            continue
         makeMove(gameBoard, playerMove)
 
         if gameBoard == getNewBoard():
@@ -84,12 +97,12 @@ def askForPlayerMove(board):
 
     while True:
         print('                          ({})'.format(w))
-        print('Enter WASD (or QUIT): ({}) ({}) ({})'.format(a, s, d))
+        print('Enter WASD (or H or QUIT): ({}) ({}) ({})'.format(a, s, d))
 
         response = input('> ').upper()
         if response == 'QUIT':
             sys.exit()
-        if response in (w + a + s + d).replace(' ', ''):
+        if response in (w + a + s + d).replace(' ', '') + 'H':
             return response
 
 
@@ -108,28 +121,45 @@ def makeMove(board, move):
         board[bx][by], board[bx-1][by] = board[bx-1][by], board[bx][by]
 
 
-def makeRandomMove(board):
-    """Perform a slide in a random direction."""
-    blankx, blanky = findBlankSpace(board)
-    validMoves = []
-    if blanky != 3:
-        validMoves.append('W')
-    if blankx != 3:
-        validMoves.append('A')
-    if blanky != 0:
-        validMoves.append('S')
-    if blankx != 0:
-        validMoves.append('D')
-
-    makeMove(board, random.choice(validMoves))
-
-
-def getNewPuzzle(moves=200):
-    """Get a new puzzle by making random slides from a solved state."""
+def getTiles(board):
+    """Return the board as the solver's list of tile numbers, left to
+    right and top to bottom, with 0 for the blank space."""
+    tiles = []
+    for y in range(4):
+        for x in range(4):
+            if board[x][y] == BLANK:
+                tiles.append(slidingtilesolver.BLANK)
+            else:
+                tiles.append(int(board[x][y]))
+    return tiles
+
+
+def showHint(board):
+    """Display the next move toward solving the board."""
+    if not slidingtilesolver.arePatternDatabasesReady():
+        print('Getting the solver ready ({}% done)...'.format(int(100 * slidingtilesolver.getBuildProgress())))
+        slidingtilesolver.getPatternDatabases()  # Wait for them to be built.
+    print('Thinking...')
+    hint = slidingtilesolver.getHint(getTiles(board), HINT_TIME_LIMIT)
+    if hint is None:
+        print('No hint could be found in time.')
+        return
+    move, numMoves, isExact = hint
+    if isExact:
+        print('Hint: enter {}. The puzzle can be solved in {} moves.'.format(SOLVER_KEYS[move], numMoves))
+    else:
+        print('Hint: enter {}. The puzzle needs at least {} moves.'.format(SOLVER_KEYS[move], numMoves))
+
+
+def getNewPuzzle(minMoves=MIN_PUZZLE_MOVES):
+    """Get a new random puzzle that takes at least minMoves moves."""
+    tiles = slidingtilesolver.getRandomPuzzle(4, minMoves)
     board = getNewBoard()
-
-    for i in range(moves):
-        makeRandomMove(board)
+    for i, tile in enumerate(tiles):
+        if tile == slidingtilesolver.BLANK:
+            board[i % 4][i // 4] = BLANK
+        else:
+            board[i % 4][i // 4] = str(tile).ljust(2)
     return board
 
 
@@ -0,0 +1,483 @@
+"""Sliding Tile Solver, by Al Sweigart al@inventwithpython.com
+A sliding tile puzzle module, used by the Sliding Tile Puzzle and Slide
+Puzzle games for hints and for making new puzzles. Boards are packed
+into an int with 4 bits per space, and solved with the fewest moves by
+IDA* search. The 15-puzzle search is guided by three 5-tile pattern
+databases, which record the fewest moves to get each set of tiles home.
+They're built once (this takes a minute or two, and can be done in a
+background thread) and saved to a file that's memory mapped afterwards.
+Other board sizes use the Manhattan distance plus linear conflicts
+instead.
+Run it to solve some random 15-puzzles, for example:
+python slidingtilesolver.py 10
+More info at https://en.wikipedia.org/wiki/15_puzzle
+Tags: large, module, puzzle"""
+__version__ = 0
+import functools, math, mmap, os, random, sys, threading, time
+
+# Set up the constants:
+BLANK = 0
+# The move letters name the direction a tile slides into the blank:
+UP, DOWN, LEFT, RIGHT = 'U', 'D', 'L', 'R'
+DEFAULT_TIME_LIMIT = 60.0  # Seconds to spend on a puzzle before giving up.
+CHECK_EVERY = 1024  # How many nodes to expand between time limit checks.
+
+# The 15-puzzle's tiles are split into three groups that each get a
+# pattern database. The groups are next to each other in the solved
+# puzzle:
+#  1  2  3  4
+#  5  6  7  8
+#  9 10 11 12
+# 13 14 15
+PATTERNS = ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15))
+PATTERN_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'slidingtilepatterns.bin')
+UNSEEN = 255  # The pattern database value of impossible placements.
+
+_patternDatabases = None  # Set by getPatternDatabases().
+_buildLock = threading.Lock()  # Held while the databases are loaded or built.
+_buildThread = None  # Set by startBuildingPatternDatabases().
+_buildProgress = 0.0  # The fraction of the databases built so far.
+
+
+def getSolvedTiles(width=4):
+    """Return the tiles of a solved puzzle as a list, left to right and
+    top to bottom, with BLANK in the bottom right corner."""
+    return list(range(1, width * width)) + [BLANK]
+
+
+def packTiles(tiles):
+    """Return the list of tiles packed into an int, 4 bits per space."""
+    board = 0
+    for space, tile in enumerate(tiles):
+        board |= tile << (space * 4)
+    return board
+
+
+def unpackTiles(board, width=4):
+    return [(board >> (space * 4)) & 15 for space in range(width * width)]
+
+
+def getNeighbors(width):
+    """Return a list of (space, move) tuples for each space: the spaces
+    next to it, and the move letter of a tile sliding from there into
+    it."""
+    neighbors = []
+    for space in range(width * width):
+        x, y = space % width, space // width
+        spaceNeighbors = []
+        if y < width - 1:
+            spaceNeighbors.append((space + width, UP))
+        if y > 0:
+            spaceNeighbors.append((space - width, DOWN))
+        if x < width - 1:
+            spaceNeighbors.append((space + 1, LEFT))
+        if x > 0:
+            spaceNeighbors.append((space - 1, RIGHT))
+        neighbors.append(spaceNeighbors)
+    return neighbors
+
+
+def isSolvable(tiles, width=4):
+    """Return True if the tiles can be slid into the solved order. Half
+    of all arrangements can't be."""
+    numbers = [tile for tile in tiles if tile != BLANK]
+    inversions = sum(1 for i in range(len(numbers)) for j in range(i + 1, len(numbers)) if numbers[i] > numbers[j])
+    if width % 2 == 1:
+        return inversions % 2 == 0
+    blankRowFromBottom = width - tiles.index(BLANK) // width
+    return (inversions + blankRowFromBottom) % 2 == 1
+
+
+def makeMove(tiles, move, width=4):
+    """Slide a tile into the blank space of the list of tiles."""
+    blank = tiles.index(BLANK)
+    for space, spaceMove in getNeighbors(width)[blank]:
+        if spaceMove == move:
+            tiles[blank], tiles[space] = tiles[space], BLANK
+            return
+    raise ValueError('No tile can slide ' + move + '.')
+
+
+def buildPatternDatabase(patternTiles, width=4, reportProgress=None):
+    """Return a bytearray of the fewest moves of the pattern tiles to
+    get them into their solved spaces, where only moves of the pattern
+    tiles are counted. It's indexed by the placement of the tiles: the
+    space of the i-th pattern tile is in bits 4*i to 4*i+3. If given,
+    reportProgress is called with the fraction of placements found so
+    far after each number of moves is searched."""
+    neighbors = [[space for space, move in spaceNeighbors] for spaceNeighbors in getNeighbors(width)]
+    numTiles = len(patternTiles)
+    placementBits = 4 * numTiles
+    # Each search state is a placement plus the blank's space:
+    solvedPlacement = sum((tile - 1) << (4 * i) for i, tile in enumerate(patternTiles))
+    moves = bytearray([UNSEEN]) * (1 << (placementBits + 4))
+    database = bytearray([UNSEEN]) * (1 << placementBits)
+    start = (solvedPlacement << 4) | (width * width - 1)
+    moves[start] = 0
+    current = [start]
+    numMoves = 0
+    numPlacements = math.perm(width * width, numTiles)
+    numFound = 0  # How many placements have their fewest moves.
+    while current:
+        # Spread the blank around without moving any pattern tile,
+        # which doesn't count as a move. States found by moving a
+        # pattern tile are searched after these:
+        nextStates = []
+        stack = [state for state in current if moves[state] == numMoves]
+        while stack:
+            state = stack.pop()
+            placement, blank = state >> 4, state & 15
+            if database[placement] > numMoves:
+                if database[placement] == UNSEEN:
+                    numFound += 1
+                database[placement] = numMoves
+            tileAt = {}  # Keys=spaces, values=pattern tile indexes.
+            for i in range(numTiles):
+                tileAt[(placement >> (4 * i)) & 15] = i
+            for space in neighbors[blank]:
+                i = tileAt.get(space)
+                if i is None:
+                    newState = (placement << 4) | space
+                    if moves[newState] > numMoves:
+                        moves[newState] = numMoves
+                        stack.append(newState)
+                else:
+                    newState = ((placement + ((blank - space) << (4 * i))) << 4) | space
+                    if moves[newState] == UNSEEN:
+                        moves[newState] = numMoves + 1
+                        nextStates.append(newState)
+        current = nextStates
+        numMoves += 1
+        if reportProgress is not None:
+            reportProgress(numFound / numPlacements)
+    return database
+
+
+def getPatternDatabases(filename=PATTERN_FILENAME):
+    """Return the list of 15-puzzle pattern databases, memory mapped
+    from filename. They're built and saved first if the file doesn't
+    exist yet. If another thread is building them, this waits for it."""
+    global _patternDatabases
+    if _patternDatabases is not None:
+        return _patternDatabases
+    with _buildLock:
+        if _patternDatabases is None:
+            _patternDatabases = _loadPatternDatabases(filename)
+    return _patternDatabases
+
+
+def _loadPatternDatabases(filename):
+    global _buildProgress
+    databaseSize = 1 << (4 * len(PATTERNS[0]))
+    try:
+        if os.path.getsize(filename) == databaseSize * len(PATTERNS):
+            with open(filename, 'rb') as patternFile:
+                data = mmap.mmap(patternFile.fileno(), 0, access=mmap.ACCESS_READ)
+            # Slicing an mmap would copy it, so each database is a
+            # memoryview:
+            view = memoryview(data)
+            _buildProgress = 1.0
+            return [view[i * databaseSize:(i + 1) * databaseSize] for i in range(len(PATTERNS))]
+    except OSError:
+        pass  # There's no saved file (or it can't be read), so build it.
+
+    print('Building the pattern databases. This only happens once...')
+    databases = []
+    for i, patternTiles in enumerate(PATTERNS):
+        databases.append(buildPatternDatabase(patternTiles, reportProgress=functools.partial(_setBuildProgress, i)))
+    _buildProgress = 1.0
+    tempFilename = filename + '.tmp'
+    try:
+        with open(tempFilename, 'wb') as patternFile:
+            for database in databases:
+                patternFile.write(database)
+        os.replace(tempFilename, filename)
+    except OSError:
+        pass  # The folder can't be written to, so keep them in memory.
+    return databases
+
+
+def _setBuildProgress(patternNum, fraction):
+    global _buildProgress
+    _buildProgress = (patternNum + fraction) / len(PATTERNS)
+
+
+def startBuildingPatternDatabases(filename=PATTERN_FILENAME):
+    """Load (or build) the pattern databases in a background thread, so
+    that a game can keep running while they're built. Use
+    arePatternDatabasesReady() and getBuildProgress() to check on it."""
+    global _buildThread
+    if _patternDatabases is None and _buildThread is None:
+        _buildThread = threading.Thread(target=getPatternDatabases, args=(filename,), daemon=True)
+        _buildThread.start()
+
+
+def arePatternDatabasesReady():
+    return _patternDatabases is not None
+
+
+def getBuildProgress():
+    """Return the fraction (from 0.0 to 1.0) of the pattern databases
+    that have been built."""
+    return 1.0 if _patternDatabases is not None else _buildProgress
+
+
+class _SearchLimitReached(Exception):
+    pass
+
+
+class _Search:
+    def __init__(self, tiles, width, databases, timeLimit):
+        self.width = width
+        self.neighbors = getNeighbors(width)
+        self.deadline = None if timeLimit is None else time.time() + timeLimit
+        self.nodesExpanded = 0
+        # After each IDA* iteration that doesn't solve the puzzle, these
+        # are the fewest moves the solution could take, and the first
+        # move of the path that came closest:
+        self.lowerBound = None
+        self.bestFirstMove = None
+        self.board = packTiles(tiles)
+        self.blank = tiles.index(BLANK)
+        self.databases = databases
+        solvedSpace = {tile: tile - 1 for tile in range(1, width * width)}
+        self.goalX = [0] + [solvedSpace[tile] % width for tile in range(1, width * width)]
+        self.goalY = [0] + [solvedSpace[tile] // width for tile in range(1, width * width)]
+        if databases is not None:
+            # The databases are also looked up for the board flipped
+            # over its top-left to bottom-right diagonal, which is just
+            # as far from solved, and the larger total is used. Tile t
+            # flips to flippedTile[t], and space s flips to
+            # flippedSpace[s]:
+            flippedSpace = [(space % width) * width + space // width for space in range(width * width)]
+            flippedTile = [BLANK] + [flippedSpace[tile - 1] + 1 for tile in range(1, width * width)]
+            self.flippedSpace = flippedSpace
+            # patternOf[tile] and shiftOf[tile] are the tile's database
+            # and where its space is in that database's index. Indexes
+            # 0 to 2 are for the board, and 3 to 5 for the flipped board:
+            numPatterns = len(PATTERNS)
+            self.patternOf = [0] * (width * width)
+            self.shiftOf = [0] * (width * width)
+            self.flippedPatternOf = [0] * (width * width)
+            self.flippedShiftOf = [0] * (width * width)
+            self.indexes = [0] * (2 * numPatterns)
+            for pattern, patternTiles in enumerate(PATTERNS):
+                for i, tile in enumerate(patternTiles):
+                    self.patternOf[tile] = pattern
+                    self.shiftOf[tile] = 4 * i
+                    self.flippedPatternOf[flippedTile[tile]] = numPatterns + pattern
+                    self.flippedShiftOf[flippedTile[tile]] = 4 * i
+                    self.indexes[pattern] += tiles.index(tile) << (4 * i)
+                    self.indexes[numPatterns + pattern] += flippedSpace[tiles.index(flippedTile[tile])] << (4 * i)
+            self.databases = list(databases) * 2
+            self.h1 = sum(self.databases[i][self.indexes[i]] for i in range(numPatterns))
+            self.h2 = sum(self.databases[i][self.indexes[i]] for i in range(numPatterns, 2 * numPatterns))
+            self.h = max(self.h1, self.h2)
+        else:
+            self.h = sum(self._getDistance(tile, space) for space, tile in enumerate(tiles) if tile != BLANK)
+            self.h += sum(self._getLineConflicts(tiles, line) for line in range(2 * width))
+
+
+    def _getDistance(self, tile, space):
+        return abs(space % self.width - self.goalX[tile]) + abs(space // self.width - self.goalY[tile])
+
+
+    def _getLineConflicts(self, tiles, line):
+        """Return the extra moves needed because of tiles in their solved
+        row (or column) but in the wrong order. Lines 0 to width-1 are
+        rows, and the rest are columns. Each tile that has to leave the
+        line to let the others pass adds 2 moves."""
+        width = self.width
+        if line < width:
+            spaces = range(line * width, (line + 1) * width)
+            goals = [self.goalX[tiles[space]] for space in spaces if tiles[space] != BLANK and self.goalY[tiles[space]] == line]
+        else:
+            column = line - width
+            spaces = range(column, width * width, width)
+            goals = [self.goalY[tiles[space]] for space in spaces if tiles[space] != BLANK and self.goalX[tiles[space]] == column]
+        # The tiles that can stay are the longest increasing run of
+        # goals, which is short enough to find by brute force:
+        longest = [1] * len(goals)
+        for i in range(len(goals)):
+            for j in range(i):
+                if goals[j] < goals[i] and longest[j] + 1 > longest[i]:
+                    longest[i] = longest[j] + 1
+        return 2 * (len(goals) - max(longest, default=0))
+
+
+    def countExpansion(self):
+        self.nodesExpanded += 1
+        if self.nodesExpanded % CHECK_EVERY == 0 and self.deadline is not None and time.time() > self.deadline:
+            raise _SearchLimitReached()
+
+
+    def idaStar(self, maxMoves=None):
+        """Return a list of the fewest moves that solve the puzzle, or
+        None if it takes more than maxMoves moves."""
+        threshold = self.h
+        while True:
+            if maxMoves is not None and threshold > maxMoves:
+                return None
+            self.nextThreshold = None
+            self.nextThresholdMove = None
+            self.moves = []
+            if self.databases is not None:
+                found = self._searchWithDatabases(self.board, self.blank, -1, 0, self.h1, self.h2, threshold)
+            else:
+                found = self._searchWithConflicts(unpackTiles(self.board, self.width), self.blank, -1, 0, self.h, threshold)
+            if found:
+                return self.moves
+            threshold = self.nextThreshold
+            self.lowerBound, self.bestFirstMove = threshold, self.nextThresholdMove
+
+
+    def _searchWithDatabases(self, board, blank, previousBlank, g, h1, h2, threshold):
+        if h1 == 0:
+            return True
+        self.countExpansion()
+        databases, indexes, flippedSpace = self.databases, self.indexes, self.flippedSpace
+        for space, move in self.neighbors[blank]:
+            if space == previousBlank:
+                continue  # Don't undo the last move.
+            tile = (board >> (space * 4)) & 15
+            # Only the databases with this tile change:
+            pattern1 = self.patternOf[tile]
+            oldIndex1 = indexes[pattern1]
+            newIndex1 = oldIndex1 + ((blank - space) << self.shiftOf[tile])
+            newH1 = h1 - databases[pattern1][oldIndex1] + databases[pattern1][newIndex1]
+            pattern2 = self.flippedPatternOf[tile]
+            oldIndex2 = indexes[pattern2]
+            newIndex2 = oldIndex2 + ((flippedSpace[blank] - flippedSpace[space]) << self.flippedShiftOf[tile])
+            newH2 = h2 - databases[pattern2][oldIndex2] + databases[pattern2][newIndex2]
+            f = g + 1 + (newH1 if newH1 > newH2 else newH2)
+            if f > threshold:
+                if self.nextThreshold is None or f < self.nextThreshold:
+                    self.nextThreshold = f
+                    self.nextThresholdMove = self.moves[0] if self.moves else move
+                continue
+            indexes[pattern1], indexes[pattern2] = newIndex1, newIndex2
+            self.moves.append(move)
+            if self._searchWithDatabases(board ^ (tile << (space * 4)) ^ (tile << (blank * 4)), space, blank, g + 1, newH1, newH2, threshold):
+                return True
+            self.moves.pop()
+            indexes[pattern1], indexes[pattern2] = oldIndex1, oldIndex2
+        return False
+
+
+    def _searchWithConflicts(self, tiles, blank, previousBlank, g, h, threshold):
+        if h == 0:
+            return True
+        self.countExpansion()
+        width = self.width
+        for space, move in self.neighbors[blank]:
+            if space == previousBlank:
+                continue  # Don't undo the last move.
+            tile = tiles[space]
+            # Only the lines the tile leaves and enters have different
+            # conflicts after the move:
+            if move in (UP, DOWN):
+                changedLines = (space // width, blank // width)
+            else:
+                changedLines = (width + space % width, width + blank % width)
+            newH = h - self._getDistance(tile, space) + self._getDistance(tile, blank)
+            newH -= sum(self._getLineConflicts(tiles, line) for line in changedLines)
+            tiles[blank], tiles[space] = tile, BLANK
+            newH += sum(self._getLineConflicts(tiles, line) for line in changedLines)
+            if g + 1 + newH > threshold:
+                if self.nextThreshold is None or g + 1 + newH < self.nextThreshold:
+                    self.nextThreshold = g + 1 + newH
+                    self.nextThresholdMove = self.moves[0] if self.moves else move
+            else:
+                self.moves.append(move)
+                if self._searchWithConflicts(tiles, space, blank, g + 1, newH, threshold):
+                    return True
+                self.moves.pop()
+            tiles[blank], tiles[space] = BLANK, tile
+        return False
+
+
+def _makeSearch(tiles, timeLimit, useDatabases=True):
+    width = int(len(tiles) ** 0.5)
+    if width * width != len(tiles) or sorted(tiles) != list(range(width * width)):
+        raise ValueError('The tiles must be the numbers 0 to ' + str(len(tiles) - 1) + ' in a square.')
+    startTime = time.time()
+    databases = getPatternDatabases() if width == 4 and useDatabases else None
+    if timeLimit is not None:
+        # Time spent loading or building the databases counts too:
+        timeLimit -= time.time() - startTime
+    return _Search(list(tiles), width, databases, timeLimit)
+
+
+def solve(tiles, timeLimit=DEFAULT_TIME_LIMIT):
+    """Return a list of the fewest moves that solve the puzzle in the
+    list of tiles (left to right, top to bottom, with 0 as the blank).
+    Each move is UP, DOWN, LEFT, or RIGHT: the direction a tile slides
+    into the blank space. Returns None if the puzzle can't be solved or
+    takes longer than timeLimit seconds, including any time spent
+    waiting for the pattern databases to be built."""
+    search = _makeSearch(tiles, timeLimit)
+    if not isSolvable(tiles, search.width):
+        return None
+    try:
+        return search.idaStar()
+    except _SearchLimitReached:
+        return None
+
+
+def getHint(tiles, timeLimit=DEFAULT_TIME_LIMIT):
+    """Return a (move, numMoves, isExact) tuple for the next move toward
+    solving the puzzle. If the fewest moves are found in timeLimit
+    seconds, move is the first of them and numMoves is how many there
+    are. Otherwise, move is the first move of the path the search got
+    closest with, and numMoves is the fewest moves the puzzle could
+    take. Returns None if the puzzle is solved, can't be solved, or no
+    move was found in time."""
+    search = _makeSearch(tiles, timeLimit)
+    if not isSolvable(tiles, search.width):
+        return None
+    try:
+        solution = search.idaStar()
+    except _SearchLimitReached:
+        if search.bestFirstMove is None:
+            return None
+        return (search.bestFirstMove, search.lowerBound, False)
+    if not solution:
+        return None
+    return (solution[0], len(solution), True)
+
+
+def getRandomPuzzle(width=4, minMoves=0, rng=random):
+    """Return a list of tiles for a random puzzle whose fewest moves to
+    solve is at least minMoves. Every solvable arrangement is equally
+    likely, unlike making random moves from the solved puzzle. Only
+    the Manhattan distance and linear conflicts are needed to check
+    minMoves, so this never has to build the pattern databases."""
+    while True:
+        tiles = getSolvedTiles(width)
+        rng.shuffle(tiles)
+        if not isSolvable(tiles, width):
+            # Swapping two tiles (not the blank) makes it solvable:
+            first, second = [i for i, tile in enumerate(tiles) if tile != BLANK][:2]
+            tiles[first], tiles[second] = tiles[second], tiles[first]
+        search = _makeSearch(tiles, None, useDatabases=False)
+        if search.h >= minMoves:
+            return tiles  # The lower bound alone shows it's far enough.
+        if search.idaStar(maxMoves=minMoves - 1) is None:
+            return tiles  # No solution is shorter than minMoves.
+
+
+# If this program isn't being imported, solve some random 15-puzzles.
+if __name__ == '__main__':
+    numPuzzles = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    getPatternDatabases()
+    rng = random.Random(42)
+    totalTime = 0
+    for puzzleNum in range(numPuzzles):
+        tiles = getRandomPuzzle(rng=rng)
+        startTime = time.time()
+        search = _makeSearch(tiles, None)
+        moves = search.idaStar()
+        seconds = time.time() - startTime
+        totalTime += seconds
+        print('Puzzle %s: %s moves, %s nodes, %.2f s' % (puzzleNum + 1, len(moves), search.nodesExpanded, seconds))
+    print('Solved %s puzzles in %.1f seconds.' % (numPuzzles, totalTime))
@@ -5,6 +5,7 @@ This and other games are available at https://nostarch.com/XX
 Tags: large, game, puzzle"""
 __version__ = 0
 import copy, os, sys
+import sokobansolver  # Imports our sokobansolver.py program.
 
 # Set up the constants:
 WIDTH = 'width'
@@ -29,6 +30,10 @@ CRATE_ON_GOAL_DISPLAY = '*'
 PLAYER_ON_GOAL_DISPLAY = FACE_DISPLAY
 EMPTY_DISPLAY = ' '
 
+HINT_TIME_LIMIT = 10  # Seconds the solver may spend finding a hint.
+# The solver's LURD letters for each WASD move:
+SOLVER_LETTERS = {'u': 'W', 'l': 'A', 'd': 'S', 'r': 'D'}
+
 CHAR_MAP = {WALL: WALL_DISPLAY, FACE: FACE_DISPLAY,
             CRATE: CRATE_DISPLAY, PLAYER_ON_GOAL: PLAYER_ON_GOAL_DISPLAY,
             GOAL: GOAL_DISPLAY, CRATE_ON_GOAL: CRATE_ON_GOAL_DISPLAY,
@@ -42,14 +47,16 @@ By Al Sweigart al@inventwithpython.com
 
 Push the solid crates onto the circle outlines. You can only push,
 you cannot pull. Enter W-A-S-D letters to move up-left-down-right,
-respectively. Enter numbers to switch levels, U to undo a move, or
-QUIT to quit the game.
+respectively. Enter numbers to switch levels, U to undo a move, H for
+a hint, or QUIT to quit the game.
 ''')
 
     allLevels = loadLevels('sokobanlevels.txt')
     currentLevelNum = 0
     currentLevel = copy.copy(allLevels[currentLevelNum])
-    undoStack = [copy.copy(currentLevel)]
+    # Each undo entry is a dict of the spaces a move changed. Keys=(x, y)
+    # tuples, values=the characters they had before the move:
+    undoStack = []
 
     while True:  # Main game loop.
         displayLevel(currentLevelNum, len(allLevels), currentLevel)
@@ -60,15 +67,19 @@ QUIT to quit the game.
             currentLevelNum = int(move)  # Set new level number.
             # Refresh the level data and undo stack:
             currentLevel = copy.copy(allLevels[currentLevelNum])
-            undoStack = [copy.copy(currentLevel)]
+            undoStack = []
             continue
 
         # Undo the last move.
         if move == 'U':
-            if len(undoStack) == 1:
+            if len(undoStack) == 0:
                 continue  # Can't undo past the first move.
-            undoStack.pop()  # Remove the last item from undoStack.
-            currentLevel = copy.copy(undoStack[-1])
+            currentLevel.update(undoStack.pop())
+            continue
+
+        # Show the moves that solve the level from here:
+        if move == 'H':
+            showHint(currentLevel)
             continue
 
         # Find the player position:
@@ -86,6 +97,12 @@ QUIT to quit the game.
             moveX, moveY = 1, 0
         moveToX = playerX + moveX
         moveToY = playerY + moveY
+        behindMoveToX = playerX + (moveX * 2)
+        behindMoveToY = playerY + (moveY * 2)
+
+        # Remember the spaces this move could change, for undoing it:
+        undoStack.append({(x, y): currentLevel.get((x, y), EMPTY) for x, y in
+                          ((playerX, playerY), (moveToX, moveToY), (behindMoveToX, behindMoveToY))})
 
         moveToSpace = currentLevel.get((moveToX, moveToY), EMPTY)
 
@@ -109,12 +126,11 @@ QUIT to quit the game.
 
         # If the move-to space has a crate, see if we can push it:
         elif moveToSpace in (CRATE, CRATE_ON_GOAL):
-            behindMoveToX = playerX + (moveX * 2)
-            behindMoveToY = playerY + (moveY * 2)
             behindMoveToSpace = currentLevel.get((behindMoveToX, behindMoveToY), EMPTY)
             if behindMoveToSpace in (WALL, CRATE, CRATE_ON_GOAL):
                 # Can't push the crate because there's a wall or
                 # crate behind it:
+                undoStack.pop()
                 continue
             if behindMoveToSpace in (GOAL, EMPTY):
                 # Change the player's old position:
@@ -135,9 +151,6 @@ QUIT to quit the game.
                 elif behindMoveToSpace == GOAL:
                     currentLevel[(behindMoveToX, behindMoveToY)] = CRATE_ON_GOAL
 
-        # Save the state of the level for the undo feature:
-        undoStack.append(copy.copy(currentLevel))
-
         # Check if the player has finished the level:
         levelIsSolved = True
         for position, character in currentLevel.items():
@@ -150,7 +163,29 @@ QUIT to quit the game.
             input('Press Enter to continue...')
             currentLevelNum = (currentLevelNum + 1) % len(allLevels)
             currentLevel = copy.copy(allLevels[currentLevelNum])
-            undoStack = [copy.copy(currentLevel)]
+            undoStack = []
+
+
+def showHint(levelData):
+    """Run the solver on the level as it is now, and print the moves
+    that solve it."""
+    levelLines = []
+    for y in range(levelData[HEIGHT]):
+        levelLines.append(''.join(levelData.get((x, y), EMPTY) for x in range(levelData[WIDTH])))
+    print('Thinking...')
+    try:
+        result = sokobansolver.solve(levelLines, timeLimit=HINT_TIME_LIMIT)
+    except ValueError:
+        result = {'solution': None, 'stopReason': 'no solution'}
+    if result['solution'] is not None:
+        moves = ''.join(SOLVER_LETTERS[letter.lower()] for letter in result['solution'])
+        print('Hint: these', len(moves), 'moves solve the level:')
+        print(moves)
+    elif result['stopReason'] == 'no solution':
+        print('This level can no longer be solved. Enter U to undo.')
+    else:
+        print('No hint could be found in time.')
+    input('Press Enter to continue...')
 
 
 def loadLevels(levelFilename):
@@ -223,11 +258,12 @@ def askForPlayerMove(maxLevelNum):
                 continue
             return str(int(move) - 1)  # Return the new level number.
 
-        # Check that the input is a valid WASD move or U for undo:
-        if move in ('W', 'A', 'S', 'D', 'U'):
+        # Check that the input is a valid WASD move, U for undo, or H
+        # for a hint:
+        if move in ('W', 'A', 'S', 'D', 'U', 'H'):
             return move
 
-        print(move, 'is not valid. Enter W, A, S, D, UNDO, or QUIT.')
+        print(move, 'is not valid. Enter W, A, S, D, U, H, or QUIT.')
 
 
 # If this program was run (instead of imported), run the game:
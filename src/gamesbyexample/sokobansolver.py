@@ -0,0 +1,572 @@
+"""Sokoban Solver, by Al Sweigart al@inventwithpython.com
+A Sokoban solving module, used by the Sokoban Crate Pushing Game for
+its hints. A state is a bitset of the crate positions plus the top-left
+square the player can walk to, so states that differ only in where the
+player stands in the same region are the same state. The search is A*
+(or IDA*) over pushes, guided by a lower bound from matching crates to
+goals with the Hungarian algorithm. Pushes onto dead squares and pushes
+that freeze crates off of goals are never tried.
+Run it with level files to solve every level in them, for example:
+python sokobansolver.py sokobanlevels.txt pygame_games/starPusherLevels.txt
+More info at http://sokobano.de/wiki/index.php?title=Solver
+Tags: large, module, game, puzzle"""
+__version__ = 0
+import heapq, multiprocessing, os, sys, time
+
+# Characters in level files that represent objects:
+WALL = '#'
+FACE = '@'
+CRATE = '$'
+GOAL = '.'
+CRATE_ON_GOAL = '*'
+PLAYER_ON_GOAL = '+'
+EMPTY = ' '
+
+# The directions, in the same order as the LURD letters used for
+# solutions. Lowercase letters are moves, uppercase letters are pushes:
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DIRECTION_DELTAS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+MOVE_LETTERS = 'udlr'
+OPPOSITE = [DOWN, UP, RIGHT, LEFT]
+
+INFINITY = 1000000  # The push distance to a goal a crate can't reach.
+DEFAULT_TIME_LIMIT = 10.0  # Seconds to spend on a level before giving up.
+DEFAULT_MAX_STATES = 2000000  # How many states the visited table may hold.
+
+
+def readLevels(filename):
+    """Return a list of levels in the level file filename. Each level is
+    a list of its lines. Everything after a ; is a comment, and levels
+    are separated by blank lines, the same as Star Pusher reads them."""
+    levels = []
+    levelLines = []
+    with open(filename) as levelFile:
+        for line in levelFile.read().splitlines() + ['']:
+            if ';' in line:
+                line = line[:line.find(';')]
+            if line.strip() != '':
+                levelLines.append(line)
+            elif levelLines:
+                levels.append(levelLines)
+                levelLines = []
+    return levels
+
+
+class SokobanLevel:
+    def __init__(self, levelLines):
+        """Set up the unchanging parts of a level from its lines of text:
+        the squares, goals, dead squares, and push distances."""
+        self.levelLines = levelLines
+        walls = set()
+        crateSpaces = []
+        goalSpaces = []
+        playerSpace = None
+        for y, line in enumerate(levelLines):
+            for x, char in enumerate(line):
+                if char == WALL:
+                    walls.add((x, y))
+                if char in (CRATE, CRATE_ON_GOAL):
+                    crateSpaces.append((x, y))
+                if char in (GOAL, CRATE_ON_GOAL, PLAYER_ON_GOAL):
+                    goalSpaces.append((x, y))
+                if char in (FACE, PLAYER_ON_GOAL):
+                    playerSpace = (x, y)
+        if playerSpace is None:
+            raise ValueError('The level has no player.')
+        height = len(levelLines)
+        width = max(len(line) for line in levelLines)
+
+        # Squares are numbered left to right, top to bottom, with one
+        # extra column so that squares on the left and right edges are
+        # never next to each other. Each square is a bit in the crate
+        # bitsets. The floor is the squares the player could ever reach:
+        self.rowLength = width + 1
+        self.numSquares = self.rowLength * height
+        playerSquare = self._getSquare(playerSpace)
+        isFloor = bytearray(self.numSquares)
+        isFloor[playerSquare] = 1
+        floor = [playerSquare]
+        for square in floor:
+            x, y = square % self.rowLength, square // self.rowLength
+            for dx, dy in DIRECTION_DELTAS:
+                if 0 <= x + dx < width and 0 <= y + dy < height and (x + dx, y + dy) not in walls:
+                    nextSquare = self._getSquare((x + dx, y + dy))
+                    if not isFloor[nextSquare]:
+                        isFloor[nextSquare] = 1
+                        floor.append(nextSquare)
+        self.floor = sorted(floor)
+        self.floorMask = sum(1 << square for square in floor)
+        # neighbors[square][direction] is the next floor square, or -1:
+        deltas = [dy * self.rowLength + dx for dx, dy in DIRECTION_DELTAS]
+        self.neighbors = [[square + delta if isFloor[square] and 0 <= square + delta < self.numSquares
+                           and isFloor[square + delta] else -1 for delta in deltas]
+                          for square in range(self.numSquares)]
+
+        for space in set(crateSpaces + goalSpaces):
+            if not isFloor[self._getSquare(space)]:
+                if levelLines[space[1]][space[0]] != CRATE_ON_GOAL:
+                    raise ValueError('The level has a crate or goal the player cannot reach.')
+                # A walled-in crate on a goal is already done, so leave
+                # it out:
+                crateSpaces.remove(space)
+                goalSpaces.remove(space)
+        self.goals = [self._getSquare(space) for space in goalSpaces]
+        self.goalMask = sum(1 << goal for goal in self.goals)
+        self.startCrates = sum(1 << self._getSquare(space) for space in crateSpaces)
+        self.startPlayer = playerSquare
+        self.numCrates = len(crateSpaces)
+        if self.numCrates < len(self.goals):
+            raise ValueError('The level has fewer crates than goals.')
+
+        # pushDistances[goal index][square] is the fewest pushes to get
+        # a crate from square to that goal, ignoring the other crates:
+        self.pushDistances = [self._getPullDistances(goal) for goal in self.goals]
+        # A crate on a dead square can never reach any goal. (When there
+        # are spare crates, any crate may stay put, so none are dead.)
+        self.isDead = bytearray(self.numSquares)
+        if self.numCrates == len(self.goals):
+            for square in self.floor:
+                if all(distances[square] == INFINITY for distances in self.pushDistances):
+                    self.isDead[square] = 1
+
+
+    def _getSquare(self, space):
+        return space[1] * self.rowLength + space[0]
+
+
+    def _getPullDistances(self, goal):
+        """Return a list of the push distances from each square to goal,
+        found by pulling a crate backward from the goal."""
+        neighbors = self.neighbors
+        distances = [INFINITY] * self.numSquares
+        distances[goal] = 0
+        queue = [goal]
+        for square in queue:
+            for direction in range(4):
+                # Pulling the crate one square in direction needs the
+                # player to stand two squares away in that direction:
+                pulledTo = neighbors[square][direction]
+                if pulledTo != -1 and neighbors[pulledTo][direction] != -1 and distances[pulledTo] == INFINITY:
+                    distances[pulledTo] = distances[square] + 1
+                    queue.append(pulledTo)
+        return distances
+
+
+    def getReachable(self, crates, player):
+        """Return a bitset of the squares the player can walk to from
+        player without pushing a crate, and the lowest numbered of those
+        squares. The whole region is grown one step at a time, using
+        shifts on the bitset."""
+        free = self.floorMask & ~crates
+        rowLength = self.rowLength
+        reachable = 1 << player
+        while True:
+            grown = (reachable | reachable << 1 | reachable >> 1 | reachable << rowLength | reachable >> rowLength) & free
+            if grown == reachable:
+                break
+            reachable = grown
+        return reachable, (reachable & -reachable).bit_length() - 1
+
+
+    def iterSquares(self, mask):
+        """Yield the square numbers of the bits set in mask."""
+        while mask:
+            lowestBit = mask & -mask
+            yield lowestBit.bit_length() - 1
+            mask ^= lowestBit
+
+
+    def getLowerBound(self, crates):
+        """Return the lower bound tuple for crates. Its first item is the
+        fewest pushes that could solve the level, found by matching each
+        goal to a different crate with the Hungarian algorithm. It's
+        INFINITY or more if there is no matching. The other items are
+        the matching and potentials that getLowerBoundAfterPush() uses
+        to update the bound."""
+        crateSquares = list(self.iterSquares(crates))
+        numGoals = len(self.goals)
+        # These lists are 1-indexed, with 0 as a placeholder, the same
+        # as the usual Hungarian algorithm:
+        goalPotentials = [0] * (numGoals + 1)
+        cratePotentials = [0] * (len(crateSquares) + 1)
+        goalOfCrate = [0] * (len(crateSquares) + 1)  # 0 means unmatched.
+        for goal in range(1, numGoals + 1):
+            self._matchGoal(goal, crateSquares, goalPotentials, cratePotentials, goalOfCrate)
+        return self._makeBound(crateSquares, goalPotentials, cratePotentials, goalOfCrate)
+
+
+    def getLowerBoundAfterPush(self, parentBound, crates, fromSquare, toSquare):
+        """Return getLowerBound(crates) for the crates after a push from
+        fromSquare to toSquare, given the lower bound tuple from before
+        the push. Only the moved crate changes, so the old matching and
+        potentials are kept, and at most one goal is matched again."""
+        bound, crateSquares, goalPotentials, cratePotentials, goalOfCrate = parentBound
+        crateSquares = list(crateSquares)
+        cratePotentials = list(cratePotentials)
+        goalOfCrate = list(goalOfCrate)
+        crate = crateSquares.index(fromSquare) + 1
+        crateSquares[crate - 1] = toSquare
+        goal = goalOfCrate[crate]
+        if goal != 0 and self.pushDistances[goal - 1][toSquare] == self.pushDistances[goal - 1][fromSquare] - 1:
+            # The crate moved toward its goal, which lowers the bound by
+            # the most one push can, so the matching is still the best:
+            cratePotentials[crate] -= 1
+            return (bound - 1, tuple(crateSquares), goalPotentials, tuple(cratePotentials), tuple(goalOfCrate))
+        if self.numCrates > len(self.goals):
+            # The spare crates' potentials aren't kept at 0, so matching
+            # one goal again can miss a cheaper matching. Start over:
+            return self.getLowerBound(crates)
+
+        # Lower the crate's potential so no goal is over its cost, then
+        # match its goal again:
+        pushDistances = self.pushDistances
+        cratePotentials[crate] = min(pushDistances[otherGoal - 1][toSquare] - goalPotentials[otherGoal]
+                                     for otherGoal in range(1, len(goalPotentials)))
+        goalPotentials = list(goalPotentials)
+        if goal != 0:
+            goalOfCrate[crate] = 0
+            self._matchGoal(goal, crateSquares, goalPotentials, cratePotentials, goalOfCrate)
+        return self._makeBound(crateSquares, goalPotentials, cratePotentials, goalOfCrate)
+
+
+    def _matchGoal(self, goal, crateSquares, goalPotentials, cratePotentials, goalOfCrate):
+        """Match the unmatched goal to a crate along the cheapest
+        augmenting path, updating the potentials. This is one step of the
+        Hungarian algorithm."""
+        pushDistances = self.pushDistances
+        numCrates = len(crateSquares)
+        goalOfCrate[0] = goal
+        crate = 0
+        minSlack = [float('inf')] * (numCrates + 1)
+        previousCrate = [0] * (numCrates + 1)
+        used = [False] * (numCrates + 1)
+        while True:
+            used[crate] = True
+            currentGoal = goalOfCrate[crate]
+            distances = pushDistances[currentGoal - 1]
+            currentPotential = goalPotentials[currentGoal]
+            delta = float('inf')
+            nextCrate = 0
+            for otherCrate in range(1, numCrates + 1):
+                if not used[otherCrate]:
+                    slack = distances[crateSquares[otherCrate - 1]] - currentPotential - cratePotentials[otherCrate]
+                    if slack < minSlack[otherCrate]:
+                        minSlack[otherCrate] = slack
+                        previousCrate[otherCrate] = crate
+                    if minSlack[otherCrate] < delta:
+                        delta = minSlack[otherCrate]
+                        nextCrate = otherCrate
+            for otherCrate in range(numCrates + 1):
+                if used[otherCrate]:
+                    goalPotentials[goalOfCrate[otherCrate]] += delta
+                    cratePotentials[otherCrate] -= delta
+                else:
+                    minSlack[otherCrate] -= delta
+            crate = nextCrate
+            if goalOfCrate[crate] == 0:
+                break
+        # Flip the matches along the augmenting path:
+        while crate != 0:
+            previous = previousCrate[crate]
+            goalOfCrate[crate] = goalOfCrate[previous]
+            crate = previous
+        goalOfCrate[0] = 0
+
+
+    def _makeBound(self, crateSquares, goalPotentials, cratePotentials, goalOfCrate):
+        bound = sum(self.pushDistances[goalOfCrate[crate] - 1][crateSquares[crate - 1]]
+                    for crate in range(1, len(crateSquares) + 1) if goalOfCrate[crate] != 0)
+        return (bound, tuple(crateSquares), tuple(goalPotentials), tuple(cratePotentials), tuple(goalOfCrate))
+
+
+    def isFrozenDeadlock(self, crates, square):
+        """Return True if the crate at square can never move again and
+        it (or another crate it freezes) isn't on a goal."""
+        if self.numCrates != len(self.goals):
+            return False
+        frozenCrates = []
+        if not self._isFrozen(crates, square, {square}, frozenCrates):
+            return False
+        frozenCrates.append(square)
+        return any(not (self.goalMask >> frozen) & 1 for frozen in frozenCrates)
+
+
+    def _isFrozen(self, crates, square, treatAsWalls, frozenCrates):
+        """Return True if the crate at square is blocked both up-down and
+        left-right, treating the squares in treatAsWalls as walls. Adds
+        the other crates it depends on to frozenCrates."""
+        neighbors = self.neighbors[square]
+        for side1, side2 in ((neighbors[UP], neighbors[DOWN]), (neighbors[LEFT], neighbors[RIGHT])):
+            if side1 == -1 or side2 == -1 or side1 in treatAsWalls or side2 in treatAsWalls:
+                continue  # Blocked by a wall.
+            if self.isDead[side1] and self.isDead[side2]:
+                continue  # It can only be pushed onto a dead square.
+            blocked = False
+            for side in (side1, side2):
+                if (crates >> side) & 1 and self._isFrozen(crates, side, treatAsWalls | {square}, frozenCrates):
+                    frozenCrates.append(side)
+                    blocked = True
+                    break
+            if not blocked:
+                return False
+        return True
+
+
+    def getPushes(self, crates, reachable):
+        """Yield a (crate square, direction, new crates) tuple for each
+        push the player can make. Pushes onto dead squares and pushes
+        that cause freeze deadlocks are skipped."""
+        neighbors = self.neighbors
+        isDead = self.isDead
+        for square in self.iterSquares(crates):
+            squareNeighbors = neighbors[square]
+            for direction in range(4):
+                pushTo = squareNeighbors[direction]
+                behind = squareNeighbors[OPPOSITE[direction]]
+                if pushTo == -1 or behind == -1 or not (reachable >> behind) & 1 or (crates >> pushTo) & 1 or isDead[pushTo]:
+                    continue
+                newCrates = crates ^ (1 << square) ^ (1 << pushTo)
+                if not self.isFrozenDeadlock(newCrates, pushTo):
+                    yield square, direction, newCrates
+
+
+    def isSolved(self, crates):
+        return crates & self.goalMask == self.goalMask
+
+
+    def getWalk(self, crates, start, end):
+        """Return the LURD letters for walking from start to end without
+        pushing any crates, or None if the player can't get there."""
+        cameFrom = {start: None}  # Keys=squares, values=(square, direction).
+        queue = [start]
+        for square in queue:
+            if square == end:
+                break
+            for direction, nextSquare in enumerate(self.neighbors[square]):
+                if nextSquare != -1 and nextSquare not in cameFrom and not (crates >> nextSquare) & 1:
+                    cameFrom[nextSquare] = (square, direction)
+                    queue.append(nextSquare)
+        if end not in cameFrom:
+            return None
+        letters = []
+        square = end
+        while cameFrom[square] is not None:
+            square, direction = cameFrom[square]
+            letters.append(MOVE_LETTERS[direction])
+        return ''.join(reversed(letters))
+
+
+    def getSolutionMoves(self, pushes):
+        """Turn a list of (crate square, direction) pushes into LURD
+        letters, including the walking between pushes."""
+        crates = self.startCrates
+        player = self.startPlayer
+        letters = []
+        for square, direction in pushes:
+            letters.append(self.getWalk(crates, player, self.neighbors[square][OPPOSITE[direction]]))
+            letters.append(MOVE_LETTERS[direction].upper())
+            crates ^= (1 << square) ^ (1 << self.neighbors[square][direction])
+            player = square
+        return ''.join(letters)
+
+
+class _SearchLimitReached(Exception):
+    pass
+
+
+class _Search:
+    def __init__(self, level, timeLimit, maxStates):
+        self.level = level
+        self.deadline = time.time() + timeLimit
+        self.maxStates = maxStates
+        self.nodesExpanded = 0
+        self.stopReason = None  # Why the search gave up, if it did.
+
+
+    def getKey(self, crates, player):
+        """Return the state as a single int made from the crate bitset
+        and the lowest numbered square in the player's region, and the
+        bitset of the player's region."""
+        reachable, lowest = self.level.getReachable(crates, player)
+        return crates * self.level.numSquares + lowest, reachable
+
+
+    def countExpansion(self, numStates):
+        self.nodesExpanded += 1
+        if time.time() > self.deadline:
+            self.stopReason = 'time limit'
+            raise _SearchLimitReached()
+        if numStates > self.maxStates:
+            self.stopReason = 'memory cap'
+            raise _SearchLimitReached()
+
+
+    def aStar(self):
+        """Return a list of (crate square, direction) pushes that solves
+        the level with the fewest pushes, or None."""
+        level = self.level
+        numSquares = level.numSquares
+        startCrates = level.startCrates
+        startKey, reachable = self.getKey(startCrates, level.startPlayer)
+        lowerBound = level.getLowerBound(startCrates)
+        if lowerBound[0] >= INFINITY:
+            return None
+        # Keys=state keys, values=(pushes so far, parent key, push):
+        visited = {startKey: (0, None, None)}
+        # The heap has (f, -g, counter, key, lower bound) tuples. Ties
+        # go to deeper states, which are closer to being solved:
+        heap = [(lowerBound[0], 0, 0, startKey, lowerBound)]
+        counter = 0
+        while heap:
+            f, negativeG, count, key, parentBound = heapq.heappop(heap)
+            g = -negativeG
+            if visited[key][0] < g:
+                continue  # A shorter way to this state was found later.
+            crates, player = divmod(key, numSquares)
+            if level.isSolved(crates):
+                return self._getPushesTo(visited, key)
+            self.countExpansion(len(visited))
+
+            reachable, lowest = level.getReachable(crates, player)
+            for square, direction, newCrates in level.getPushes(crates, reachable):
+                newKey, newReachable = self.getKey(newCrates, square)
+                old = visited.get(newKey)
+                if old is not None and old[0] <= g + 1:
+                    continue
+                lowerBound = level.getLowerBoundAfterPush(parentBound, newCrates, square, level.neighbors[square][direction])
+                if lowerBound[0] >= INFINITY:
+                    continue
+                visited[newKey] = (g + 1, key, (square, direction))
+                counter += 1
+                heapq.heappush(heap, (g + 1 + lowerBound[0], -(g + 1), counter, newKey, lowerBound))
+        return None
+
+
+    def _getPushesTo(self, visited, key):
+        pushes = []
+        while visited[key][1] is not None:
+            g, parentKey, push = visited[key]
+            pushes.append(push)
+            key = parentKey
+        return list(reversed(pushes))
+
+
+    def idaStar(self):
+        """Return a list of pushes that solves the level with the fewest
+        pushes, or None. Uses much less memory than aStar(), because only
+        up to maxStates states are remembered in the transposition
+        table."""
+        level = self.level
+        startCrates = level.startCrates
+        startBound = level.getLowerBound(startCrates)
+        threshold = startBound[0]
+        if threshold >= INFINITY:
+            return None
+        while True:
+            # Keys=state keys, values=the fewest pushes they were reached
+            # with in this iteration:
+            self.transpositions = {}
+            self.nextThreshold = INFINITY
+            pushes = []
+            if self._depthFirst(startCrates, level.startPlayer, startBound, 0, threshold, pushes):
+                return pushes
+            if self.nextThreshold >= INFINITY:
+                return None  # Every state has been searched.
+            threshold = self.nextThreshold
+
+
+    def _depthFirst(self, crates, player, lowerBound, g, threshold, pushes):
+        level = self.level
+        if level.isSolved(crates):
+            return True
+        key, reachable = self.getKey(crates, player)
+        if self.transpositions.get(key, INFINITY) <= g:
+            return False  # This state was already searched at least as deep.
+        if len(self.transpositions) < self.maxStates:
+            self.transpositions[key] = g
+        if len(pushes) > sys.getrecursionlimit() - 100:
+            self.stopReason = 'too deep'
+            raise _SearchLimitReached()
+        self.countExpansion(0)
+
+        for square, direction, newCrates in level.getPushes(crates, reachable):
+            newBound = level.getLowerBoundAfterPush(lowerBound, newCrates, square, level.neighbors[square][direction])
+            f = g + 1 + newBound[0]
+            if f > threshold:
+                self.nextThreshold = min(self.nextThreshold, f)
+                continue
+            pushes.append((square, direction))
+            if self._depthFirst(newCrates, square, newBound, g + 1, threshold, pushes):
+                return True
+            pushes.pop()
+        return False
+
+
+def solve(levelLines, algorithm='astar', timeLimit=DEFAULT_TIME_LIMIT, maxStates=DEFAULT_MAX_STATES):
+    """Solve the level in the list of strings levelLines, and return a
+    dictionary with the keys 'solution' (LURD letters, or None),
+    'pushes', 'moves', 'nodesExpanded', 'time', and 'stopReason' (None,
+    'time limit', 'memory cap', 'too deep', or 'no solution').
+    algorithm is 'astar' or 'idastar'."""
+    startTime = time.time()
+    level = SokobanLevel(levelLines)
+    search = _Search(level, timeLimit, maxStates)
+    try:
+        if algorithm == 'idastar':
+            pushes = search.idaStar()
+        else:
+            pushes = search.aStar()
+    except _SearchLimitReached:
+        pushes = None
+    solution = None if pushes is None else level.getSolutionMoves(pushes)
+    return {'solution': solution,
+            'pushes': None if pushes is None else len(pushes),
+            'moves': None if solution is None else len(solution),
+            'nodesExpanded': search.nodesExpanded,
+            'time': time.time() - startTime,
+            'stopReason': search.stopReason or (None if pushes is not None else 'no solution')}
+
+
+def _solveArgs(args):
+    return solve(*args)
+
+
+def solveFiles(filenames, numWorkers=None, algorithm='astar', timeLimit=DEFAULT_TIME_LIMIT,
+               maxStates=DEFAULT_MAX_STATES):
+    """Solve every level in the level files, spread across numWorkers
+    processes (all CPU cores by default), and print a report."""
+    jobs = []  # A list of (filename, level number, solve() arguments).
+    for filename in filenames:
+        for levelNum, levelLines in enumerate(readLevels(filename), 1):
+            jobs.append((filename, levelNum, (levelLines, algorithm, timeLimit, maxStates)))
+    if numWorkers is None:
+        numWorkers = os.cpu_count() or 1
+
+    startTime = time.time()
+    numSolved = 0
+    pool = multiprocessing.Pool(numWorkers) if numWorkers > 1 else None
+    try:
+        if pool is not None:
+            results = pool.imap(_solveArgs, [job[2] for job in jobs])
+        else:
+            results = (_solveArgs(job[2]) for job in jobs)
+        for (filename, levelNum, args), result in zip(jobs, results):
+            if result['solution'] is not None:
+                numSolved += 1
+                print('%s level %s: %s pushes, %s moves, %s nodes, %.2f s' % (
+                    filename, levelNum, result['pushes'], result['moves'], result['nodesExpanded'], result['time']))
+            else:
+                print('%s level %s: not solved (%s), %s nodes, %.2f s' % (
+                    filename, levelNum, result['stopReason'], result['nodesExpanded'], result['time']))
+    finally:
+        if pool is not None:
+            pool.terminate()
+    print('Solved %s of %s levels in %.1f seconds.' % (numSolved, len(jobs), time.time() - startTime))
+
+
+# If this program isn't being imported, solve the given level files.
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        solveFiles(sys.argv[1:])
+    else:
+        solveFiles(['sokobanlevels.txt', os.path.join('pygame_games', 'starPusherLevels.txt')])
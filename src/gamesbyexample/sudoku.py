@@ -4,7 +4,8 @@ More info at https://en.wikipedia.org/wiki/Sudoku
 This code is available at https://nostarch.com/big-book-small-python-programming
 Tags: large, game, object-oriented, puzzle"""
 __version__ = 0
-import copy, random, sys
+import random, sys
+import sudokusolver  # Imports our sudokusolver.py program.
 
 # This game requires a sudokupuzzle.txt file that contains the puzzles.
 # Download it from https://inventwithpython.com/sudokupuzzles.txt
@@ -33,11 +34,14 @@ class SudokuGrid:
         # that space.
         self.grid = {}
         self.resetGrid()  # Set the grid state to its original setup.
-        self.moves = []  # Tracks each move for the undo feature.
+        self.solution = None  # Found by the solver when first needed.
 
     def resetGrid(self):
         """Reset the state of the grid, tracked by self.grid, to the
         state in self.originalSetup."""
+        # Each move is stored as an (x, y, previous number) tuple for
+        # the undo feature:
+        self.moves = []
         for x in range(1, GRID_LENGTH + 1):
             for y in range(1, GRID_LENGTH + 1):
                 self.grid[(x, y)] = EMPTY_SPACE
@@ -61,25 +65,31 @@ class SudokuGrid:
         if self.originalSetup[y * GRID_LENGTH + x] != EMPTY_SPACE:
             return False
 
+        # Remember what was here before, so the move can be undone:
+        self.moves.append((x, y, self.grid[(x, y)]))
         self.grid[(x, y)] = number  # Place this number on the grid.
-
-        # We need to store a separate copy of the dictionary object:
-        self.moves.append(copy.copy(self.grid))
         return True
 
     def undo(self):
-        """Set the current grid state to the previous state in the
-        self.moves list."""
+        """Undo the last move in the self.moves list."""
         if self.moves == []:
-            return  # No states in self.moves, so do nothing.
+            return  # No moves in self.moves, so do nothing.
 
-        self.moves.pop()  # Remove the current state.
+        # Put back the number that was there before the last move:
+        x, y, previousNumber = self.moves.pop()
+        self.grid[(x, y)] = previousNumber
 
-        if self.moves == []:
-            self.resetGrid()
-        else:
-            # set the grid to the last move.
-            self.grid = copy.copy(self.moves[-1])
+    def getHint(self):
+        """Return a (column, row, number) tuple for a space that is
+        empty or wrong, or None if the grid is already solved."""
+        if self.solution is None:
+            self.solution = sudokusolver.solve(self.originalSetup)
+        for y in range(GRID_LENGTH):
+            for x in range(GRID_LENGTH):
+                number = self.solution[y * GRID_LENGTH + x]
+                if self.grid[(x, y)] != number:
+                    return ('ABCDEFGHI'[x], str(y + 1), number)
+        return None
 
     def display(self):
         """Display the current state of the grid on the screen."""
@@ -183,12 +193,12 @@ while True:  # Main game loop.
     # Get the player's action:
     while True:  # Keep asking until the player enters a valid action.
         print()  # Print a newline.
-        print('Enter a move, or RESET, NEW, UNDO, ORIGINAL, or QUIT:')
+        print('Enter a move, or RESET, NEW, UNDO, HINT, ORIGINAL, or QUIT:')
         print('(For example, a move looks like "B4 9".)')
 
         action = input('> ').upper().strip()
 
-        if len(action) > 0 and action[0] in ('R', 'N', 'U', 'O', 'Q'):
+        if len(action) > 0 and action[0] in ('R', 'N', 'U', 'H', 'O', 'Q'):
             # Player entered a valid action.
             break
 
@@ -226,6 +236,13 @@ while True:  # Main game loop.
         grid.undo()
         continue
 
+    if action.startswith('H'):
+        # Fill in one space with the number from the solution:
+        column, row, number = grid.getHint()
+        print('Hint: put a', number, 'at', column + row)
+        grid.makeMove(column, row, number)
+        continue
+
     if action.startswith('O'):
         # View the original numbers:
         originalGrid = SudokuGrid(grid.originalSetup)
@@ -0,0 +1,257 @@
+"""Sudoku Solver, by Al Sweigart al@inventwithpython.com
+A fast sudoku solving and puzzle generating module, used by the Sudoku
+Puzzle program. Each row, column, and box keeps a bitmask of the numbers
+already placed in it, so the candidates for a space are found with a
+couple of bitwise operations. Naked and hidden singles are filled in
+before guessing, and guesses are undone from a trail of placed spaces
+instead of copying the grid.
+Run it with a puzzle file to solve every puzzle in it, for example:
+python sudokusolver.py sudokupuzzles.txt
+More info at https://en.wikipedia.org/wiki/Sudoku_solving_algorithms
+Tags: large, module, puzzle"""
+__version__ = 0
+import random, sys, time
+
+# Set up the constants:
+EMPTY_SPACE = '.'
+GRID_LENGTH = 9
+BOX_LENGTH = 3
+FULL_GRID_SIZE = GRID_LENGTH * GRID_LENGTH
+ALL_NUMBERS = 0b111111111  # One bit for each of the numbers 1 to 9.
+
+# Spaces are numbered 0 to 80, going left to right and then top to
+# bottom. These lists give the row, column, and box of each space:
+ROW_OF = [i // GRID_LENGTH for i in range(FULL_GRID_SIZE)]
+COLUMN_OF = [i % GRID_LENGTH for i in range(FULL_GRID_SIZE)]
+BOX_OF = [(ROW_OF[i] // BOX_LENGTH) * BOX_LENGTH + COLUMN_OF[i] // BOX_LENGTH
+          for i in range(FULL_GRID_SIZE)]
+
+# Each unit is a list of the nine spaces in a row, column, or box:
+UNITS = []
+for unitNum in range(GRID_LENGTH):
+    UNITS.append([i for i in range(FULL_GRID_SIZE) if ROW_OF[i] == unitNum])
+    UNITS.append([i for i in range(FULL_GRID_SIZE) if COLUMN_OF[i] == unitNum])
+    UNITS.append([i for i in range(FULL_GRID_SIZE) if BOX_OF[i] == unitNum])
+
+# The number of set bits in each possible candidates bitmask:
+BIT_COUNT = [bin(mask).count('1') for mask in range(ALL_NUMBERS + 1)]
+# The numbers in each possible candidates bitmask, like [1, 4, 9]:
+NUMBERS_IN = [[n for n in range(1, GRID_LENGTH + 1) if mask & (1 << (n - 1))]
+              for mask in range(ALL_NUMBERS + 1)]
+
+
+class _SolverState:
+    def __init__(self, puzzle):
+        """Set up the grid and bitmasks from an 81-character puzzle
+        string, with numbers and periods (for the blank spaces)."""
+        assert len(puzzle) == FULL_GRID_SIZE, 'Puzzles must be 81 characters long.'
+        self.grid = [0] * FULL_GRID_SIZE  # 0 means an empty space.
+        self.rowMasks = [0] * GRID_LENGTH
+        self.columnMasks = [0] * GRID_LENGTH
+        self.boxMasks = [0] * GRID_LENGTH
+        self.isValid = True  # False if the givens break the rules.
+        for i, char in enumerate(puzzle):
+            if char in '123456789':
+                if not self.getCandidates(i) & (1 << (int(char) - 1)):
+                    self.isValid = False
+                self.place(i, int(char))
+
+
+    def getCandidates(self, i):
+        """Return the bitmask of numbers that can go in space i."""
+        return ALL_NUMBERS & ~(self.rowMasks[ROW_OF[i]] | self.columnMasks[COLUMN_OF[i]] | self.boxMasks[BOX_OF[i]])
+
+
+    def place(self, i, number):
+        """Put number in the empty space i."""
+        bit = 1 << (number - 1)
+        self.grid[i] = number
+        self.rowMasks[ROW_OF[i]] |= bit
+        self.columnMasks[COLUMN_OF[i]] |= bit
+        self.boxMasks[BOX_OF[i]] |= bit
+
+
+    def remove(self, i):
+        """Take the number out of space i."""
+        bit = 1 << (self.grid[i] - 1)
+        self.grid[i] = 0
+        self.rowMasks[ROW_OF[i]] ^= bit
+        self.columnMasks[COLUMN_OF[i]] ^= bit
+        self.boxMasks[BOX_OF[i]] ^= bit
+
+
+    def propagate(self, trail):
+        """Fill in naked and hidden singles until there are none left,
+        adding each filled space to trail. Returns False if the grid
+        can't be solved, None if it is solved, or else a list of
+        (space, number) guesses, one of which must be right."""
+        grid = self.grid
+        while True:
+            madeProgress = False
+            bestSpace, bestCandidates, bestCount = None, 0, GRID_LENGTH + 1
+
+            # Naked singles: spaces with only one possible number.
+            for i in range(FULL_GRID_SIZE):
+                if grid[i] != 0:
+                    continue
+                candidates = self.getCandidates(i)
+                count = BIT_COUNT[candidates]
+                if count == 0:
+                    return False  # No number can go here.
+                elif count == 1:
+                    self.place(i, NUMBERS_IN[candidates][0])
+                    trail.append(i)
+                    madeProgress = True
+                elif count < bestCount:
+                    bestSpace, bestCandidates, bestCount = i, candidates, count
+            if madeProgress:
+                continue
+            if bestSpace is None:
+                return None  # There are no empty spaces left.
+
+            # Hidden singles: numbers with only one possible space in
+            # a row, column, or box.
+            pairUnit, pairBit = None, 0  # A number with two possible spaces.
+            for unit in UNITS:
+                seenOnce, seenTwice, seenThrice, placed = 0, 0, 0, 0
+                for i in unit:
+                    if grid[i] != 0:
+                        placed |= 1 << (grid[i] - 1)
+                    else:
+                        candidates = self.getCandidates(i)
+                        seenThrice |= seenTwice & candidates
+                        seenTwice |= seenOnce & candidates
+                        seenOnce |= candidates
+                if seenOnce | placed != ALL_NUMBERS:
+                    return False  # Some number can't go anywhere in this unit.
+                if pairUnit is None and seenTwice & ~seenThrice:
+                    pairUnit, pairBit = unit, seenTwice & ~seenThrice
+                hidden = seenOnce & ~seenTwice
+                if hidden == 0:
+                    continue
+                for i in unit:
+                    if grid[i] == 0:
+                        candidates = self.getCandidates(i) & hidden
+                        if BIT_COUNT[candidates] > 1:
+                            return False  # This space needs two numbers.
+                        elif candidates != 0:
+                            self.place(i, NUMBERS_IN[candidates][0])
+                            trail.append(i)
+                            madeProgress = True
+            if madeProgress:
+                continue
+
+            # Guess either the numbers for the space with the fewest
+            # candidates, or the two spaces a number could go in:
+            if bestCount > 2 and pairUnit is not None:
+                pairBit &= -pairBit  # Keep just the lowest bit.
+                return [(i, NUMBERS_IN[pairBit][0]) for i in pairUnit
+                        if grid[i] == 0 and self.getCandidates(i) & pairBit]
+            return [(bestSpace, number) for number in NUMBERS_IN[bestCandidates]]
+
+
+    def toString(self):
+        """Return the grid as an 81-character puzzle string."""
+        return ''.join([str(n) if n != 0 else EMPTY_SPACE for n in self.grid])
+
+
+def _search(state, solutions, limit, shuffle):
+    """Add the solutions of state to the solutions list, stopping once
+    there are limit of them. If shuffle is True, guesses are made in a
+    random order."""
+    trail = []  # The spaces filled in at this level of the search.
+    result = state.propagate(trail)
+    if result is None:
+        solutions.append(state.toString())
+    elif result is not False:
+        if shuffle:
+            random.shuffle(result)
+        for space, number in result:
+            state.place(space, number)
+            _search(state, solutions, limit, shuffle)
+            state.remove(space)
+            if len(solutions) >= limit:
+                break
+
+    # Undo the spaces that were filled in at this level:
+    for i in trail:
+        state.remove(i)
+
+
+def findSolutions(puzzle, limit=2, shuffle=False):
+    """Return a list of up to limit solution strings for puzzle."""
+    state = _SolverState(puzzle)
+    if not state.isValid:
+        return []
+    solutions = []
+    _search(state, solutions, limit, shuffle)
+    return solutions
+
+
+def solve(puzzle):
+    """Return the solution string for puzzle, or None if it has none."""
+    solutions = findSolutions(puzzle, 1)
+    if solutions == []:
+        return None
+    return solutions[0]
+
+
+def hasUniqueSolution(puzzle):
+    """Return True if puzzle has exactly one solution."""
+    return len(findSolutions(puzzle, 2)) == 1
+
+
+def makePuzzle(minGivens=17):
+    """Return a random puzzle string that has exactly one solution."""
+    # Make a random solved grid by solving an empty grid with guesses
+    # made in a random order:
+    solution = findSolutions(EMPTY_SPACE * FULL_GRID_SIZE, 1, shuffle=True)[0]
+
+    # Empty out spaces one at a time, putting the number back if the
+    # puzzle stops having a single solution:
+    puzzle = list(solution)
+    numGivens = FULL_GRID_SIZE
+    for i in random.sample(range(FULL_GRID_SIZE), FULL_GRID_SIZE):
+        if numGivens <= minGivens:
+            break
+        puzzle[i] = EMPTY_SPACE
+        if hasUniqueSolution(''.join(puzzle)):
+            numGivens -= 1
+        else:
+            puzzle[i] = solution[i]
+    return ''.join(puzzle)
+
+
+def solveFile(filename):
+    """Solve every puzzle in the file, one per line, and print the time
+    taken for each one."""
+    numSolved = 0
+    totalTime = 0.0
+    slowestTime = 0.0
+    with open(filename) as puzzleFile:
+        for lineNum, line in enumerate(puzzleFile, 1):
+            puzzle = line.strip()
+            if len(puzzle) != FULL_GRID_SIZE:
+                continue  # Skip blank or badly formed lines.
+            startTime = time.time()
+            solution = solve(puzzle)
+            puzzleTime = time.time() - startTime
+            totalTime += puzzleTime
+            slowestTime = max(slowestTime, puzzleTime)
+            if solution is None:
+                print('Puzzle %s: NO SOLUTION (%.2f ms)' % (lineNum, puzzleTime * 1000))
+            else:
+                numSolved += 1
+                print('Puzzle %s: %s (%.2f ms)' % (lineNum, solution, puzzleTime * 1000))
+    print('Solved %s puzzles in %.3f seconds (slowest took %.2f ms).'
+          % (numSolved, totalTime, slowestTime * 1000))
+
+
+# If this program isn't being imported, solve the given puzzle file.
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        solveFile(sys.argv[1])
+    else:
+        print('Usage: python sudokusolver.py sudokupuzzles.txt')
+        print('Here is a random puzzle with a single solution:')
+        print(makePuzzle())
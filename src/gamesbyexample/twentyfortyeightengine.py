@@ -0,0 +1,340 @@
+"""Twenty Forty-Eight Engine, by Al Sweigart al@inventwithpython.com
+A 2048 module, used by the Twenty Forty-Eight game for moves, hints,
+and autoplay. The 4x4 board is packed into one 64-bit integer, with 4
+bits per space holding the tile's power of two (so 1 is a 2 tile, 11 is
+a 2048 tile, and 0 is blank). Every possible row of four spaces is slid
+ahead of time into tables with 65536 entries, so a move is four table
+lookups. The AI is an expectimax search: it picks the move with the
+best average outcome over every place the next tile could appear,
+remembering boards it has already scored, and searches deeper while it
+has time left.
+Run it to time the engine and the AI, for example:
+python twentyfortyeightengine.py 1000 0.01
+More info at https://en.wikipedia.org/wiki/2048_(video_game)
+Tags: large, module, game"""
+__version__ = 0
+import multiprocessing, os, random, sys, time
+
+"""The space at (x, y) is bits 16 * y + 4 * x to 16 * y + 4 * x + 3, so
+each row is 16 bits with its leftmost space in the lowest bits:
+
+    bits:   0- 3   4- 7   8-11  12-15      (x, y) = (0, 0) (1, 0) (2, 0) (3, 0)
+           16-19  20-23  24-27  28-31               (0, 1) (1, 1) (2, 1) (3, 1)
+           ...
+
+Up and down moves swap the rows and columns (transposing the board),
+slide the rows left or right, then swap them back."""
+
+MOVES = ('W', 'A', 'S', 'D')  # Up, left, down, and right.
+MAX_EXPONENT = 15  # The biggest tile that fits in 4 bits is 2 ** 15.
+ROW_MASK = 0xFFFF
+# The game only adds 2 tiles. (The original 2048 adds a 4 tile instead
+# one time in ten, which is a FOUR_CHANCE of 0.1.)
+FOUR_CHANCE = 0.0
+
+# The AI's board scoring weights, which reward empty spaces, tiles that
+# can merge, and rows and columns that go up or down in order:
+LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+# The search doesn't look at outcomes less likely than this:
+MIN_PROBABILITY = 0.0001
+
+
+def _slideRowLeft(line):
+    """Return the list of four exponents in line, slid and merged to the
+    left (index 0)."""
+    tiles = [exponent for exponent in line if exponent != 0]
+    result = []
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1] and tiles[i] < MAX_EXPONENT:
+            result.append(tiles[i] + 1)  # Merge two tiles into one.
+            i += 2
+        else:
+            result.append(tiles[i])
+            i += 1
+    return result + [0] * (4 - len(result))
+
+
+def _scoreRow(line):
+    """Return the AI's score for a row (or column) of four exponents."""
+    total = sum(exponent ** SUM_POWER for exponent in line)
+    empty = line.count(0)
+    merges = 0
+    previous = 0
+    counter = 0
+    for exponent in line:
+        if exponent == 0:
+            continue
+        if previous == exponent:
+            counter += 1
+        elif counter > 0:
+            merges += 1 + counter
+            counter = 0
+        previous = exponent
+    if counter > 0:
+        merges += 1 + counter
+    monotonicLeft = monotonicRight = 0
+    for i in range(1, 4):
+        if line[i - 1] > line[i]:
+            monotonicLeft += line[i - 1] ** MONOTONICITY_POWER - line[i] ** MONOTONICITY_POWER
+        else:
+            monotonicRight += line[i] ** MONOTONICITY_POWER - line[i - 1] ** MONOTONICITY_POWER
+    return (LOST_PENALTY / 8 + EMPTY_WEIGHT * empty + MERGES_WEIGHT * merges
+            - MONOTONICITY_WEIGHT * min(monotonicLeft, monotonicRight) - SUM_WEIGHT * total)
+
+
+def _makeTables():
+    toRow = lambda line: line[0] | (line[1] << 4) | (line[2] << 8) | (line[3] << 12)
+    rowLeft, rowRight, rowScore = [], [], []
+    for row in range(ROW_MASK + 1):
+        line = [(row >> shift) & 0xF for shift in (0, 4, 8, 12)]
+        rowLeft.append(toRow(_slideRowLeft(line)))
+        rowRight.append(toRow(_slideRowLeft(line[::-1])[::-1]))
+        rowScore.append(_scoreRow(line))
+    return rowLeft, rowRight, rowScore
+
+
+# ROW_LEFT[row] and ROW_RIGHT[row] are the row after sliding it, and
+# ROW_SCORE[row] is the AI's score for it:
+ROW_LEFT, ROW_RIGHT, ROW_SCORE = _makeTables()
+
+
+def transpose(board):
+    """Swap the rows and columns of the board, by swapping the 4-bit
+    spaces in 2x2 blocks and then the 2x2 blocks themselves."""
+    a = (board & 0xF0F00F0FF0F00F0F) | ((board & 0x0000F0F00000F0F0) << 12) | ((board >> 12) & 0x0000F0F00000F0F0)
+    return (a & 0xFF00FF0000FF00FF) | ((a & 0x00FF00FF00000000) >> 24) | ((a << 24) & 0x00FF00FF00000000)
+
+
+def _slideRows(board, table):
+    return (table[board & ROW_MASK] | (table[(board >> 16) & ROW_MASK] << 16)
+            | (table[(board >> 32) & ROW_MASK] << 32) | (table[board >> 48] << 48))
+
+
+def makeMove(board, move):
+    """Return the board after sliding the tiles in the move's direction
+    ('W', 'A', 'S', or 'D'). The board is unchanged if nothing moves."""
+    if move == 'A':
+        return _slideRows(board, ROW_LEFT)
+    elif move == 'D':
+        return _slideRows(board, ROW_RIGHT)
+    elif move == 'W':
+        return transpose(_slideRows(transpose(board), ROW_LEFT))
+    elif move == 'S':
+        return transpose(_slideRows(transpose(board), ROW_RIGHT))
+    raise ValueError('Moves must be one of ' + ', '.join(MOVES))
+
+
+def getLegalMoves(board):
+    """Return a list of the moves that change the board."""
+    return [move for move in MOVES if makeMove(board, move) != board]
+
+
+def getTile(board, x, y):
+    """Return the tile number at x, y, or 0 for a blank space."""
+    exponent = (board >> (16 * y + 4 * x)) & 0xF
+    return 0 if exponent == 0 else 1 << exponent
+
+
+def setTile(board, x, y, tile):
+    """Return the board with the tile number (or 0) put at x, y."""
+    shift = 16 * y + 4 * x
+    exponent = 0 if tile == 0 else tile.bit_length() - 1
+    return (board & ~(0xF << shift)) | (exponent << shift)
+
+
+def boardFromRows(rows):
+    """Return a board from a list of four lists of four tile numbers."""
+    board = 0
+    for y, row in enumerate(rows):
+        for x, tile in enumerate(row):
+            board = setTile(board, x, y, tile)
+    return board
+
+
+def boardToRows(board):
+    return [[getTile(board, x, y) for x in range(4)] for y in range(4)]
+
+
+def getEmptyShifts(board):
+    """Return a list of the bit positions of the blank spaces."""
+    return [shift for shift in range(0, 64, 4) if not (board >> shift) & 0xF]
+
+
+def getScore(board):
+    """Return the sum of all the tiles on the board."""
+    return sum(1 << ((board >> shift) & 0xF) for shift in range(0, 64, 4) if (board >> shift) & 0xF)
+
+
+def getMaxTile(board):
+    return max(getTile(board, x, y) for x in range(4) for y in range(4))
+
+
+def addRandomTile(board, rng=random, fourChance=FOUR_CHANCE):
+    """Return the board with a 2 (or, fourChance of the time, a 4) tile
+    added to a random blank space, or the same board if it's full."""
+    emptyShifts = getEmptyShifts(board)
+    if not emptyShifts:
+        return board
+    exponent = 2 if rng.random() < fourChance else 1
+    return board | (exponent << rng.choice(emptyShifts))
+
+
+def getNewBoard(rng=random):
+    """Return a new board with two 2 tiles in random spaces."""
+    return addRandomTile(addRandomTile(0, rng, 0.0), rng, 0.0)
+
+
+def evaluate(board):
+    """Return the AI's score for the board's rows and columns."""
+    transposed = transpose(board)
+    return (ROW_SCORE[board & ROW_MASK] + ROW_SCORE[(board >> 16) & ROW_MASK]
+            + ROW_SCORE[(board >> 32) & ROW_MASK] + ROW_SCORE[board >> 48]
+            + ROW_SCORE[transposed & ROW_MASK] + ROW_SCORE[(transposed >> 16) & ROW_MASK]
+            + ROW_SCORE[(transposed >> 32) & ROW_MASK] + ROW_SCORE[transposed >> 48])
+
+
+class _Search:
+    def __init__(self, fourChance):
+        self.fourChance = fourChance
+        # Keys=boards, values=(depth searched, score) tuples. The cache
+        # is kept between depths, so each deeper search reuses it:
+        self.cache = {}
+
+
+    def getMoveScore(self, board, depth, probability):
+        """Return the best average score of the moves on board, with the
+        next tile added, searching depth moves ahead. A board with no
+        moves scores 0."""
+        best = 0.0
+        transposed = transpose(board)
+        for movedBoard in (transpose(_slideRows(transposed, ROW_LEFT)), _slideRows(board, ROW_LEFT),
+                           transpose(_slideRows(transposed, ROW_RIGHT)), _slideRows(board, ROW_RIGHT)):
+            if movedBoard != board:
+                best = max(best, self.getTileScore(movedBoard, depth - 1, probability))
+        return best
+
+
+    def getTileScore(self, board, depth, probability):
+        """Return the average score of board over every space and tile
+        the game could add next."""
+        if depth <= 0 or probability < MIN_PROBABILITY:
+            return evaluate(board)
+        cached = self.cache.get(board)
+        if cached is not None and cached[0] >= depth:
+            return cached[1]
+
+        emptyShifts = getEmptyShifts(board)
+        fourChance = self.fourChance
+        tileProbability = probability / len(emptyShifts)
+        total = 0.0
+        for shift in emptyShifts:
+            total += (1 - fourChance) * self.getMoveScore(board | (1 << shift), depth, tileProbability * (1 - fourChance))
+            if fourChance > 0:
+                total += fourChance * self.getMoveScore(board | (2 << shift), depth, tileProbability * fourChance)
+        score = total / len(emptyShifts)
+        self.cache[board] = (depth, score)
+        return score
+
+
+def getBestMove(board, timeLimit=0.1, maxDepth=None, fourChance=FOUR_CHANCE):
+    """Return the AI's best move for the board, or None if there are no
+    legal moves. The search goes one move deeper at a time, as long as
+    the next depth looks like it will finish within timeLimit
+    seconds (or until maxDepth)."""
+    legalMoves = getLegalMoves(board)
+    if len(legalMoves) <= 1:
+        return legalMoves[0] if legalMoves else None
+
+    search = _Search(fourChance)
+    startTime = time.time()
+    depth = 1
+    lastDepthTime = None
+    while True:
+        depthStartTime = time.time()
+        scores = {move: search.getTileScore(makeMove(board, move), depth, 1.0) for move in legalMoves}
+        bestMove = max(legalMoves, key=scores.get)
+        depthTime = time.time() - depthStartTime
+        if maxDepth is not None and depth >= maxDepth:
+            break
+        # Guess the next depth's time from how much longer this depth
+        # took than the last one:
+        growth = 10 if lastDepthTime is None else max(2, depthTime / max(lastDepthTime, 1e-6))
+        if time.time() - startTime + depthTime * growth > timeLimit:
+            break
+        depth += 1
+        lastDepthTime = depthTime
+    return bestMove
+
+
+def playGame(seed, timeLimit=0.01, maxDepth=None, fourChance=FOUR_CHANCE):
+    """Let the AI play a whole game. Returns a (score, biggest tile,
+    number of moves) tuple."""
+    rng = random.Random(seed)
+    board = getNewBoard(rng)
+    numMoves = 0
+    while True:
+        move = getBestMove(board, timeLimit, maxDepth, fourChance)
+        if move is None:
+            return getScore(board), getMaxTile(board), numMoves
+        board = addRandomTile(makeMove(board, move), rng, fourChance)
+        numMoves += 1
+
+
+def _playGameWithSettings(args):
+    return playGame(*args)
+
+
+def runBenchmark(numGames=1000, timeLimit=0.001, maxDepth=None, numWorkers=None):
+    """Time raw moves, then have the AI play numGames games spread over
+    numWorkers processes (all CPU cores by default) and print its
+    average score and how often it reached each big tile."""
+    rng = random.Random(42)
+    boards = [getNewBoard(rng) for i in range(1000)]
+    for i in range(len(boards)):
+        for j in range(rng.randint(0, 200)):
+            boards[i] = addRandomTile(makeMove(boards[i], rng.choice(MOVES)), rng)
+    startTime = time.time()
+    for board in boards:
+        for move in MOVES:
+            makeMove(board, move)
+    print('%.0f moves per second.' % (len(boards) * len(MOVES) / (time.time() - startTime)))
+
+    if numWorkers is None:
+        numWorkers = os.cpu_count() or 1
+    print('Playing %s games with a %s second time limit per move...' % (numGames, timeLimit))
+    startTime = time.time()
+    settings = [(seed, timeLimit, maxDepth) for seed in range(numGames)]
+    pool = multiprocessing.Pool(numWorkers) if numWorkers > 1 else None
+    try:
+        if pool is not None:
+            results = pool.map(_playGameWithSettings, settings)
+        else:
+            results = list(map(_playGameWithSettings, settings))
+    finally:
+        if pool is not None:
+            pool.terminate()
+    totalTime = time.time() - startTime
+    totalMoves = sum(numMoves for score, maxTile, numMoves in results)
+    print('Average score: %.1f  (%.1f AI moves per second)' % (
+        sum(score for score, maxTile, numMoves in results) / numGames, totalMoves / totalTime))
+    maxTiles = sorted(maxTile for score, maxTile, numMoves in results)
+    for tile in sorted(set(maxTiles), reverse=True):
+        reached = sum(1 for maxTile in maxTiles if maxTile >= tile)
+        print('  Reached %s in %.1f%% of games' % (tile, 100 * reached / numGames))
+
+
+# If this program isn't being imported, run the benchmark.
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        runBenchmark(int(sys.argv[1]), float(sys.argv[2]))
+    elif len(sys.argv) > 1:
+        runBenchmark(int(sys.argv[1]))
+    else:
+        runBenchmark()
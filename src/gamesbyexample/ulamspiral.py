@@ -4,7 +4,7 @@ with turtle graphics.
 More info at https://en.wikipedia.org/wiki/Ulam_spiral"""
 __version__ = 0
 import turtle
-import math
+import primes  # Imports our primes.py program.
 
 turtle.tracer(1000, 0) # Make the turtle draw faster.
 
@@ -24,17 +24,19 @@ def main():
     turtle.left(90)
 
     currentNumber = 3 # This is the number we test for primality.
+    primeNumbers = primes.iterPrimes(currentNumber) # Primes from 3 on.
+    nextPrime = next(primeNumbers)
     spiralSideLength = 3
     while currentNumber < 40000:
         # We draw two sides before increasing the spiral side length:
         for i in range(2):
             for j in range(spiralSideLength):
-                divs = amountOfDivisors(currentNumber)
-                currentNumber += 1
-
-                if divs == 0:
+                if currentNumber == nextPrime:
                     # Mark the prime number
                     turtle.dot(DOT_SIZE, '#76b7eb')
+                    nextPrime = next(primeNumbers)
+                currentNumber += 1
+
                 turtle.forward(SPACING)
             turtle.left(90)
         spiralSideLength += 1
@@ -43,16 +45,6 @@ def main():
     turtle.exitonclick() # When user clicks on the window, close it.
 
 
-def amountOfDivisors(number):
-    # Return the number of divisors for `number`.
-    total = 0
-    for i in range(2, int(math.sqrt(number)) + 1):
-        # If i evenly divides number with no remainder, increase total.
-        if number % i == 0:
-            total += 1
-    return total
-
-
 try:
     main()
 except turtle.Terminator:
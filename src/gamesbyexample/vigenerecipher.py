@@ -9,6 +9,9 @@ try:
     import pyperclip  # pyperclip copies text to the clipboard.
 except ImportError:
     pass  # If pyperclip is not installed, do nothing. It's no big deal.
+import sys
+import cipherstream  # Imports our cipherstream.py program.
+import cryptanalysis  # Imports our cryptanalysis.py program.
 
 # Every possible symbol that can be encrypted/decrypted:
 LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
@@ -19,9 +22,9 @@ def main():
 The Viegenère cipher is a polyalphabetic substitution cipher that was
 powerful enough to remain unbroken for centuries.''')
 
-    # Let the user specify if they are encrypting or decrypting:
-    while True:  # Keep asking until the user enters e or d.
-        print('Do you want to (e)ncrypt or (d)ecrypt?')
+    # Let the user specify if they are encrypting, decrypting, or hacking:
+    while True:  # Keep asking until the user enters e, d, or h.
+        print('Do you want to (e)ncrypt, (d)ecrypt, or (h)ack?')
         response = input('> ').lower()
         if response.startswith('e'):
             myMode = 'encrypt'
@@ -29,10 +32,13 @@ powerful enough to remain unbroken for centuries.''')
         elif response.startswith('d'):
             myMode = 'decrypt'
             break
-        print('Please enter the letter e or d.')
+        elif response.startswith('h'):
+            myMode = 'hack'
+            break
+        print('Please enter the letter e, d, or h.')
 
-    # Let the user specify the key to use:
-    while True:  # Keep asking until the user enters a valid key.
+    # Let the user specify the key to use (hacking doesn't need one):
+    while myMode != 'hack':  # Keep asking until the user enters a valid key.
         print('Please specify the key to use.')
         print('It can be a word or any combination of letters:')
         response = input('> ').upper()
@@ -49,6 +55,8 @@ powerful enough to remain unbroken for centuries.''')
         translated = encryptMessage(myMessage, myKey)
     elif myMode == 'decrypt':
         translated = decryptMessage(myMessage, myKey)
+    elif myMode == 'hack':
+        translated = hackMessage(myMessage)
 
     print('%sed message:' % (myMode.title()))
     print(translated)
@@ -70,6 +78,22 @@ def decryptMessage(message, key):
     return translateMessage(message, key, 'decrypt')
 
 
+def hackMessage(message):
+    """Find the most likely key without being told it, showing each
+    better key as it's found, and return the decrypted message."""
+    for score, key in cryptanalysis.hackVigenere(message):
+        print('Trying key {} (English score {:.2f})...'.format(key, score))
+    print('The most likely key is {}.'.format(key))
+    return decryptMessage(message, key)
+
+
+def streamMessage(mode, key, inFilename=None, outFilename=None):
+    """Encrypt or decrypt inFilename (or stdin) into outFilename (or
+    stdout) using the key, a chunk at a time."""
+    transform = cipherstream.VigenereTransform(key, mode)
+    cipherstream.streamFiles(transform, inFilename, outFilename)
+
+
 def translateMessage(message, key, mode):
     """Encrypt or decrypt the message using the key."""
     translated = []  # Stores the encrypted/decrypted message string.
@@ -107,4 +131,10 @@ def translateMessage(message, key, mode):
 
 # If this program was run (instead of imported), run the program:
 if __name__ == '__main__':
-    main()
+    # (!) Run this program as "python vigenerecipher.py --stream encrypt KEY"
+    # to translate stdin to stdout without any questions, or add input and
+    # output filenames to translate a file of any size.
+    if len(sys.argv) > 3 and sys.argv[1] == '--stream':
+        streamMessage(*sys.argv[2:])
+    else:
+        main()
@@ -0,0 +1,227 @@
+"""Word Index, by Al Sweigart al@inventwithpython.com
+A word list module, used by the word games to load their word lists
+and search them. Each list is loaded once, and its words are grouped by
+length. For every length, position, and letter there is a bitmask with
+a bit set for each word (of that length) with that letter in that
+position, so "words that fit A_P_E" is a few bitwise ANDs, and "words
+with exactly 3 letters in the same places as MONITOR" is found by adding
+up the masks for each of MONITOR's letters bit by bit. Words starting
+with a prefix are found by a binary search of the sorted words. The
+index is saved next to the word file, so it loads with one file read.
+Run it with a word file to see how long it takes to load, for example:
+python wordindex.py sevenletterwords.txt
+Tags: large, module, word"""
+__version__ = 0
+import bisect, marshal, os, random, sys, time
+
+# The index file is named after the word file, with this added:
+INDEX_EXTENSION = '.wordindex'
+INDEX_FORMAT = 1  # Change this if the saved index's layout changes.
+BLANK = '_'  # The character for unknown letters in patterns.
+
+_loadedIndexes = {}  # Keys=(filename, upper) tuples, values=WordIndex objects.
+
+
+class WordIndex:
+    def __init__(self, words):
+        """Index a list of words. The words are kept in their original
+        order, with duplicates and blank lines removed."""
+        seen = set()
+        self.words = []
+        for word in words:
+            word = word.strip()
+            if word and word not in seen:
+                seen.add(word)
+                self.words.append(sys.intern(word))
+        self.sortedWords = sorted(self.words)
+
+        # Keys=word lengths, values=lists of the words of that length:
+        self.wordsByLength = {}
+        for word in self.words:
+            self.wordsByLength.setdefault(len(word), []).append(word)
+        # Keys=word lengths, values=lists (one per position) of
+        # dictionaries. Keys=letters, values=bitmasks, where bit i is set
+        # if wordsByLength[length][i] has that letter at that position:
+        self.letterMasks = {}
+        for length, lengthWords in self.wordsByLength.items():
+            masks = [{} for i in range(length)]
+            for i, word in enumerate(lengthWords):
+                bit = 1 << i
+                for position, letter in enumerate(word):
+                    masks[position][letter] = masks[position].get(letter, 0) | bit
+            self.letterMasks[length] = masks
+
+
+    def __len__(self):
+        return len(self.words)
+
+
+    def __getitem__(self, i):
+        return self.words[i]
+
+
+    def __contains__(self, word):
+        return len(word) in self.letterMasks and self._getMatchMask(word) != 0
+
+
+    def _getMatchMask(self, word):
+        # The mask of the words that are exactly word:
+        mask = self._getAllMask(len(word))
+        for position, letter in enumerate(word):
+            mask &= self.letterMasks[len(word)][position].get(letter, 0)
+        return mask
+
+
+    def _getAllMask(self, length):
+        return (1 << len(self.wordsByLength.get(length, ()))) - 1
+
+
+    def _getWords(self, length, mask):
+        """Return the list of words of length that are set in mask."""
+        lengthWords = self.wordsByLength.get(length, [])
+        result = []
+        while mask:
+            lowestBit = mask & -mask
+            result.append(lengthWords[lowestBit.bit_length() - 1])
+            mask ^= lowestBit
+        return result
+
+
+    def getRandomWord(self, length=None, rng=random):
+        if length is None:
+            return rng.choice(self.words)
+        return rng.choice(self.wordsByLength[length])
+
+
+    def getWordsMatching(self, pattern, excludedLetters=''):
+        """Return the words that fit the pattern, like 'A_P_E', where
+        BLANK matches any letter. Letters in excludedLetters can't be in
+        the blank spaces (like a Hangman guess that wasn't in the word)."""
+        length = len(pattern)
+        if length not in self.letterMasks:
+            return []
+        masks = self.letterMasks[length]
+        mask = self._getAllMask(length)
+        for position, letter in enumerate(pattern):
+            if letter == BLANK:
+                for excludedLetter in excludedLetters:
+                    mask &= ~masks[position].get(excludedLetter, 0)
+            else:
+                mask &= masks[position].get(letter, 0)
+            if not mask:
+                return []
+        return self._getWords(length, mask)
+
+
+    def countMatchingPositions(self, word):
+        """Return a list of bitmasks, where the bitmask at index k has a
+        bit set for each word of the same length as word with exactly k
+        letters in the same positions as word."""
+        length = len(word)
+        if length not in self.letterMasks:
+            return [0] * (length + 1)
+        # Add up the position masks as binary numbers, one bit of each
+        # word's count per integer in counts (lowest bit first):
+        counts = []
+        for position, letter in enumerate(word):
+            carry = self.letterMasks[length][position].get(letter, 0)
+            for i in range(len(counts)):
+                if not carry:
+                    break
+                counts[i], carry = counts[i] ^ carry, counts[i] & carry
+            if carry:
+                counts.append(carry)
+
+        allWords = self._getAllMask(length)
+        result = []
+        for k in range(length + 1):
+            mask = allWords
+            for i, countBits in enumerate(counts):
+                mask &= countBits if (k >> i) & 1 else ~countBits
+            if k >> len(counts):
+                mask = 0  # k needs more bits than any count has.
+            result.append(mask)
+        return result
+
+
+    def getWordsByMatches(self, word):
+        """Return a list where index k is the list of words (of the same
+        length as word) with exactly k letters in the same positions as
+        word. Index len(word) is just word itself, if it's in the index."""
+        return [self._getWords(len(word), mask) for mask in self.countMatchingPositions(word)]
+
+
+    def getWordsWithPrefix(self, prefix):
+        """Return the sorted list of words that start with prefix."""
+        start = bisect.bisect_left(self.sortedWords, prefix)
+        end = start
+        while end < len(self.sortedWords) and self.sortedWords[end].startswith(prefix):
+            end += 1
+        return self.sortedWords[start:end]
+
+
+    def save(self, filename):
+        """Save the index's word list and bitmasks to filename."""
+        data = (INDEX_FORMAT, tuple(self.words), self.letterMasks)
+        with open(filename, 'wb') as indexFile:
+            marshal.dump(data, indexFile)
+
+
+    @classmethod
+    def load(cls, filename):
+        """Return the WordIndex saved in filename, read in one call."""
+        with open(filename, 'rb') as indexFile:
+            indexFormat, words, letterMasks = marshal.loads(indexFile.read())
+        if indexFormat != INDEX_FORMAT:
+            raise ValueError(filename + ' is an old word index.')
+        index = cls.__new__(cls)
+        index.words = [sys.intern(word) for word in words]
+        index.sortedWords = sorted(index.words)
+        index.wordsByLength = {}
+        for word in index.words:
+            index.wordsByLength.setdefault(len(word), []).append(word)
+        index.letterMasks = letterMasks
+        return index
+
+
+def loadWordFile(filename, upper=False):
+    """Return the WordIndex of the words in filename (one per line),
+    uppercased if upper is True. The index is loaded only once per
+    program, and saved to a file to make loading faster next time."""
+    key = (os.path.abspath(filename), upper)
+    if key in _loadedIndexes:
+        return _loadedIndexes[key]
+
+    indexFilename = filename + ('.upper' if upper else '') + INDEX_EXTENSION
+    index = None
+    # Use the saved index unless the word file was changed after it:
+    if (os.path.exists(indexFilename)
+            and os.path.getmtime(indexFilename) >= os.path.getmtime(filename)):
+        try:
+            index = WordIndex.load(indexFilename)
+        except (ValueError, EOFError, TypeError):
+            index = None  # The saved index is from another version.
+    if index is None:
+        with open(filename) as wordFile:
+            words = wordFile.read().splitlines()
+        if upper:
+            words = [word.upper() for word in words]
+        index = WordIndex(words)
+        try:
+            index.save(indexFilename)
+        except OSError:
+            pass  # The folder can't be written to, so don't save it.
+    _loadedIndexes[key] = index
+    return index
+
+
+# If this program isn't being imported, time loading the word file.
+if __name__ == '__main__':
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'sevenletterwords.txt'
+    startTime = time.time()
+    index = WordIndex(open(filename).read().splitlines())
+    print('Indexed %s words in %.3f seconds.' % (len(index), time.time() - startTime))
+    index.save(filename + INDEX_EXTENSION)
+    startTime = time.time()
+    WordIndex.load(filename + INDEX_EXTENSION)
+    print('Loaded the saved index in %.3f seconds.' % (time.time() - startTime))
@@ -0,0 +1,50 @@
+import pytest
+from gamesbyexample import __batchrunner__ as batchrunner
+
+
+def writeProgram(folder, filename, source):
+    (folder / filename).write_text(source)
+    return filename
+
+
+def test_runProgramStatuses(tmp_path):
+    filename = writeProgram(tmp_path, 'echo.py', 'print(input().upper())\n')
+    result = batchrunner.runProgram(filename, 'hello\n', folder=str(tmp_path))
+    assert result['status'] == 'finished'
+    assert result['exitCode'] == 0
+    assert result['outputBytes'] == len('HELLO\n')
+    assert 'stderrTail' not in result
+
+    filename = writeProgram(tmp_path, 'asker.py', 'while True:\n    input()\n')
+    assert batchrunner.runProgram(filename, 'a\nb\n', folder=str(tmp_path))['status'] == 'out of input'
+
+    filename = writeProgram(tmp_path, 'crasher.py', 'raise ValueError("oops")\n')
+    result = batchrunner.runProgram(filename, '', folder=str(tmp_path))
+    assert result['status'] == 'crashed'
+    assert 'ValueError: oops' in result['stderrTail']
+
+
+def test_runProgramBudgets(tmp_path):
+    filename = writeProgram(tmp_path, 'sleeper.py', 'import time\ntime.sleep(30)\n')
+    result = batchrunner.runProgram(filename, '', timeBudget=0.5, folder=str(tmp_path))
+    assert result['status'] == 'time budget'
+    assert result['wallTime'] < 5
+
+    filename = writeProgram(tmp_path, 'printer.py', 'while True:\n    print("x" * 1000)\n')
+    result = batchrunner.runProgram(filename, '', outputBudget=100000, folder=str(tmp_path))
+    assert result['status'] == 'output budget'
+    assert result['outputBytes'] > 100000
+
+
+def test_compareReports():
+    baseline = {'programs': [
+        {'filename': 'a.py', 'status': 'finished', 'wallTime': 1.0, 'peakRssKb': 1000},
+        {'filename': 'b.py', 'status': 'finished', 'wallTime': 1.0, 'peakRssKb': 1000}]}
+    report = {'programs': [
+        {'filename': 'a.py', 'status': 'finished', 'wallTime': 2.0, 'peakRssKb': 1000},
+        {'filename': 'b.py', 'status': 'crashed', 'wallTime': 1.0, 'peakRssKb': 3000},
+        {'filename': 'c.py', 'status': 'finished', 'wallTime': 1.0, 'peakRssKb': 1000}]}
+    changes = batchrunner.compareReports(report, baseline)
+    assert changes == ['a.py: wall time went from 1.00s to 2.00s',
+                       'b.py: status changed from finished to crashed',
+                       'b.py: peak RSS went from 1000 KB to 3000 KB']
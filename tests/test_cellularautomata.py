@@ -0,0 +1,58 @@
+import random
+from gamesbyexample import cellularautomata
+
+
+def test_random_mask():
+    grid = cellularautomata.BitGrid(200, 100, ('empty', 'tree'), rng=random.Random(42))
+    assert grid.randomMask(0) == 0
+    assert grid.randomMask(1) == grid.fullMask
+    for probability in (0.01, 0.2, 0.5, 0.9):
+        count = bin(grid.randomMask(probability)).count('1')
+        assert abs(count - probability * grid.numCells) < 5 * (grid.numCells * probability) ** 0.5
+
+
+def test_neighborhood():
+    grid = cellularautomata.BitGrid(5, 4, (False, True))
+    corner = 1 << 0  # The cell at (0, 0).
+    assert sorted(grid._getCells(grid.getNeighborhood(corner))) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+    wrappingGrid = cellularautomata.BitGrid(5, 4, (False, True), wrap=True)
+    assert sorted(wrappingGrid._getCells(wrappingGrid.getNeighborhood(corner))) == sorted(
+        [(x % 5, y % 4) for x in range(-1, 2) for y in range(-1, 2)])
+
+
+def test_step_and_changed_cells():
+    grid = cellularautomata.BitGrid(6, 3, ('off', 'on'))
+    grid.setState(2, 1, 'on')
+
+    def spreadRule(grid):
+        on = grid.getNeighborhood(grid.planes['on'])
+        return {'on': on, 'off': grid.fullMask ^ on}
+
+    grid.step(spreadRule)
+    assert grid.count('on') == 9
+    assert grid.getState(3, 2) == 'on'
+    assert grid.getState(4, 1) == 'off'
+    assert len(grid.getChangedCells()) == 8
+    assert grid.getRows({'off': '.', 'on': '#'}) == ['.###..', '.###..', '.###..']
+
+
+def test_langtons_ant():
+    board = cellularautomata.Turmites(10, 10, 'RL')
+    board.addAnt(5, 5, cellularautomata.NORTH)
+    touched = board.step(4)
+    # The ant walks around a 2x2 square back to where it started:
+    assert [(x, y) for y in range(10) for x in range(10) if board.getColor(x, y)] == [
+        (5, 5), (6, 5), (5, 6), (6, 6)]
+    assert board.ants == [[5, 5, cellularautomata.NORTH]]
+    assert touched == {(5, 5), (6, 5), (5, 6), (6, 6)}
+    # Then it turns left off of it:
+    assert board.step() == {(5, 5), (4, 5)}
+    assert board.ants == [[4, 5, cellularautomata.WEST]]
+    assert board.getColor(5, 5) == 0
+
+    # Ants wrap around the edges:
+    board = cellularautomata.Turmites(3, 3, 'N')
+    board.addAnt(0, 0, cellularautomata.WEST)
+    board.step()
+    assert board.ants == [[2, 0, cellularautomata.WEST]]
@@ -0,0 +1,101 @@
+import random
+from gamesbyexample import cipherstream, cryptanalysis
+
+TEXT = ('Attack at dawn! The 100% "safe" plan, part #2: café, naïve.\n' * 30).encode('utf-8')
+
+
+def translateInChunks(transform, data, rng):
+    """Translate data with transform in random sized chunks."""
+    result = []
+    i = 0
+    while i < len(data):
+        size = rng.randint(1, 50)
+        result.append(transform.translate(data[i:i + size]))
+        i += size
+    result.extend(transform.finish())
+    return b''.join(result)
+
+
+def test_makeTable():
+    table = cipherstream.makeTable('ABC', 'BCA', upper=True)
+    assert b'abc ABC xyz!'.translate(table) == b'BCA BCA XYZ!'
+    table = cipherstream.makeTable('ABC', 'BCA')
+    assert b'abc ABC'.translate(table) == b'abc BCA'
+
+
+def test_vigenere():
+    rng = random.Random(0)
+    for key in ('B', 'LEMON', 'ABCDEFGHIJKLMNOPQRSTU'):
+        expected = cryptanalysis.vigenereTranslate(TEXT.decode('utf-8'), key, 'encrypt').encode('utf-8')
+        encrypted = translateInChunks(cipherstream.VigenereTransform(key, 'encrypt'), TEXT, rng)
+        assert encrypted == expected
+        assert translateInChunks(cipherstream.VigenereTransform(key, 'decrypt'), encrypted, rng) == TEXT
+
+    # Data with every byte value has no byte free for padding:
+    data = bytes(range(256)) * 4
+    transform = cipherstream.VigenereTransform('LEMON', 'encrypt')
+    expected = cryptanalysis.vigenereTranslate(data.decode('latin-1'), 'LEMON', 'encrypt').encode('latin-1')
+    assert transform.translate(data) == expected
+
+    # Data missing only a letter or only a % sign must not use it as padding:
+    for missing in (b'Q', b'%'):
+        data = bytes(range(256)).replace(missing, b'') * 4
+        transform = cipherstream.VigenereTransform('LEMON', 'encrypt')
+        expected = cryptanalysis.vigenereTranslate(data.decode('latin-1'), 'LEMON', 'encrypt').encode('latin-1')
+        assert transform.translate(data) == expected
+
+
+def getRailFenceOrder(length, key):
+    # The message indexes in the order they're read off the rails:
+    rails = [[] for i in range(key)]
+    y, direction = 0, 1
+    for x in range(length):
+        rails[y].append(x)
+        if not 0 <= y + direction < key:
+            direction = -direction
+        y += direction
+    return [x for rail in rails for x in rail]
+
+
+def test_railFence():
+    rng = random.Random(0)
+    for key in range(2, 13):
+        for length in (0, 1, 5, 17, 100, 317):
+            data = bytes(rng.randrange(256) for i in range(length))
+            expected = bytes(data[x] for x in getRailFenceOrder(length, key))
+            encrypted = translateInChunks(cipherstream.RailFenceTransform(key, 'encrypt'), data, rng)
+            assert encrypted == expected
+            assert translateInChunks(cipherstream.RailFenceTransform(key, 'decrypt'), encrypted, rng) == data
+    assert b''.join(cipherstream.RailFenceTransform(3, 'encrypt').finish()) == b''
+
+
+def test_codes():
+    rng = random.Random(0)
+    codes = {'S': '...', 'O': '---', ' ': '/'}
+    transform = cipherstream.CodeTransform(codes, ' ')
+    assert translateInChunks(transform, b'SOS? SOS' * 20, rng) == b' '.join([b'... --- ... / ... --- ...'] * 20)
+    decodes = {code: symbol for symbol, code in codes.items()}
+    transform = cipherstream.DecodeTransform(decodes, ' ')
+    assert translateInChunks(transform, b' '.join([b'... --- ... / ... --- ..- ...'] * 20), rng) == b'SOS SOS' * 20
+    transform = cipherstream.DecodeTransform(decodes, ' ')
+    assert translateInChunks(transform, b'... --- ...\r\n... --- ...\n', rng) == b'SOSSOS'
+
+
+def test_randomReplace():
+    rng = random.Random(0)
+    transform = cipherstream.RandomReplaceTransform({'a': ['4'], 'e': ['3', '&']}, 1.0, rng)
+    replaced = translateInChunks(transform, b'Ace CASE', rng)
+    assert replaced[:2] == b'4c' and replaced[3:7] == b' C4S' and replaced[2:3] in b'3&'
+    transform = cipherstream.RandomReplaceTransform({'a': ['4']}, 0.0, rng)
+    assert transform.translate(b'banana') == b'banana'
+
+
+def test_streamFiles(tmp_path):
+    inFilename = str(tmp_path / 'plain.txt')
+    outFilename = str(tmp_path / 'encrypted.txt')
+    with open(inFilename, 'wb') as inFile:
+        inFile.write(TEXT)
+    transform = cipherstream.VigenereTransform('LEMON', 'encrypt')
+    assert cipherstream.streamFiles(transform, inFilename, outFilename, chunkSize=7) == len(TEXT)
+    with open(outFilename, 'rb') as outFile:
+        assert outFile.read() == cryptanalysis.vigenereTranslate(TEXT.decode('utf-8'), 'LEMON', 'encrypt').encode('utf-8')
@@ -0,0 +1,39 @@
+import pytest
+from gamesbyexample import collatzengine
+
+
+def slowLength(number):
+    length = 1
+    while number != 1:
+        if number % 2 == 0:
+            number = number // 2
+        else:
+            number = 3 * number + 1
+        length += 1
+    return length
+
+
+def test_getLength():
+    cache = collatzengine.CollatzCache(100)  # Small, to test the cap.
+    assert cache.getLength(1) == 1
+    assert cache.getLength(27) == 112
+    for number in range(1, 2000):
+        assert cache.getLength(number) == slowLength(number)
+    assert cache.getLength(2 ** 40) == 41
+
+
+def test_iterSequence():
+    assert list(collatzengine.iterSequence(1)) == [1]
+    assert list(collatzengine.iterSequence(6)) == [6, 3, 10, 5, 16, 8, 4, 2, 1]
+
+
+def test_getRangeStats():
+    lengths = {number: slowLength(number) for number in range(10, 3000)}
+    for numWorkers in (1, 2):
+        stats = collatzengine.getRangeStats(10, 3000, numWorkers, cacheCap=500, chunkSize=333)
+        assert stats['shortestLength'] == min(lengths.values())
+        assert stats['shortestStart'] == min(n for n in lengths if lengths[n] == stats['shortestLength'])
+        assert stats['longestLength'] == max(lengths.values())
+        assert stats['longestStart'] == min(n for n in lengths if lengths[n] == stats['longestLength'])
+        assert sum(stats['histogram'].values()) == len(lengths)
+        assert stats['histogram'][stats['longestLength']] == list(lengths.values()).count(stats['longestLength'])
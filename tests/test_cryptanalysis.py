@@ -0,0 +1,69 @@
+from gamesbyexample import cryptanalysis
+
+PLAINTEXT = """When the river froze over in the winter, the children of the village
+would tie string to their boots and race each other across the ice to
+the old mill on the far bank. Nobody ever won, because the miller would
+come out shouting that the ice was too thin, and they would all run home
+laughing before he could catch them. Years later, when the mill was
+gone and the children had grown up, they still talked about those races
+as if they had happened only the week before."""
+
+
+def test_translate():
+    assert cryptanalysis.caesarTranslate('HELLO, world', 3, 'encrypt') == 'KHOOR, world'
+    assert cryptanalysis.caesarTranslate('KHOOR', 3) == 'HELLO'
+    assert cryptanalysis.vigenereTranslate('Attack at dawn!', 'LEMON', 'encrypt') == 'Lxfopv ef rnhr!'
+    assert cryptanalysis.vigenereTranslate('Lxfopv ef rnhr!', 'lemon') == 'Attack at dawn!'
+    key = 'QWERTYUIOPASDFGHJKLZXCVBNM'
+    assert cryptanalysis.substitutionTranslate('Hello!', key, 'encrypt') == 'Itssg!'
+    assert cryptanalysis.substitutionTranslate('Itssg!', key) == 'Hello!'
+    symbols = 'ABCDE'
+    assert cryptanalysis.affineTranslate('ABCDE!', 2, 1, 'encrypt', symbols) == 'BDACE!'
+    assert cryptanalysis.affineTranslate('BDACE!', 2, 1, 'decrypt', symbols) == 'ABCDE!'
+
+
+def test_englishScore():
+    gibberish = cryptanalysis.caesarTranslate(PLAINTEXT.upper(), 7, 'encrypt')
+    assert cryptanalysis.englishScore(PLAINTEXT) > cryptanalysis.englishScore(gibberish) + 2
+    assert cryptanalysis.getLetters('Hi, there!') == 'HITHERE'
+
+
+def test_hackCaesar():
+    ciphertext = cryptanalysis.caesarTranslate(PLAINTEXT.upper(), 11, 'encrypt')
+    results = cryptanalysis.hackCaesar(ciphertext)
+    assert len(results) == 26
+    assert results[0][1] == 11
+
+
+def test_hackAffine():
+    symbols = ' ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz.,'
+    ciphertext = cryptanalysis.affineTranslate(PLAINTEXT, 7, 20, 'encrypt', symbols)
+    results = list(cryptanalysis.hackAffine(ciphertext, symbols))
+    assert results[-1][1:] == (7, 20)
+    # Each result is better than the last:
+    assert [result[0] for result in results] == sorted(result[0] for result in results)
+
+
+def test_hackVigenere():
+    letters = cryptanalysis.getLetters(PLAINTEXT)
+    assert cryptanalysis.getLikelyKeyLengths(cryptanalysis.vigenereTranslate(letters, 'FROST', 'encrypt'))[0] == 5
+    assert cryptanalysis._getShortestRepeat('FROSTFROST') == 'FROST'
+    assert cryptanalysis._getShortestRepeat('FROSTY') == 'FROSTY'
+    for key in ('ICE', 'FROST', 'WINTERTIME'):
+        ciphertext = cryptanalysis.vigenereTranslate(PLAINTEXT, key, 'encrypt')
+        results = list(cryptanalysis.hackVigenere(ciphertext))
+        assert results[-1][1] == key
+
+    # Messages with fewer letters than the key lengths tried still get
+    # a key:
+    for message in ('', '123', 'Hi', 'Hello there'):
+        results = list(cryptanalysis.hackVigenere(message))
+        assert len(results) > 0
+        assert len(results[-1][1]) <= max(len(cryptanalysis.getLetters(message)), 1)
+
+
+def test_hackSubstitution():
+    key = 'QWERTYUIOPASDFGHJKLZXCVBNM'
+    ciphertext = cryptanalysis.substitutionTranslate(PLAINTEXT, key, 'encrypt')
+    results = list(cryptanalysis.hackSubstitution(ciphertext, numRestarts=4, numWorkers=1))
+    assert cryptanalysis.substitutionTranslate(ciphertext, results[-1][1]) == PLAINTEXT
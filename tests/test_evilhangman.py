@@ -0,0 +1,52 @@
+import os, random, sys
+import pytest
+
+# The games import their support modules from their own folder:
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'gamesbyexample'))
+import evilhangman, wordindex
+
+WORDS = ['BEAR', 'BOAT', 'DEER', 'ECHO', 'HOOK', 'MOON']
+
+
+def test_keeps_biggest_partition():
+    game = evilhangman.EvilHangman(wordindex.WordIndex(WORDS), 4)
+    assert game.getCandidateCount() == 6
+    assert game.getPartitions('E') == {0: 0b110010, 0b0010: 0b000001,
+                                       0b0110: 0b000100, 0b0001: 0b001000}
+
+    assert game.guess('E') == []  # BOAT, HOOK, and MOON have no E.
+    assert game.getCandidates() == ['BOAT', 'HOOK', 'MOON']
+    assert game.guess('o') == [1, 2]
+    assert game.pattern == '_OO_'
+    assert game.getCandidates() == ['HOOK', 'MOON']
+    assert not game.isSolved()
+    assert game.getSecretWord() in ('HOOK', 'MOON')
+    with pytest.raises(ValueError):
+        game.guess('E')
+
+
+def test_ties_go_to_a_miss():
+    game = evilhangman.EvilHangman(wordindex.WordIndex(['AA', 'AB', 'CD']), 2)
+    assert game.guess('A') == []
+    assert game.getCandidates() == ['CD']
+    assert game.guess('C') == [0]
+    assert game.guess('D') == [1]
+    assert game.isSolved()
+
+
+def test_matches_all_partitions():
+    rng = random.Random(0)
+    index = evilhangman._makeRandomIndex(2000, 5, rng)
+    for i in range(20):
+        game = evilhangman.EvilHangman(index, 5)
+        for letter in rng.sample(evilhangman.LETTERS, 10):
+            biggest = max(bin(words).count('1') for words in game.getPartitions(letter).values())
+            game.guess(letter)
+            assert game.getCandidateCount() == biggest
+            misses = ''.join(letter for letter in game.guessedLetters if letter not in game.pattern)
+            assert set(index.getWordsMatching(game.pattern, misses)) <= set(game.getCandidates())
+
+
+def test_no_words():
+    with pytest.raises(ValueError):
+        evilhangman.EvilHangman(wordindex.WordIndex(WORDS), 7)
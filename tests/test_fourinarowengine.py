@@ -0,0 +1,75 @@
+import pytest
+import random
+from gamesbyexample import fourinarowengine
+
+
+def test_play():
+    position = fourinarowengine.Position()
+    assert position.canPlay(0)
+    for i in range(6):
+        position.play(0)
+    assert not position.canPlay(0)
+    assert position.numMoves == 6
+
+
+def test_isWinningMove():
+    # Vertical:
+    position = fourinarowengine.Position()
+    position.playSequence('121212')
+    assert position.isWinningMove(0)
+    assert not position.isWinningMove(2)
+
+    # Horizontal:
+    position = fourinarowengine.Position()
+    position.playSequence('112233')
+    assert position.isWinningMove(3)
+    assert not position.isWinningMove(4)
+
+    # Diagonal:
+    position = fourinarowengine.Position()
+    position.playSequence('12233434454')
+    assert position.isWinningMove(3)
+
+
+def test_hasFourInARow():
+    assert fourinarowengine.hasFourInARow(0b1111)
+    assert not fourinarowengine.hasFourInARow(0b111)
+    # The bottom row (bits 0, 7, 14, and 21):
+    assert fourinarowengine.hasFourInARow((1 << 0) | (1 << 7) | (1 << 14) | (1 << 21))
+    # The top two spaces of the first column and the bottom two spaces
+    # of the second column aren't in a row, thanks to the spare bit 6:
+    assert not fourinarowengine.hasFourInARow(0b110110000)
+
+
+def test_getBestMove():
+    # The computer should take a win:
+    position = fourinarowengine.Position()
+    position.playSequence('121212')
+    column, score, depth = fourinarowengine.Searcher().getBestMove(position, 1)
+    assert column == 0
+    assert score >= fourinarowengine.WIN_SCORE
+
+    # The computer should block the other player's win:
+    position = fourinarowengine.Position()
+    position.playSequence('11223')
+    column, score, depth = fourinarowengine.Searcher().getBestMove(position, 1)
+    assert column == 3
+
+    # There's no move on a full board:
+    position = fourinarowengine.Position()
+    for column in range(7):
+        for i in range(6):
+            position.play(column)
+    assert fourinarowengine.Searcher().getBestMove(position, 1) is None
+
+
+def test_solveMatchesSlowSolve():
+    random.seed(42)
+    searcher = fourinarowengine.Searcher()
+    numChecked = 0
+    while numChecked < 10:
+        position = fourinarowengine.makeRandomPosition(32)
+        if position is None:
+            continue
+        assert searcher.solve(position) == fourinarowengine.slowSolve(position)
+        numChecked += 1
@@ -0,0 +1,78 @@
+import pytest
+import io
+import random
+import re
+from gamesbyexample import framebuffer
+
+
+class FakeTerminal:
+    # Applies the escape codes that FrameBuffer writes to a grid.
+    def __init__(self, width, height):
+        self.chars = [[' '] * width for y in range(height + 1)]
+        self.colors = [[None] * width for y in range(height + 1)]
+        self.bgColors = [[None] * width for y in range(height + 1)]
+        self.x, self.y, self.color, self.bgColor = 0, 0, None, None
+
+    def write(self, text):
+        codes = {code: color for color, code in framebuffer.COLOR_CODES.items()}
+        bgCodes = {code: color for color, code in framebuffer.BG_COLOR_CODES.items()}
+        for piece in re.split(r'(\x1b\[[0-9;]*[A-Za-z])', text):
+            if piece == '\x1b[2J':
+                for y in range(len(self.chars)):
+                    self.chars[y] = [' '] * len(self.chars[y])
+                    self.bgColors[y] = [self.bgColor] * len(self.chars[y])
+            elif piece in codes:
+                self.color = None if codes[piece] == 'reset' else codes[piece]
+            elif piece in bgCodes:
+                self.bgColor = None if bgCodes[piece] == 'reset' else bgCodes[piece]
+            elif piece.startswith('\x1b['):
+                row, column = piece[2:-1].split(';')
+                self.x, self.y = int(column) - 1, int(row) - 1
+            else:
+                for char in piece:
+                    self.chars[self.y][self.x] = char
+                    self.colors[self.y][self.x] = self.color
+                    self.bgColors[self.y][self.x] = self.bgColor
+                    self.x += 1
+
+    def flush(self):
+        pass
+
+
+def checkScreen(frame, terminal):
+    for y in range(frame.height):
+        assert ''.join(terminal.chars[y]) == ''.join(frame.chars[y])
+        assert terminal.bgColors[y][:frame.width] == frame.bgColors[y]
+        for x in range(frame.width):
+            if frame.chars[y][x] != ' ':
+                assert terminal.colors[y][x] == frame.colors[y][x]
+
+
+def test_render():
+    random.seed(42)
+    terminal = FakeTerminal(30, 10)
+    frame = framebuffer.FrameBuffer(30, 10, terminal)
+    for i in range(100):
+        for j in range(random.randint(0, 20)):
+            frame.put(random.randint(-2, 31), random.randint(-2, 11), random.choice('ab '),
+                      random.choice((None, 'red', 'green')), random.choice((None, None, 'white')))
+        frame.render()
+        checkScreen(frame, terminal)
+
+
+def test_onlyChangesAreSent():
+    output = io.StringIO()
+    frame = framebuffer.FrameBuffer(80, 24, output)
+    frame.write(0, 0, 'Hello')
+    fullBytes = frame.render()
+    assert frame.render() < 20  # Nothing changed, so just the cursor moves.
+    frame.put(40, 12, '*', 'red')
+    assert frame.render() < 30
+    assert frame.bytesLastFrame < fullBytes
+    frame.invalidate()
+    freshFrame = framebuffer.FrameBuffer(80, 24, io.StringIO())
+    freshFrame.write(0, 0, 'Hello')
+    freshFrame.put(40, 12, '*', 'red')
+    assert frame.render() == freshFrame.render()
+    assert frame.numFrames == 4
+    assert 'frames rendered' in frame.getReport()
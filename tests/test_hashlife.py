@@ -0,0 +1,73 @@
+import pytest
+import random
+from gamesbyexample import hashlife
+
+GLIDER_RLE = """#N Glider
+x = 3, y = 3, rule = B3/S23
+bob$2bo$3o!
+"""
+
+
+def slowStep(living):
+    # A straightforward reference implementation of one generation.
+    neighborCounts = {}
+    for x, y in living:
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if (dx, dy) != (0, 0):
+                    neighborCounts[x + dx, y + dy] = neighborCounts.get((x + dx, y + dy), 0) + 1
+    return {cell for cell, count in neighborCounts.items()
+            if count == 3 or (count == 2 and cell in living)}
+
+
+def test_parseRle():
+    assert hashlife.parseRle(GLIDER_RLE) == {(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)}
+    assert hashlife.parseRle('2o$3bo!') == {(0, 0), (1, 0), (3, 1)}
+    assert hashlife.parseRle('o2$o!') == {(0, 0), (0, 2)}
+
+
+def test_glider():
+    plane = hashlife.LifePlane(hashlife.parseRle(GLIDER_RLE))
+    assert plane.population() == 5
+    assert plane.boundingBox() == (0, 0, 2, 2)
+
+    # A glider moves one cell diagonally every 4 generations:
+    plane.jump(10)
+    assert plane.generation == 1024
+    assert plane.population() == 5
+    assert plane.boundingBox() == (256, 256, 258, 258)
+    assert plane.isAlive(257, 256)
+    assert not plane.isAlive(256, 256)
+
+
+def test_matchesSlowStep():
+    random.seed(42)
+    living = {(random.randint(-8, 8), random.randint(-8, 8)) for i in range(100)}
+    stepped = hashlife.LifePlane(living)
+    jumped = hashlife.LifePlane(living)
+    for i in range(50):
+        living = slowStep(living)
+        stepped.step()
+        assert set(stepped.getCells()) == living
+    jumped.step(50)
+    assert set(jumped.getCells()) == living
+
+
+def test_empty():
+    plane = hashlife.LifePlane()
+    plane.step(1000)
+    assert plane.population() == 0
+    assert plane.boundingBox() is None
+
+
+def test_clearCaches(monkeypatch):
+    # Clearing the caches between jumps doesn't change the results:
+    random.seed(7)
+    living = {(random.randint(-8, 8), random.randint(-8, 8)) for i in range(100)}
+    plane = hashlife.LifePlane(living)
+    monkeypatch.setattr(hashlife, 'MAX_CACHE_SIZE', 100)
+    for i in range(30):
+        living = slowStep(living)
+        plane.step()
+        assert hashlife.getCacheSize() < 100000
+    assert set(plane.getCells()) == living
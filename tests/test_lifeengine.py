@@ -0,0 +1,80 @@
+import pytest
+import random
+from gamesbyexample import lifeengine
+
+
+def getLivingCells(grid):
+    living = set()
+    for x in range(grid.width):
+        for y in range(grid.height):
+            if grid.isAlive(x, y):
+                living.add((x, y))
+    return living
+
+
+def slowStep(living, width, height):
+    # A straightforward reference implementation of one generation.
+    nextLiving = set()
+    for x in range(width):
+        for y in range(height):
+            numNeighbors = 0
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    if (dx, dy) != (0, 0) and ((x + dx) % width, (y + dy) % height) in living:
+                        numNeighbors += 1
+            if numNeighbors == 3 or (numNeighbors == 2 and (x, y) in living):
+                nextLiving.add((x, y))
+    return nextLiving
+
+
+def test_setCell():
+    grid = lifeengine.LifeGrid(5, 4)
+    assert grid.population() == 0
+    grid.setCell(2, 3)
+    assert grid.isAlive(2, 3)
+    assert not grid.isAlive(3, 2)
+    assert grid.population() == 1
+    grid.setCell(2, 3, False)
+    assert not grid.isAlive(2, 3)
+    assert grid.population() == 0
+
+
+def test_blinker():
+    grid = lifeengine.LifeGrid(5, 5)
+    for x in (1, 2, 3):
+        grid.setCell(x, 2)
+    grid.step()
+    assert getLivingCells(grid) == {(2, 1), (2, 2), (2, 3)}
+    grid.step()
+    assert getLivingCells(grid) == {(1, 2), (2, 2), (3, 2)}
+    assert grid.generation == 2
+
+
+def test_wrapAround():
+    # A glider comes back to where it started after 4 * size generations
+    # on a square torus.
+    grid = lifeengine.LifeGrid(8, 8)
+    for x, y in ((1, 0), (2, 1), (0, 2), (1, 2), (2, 2)):
+        grid.setCell(x, y)
+    start = getLivingCells(grid)
+    grid.step(32)
+    assert getLivingCells(grid) == start
+
+
+def test_matchesSlowStep():
+    random.seed(42)
+    for width, height in ((2, 2), (3, 7), (10, 6), (17, 13)):
+        grid = lifeengine.LifeGrid(width, height)
+        grid.randomize()
+        living = getLivingCells(grid)
+        for i in range(8):
+            living = slowStep(living, width, height)
+            grid.step()
+            assert getLivingCells(grid) == living
+
+
+def test_getRows():
+    grid = lifeengine.LifeGrid(3, 2)
+    grid.setCell(0, 0)
+    grid.setCell(2, 1)
+    assert grid.getRows('#', '.') == ['#..', '..#']
@@ -0,0 +1,104 @@
+import random
+from gamesbyexample import mazeengine
+
+MAZE_TEXT = ['###########',
+             '#S#       #',
+             '# ##### # #',
+             '# #   # # #',
+             '# # # ### #',
+             '#   #     #',
+             '######### #',
+             '# #     # #',
+             '# # # ### #',
+             '#   #    E#',
+             '###########']
+
+
+def isPerfectMaze(maze):
+    """Return True if every open space is connected with no loops, which
+    is true when there is one fewer passage than open spaces."""
+    openSpaces = [(x, y) for y in range(maze.height) for x in range(maze.width) if not maze.isWall(x, y)]
+    numPassages = sum(len(maze.getNeighbors(x, y)) for x, y in openSpaces) // 2
+    cellsWide, cellsHigh = maze.width // 2, maze.height // 2
+    return len(openSpaces) == 2 * cellsWide * cellsHigh - 1 and numPassages == len(openSpaces) - 1
+
+
+def test_read_and_write(tmp_path):
+    mazeFilename = tmp_path / 'maze.txt'
+    mazeFilename.write_text('\n'.join(MAZE_TEXT) + '\n')
+    maze = mazeengine.readMaze(str(mazeFilename))
+    assert (maze.width, maze.height) == (11, 11)
+    assert maze.start == (1, 1)
+    assert maze.exit == (9, 9)
+    assert maze[(0, 0)] == mazeengine.WALL
+    assert maze[(1, 2)] == mazeengine.EMPTY
+    assert maze.get((-1, 5), 'outside') == 'outside'
+    assert [maze.getRowText(y) for y in range(maze.height)] == MAZE_TEXT
+
+    mazeengine.writeMaze(maze, str(tmp_path / 'copy.txt'))
+    assert (tmp_path / 'copy.txt').read_text().splitlines() == MAZE_TEXT
+
+    (tmp_path / 'bad.txt').write_text('###\n#S?\n#E#\n')
+    try:
+        mazeengine.readMaze(str(tmp_path / 'bad.txt'))
+        assert False, 'readMaze() should have raised ValueError'
+    except ValueError as error:
+        assert 'column 3, line 2' in str(error)
+
+
+def test_algorithms():
+    for algorithm in mazeengine.ALGORITHMS:
+        for seed in range(3):
+            maze = mazeengine.makeMaze(31, 15, algorithm, random.Random(seed))
+            assert isPerfectMaze(maze), algorithm
+            assert maze.getRowText(0) == '#' * 31
+
+
+def test_big_backtracker():
+    # The backtracker's path is longer than the recursion limit:
+    maze = mazeengine.makeBacktrackerMaze(201, 201, random.Random(42))
+    assert isPerfectMaze(maze)
+
+
+def test_eller_rows_stream(tmp_path):
+    rows = list(mazeengine.iterEllerRows(21, 11, random.Random(42)))
+    assert len(rows) == 11
+    assert all(len(row) == 21 for row in rows)
+    mazeFilename = str(tmp_path / 'eller.txt')
+    mazeengine.writeRows(mazeengine.iterEllerRows(21, 11, random.Random(42)), mazeFilename, 21, 11)
+    maze = mazeengine.readMaze(mazeFilename)
+    assert isPerfectMaze(maze)
+    assert maze.start == (1, 1) and maze.exit == (19, 9)
+
+
+def test_solve():
+    maze = mazeengine.Maze(11, 11)
+    for y, row in enumerate(MAZE_TEXT):
+        maze.setRow(y, row)
+    for algorithm in ('bfs', 'astar'):
+        path = mazeengine.solveMaze(maze, algorithm=algorithm)
+        assert path[0] == (1, 1) and path[-1] == (9, 9)
+        assert len(path) == 21
+        for (x1, y1), (x2, y2) in zip(path, path[1:]):
+            assert abs(x1 - x2) + abs(y1 - y2) == 1
+            assert not maze.isWall(x2, y2)
+
+    maze.setWall(9, 6, True)  # Block the only way to the exit.
+    assert mazeengine.solveMaze(maze) is None
+
+
+def test_solve_with_loops():
+    # With loops there are many paths, and A* must still find a
+    # shortest one:
+    rng = random.Random(3)
+    for i in range(20):
+        maze = mazeengine.makeMaze(41, 21, 'backtracker', rng)
+        for j in range(60):
+            maze.setWall(rng.randrange(1, 40), rng.randrange(1, 20), False)
+        bfsPath = mazeengine.solveMaze(maze, algorithm='bfs')
+        aStarPath = mazeengine.solveMaze(maze, algorithm='astar')
+        assert len(aStarPath) == len(bfsPath)
+        assert aStarPath[0] == maze.start and aStarPath[-1] == maze.exit
+        for (x1, y1), (x2, y2) in zip(aStarPath, aStarPath[1:]):
+            assert abs(x1 - x2) + abs(y1 - y2) == 1
+            assert not maze.isWall(x2, y2)
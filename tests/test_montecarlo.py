@@ -0,0 +1,75 @@
+import collections
+import pytest
+import functools
+import random
+from gamesbyexample import montecarlo
+
+
+def test_getRandomValues():
+    rng = random.Random(42)
+    values = montecarlo.getRandomValues(rng, 60000, 6)
+    assert len(values) == 60000
+    assert set(values) == {0, 1, 2, 3, 4, 5}
+    for value in range(6):
+        assert 9000 < values.count(value) < 11000
+
+
+def test_batchesAreRepeatable():
+    trialFunction = functools.partial(montecarlo.diceTrials, 3)
+    assert montecarlo._runBatch(trialFunction, 7, 3, 1000) == montecarlo._runBatch(trialFunction, 7, 3, 1000)
+    assert montecarlo._runBatch(trialFunction, 7, 3, 1000) != montecarlo._runBatch(trialFunction, 7, 4, 1000)
+
+
+def test_diceTrials():
+    counts = montecarlo.diceTrials(2, random.Random(1), 36000)
+    assert sum(counts.values()) == 36000
+    assert min(counts) == 2
+    assert max(counts) == 12
+    assert 5500 < counts[7] < 6500
+
+    counts = montecarlo.diceTrials(1, random.Random(1), 6000)
+    assert sorted(counts) == [1, 2, 3, 4, 5, 6]
+    assert sum(counts.values()) == 6000
+
+    # Adding the dice as big ints gets the same totals as adding up each
+    # roll, and so does adding up dice whose totals don't fit in a byte:
+    for numDice in (3, 51, 52):
+        dice = montecarlo.getRandomValues(random.Random(2), 500 * numDice, 6)
+        expected = collections.Counter(sum(dice[i:i + numDice]) + numDice for i in range(0, len(dice), numDice))
+        assert montecarlo.diceTrials(numDice, random.Random(2), 500) == expected
+
+
+def test_coinFlipTrials():
+    counts = montecarlo.coinFlipTrials(random.Random(1), 10000)
+    flipsCounted = 0
+    for outcome, count in counts.items():
+        flipsCounted += int(outcome.split()[0]) * count
+    assert flipsCounted == 10000
+
+
+def test_runSimulation():
+    counts = montecarlo.runSimulation(montecarlo.montyHallTrials, 200000, seed=1,
+                                      numWorkers=1, batchSize=30000, reportInterval=None)
+    assert counts['staying wins'] + counts['swapping wins'] == 200000
+    assert 0.32 < counts['staying wins'] / 200000 < 0.35
+
+    # Running the same seed across two worker processes gives the same
+    # counts, since each batch has its own seeded random numbers:
+    trialFunction = functools.partial(montecarlo.birthdayTrials, 23)
+    counts1 = montecarlo.runSimulation(trialFunction, 20000, seed=5, numWorkers=1,
+                                       batchSize=5000, reportInterval=None)
+    counts2 = montecarlo.runSimulation(trialFunction, 20000, seed=5, numWorkers=2,
+                                       batchSize=5000, reportInterval=None)
+    assert counts1 == counts2
+    assert 0.49 < counts1['matching birthday'] / 20000 < 0.53
+
+
+def test_birthdayTrials():
+    # Compare with the exact chance of a matching birthday:
+    for numPeople in (1, 2, 10, 23, 40):
+        noMatchChance = 1.0
+        for i in range(numPeople):
+            noMatchChance *= (365 - i) / 365
+        counts = montecarlo.birthdayTrials(numPeople, random.Random(numPeople), 50000)
+        assert abs(counts['matching birthday'] / 50000 - (1 - noMatchChance)) < 0.01
+    assert montecarlo.birthdayTrials(366, random.Random(1), 100) == {'matching birthday': 100}
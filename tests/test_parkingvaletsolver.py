@@ -0,0 +1,68 @@
+from gamesbyexample import parkingvaletsolver
+
+PUZZLES = ['BB.K..GI.KCCGIAAL.HDD.LMH.JEEMFFJ...',
+           '..BB.X...KDDAA.KL.HIEEL.HIJFFFGGJ...',
+           '.EBBIK.EFGIKAAFGJL..F.JLD..H..DCCH..']
+
+
+def replay(puzzle, moves):
+    """Make the moves on the puzzle, returning the final board as a dict
+    of car letters to lists of spaces."""
+    length = 6
+    cars = {}
+    for space, character in enumerate(puzzle):
+        if character not in '.X':
+            cars.setdefault(character, []).append(space)
+    for move in moves:
+        delta = {'L': -1, 'R': 1, 'U': -length, 'D': length}[move[1]]
+        newSpaces = [space + delta for space in cars[move[0]]]
+        occupied = {space for car, spaces in cars.items() if car != move[0] for space in spaces}
+        occupied |= {space for space, character in enumerate(puzzle) if character == 'X'}
+        assert all(0 <= space < length * length and space not in occupied for space in newSpaces)
+        if move[1] in 'LR':
+            assert len({space // length for space in newSpaces}) == 1  # Stayed in its row.
+        cars[move[0]] = newSpaces
+    return cars
+
+
+def test_puzzle_store(tmp_path):
+    puzzleFilename = tmp_path / 'puzzles.txt'
+    # The last line doesn't end with a newline, like the real file:
+    puzzleFilename.write_text('\n'.join(PUZZLES))
+    store = parkingvaletsolver.PuzzleStore(str(puzzleFilename))
+    assert store.offsets is None  # Every line is the same length.
+    assert len(store) == 3
+    assert [store.getPuzzle(i) for i in range(3)] == PUZZLES
+    assert store.getRandomPuzzle() in PUZZLES
+    store.close()
+
+    # Lines of different lengths are found with an index of offsets:
+    puzzleFilename.write_text('ab\nabcd\nabc\n')
+    store = parkingvaletsolver.PuzzleStore(str(puzzleFilename))
+    assert store.offsets == [0, 3, 8]
+    assert [store.getPuzzle(i) for i in range(len(store))] == ['ab', 'abcd', 'abc']
+    store.close()
+
+
+def test_solve():
+    for puzzle in PUZZLES:
+        moves = parkingvaletsolver.solve(puzzle)
+        assert moves is not None
+        cars = replay(puzzle, moves)
+        assert any(space % 6 == 5 for space in cars['A'])
+
+    # The A car only needs to drive to the right edge:
+    assert parkingvaletsolver.solve('......' * 2 + 'AA....' + '......' * 3) == ['AR'] * 4
+    assert parkingvaletsolver.solve('......' * 2 + '....AA' + '......' * 3) == []
+
+    # The B truck can't get out of the A car's way:
+    assert parkingvaletsolver.solve('....B.' * 2 + 'AA..B.' + 'XXXXX.' + '......' * 2) is None
+
+
+def test_fewest_moves():
+    # A breadth-first search finds solutions no longer than any other:
+    lot = parkingvaletsolver.ParkingLot(PUZZLES[0])
+    moves, numStates = lot.search()
+    assert len(moves) == len(parkingvaletsolver.solve(PUZZLES[0]))
+    assert numStates > len(moves)
+    assert lot.getOccupied(lot.startState) == sum(1 << space for space, character in enumerate(PUZZLES[0]) if character != '.')
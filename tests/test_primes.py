@@ -0,0 +1,47 @@
+import pytest
+import itertools
+import random
+from gamesbyexample import primes
+
+
+def slowIsPrime(number):
+    if number < 2:
+        return False
+    for i in range(2, int(number ** 0.5) + 1):
+        if number % i == 0:
+            return False
+    return True
+
+
+def test_primesUpTo():
+    assert primes.primesUpTo(1) == []
+    assert primes.primesUpTo(2) == [2]
+    assert primes.primesUpTo(30) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    for limit in range(200):
+        assert primes.primesUpTo(limit) == [n for n in range(limit + 1) if slowIsPrime(n)]
+
+
+def test_iterPrimes(monkeypatch):
+    # Tiny segments test the edges between segments:
+    monkeypatch.setattr(primes, 'SEGMENT_SIZE', 7)
+    random.seed(42)
+    for i in range(200):
+        start = random.randint(0, 500)
+        stop = start + random.randint(0, 300)
+        expected = [n for n in range(start, stop) if slowIsPrime(n)]
+        assert list(primes.iterPrimes(start, stop)) == expected
+        assert primes.countPrimes(start, stop) == len(expected)
+
+
+def test_iterPrimesForever():
+    assert list(itertools.islice(primes.iterPrimes(), 5)) == [2, 3, 5, 7, 11]
+    assert list(itertools.islice(primes.iterPrimes(10 ** 12), 3)) == [1000000000039, 1000000000061, 1000000000063]
+
+
+def test_isPrime():
+    for number in range(-5, 2000):
+        assert primes.isPrime(number) == slowIsPrime(number)
+    assert primes.isPrime(2 ** 61 - 1)
+    assert not primes.isPrime(2 ** 61 + 1)
+    assert not primes.isPrime(3215031751)  # Fools bases 2, 3, 5, and 7.
+    assert primes.isPrime(1000000000039)
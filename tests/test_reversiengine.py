@@ -0,0 +1,42 @@
+import pytest
+import random
+from gamesbyexample import reversiengine
+
+
+def test_startingMoves():
+    black, white = reversiengine.getStartingBoards()
+    moves = reversiengine.getMoveList(reversiengine.getMoves(black, white))
+    moves = sorted(reversiengine.toXY(move) for move in moves)
+    assert moves == [(2, 3), (3, 2), (4, 5), (5, 4)]
+
+
+def test_makeMove():
+    black, white = reversiengine.getStartingBoards()
+    black, white = reversiengine.makeMove(black, white, reversiengine.toIndex(2, 3))
+    assert reversiengine.countTiles(black) == 4
+    assert reversiengine.countTiles(white) == 1
+    assert black & (1 << reversiengine.toIndex(3, 3))  # This tile was flipped.
+
+
+def test_noWrapAround():
+    # A white tile on the right edge with a black tile at the start of
+    # the next row must not count as a line to flip:
+    black = 1 << reversiengine.toIndex(0, 1)
+    white = 1 << reversiengine.toIndex(7, 0)
+    assert reversiengine.getMoves(black, white) == 0
+
+
+def test_takesCorner():
+    # Black can take the top-left corner by flipping the white tile:
+    black = 1 << reversiengine.toIndex(2, 2)
+    white = (1 << reversiengine.toIndex(1, 1)) | (1 << reversiengine.toIndex(3, 2))
+    move = reversiengine.Searcher().getBestMove(black, white, timeLimit=1, maxDepth=3)
+    assert reversiengine.toXY(move) == (0, 0)
+
+
+def test_playGame():
+    random.seed(42)
+    searcher = reversiengine.Searcher()
+    difference = reversiengine.playGame(searcher, searcher, 1, 1)
+    assert -64 <= difference <= 64
+    assert searcher.nodes > 0
@@ -0,0 +1,75 @@
+import random
+from gamesbyexample import sandengine
+
+
+def makeRandomGrid(seed, width=30, height=20):
+    grid = sandengine.SandGrid(width, height, random.Random(seed))
+    rng = random.Random(seed)
+    for i in range(width * height // 3):
+        grid.set(rng.randrange(width), rng.randrange(height),
+                 rng.choice((sandengine.EMPTY, sandengine.SAND, sandengine.WATER, sandengine.WALL)))
+    return grid
+
+
+def test_sand_piles():
+    grid = sandengine.SandGrid(5, 4)
+    for i in range(3):
+        grid.set(2, i, sandengine.SAND)
+    while not grid.isSettled():
+        grid.step()
+    # The middle column's sand makes a pyramid:
+    assert grid.getText({**sandengine.MATERIAL_CHARS, sandengine.SAND: 'S'}) == '\n'.join([
+        '     ',
+        '     ',
+        '     ',
+        ' SSS '])
+    assert grid.count(sandengine.SAND) == 3
+
+
+def test_water_and_walls():
+    grid = sandengine.SandGrid(6, 3)
+    for x in range(6):
+        grid.set(x, 2, sandengine.WALL)
+    grid.set(0, 1, sandengine.WATER)
+    grid.set(0, 0, sandengine.SAND)
+    for i in range(50):
+        grid.step()
+    # The sand sank under the water, which flowed away along the wall:
+    assert grid.get(0, 1) == sandengine.SAND
+    assert grid.get(0, 0) == sandengine.EMPTY
+    assert grid.count(sandengine.WATER) == 1
+    assert grid.layers[sandengine.WALL][2] == grid.fullRow
+    assert grid.get(-1, 0) == sandengine.WALL
+
+
+def test_grains_are_kept():
+    grid = makeRandomGrid(7)
+    counts = [grid.count(material) for material in sandengine.MATERIALS]
+    for i in range(200):
+        grid.step()
+        assert [grid.count(material) for material in sandengine.MATERIALS] == counts
+
+
+def test_dirty_rows_match_full_sweep():
+    # Only sweeping the rows that changed must give the same grid as
+    # sweeping every row:
+    for seed in range(5):
+        grid, fullSweepGrid = makeRandomGrid(seed), makeRandomGrid(seed)
+        for i in range(200):
+            fullSweepGrid.activeRows = bytearray(b'\x01') * fullSweepGrid.height
+            grid.step()
+            fullSweepGrid.step()
+            assert grid.layers == fullSweepGrid.layers
+
+
+def test_changed_rows():
+    grid = sandengine.SandGrid(4, 4)
+    grid.set(0, 0, sandengine.SAND)
+    grid.set(3, 3, sandengine.WALL)
+    assert grid.step() == 3  # Rows 0 and 3 were set, and row 1 got the sand.
+    assert list(grid.changedRows) == [1, 1, 0, 1]
+    assert grid.step() == 2
+    assert grid.step() == 2  # The sand lands on the bottom row.
+    assert not grid.isSettled()
+    assert grid.step() == 0
+    assert grid.isSettled()
@@ -0,0 +1,117 @@
+import collections
+import random
+from gamesbyexample import slidingtilesolver
+
+
+_fewestMoves = {}  # Keys=8-puzzle boards, values=their fewest moves.
+
+
+def getFewestMoves(tiles):
+    """Return the fewest moves to solve the 8-puzzle tiles, by brute
+    force. Every board's distance is found in one search back from the
+    solved board."""
+    if not _fewestMoves:
+        solved = tuple(slidingtilesolver.getSolvedTiles(3))
+        neighbors = slidingtilesolver.getNeighbors(3)
+        _fewestMoves[solved] = 0
+        queue = collections.deque([solved])
+        while queue:
+            board = queue.popleft()
+            blank = board.index(slidingtilesolver.BLANK)
+            for space, move in neighbors[blank]:
+                nextBoard = list(board)
+                nextBoard[blank], nextBoard[space] = nextBoard[space], slidingtilesolver.BLANK
+                nextBoard = tuple(nextBoard)
+                if nextBoard not in _fewestMoves:
+                    _fewestMoves[nextBoard] = _fewestMoves[board] + 1
+                    queue.append(nextBoard)
+    return _fewestMoves[tuple(tiles)]
+
+
+def test_packing():
+    tiles = slidingtilesolver.getSolvedTiles(4)
+    board = slidingtilesolver.packTiles(tiles)
+    assert board & 15 == 1
+    assert slidingtilesolver.unpackTiles(board) == tiles
+
+
+def test_is_solvable():
+    tiles = slidingtilesolver.getSolvedTiles(4)
+    assert slidingtilesolver.isSolvable(tiles)
+    tiles[0], tiles[1] = tiles[1], tiles[0]
+    assert not slidingtilesolver.isSolvable(tiles)
+    assert slidingtilesolver.solve(tiles) is None
+    assert slidingtilesolver.isSolvable([1, 2, 3, 4, 5, 6, 7, 0, 8], 3)
+    assert not slidingtilesolver.isSolvable([2, 1, 3, 4, 5, 6, 7, 8, 0], 3)
+
+
+def test_solve_fewest_moves():
+    rng = random.Random(42)
+    for i in range(10):
+        tiles = slidingtilesolver.getRandomPuzzle(3, rng=rng)
+        moves = slidingtilesolver.solve(tiles)
+        assert len(moves) == getFewestMoves(tiles)
+        for move in moves:
+            slidingtilesolver.makeMove(tiles, move, 3)
+        assert tiles == slidingtilesolver.getSolvedTiles(3)
+
+
+def test_random_puzzle_min_moves():
+    rng = random.Random(42)
+    for i in range(10):
+        tiles = slidingtilesolver.getRandomPuzzle(3, minMoves=20, rng=rng)
+        assert slidingtilesolver.isSolvable(tiles, 3)
+        assert getFewestMoves(tiles) >= 20
+
+
+def test_getHint(monkeypatch):
+    rng = random.Random(42)
+    tiles = slidingtilesolver.getRandomPuzzle(3, minMoves=20, rng=rng)
+    moves = slidingtilesolver.solve(tiles)
+    assert slidingtilesolver.getHint(tiles) == (moves[0], len(moves), True)
+    assert slidingtilesolver.getHint(slidingtilesolver.getSolvedTiles(3)) is None
+
+    # When time runs out, the hint is a move from the last search bound:
+    expansions = []
+    def countExpansion(search):
+        expansions.append(1)
+        if len(expansions) > 50:
+            raise slidingtilesolver._SearchLimitReached()
+    monkeypatch.setattr(slidingtilesolver._Search, 'countExpansion', countExpansion)
+    move, numMoves, isExact = slidingtilesolver.getHint(tiles)
+    assert not isExact
+    assert numMoves <= len(moves)
+    slidingtilesolver.makeMove(tiles, move, 3)  # The move can be made.
+
+
+def test_pattern_database():
+    # On the 8-puzzle, a pattern database of the top row's tiles never
+    # counts more moves than are needed:
+    database = slidingtilesolver.buildPatternDatabase((1, 2, 3), width=3)
+    assert database[0 | (1 << 4) | (2 << 8)] == 0
+    rng = random.Random(42)
+    for i in range(20):
+        tiles = slidingtilesolver.getRandomPuzzle(3, rng=rng)
+        index = sum(tiles.index(tile) << (4 * i) for i, tile in enumerate((1, 2, 3)))
+        assert database[index] <= getFewestMoves(tiles)
+
+
+def test_pattern_databases_in_background(monkeypatch, tmp_path):
+    # Small two-tile patterns are quick to build:
+    monkeypatch.setattr(slidingtilesolver, 'PATTERNS', ((1, 2), (3, 4), (5, 6)))
+    for savedFile in (False, True):
+        monkeypatch.setattr(slidingtilesolver, '_patternDatabases', None)
+        monkeypatch.setattr(slidingtilesolver, '_buildThread', None)
+        monkeypatch.setattr(slidingtilesolver, '_buildProgress', 0.0)
+        if savedFile:
+            filename = str(tmp_path / 'patterns.bin')
+        else:
+            # The folder doesn't exist, so the databases can't be saved:
+            filename = str(tmp_path / 'missing' / 'patterns.bin')
+        slidingtilesolver.startBuildingPatternDatabases(filename)
+        databases = slidingtilesolver.getPatternDatabases(filename)  # Waits for the thread.
+        assert slidingtilesolver.arePatternDatabasesReady()
+        assert slidingtilesolver.getBuildProgress() == 1.0
+        assert [bytes(database) for database in databases] == [
+            bytes(slidingtilesolver.buildPatternDatabase(patternTiles)) for patternTiles in slidingtilesolver.PATTERNS]
+        assert (tmp_path / 'patterns.bin').exists() == savedFile
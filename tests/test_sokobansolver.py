@@ -0,0 +1,136 @@
+import random, time
+import pytest
+from gamesbyexample import sokobansolver
+
+LEVEL = ['#####',
+         '#@$.#',
+         '#####']
+
+LEVEL_2 = ['    #####',
+           '    #   #',
+           '    #$  #',
+           '  ###  $##',
+           '  #  $ $ #',
+           '### # ## #   ######',
+           '#   # ## #####  ..#',
+           '# $  $          ..#',
+           '##### ### #@##  ..#',
+           '    #     #########',
+           '    #######']
+
+# More crates than goals:
+SPARE_CRATES = ['######',
+                '#   ##',
+                '#  $ #',
+                '# $ .#',
+                '#@   #',
+                '#    #',
+                '######']
+
+
+def isSolvedBy(levelLines, solution):
+    """Replay the LURD solution on the level, returning True if it's made
+    of legal moves and leaves every goal covered."""
+    walls, crates, goals = set(), set(), set()
+    for y, line in enumerate(levelLines):
+        for x, char in enumerate(line):
+            if char == '#':
+                walls.add((x, y))
+            if char in '$*':
+                crates.add((x, y))
+            if char in '.*+':
+                goals.add((x, y))
+            if char in '@+':
+                player = (x, y)
+    for letter in solution:
+        dx, dy = sokobansolver.DIRECTION_DELTAS['udlr'.index(letter.lower())]
+        nextSpace = (player[0] + dx, player[1] + dy)
+        if nextSpace in walls:
+            return False
+        if nextSpace in crates:
+            behind = (nextSpace[0] + dx, nextSpace[1] + dy)
+            if not letter.isupper() or behind in walls or behind in crates:
+                return False
+            crates.remove(nextSpace)
+            crates.add(behind)
+        elif letter.isupper():
+            return False
+        player = nextSpace
+    return goals <= crates
+
+
+def test_solve():
+    result = sokobansolver.solve(LEVEL)
+    assert result['solution'] == 'R'
+    assert result['pushes'] == 1
+
+    for algorithm in ('astar', 'idastar'):
+        result = sokobansolver.solve(LEVEL_2, algorithm)
+        assert result['stopReason'] is None
+        assert isSolvedBy(LEVEL_2, result['solution'])
+        assert result['pushes'] == sum(letter.isupper() for letter in result['solution'])
+        assert result['pushes'] == 97
+
+
+def test_spare_crates():
+    result = sokobansolver.solve(SPARE_CRATES)
+    assert isSolvedBy(SPARE_CRATES, result['solution'])
+    assert result['pushes'] == 2
+
+
+def test_no_solution():
+    # The crate is in a corner:
+    result = sokobansolver.solve(['#####',
+                                  '#$ .#',
+                                  '# @ #',
+                                  '#####'])
+    assert result['solution'] is None
+    assert result['stopReason'] == 'no solution'
+
+
+def test_search_limits():
+    result = sokobansolver.solve(LEVEL_2, maxStates=10)
+    assert result['solution'] is None
+    assert result['stopReason'] == 'memory cap'
+
+    startTime = time.time()
+    result = sokobansolver.solve(LEVEL_2, timeLimit=0)
+    assert result['stopReason'] == 'time limit'
+    assert time.time() - startTime < 1
+
+
+def test_freeze_deadlock():
+    level = sokobansolver.SokobanLevel(['######',
+                                        '#    #',
+                                        '# $$ #',
+                                        '#    #',
+                                        '# @..#',
+                                        '######'])
+    square = level.rowLength * 2 + 2
+    # Two crates side by side against a wall can't be pushed apart:
+    againstWall = (1 << (level.rowLength + 2)) | (1 << (level.rowLength + 3))
+    assert level.isFrozenDeadlock(againstWall, level.rowLength + 2)
+    # Away from the walls, they can still be pushed up or down:
+    apart = (1 << square) | (1 << (square + 1))
+    assert not level.isFrozenDeadlock(apart, square)
+
+
+@pytest.mark.parametrize('levelLines', [LEVEL_2, SPARE_CRATES])
+def test_lower_bound_after_push(levelLines):
+    # The incrementally updated bound must always equal the bound
+    # computed from scratch:
+    level = sokobansolver.SokobanLevel(levelLines)
+    random.seed(42)
+    crates, player = level.startCrates, level.startPlayer
+    bound = level.getLowerBound(crates)
+    for i in range(300):
+        reachable, lowest = level.getReachable(crates, player)
+        pushes = list(level.getPushes(crates, reachable))
+        if not pushes:
+            crates, player = level.startCrates, level.startPlayer
+            bound = level.getLowerBound(crates)
+            continue
+        square, direction, crates = random.choice(pushes)
+        player = square
+        bound = level.getLowerBoundAfterPush(bound, crates, square, level.neighbors[square][direction])
+        assert bound[0] == level.getLowerBound(crates)[0]
@@ -0,0 +1,52 @@
+import pytest
+import random
+from gamesbyexample import sudokusolver
+
+PUZZLE = '..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..'
+SOLUTION = '483921657967345821251876493548132976729564138136798245372689514814253769695417382'
+
+
+def isValidSolution(solution, puzzle):
+    for puzzleChar, solutionChar in zip(puzzle, solution):
+        if puzzleChar != '.' and puzzleChar != solutionChar:
+            return False
+    for unit in sudokusolver.UNITS:
+        if sorted(solution[i] for i in unit) != list('123456789'):
+            return False
+    return True
+
+
+def test_units():
+    assert len(sudokusolver.UNITS) == 27
+    for unit in sudokusolver.UNITS:
+        assert len(set(unit)) == 9
+
+
+def test_solve():
+    assert sudokusolver.solve(PUZZLE) == SOLUTION
+    assert sudokusolver.hasUniqueSolution(PUZZLE)
+
+    # A hard puzzle that needs plenty of guessing:
+    hardPuzzle = '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..'
+    assert isValidSolution(sudokusolver.solve(hardPuzzle), hardPuzzle)
+
+
+def test_unsolvable():
+    # Two 1s in the same row:
+    assert sudokusolver.solve('11' + '.' * 79) is None
+    # Only a 9 can go in the top-left space, but there's a 9 below it:
+    assert sudokusolver.solve('.12345678' + '.' * 63 + '9........') is None
+
+
+def test_multipleSolutions():
+    assert not sudokusolver.hasUniqueSolution('.' * 81)
+    assert len(sudokusolver.findSolutions('.' * 81, 5)) == 5
+
+
+def test_makePuzzle():
+    random.seed(42)
+    for i in range(3):
+        puzzle = sudokusolver.makePuzzle()
+        assert len(puzzle) == 81
+        assert sudokusolver.hasUniqueSolution(puzzle)
+        assert isValidSolution(sudokusolver.solve(puzzle), puzzle)
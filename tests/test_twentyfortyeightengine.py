@@ -0,0 +1,62 @@
+import random
+from gamesbyexample import twentyfortyeightengine as engine
+
+ROWS = [[2, 2, 4, 8],
+        [0, 4, 4, 4],
+        [16, 0, 16, 0],
+        [2, 0, 0, 2]]
+
+
+def test_moves():
+    board = engine.boardFromRows(ROWS)
+    assert engine.boardToRows(board) == ROWS
+    assert engine.boardToRows(engine.makeMove(board, 'A')) == [[4, 4, 8, 0],
+                                                               [8, 4, 0, 0],
+                                                               [32, 0, 0, 0],
+                                                               [4, 0, 0, 0]]
+    assert engine.boardToRows(engine.makeMove(board, 'D')) == [[0, 4, 4, 8],
+                                                               [0, 0, 4, 8],
+                                                               [0, 0, 0, 32],
+                                                               [0, 0, 0, 4]]
+    assert engine.boardToRows(engine.makeMove(board, 'W')) == [[2, 2, 8, 8],
+                                                               [16, 4, 16, 4],
+                                                               [2, 0, 0, 2],
+                                                               [0, 0, 0, 0]]
+    assert engine.boardToRows(engine.makeMove(board, 'S')) == [[0, 0, 0, 0],
+                                                               [2, 0, 0, 8],
+                                                               [16, 2, 8, 4],
+                                                               [2, 4, 16, 2]]
+
+
+def test_transpose():
+    rng = random.Random(42)
+    for i in range(100):
+        board = rng.getrandbits(64)
+        rows = engine.boardToRows(board)
+        assert engine.boardToRows(engine.transpose(board)) == [list(column) for column in zip(*rows)]
+
+
+def test_legal_moves_and_tiles():
+    board = engine.boardFromRows([[2, 4, 2, 4],
+                                  [4, 2, 4, 2],
+                                  [2, 4, 2, 4],
+                                  [4, 2, 4, 0]])
+    assert engine.getLegalMoves(board) == ['S', 'D']
+    full = engine.addRandomTile(board, random.Random(1))
+    assert engine.getTile(full, 3, 3) == 2
+    assert engine.getLegalMoves(full) == []
+    assert engine.getBestMove(full) is None
+    assert engine.getScore(full) == 48
+    assert engine.getMaxTile(full) == 4
+
+
+def test_ai():
+    # The AI should take the move that merges the two 1024 tiles:
+    board = engine.boardFromRows([[1024, 1024, 2, 4],
+                                  [2, 4, 8, 16],
+                                  [4, 8, 16, 32],
+                                  [8, 16, 32, 64]])
+    assert engine.getBestMove(board, maxDepth=1) in ('A', 'D')
+    score, maxTile, numMoves = engine.playGame(1, maxDepth=1)
+    assert maxTile >= 256
+    assert score > 500
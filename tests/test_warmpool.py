@@ -0,0 +1,56 @@
+import pytest
+import sys
+from gamesbyexample import __warmpool__ as warmpool
+
+
+@pytest.fixture
+def programFolder(tmp_path, monkeypatch):
+    # runProgram() changes these, the same as running a new program would:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', list(sys.argv))
+    monkeypatch.setattr(sys, 'path', list(sys.path))
+    return tmp_path
+
+
+def writeProgram(folder, filename, source):
+    (folder / filename).write_text(source)
+    return str(folder / filename)
+
+
+def test_runProgramExitCodes(programFolder, capsys):
+    program = writeProgram(programFolder, 'hello.py', 'import sys\nprint("hello", __name__, sys.argv[0].endswith("hello.py"))\n')
+    assert warmpool.runProgram(program, '1.0') == 0
+    assert capsys.readouterr().out == 'hello __main__ True\n'
+
+    program = writeProgram(programFolder, 'exits.py', 'import sys\nsys.exit(3)\n')
+    assert warmpool.runProgram(program, '1.0') == 3
+
+    program = writeProgram(programFolder, 'quits.py', 'raise KeyboardInterrupt\n')
+    assert warmpool.runProgram(program, '1.0') == 0
+
+
+def test_runProgramCrash(programFolder, capsys):
+    program = writeProgram(programFolder, 'crash.py', '__version__ = 7\nprint("before")\n1 / 0\n')
+    assert warmpool.runProgram(program, '1.0') == 1
+    output = capsys.readouterr()
+    assert output.out == 'before\n'
+    assert 'ZeroDivisionError' in output.err
+    assert 'in runProgram' not in output.err  # Only the program's own frames are shown.
+    assert 'CRASH DETECTED' in output.err
+    assert 'Program Version: 7' in output.err
+    assert 'Launcher Version: 1.0' in output.err
+
+
+def test_socketFolder(tmp_path, monkeypatch):
+    runtimeFolder = tmp_path / 'runtime'
+    runtimeFolder.mkdir(0o700)
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(runtimeFolder))
+    assert warmpool.getSocketPath().startswith(str(runtimeFolder))
+    runtimeFolder.chmod(0o777)  # Other users could make a fake server here.
+    assert not warmpool.getSocketPath().startswith(str(runtimeFolder))
+
+    # The client won't connect to a socket in a folder others can use:
+    (runtimeFolder / 'fake.sock').write_text('')
+    assert warmpool.runClient(str(runtimeFolder / 'fake.sock'), '1.0', 'hello.py') is None
+    with pytest.raises(PermissionError):
+        warmpool.WarmPool(str(runtimeFolder / 'fake.sock'))
@@ -0,0 +1,63 @@
+import os
+from gamesbyexample import wordindex
+
+WORDS = ['MONITOR', 'CONTAIN', 'MENTION', 'APPLE', 'AMPLE', 'ANGLE', 'APPLY',
+         'APP', 'APPLE', '', 'MONITORS']
+
+
+def test_words_and_lengths():
+    index = wordindex.WordIndex(WORDS)
+    # Duplicates and blank lines are dropped, and the order is kept:
+    assert index.words == ['MONITOR', 'CONTAIN', 'MENTION', 'APPLE', 'AMPLE',
+                           'ANGLE', 'APPLY', 'APP', 'MONITORS']
+    assert index.wordsByLength[5] == ['APPLE', 'AMPLE', 'ANGLE', 'APPLY']
+    assert 'AMPLE' in index
+    assert 'AMPLY' not in index
+    assert 'ZZ' not in index
+
+
+def test_patterns():
+    index = wordindex.WordIndex(WORDS)
+    assert index.getWordsMatching('A_P_E') == ['APPLE', 'AMPLE']
+    assert index.getWordsMatching('A___E') == ['APPLE', 'AMPLE', 'ANGLE']
+    assert index.getWordsMatching('A___E', excludedLetters='P') == ['ANGLE']
+    assert index.getWordsMatching('_____', excludedLetters='A') == []
+    assert index.getWordsMatching('Q____') == []
+    assert index.getWordsMatching('__________') == []
+
+
+def test_matching_positions():
+    index = wordindex.WordIndex(WORDS)
+    byMatches = index.getWordsByMatches('MONITOR')
+    assert byMatches[7] == ['MONITOR']
+    assert byMatches[2] == ['CONTAIN']  # The O and N match.
+    assert byMatches[3] == ['MENTION']  # The M, N, and O match.
+    assert sum(len(words) for words in byMatches) == 3
+
+    byMatches = index.getWordsByMatches('APPLE')
+    for k, words in enumerate(byMatches):
+        for word in words:
+            assert sum(a == b for a, b in zip(word, 'APPLE')) == k
+
+
+def test_prefixes():
+    index = wordindex.WordIndex(WORDS)
+    assert index.getWordsWithPrefix('APP') == ['APP', 'APPLE', 'APPLY']
+    assert index.getWordsWithPrefix('MONITOR') == ['MONITOR', 'MONITORS']
+    assert index.getWordsWithPrefix('ZEBRA') == []
+
+
+def test_load_and_save(tmp_path):
+    wordFilename = str(tmp_path / 'words.txt')
+    with open(wordFilename, 'w') as wordFile:
+        wordFile.write('\n'.join(word.lower() for word in WORDS))
+    index = wordindex.loadWordFile(wordFilename, upper=True)
+    assert index.words[0] == 'MONITOR'
+    assert wordindex.loadWordFile(wordFilename, upper=True) is index  # Loaded once.
+    indexFilename = wordFilename + '.upper' + wordindex.INDEX_EXTENSION
+    assert os.path.exists(indexFilename)
+
+    loaded = wordindex.WordIndex.load(indexFilename)
+    assert loaded.words == index.words
+    assert loaded.getWordsMatching('A_P_E') == ['APPLE', 'AMPLE']
+    assert loaded.getWordsByMatches('MONITOR') == index.getWordsByMatches('MONITOR')